@@ -16,8 +16,11 @@ HMAC secret auto-generation: if VECTORAIZ_APIKEY_HMAC_SECRET is not set,
 generate one, persist to /data/.vectoraiz_hmac_secret, and log WARNING.
 
 Updated: S130 (2026-02-13) — BQ-127 Air-Gap Architecture
+Updated: BQ-VZ-PERF — Read-only local key validation off the event loop,
+         cached by key_id + secret digest, coalesced last_used_at flushes
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -26,7 +29,7 @@ import os
 import secrets
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 from cachetools import TTLCache
@@ -52,9 +55,15 @@ class AuthenticatedUser(BaseModel):
     model_config = {"populate_by_name": True}
 
 
-# In-memory cache for validated API keys
+# In-memory cache for validated API keys, keyed by _api_key_cache_key()
 api_key_cache = TTLCache(maxsize=1000, ttl=settings.auth_cache_ttl)
 
+# Seconds between background writes of coalesced local key last_used_at
+LAST_USED_FLUSH_INTERVAL_S = 30
+
+# key_id -> most recent use, written to local_api_keys by flush_last_used()
+_pending_last_used: Dict[str, datetime] = {}
+
 
 def _is_auth_enabled() -> bool:
     """Check if auth is enabled.
@@ -149,46 +158,68 @@ def _parse_local_key(api_key: str) -> Optional[tuple]:
     return parts[1], parts[2]
 
 
-async def _validate_local_key(api_key: str) -> Optional[AuthenticatedUser]:
-    """Validate a local ``vz_`` API key against the local_api_keys table.
+def _api_key_cache_key(api_key: str) -> str:
+    """Cache key for an X-API-Key header value — never the raw key.
 
-    Performs O(1) lookup by key_id, then compares HMAC hashes.
-    Updates last_used_at on successful validation.
+    Local keys are keyed by key_id plus a digest of the secret, so a key's
+    entries can be found for revocation without storing its secret.
     """
     parsed = _parse_local_key(api_key)
-    if not parsed:
-        return None
-    key_id, secret = parsed
+    if parsed:
+        key_id, secret = parsed
+        return f"vz:{key_id}:{hashlib.sha256(secret.encode()).hexdigest()}"
+    return f"key:{hashlib.sha256(api_key.encode()).hexdigest()}"
+
+
+def invalidate_local_key(key_id: str) -> None:
+    """Drop cached validations of a local key (call after revoking it)."""
+    prefix = f"vz:{key_id}:"
+    for cache_key in [k for k in list(api_key_cache.keys()) if k.startswith(prefix)]:
+        api_key_cache.pop(cache_key, None)
+
 
+def invalidate_local_user(user_id: str) -> None:
+    """Drop cached validations of every local key owned by *user_id*."""
+    stale = [
+        k for k, v in list(api_key_cache.items())
+        if k.startswith("vz:") and v.user_id == user_id
+    ]
+    for cache_key in stale:
+        api_key_cache.pop(cache_key, None)
+
+
+def _record_local_key_use(key_id: str) -> None:
+    """Note a use of *key_id*; the next flush_last_used() persists it."""
+    _pending_last_used[key_id] = datetime.now(timezone.utc)
+
+
+def _lookup_local_key(key_id: str, secret: str) -> Optional[AuthenticatedUser]:
+    """Read-only key + user lookup (blocking — run in a worker thread)."""
     # Lazy import to avoid circular deps
     from app.core.database import get_session_context
     from app.models.local_auth import LocalAPIKey, LocalUser
     from sqlmodel import select
 
     with get_session_context() as session:
-        stmt = select(LocalAPIKey).where(
+        stmt = select(LocalAPIKey, LocalUser).join(
+            LocalUser, LocalUser.id == LocalAPIKey.user_id,
+        ).where(
             LocalAPIKey.key_id == key_id,
             LocalAPIKey.revoked_at.is_(None),  # type: ignore[union-attr]
         )
-        key_record = session.exec(stmt).first()
-        if not key_record:
+        row = session.exec(stmt).first()
+        if not row:
             return None
+        key_record, user = row
 
         # Verify HMAC
         expected_hash = hmac_hash_secret(secret)
         if not hmac.compare_digest(key_record.key_hash, expected_hash):
             return None
 
-        # Load associated user
-        user = session.get(LocalUser, key_record.user_id)
-        if not user or not user.is_active:
+        if not user.is_active:
             return None
 
-        # Update last_used_at
-        key_record.last_used_at = datetime.now(timezone.utc)
-        session.add(key_record)
-        session.commit()
-
         # Parse scopes from JSON string
         try:
             scopes = json.loads(key_record.scopes)
@@ -205,6 +236,70 @@ async def _validate_local_key(api_key: str) -> Optional[AuthenticatedUser]:
         )
 
 
+async def _validate_local_key(api_key: str) -> Optional[AuthenticatedUser]:
+    """Validate a local ``vz_`` API key against the local_api_keys table.
+
+    Performs O(1) lookup by key_id, then compares HMAC hashes. The lookup
+    runs in a worker thread and writes nothing; last_used_at is recorded
+    in memory and persisted by the periodic flush.
+    """
+    parsed = _parse_local_key(api_key)
+    if not parsed:
+        return None
+    key_id, secret = parsed
+
+    user = await asyncio.to_thread(_lookup_local_key, key_id, secret)
+    if user:
+        _record_local_key_use(key_id)
+    return user
+
+
+def _write_last_used(pending: Dict[str, datetime]) -> None:
+    """Bulk-update last_used_at for *pending* keys in one transaction."""
+    from app.core.database import get_session_context
+    from app.models.local_auth import LocalAPIKey
+    from sqlalchemy import bindparam, update
+
+    table = LocalAPIKey.__table__
+    stmt = (
+        update(table)
+        .where(table.c.key_id == bindparam("b_key_id"))
+        .values(last_used_at=bindparam("b_used_at"))
+    )
+    with get_session_context() as session:
+        session.connection().execute(
+            stmt,
+            [{"b_key_id": key_id, "b_used_at": used_at} for key_id, used_at in pending.items()],
+        )
+        session.commit()
+
+
+async def flush_last_used() -> int:
+    """Persist coalesced local key uses off the event loop. Returns keys written."""
+    global _pending_last_used
+    if not _pending_last_used:
+        return 0
+    pending, _pending_last_used = _pending_last_used, {}
+    try:
+        await asyncio.to_thread(_write_last_used, pending)
+    except BaseException:
+        # Keep the uses for the next flush (newer ones win)
+        for key_id, used_at in pending.items():
+            _pending_last_used.setdefault(key_id, used_at)
+        raise
+    return len(pending)
+
+
+async def last_used_flush_loop(interval: int = LAST_USED_FLUSH_INTERVAL_S) -> None:
+    """Periodic last_used_at flush — started from main.py lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_last_used()
+        except Exception:
+            logger.exception("Local API key last_used_at flush failed")
+
+
 # ---------------------------------------------------------------------------
 # ai.market validation (connected mode — existing flow)
 # ---------------------------------------------------------------------------
@@ -467,8 +562,11 @@ async def get_current_user(request: Request) -> AuthenticatedUser:
         )
 
     # Check cache first
-    cached_user = api_key_cache.get(api_key)
+    cache_key = _api_key_cache_key(api_key)
+    cached_user = api_key_cache.get(cache_key)
     if cached_user:
+        if cache_key.startswith("vz:"):
+            _record_local_key_use(cached_user.key_id)
         request.state.user = cached_user
         return cached_user
 
@@ -496,7 +594,7 @@ async def get_current_user(request: Request) -> AuthenticatedUser:
         )
 
     # Store in cache and request state
-    api_key_cache[api_key] = validated_user
+    api_key_cache[cache_key] = validated_user
     request.state.user = validated_user
     request.state.user_role = "admin"  # BQ-VZ-MULTI-USER: API key users default to admin
     return validated_user
@@ -523,8 +621,11 @@ async def get_current_user_ws(websocket: WebSocket) -> Optional[AuthenticatedUse
         return None
 
     # Check cache
-    cached_user = api_key_cache.get(api_key)
+    cache_key = _api_key_cache_key(api_key)
+    cached_user = api_key_cache.get(cache_key)
     if cached_user:
+        if cache_key.startswith("vz:"):
+            _record_local_key_use(cached_user.key_id)
         return cached_user
 
     validated_user: Optional[AuthenticatedUser] = None
@@ -545,7 +646,7 @@ async def get_current_user_ws(websocket: WebSocket) -> Optional[AuthenticatedUse
     if not validated_user:
         return None
 
-    api_key_cache[api_key] = validated_user
+    api_key_cache[cache_key] = validated_user
     return validated_user
 
 
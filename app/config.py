@@ -184,10 +184,19 @@ class Settings(BaseSettings):
     max_upload_size_gb: int = 1000               # Safety valve only — local app, disk is the real limit
     streaming_queue_maxsize: int = 32            # Backpressure queue depth
     streaming_batch_target_rows: int = 10000     # Target rows per RecordBatch
+    pdf_extract_workers: int = _DETECTED_CPU_WORKERS  # Process pool size for page-range PDF extraction
+    pdf_pages_per_task: int = 16                 # Pages per process-pool task
+    pdf_table_min_edges: int = 4                 # Skip pdfplumber on pages with fewer ruling segments
+    excel_engine: Literal["auto", "openpyxl", "calamine"] = "auto"  # auto: calamine for .xls when installed
     parquet_row_group_size_mb: int = 64           # Target row group size for ParquetWriter
 
     # BQ-VZ-DB-CONNECT: Database extraction limits
     db_extract_max_rows: int = 5_000_000  # Max rows per extraction (M3)
+    db_extract_engine: Literal["auto", "sqlalchemy"] = "auto"  # auto: ADBC/connectorx when importable
+    db_extract_max_partitions: int = 4  # Concurrent range queries per partitioned extraction (source load cap)
+    db_extract_concurrency: int = 2  # Tables extracted at once per connection
+    db_pipeline_concurrency: int = _DETECTED_CPU_WORKERS  # Extracted tables in processing/PII at once
+    db_extract_partition_min_rows: int = 1_000_000  # Estimated rows per partition before splitting
 
     # BQ-VZ-SERIAL-CLIENT: Serial activation & metering
     serial: Optional[str] = None  # Device serial number for X-Serial header
@@ -201,7 +210,20 @@ class Settings(BaseSettings):
     reranker_enabled: bool = True
     reranker_top_k: int = 30
     reranker_timeout_ms: int = 200
+    reranker_backend: Literal["torch", "onnx_int8"] = "torch"  # onnx_int8 needs optimum[onnxruntime], sentence-transformers>=3.2
+    reranker_onnx_file: str = "onnx/model_qint8_avx512_vnni.onnx"  # Quantized export in the model repo
+    reranker_max_length: int = 256               # Truncate pairs to this many tokens (0 = model max)
+    reranker_batch_window_ms: int = 5            # Micro-batch concurrent rerank calls within this window
+    reranker_max_batch_pairs: int = 64           # Pairs per predict() call
+    reranker_cache_size: int = 50000             # Cached (query, point, text) scores
     fts_enabled: bool = True
+    fts_build_workers: int = 2                   # Bounded pool for background FTS index builds
+    fts_search_workers: int = 4                  # Parallel BM25 fan-out for multi-dataset search
+    fts_pool_max_idle: int = 4                   # Idle read-only FTS connections kept per dataset
+    fts_pool_idle_s: float = 300.0               # Close pooled FTS connections idle this long
+
+    # BQ-VZ-DATA-READINESS: Sketch profiling
+    sketch_workers: int = _DETECTED_CPU_WORKERS  # Process pool size for column-parallel profiling
 
     # CORS
     cors_origins: List[str] = ["http://localhost:5173", "http://localhost:3000", "http://localhost:8080", "https://vectoraiz-frontend-production.up.railway.app", "https://dev.vectoraiz.com", "https://vectoraiz.com", "https://www.vectoraiz.com", "https://vectoraiz-website-production.up.railway.app"]
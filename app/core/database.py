@@ -11,22 +11,28 @@ Supports two backends via DATABASE_URL env var:
 SQLite extras: WAL mode, busy_timeout=5000, check_same_thread=False,
 retry on SQLITE_BUSY up to 3× with jittered backoff.
 
+Coroutines use the async engine (aiosqlite / asyncpg) on the same URL via
+``async_session_context()``; the sync helpers are for threads and scripts.
+
 Phase: BQ-111 — Persistent State
 Created: 2026-02-12
 """
 
+import asyncio
 import logging
 import os
 import random
 import time
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Generator, Optional
+from typing import AsyncIterator, Generator, Optional
 
 from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session as SQLModelSession, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
 
@@ -47,6 +53,13 @@ _is_sqlite = DATABASE_URL.startswith("sqlite")
 # Engine (lazy singleton)
 # ---------------------------------------------------------------------------
 _engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+
+# Async drivers for the DATABASE_URL backends
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
 # Legacy compat: keep the old state DB path for init_db()
 _LEGACY_DATABASE_DIR = Path(settings.data_directory)
@@ -55,6 +68,13 @@ _LEGACY_DATABASE_URL = f"sqlite:///{_LEGACY_DATABASE_FILE}"
 _legacy_engine: Optional[Engine] = None
 
 
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
 def _build_engine(url: str) -> Engine:
     """Create an engine appropriate for the database backend."""
     if url.startswith("sqlite"):
@@ -67,14 +87,7 @@ def _build_engine(url: str) -> Engine:
             echo=settings.debug,
             connect_args={"check_same_thread": False},
         )
-
-        @event.listens_for(engine, "connect")
-        def _set_sqlite_pragmas(dbapi_conn, _connection_record):
-            cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA busy_timeout=5000")
-            cursor.close()
-
+        event.listen(engine, "connect", _set_sqlite_pragmas)
         return engine
 
     # PostgreSQL (or other)
@@ -95,6 +108,49 @@ def get_engine() -> Engine:
     return _engine
 
 
+def _async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite / asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    if backend == "postgres":
+        backend = "postgresql"
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database URL scheme '{scheme}'")
+    return f"{_ASYNC_DRIVERS[backend]}{sep}{rest}"
+
+
+def _build_async_engine(url: str) -> AsyncEngine:
+    """Create the async twin of ``_build_engine`` (same pragmas and pool sizing)."""
+    if url.startswith("sqlite"):
+        db_path = url.replace("sqlite:///", "")
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        engine = create_async_engine(_async_url(url), echo=settings.debug)
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_async_engine(
+        _async_url(url),
+        echo=settings.debug,
+        pool_size=5,
+        max_overflow=10,
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async engine for the primary database.
+
+    Pooled asyncpg connections belong to the event loop that opened them,
+    so this engine is for the serving loop only; worker threads and scripts
+    keep using ``get_engine()``.
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _build_async_engine(DATABASE_URL)
+        logger.info("Async database engine created: %s", _async_url(DATABASE_URL).split("://")[0])
+    return _async_engine
+
+
 def get_legacy_engine() -> Engine:
     """Get or create the legacy vai_state.db engine (sessions, messages, prefs)."""
     global _legacy_engine
@@ -138,6 +194,27 @@ def _sqlite_retry(fn):
     raise last_exc  # type: ignore[misc]
 
 
+async def _sqlite_retry_async(fn):
+    """Await *fn()* with the same SQLite BUSY retry, backing off with asyncio.sleep."""
+    last_exc: Optional[Exception] = None
+    for attempt in range(_SQLITE_MAX_RETRIES):
+        try:
+            return await fn()
+        except OperationalError as exc:
+            if "database is locked" not in str(exc).lower():
+                raise
+            last_exc = exc
+            delay = random.randint(_SQLITE_BACKOFF_MIN_MS, _SQLITE_BACKOFF_MAX_MS) / 1000
+            logger.warning(
+                "SQLITE_BUSY retry %d/%d — sleeping %.3fs",
+                attempt + 1,
+                _SQLITE_MAX_RETRIES,
+                delay,
+            )
+            await asyncio.sleep(delay)
+    raise last_exc  # type: ignore[misc]
+
+
 # ---------------------------------------------------------------------------
 # Session helpers
 # ---------------------------------------------------------------------------
@@ -172,6 +249,23 @@ def get_session_context():
         yield session
 
 
+@asynccontextmanager
+async def async_session_context() -> AsyncIterator[AsyncSession]:
+    """
+    Async context manager for coroutines — never blocks the event loop.
+
+    Objects stay loaded after commit (``expire_on_commit=False``) because an
+    expired attribute cannot be lazily reloaded outside an await.
+
+    Usage::
+
+        async with async_session_context() as session:
+            result = await session.exec(...)
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
 def get_legacy_session() -> Generator[SQLModelSession, None, None]:
     """FastAPI dependency for the legacy vai_state.db (sessions, prefs)."""
     engine = get_legacy_engine()
@@ -297,6 +391,69 @@ def _migrate_legacy_bq128(engine: Engine) -> None:
             conn.commit()
             logger.info("BQ-128 Audit: Added partial unique index uq_msg_session_client_id")
 
+    _migrate_message_token_sums(engine)
+
+
+def _migrate_message_token_sums(engine: Engine) -> None:
+    """Add per-session running token sums and backfill them (SQLite ALTER TABLE).
+
+    Existing messages without a token_count get the ~4 chars/token estimate
+    ContextWindowManager uses, then cumulative_tokens is filled with a window
+    sum per session. Idempotent: only rows still missing a sum are touched.
+    """
+    from sqlalchemy import inspect
+    insp = inspect(engine)
+
+    session_cols = {c["name"] for c in insp.get_columns("sessions")}
+    new_session_cols = {
+        "total_tokens": "INTEGER DEFAULT 0",
+        "context_summary": "TEXT",
+        "context_summary_through": "INTEGER",
+    }
+    msg_cols = {c["name"] for c in insp.get_columns("messages")}
+    with engine.connect() as conn:
+        for col_name, col_def in new_session_cols.items():
+            if col_name not in session_cols:
+                conn.execute(text(f"ALTER TABLE sessions ADD COLUMN {col_name} {col_def}"))
+                logger.info("Added %s column to sessions table", col_name)
+        if "cumulative_tokens" not in msg_cols:
+            conn.execute(text("ALTER TABLE messages ADD COLUMN cumulative_tokens INTEGER"))
+            logger.info("Added cumulative_tokens column to messages table")
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_messages_session_cumulative "
+            "ON messages (session_id, cumulative_tokens)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_messages_session_role_cumulative "
+            "ON messages (session_id, role, cumulative_tokens)"
+        ))
+
+        missing = conn.execute(text(
+            "SELECT COUNT(*) FROM messages WHERE cumulative_tokens IS NULL"
+        )).scalar()
+        if missing:
+            conn.execute(text(
+                "UPDATE messages SET token_count = CASE "
+                "WHEN content IS NULL OR content = '' THEN 0 "
+                "ELSE MAX(1, LENGTH(content) / 4) END "
+                "WHERE token_count IS NULL"
+            ))
+            conn.execute(text(
+                "UPDATE messages SET cumulative_tokens = w.running FROM ("
+                "  SELECT id, SUM(token_count) OVER ("
+                "    PARTITION BY session_id ORDER BY created_at, rowid"
+                "    ROWS UNBOUNDED PRECEDING) AS running"
+                "  FROM messages) AS w "
+                "WHERE w.id = messages.id"
+            ))
+            conn.execute(text(
+                "UPDATE sessions SET total_tokens = COALESCE(("
+                "  SELECT SUM(token_count) FROM messages WHERE messages.session_id = sessions.id"
+                "), 0)"
+            ))
+            logger.info("Backfilled cumulative token sums for %d messages", missing)
+        conn.commit()
+
 
 def _ensure_default_preferences(engine: Engine) -> None:
     """Migrate singleton row (id=1) to per-user schema if needed. No-op for fresh installs."""
@@ -329,6 +486,14 @@ def _run_alembic_upgrade() -> None:
 # Shutdown
 # ---------------------------------------------------------------------------
 
+async def close_async_db() -> None:
+    """Dispose the async engine at shutdown (must run on the serving loop)."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 def close_db() -> None:
     """Dispose both engines at shutdown."""
     global _engine, _legacy_engine
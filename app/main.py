@@ -18,7 +18,7 @@ from app.config import settings
 # BQ-127: Stock routers — always imported regardless of mode
 from app.routers import health, datasets, search, sql, vectors, pii, docs, diagnostics, imports
 from app.routers import auth as auth_router_module
-from app.core.database import init_db, close_db
+from app.core.database import init_db, close_async_db, close_db
 from app.core.structured_logging import setup_logging
 from app.core.errors import VectorAIzError
 from app.core.errors.registry import error_registry
@@ -291,6 +291,12 @@ async def lifespan(app: FastAPI):
         _safe_background_task("resource_monitor", resource_monitor_loop())
     )
 
+    # BQ-VZ-PERF: Persist coalesced local API key last_used_at (every 30s)
+    from app.auth.api_key_auth import flush_last_used, last_used_flush_loop
+    last_used_task = asyncio.create_task(
+        _safe_background_task("api_key_last_used", last_used_flush_loop())
+    )
+
     # BQ-ALLAI-FILES: Start chat attachment cleanup (every 10 min)
     async def _attachment_cleanup_loop():
         from app.services.chat_attachment_service import chat_attachment_service
@@ -305,6 +311,10 @@ async def lifespan(app: FastAPI):
     # BQ-VZ-ARTIFACTS: Artifact cleanup (every 1 hour)
     async def _artifact_cleanup_loop():
         from app.services.artifacts_service import get_artifacts_service
+        try:
+            await asyncio.to_thread(get_artifacts_service().reconcile_index)
+        except Exception:
+            logger.exception("Artifact index reconciliation error")
         while True:
             await asyncio.sleep(3600)
             try:
@@ -354,13 +364,12 @@ async def lifespan(app: FastAPI):
     try:
         from app.models.dataset import DatasetRecord as DBDatasetRecord
         from sqlmodel import select
-        from app.core.database import get_engine
-        from sqlmodel import Session
+        from app.core.database import async_session_context
 
-        with Session(get_engine()) as _session:
-            _uploaded = _session.exec(
+        async with async_session_context() as _session:
+            _uploaded = (await _session.exec(
                 select(DBDatasetRecord).where(DBDatasetRecord.status == "uploaded")
-            ).all()
+            )).all()
             for _rec in _uploaded:
                 await _processing_queue.submit(_rec.id)
             if _uploaded:
@@ -393,6 +402,17 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # BQ-VZ-PERF: Stop the last_used_at flusher, then write what's pending
+    last_used_task.cancel()
+    try:
+        await last_used_task
+    except asyncio.CancelledError:
+        pass
+    try:
+        await flush_last_used()
+    except Exception:
+        logger.exception("Final API key last_used_at flush failed")
+
     # BQ-ALLAI-FILES: Cancel attachment cleanup
     attachment_cleanup_task.cancel()
     try:
@@ -436,10 +456,15 @@ async def lifespan(app: FastAPI):
             pass
         logger.info("Trust Channel client stopped")
 
+    # BQ-VZ-PERF: Write pending pipeline status snapshots
+    from app.services.pipeline_service import flush_pipeline_status
+    flush_pipeline_status()
+
     # BQ-127: Only close stripe proxy in connected mode
     if settings.mode == "connected":
         from app.services.stripe_connect_proxy import close_proxy_client
         await close_proxy_client()
+    await close_async_db()
     close_db()
     executor.shutdown(wait=False)
 
@@ -268,6 +268,8 @@ ERROR_HTTP_STATUS: Dict[str, int] = {
     "sql_too_long": 400,
     "dataset_not_found": 404,
     "query_timeout": 408,
+    "query_cancelled": 499,           # Client closed request before completion
+    "query_memory_exceeded": 400,
     "service_unavailable": 503,
     "internal_error": 500,
 }
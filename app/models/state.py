@@ -11,6 +11,7 @@ Phase: 3.W.1
 Created: 2026-01-25
 Updated: BQ-128 Phase 1 — Added user_id, MessageKind, usage tracking, idempotency
 Updated: BQ-128 Phase 2 Audit — Per-user prefs, idempotency constraint
+Updated: BQ-VZ-PERF — Cumulative message tokens, cached context summary
 """
 
 from datetime import datetime, timezone
@@ -91,6 +92,15 @@ class Session(TimestampMixin, table=True):
     # Tracks total persisted messages (user + assistant), not turns
     total_message_count: int = Field(default=0)
 
+    # Running sum of message token_count; the newest message's
+    # cumulative_tokens always equals this
+    total_tokens: int = Field(default=0)
+
+    # Rolling summary of history that fell out of the context window,
+    # covering messages up to cumulative_tokens == context_summary_through
+    context_summary: Optional[str] = Field(default=None, nullable=True)
+    context_summary_through: Optional[int] = Field(default=None, nullable=True)
+
     # Optional: track which dataset(s) this session is about
     dataset_id: Optional[str] = Field(default=None, nullable=True, index=True)
 
@@ -131,6 +141,9 @@ class Message(SQLModel, table=True):
 
     # Token tracking for context window management
     token_count: Optional[int] = Field(default=None)
+    # Session running token sum up to and including this message, stamped at
+    # insert. Indexed with session_id (see _migrate_legacy_bq128).
+    cumulative_tokens: Optional[int] = Field(default=None, nullable=True)
 
     # BQ-128: Usage tracking per message (nullable — populated for assistant messages)
     input_tokens: Optional[int] = Field(default=None, nullable=True)
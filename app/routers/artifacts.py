@@ -48,17 +48,21 @@ async def list_artifacts(
     limit: int = Query(50, ge=1, le=100),
     include_expired: bool = Query(False),
     format_filter: Optional[str] = Query(None),
+    starred: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
-    """List artifacts for the current user."""
+    """List artifacts for the current user (keyset-paginated via cursor)."""
     user_id = _get_user_id(request)
     svc = get_artifacts_service()
-    artifacts = await asyncio.to_thread(
-        svc.list_artifacts, user_id, include_expired, offset, limit
-    )
+    try:
+        artifacts, next_cursor = await asyncio.to_thread(
+            svc.list_artifacts_page, user_id, include_expired, limit,
+            cursor, format_filter, starred, offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     result = [a.to_dict() for a in artifacts]
-    if format_filter:
-        result = [a for a in result if a["format"] == format_filter]
-    return {"artifacts": result, "total": len(result)}
+    return {"artifacts": result, "total": len(result), "next_cursor": next_cursor}
 
 
 @router.get("/{artifact_id}")
@@ -130,7 +130,7 @@ def _generate_key_secret() -> str:
     return "".join(secrets.choice(alphabet) for _ in range(32))
 
 
-def _create_api_key_for_user(
+async def _create_api_key_for_user(
     user_id: str,
     label: str = "Default",
     scopes: Optional[List[str]] = None,
@@ -139,7 +139,7 @@ def _create_api_key_for_user(
 
     Returns dict with: key_id, full_key, label, scopes, created_at
     """
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalAPIKey
 
     if scopes is None:
@@ -161,9 +161,9 @@ def _create_api_key_for_user(
         created_at=now,
     )
 
-    with get_session_context() as session:
+    async with async_session_context() as session:
         session.add(record)
-        session.commit()
+        await session.commit()
 
     logger.info("API key created: key_id=%s user_id=%s label=%s", key_id, user_id, label)
 
@@ -281,12 +281,12 @@ async def check_setup():
     needs = await auth_svc.needs_setup()
 
     # Also check BQ-127 local_users for backward compat
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
     from sqlmodel import select, func
 
-    with get_session_context() as session:
-        local_count = session.exec(select(func.count()).select_from(LocalUser)).one()
+    async with async_session_context() as session:
+        local_count = (await session.exec(select(func.count()).select_from(LocalUser))).one()
 
     return {
         "needs_setup": needs and local_count == 0,
@@ -325,12 +325,12 @@ async def setup(body: SetupRequest, request: Request, response: Response):
         )
 
     # Also check BQ-127 local_users
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
     from sqlmodel import select, func
 
-    with get_session_context() as session:
-        local_count = session.exec(select(func.count()).select_from(LocalUser)).one()
+    async with async_session_context() as session:
+        local_count = (await session.exec(select(func.count()).select_from(LocalUser))).one()
         if local_count > 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -352,7 +352,7 @@ async def setup(body: SetupRequest, request: Request, response: Response):
         )
 
     # Create user in local_users table (bcrypt — BQ-127 backward compat)
-    with get_session_context() as session:
+    async with async_session_context() as session:
         local_user = LocalUser(
             id=user.id,  # Same UUID for cross-table mapping
             username=body.username.strip().lower(),
@@ -361,10 +361,10 @@ async def setup(body: SetupRequest, request: Request, response: Response):
             is_active=True,
         )
         session.add(local_user)
-        session.commit()
+        await session.commit()
 
     # Generate API key (BQ-127 backward compat)
-    key_info = _create_api_key_for_user(
+    key_info = await _create_api_key_for_user(
         user_id=user.id,
         label="Admin (setup)",
         scopes=["read", "write", "admin"],
@@ -407,7 +407,7 @@ async def login(body: LoginRequest, request: Request, response: Response):
         _set_jwt_cookie(response, user.id, user.role)
 
         # Also generate API key for backward compat with existing frontend
-        key_info = _create_api_key_for_user(
+        key_info = await _create_api_key_for_user(
             user_id=user.id,
             label=f"Login ({datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')})",
             scopes=["read", "write", "admin"] if user.role == "admin" else ["read", "write"],
@@ -421,20 +421,20 @@ async def login(body: LoginRequest, request: Request, response: Response):
         )
 
     # Fall back to local_users table (bcrypt — BQ-127)
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
     from sqlmodel import select
 
-    with get_session_context() as session:
+    async with async_session_context() as session:
         stmt = select(LocalUser).where(LocalUser.username == body.username.strip())
-        local_user = session.exec(stmt).first()
+        local_user = (await session.exec(stmt)).first()
 
     if local_user and local_user.is_active and _verify_password(body.password, local_user.password_hash):
         # Set JWT cookie using local_user info
         _set_jwt_cookie(response, local_user.id, local_user.role)
 
         # Generate API key
-        key_info = _create_api_key_for_user(
+        key_info = await _create_api_key_for_user(
             user_id=local_user.id,
             label=f"Login ({datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')})",
             scopes=["read", "write", "admin"],
@@ -582,11 +582,11 @@ async def logout(response: Response):
 async def get_me(user: AuthenticatedUser = Depends(get_current_user)):
     """Return current user info — checks users table first, then local_users."""
     # Try users table first (BQ-VZ-MULTI-USER)
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.user import User
 
-    with get_session_context() as session:
-        mu_user = session.get(User, user.user_id)
+    async with async_session_context() as session:
+        mu_user = await session.get(User, user.user_id)
 
     if mu_user:
         return UserInfo(
@@ -602,8 +602,8 @@ async def get_me(user: AuthenticatedUser = Depends(get_current_user)):
     # Fall back to local_users (BQ-127)
     from app.models.local_auth import LocalUser
 
-    with get_session_context() as session:
-        local_user = session.get(LocalUser, user.user_id)
+    async with async_session_context() as session:
+        local_user = await session.get(LocalUser, user.user_id)
 
     if local_user:
         return UserInfo(
@@ -640,7 +640,7 @@ async def create_key(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     """BQ-127: Create a new API key for the authenticated user."""
-    key_info = _create_api_key_for_user(
+    key_info = await _create_api_key_for_user(
         user_id=user.user_id,
         label=body.label,
         scopes=body.scopes,
@@ -661,13 +661,13 @@ async def create_key(
 )
 async def list_keys(user: AuthenticatedUser = Depends(get_current_user)):
     """BQ-127: List API keys for the authenticated user (secrets masked)."""
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalAPIKey
     from sqlmodel import select
 
-    with get_session_context() as session:
+    async with async_session_context() as session:
         stmt = select(LocalAPIKey).where(LocalAPIKey.user_id == user.user_id)
-        keys = session.exec(stmt).all()
+        keys = (await session.exec(stmt)).all()
 
     result = []
     for k in keys:
@@ -703,16 +703,16 @@ async def revoke_key(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     """BQ-127: Revoke an API key by key_id."""
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalAPIKey
     from sqlmodel import select
 
-    with get_session_context() as session:
+    async with async_session_context() as session:
         stmt = select(LocalAPIKey).where(
             LocalAPIKey.key_id == key_id,
             LocalAPIKey.user_id == user.user_id,
         )
-        key_record = session.exec(stmt).first()
+        key_record = (await session.exec(stmt)).first()
         if not key_record:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -727,13 +727,11 @@ async def revoke_key(
 
         key_record.revoked_at = datetime.now(timezone.utc)
         session.add(key_record)
-        session.commit()
+        await session.commit()
 
     # Invalidate cache for this key
-    from app.auth.api_key_auth import api_key_cache
-    keys_to_remove = [k for k, v in api_key_cache.items() if v.key_id == key_id]
-    for k in keys_to_remove:
-        api_key_cache.pop(k, None)
+    from app.auth.api_key_auth import invalidate_local_key
+    invalidate_local_key(key_id)
 
     logger.info("API key revoked: key_id=%s by user=%s", key_id, user.user_id)
     return {"detail": f"Key '{key_id}' revoked."}
@@ -824,10 +822,10 @@ async def create_user(
         )
 
     # Also create in local_users for API key backward compat
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
 
-    with get_session_context() as session:
+    async with async_session_context() as session:
         local_user = LocalUser(
             id=new_user.id,
             username=new_user.username,
@@ -836,7 +834,7 @@ async def create_user(
             is_active=True,
         )
         session.add(local_user)
-        session.commit()
+        await session.commit()
 
     return UserInfo(
         user_id=new_user.id,
@@ -885,15 +883,19 @@ async def deactivate_user(
         )
 
     # Also deactivate in local_users if exists
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
 
-    with get_session_context() as session:
-        local_user = session.get(LocalUser, user_id)
+    async with async_session_context() as session:
+        local_user = await session.get(LocalUser, user_id)
         if local_user:
             local_user.is_active = False
             session.add(local_user)
-            session.commit()
+            await session.commit()
+
+    # Cached API key validations must not outlive the account
+    from app.auth.api_key_auth import invalidate_local_user
+    invalidate_local_user(user_id)
 
     return {"detail": "User deactivated."}
 
@@ -929,14 +931,14 @@ async def admin_reset_password(
         )
 
     # Also update in local_users if exists
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.local_auth import LocalUser
 
-    with get_session_context() as session:
-        local_user = session.get(LocalUser, user_id)
+    async with async_session_context() as session:
+        local_user = await session.get(LocalUser, user_id)
         if local_user:
             local_user.password_hash = _hash_password(body.new_password)
             session.add(local_user)
-            session.commit()
+            await session.commit()
 
     return {"detail": "Password reset successfully."}
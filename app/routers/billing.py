@@ -100,8 +100,8 @@ def _hmac_key(raw_key: str) -> str:
 
 
 def _get_db_session():
-    from app.core.database import get_session_context
-    return get_session_context()
+    from app.core.database import async_session_context
+    return async_session_context()
 
 
 # ---------------------------------------------------------------------------
@@ -137,10 +137,10 @@ async def create_api_key(
         created_at=now,
     )
 
-    with _get_db_session() as session:
+    async with _get_db_session() as session:
         session.add(db_key)
-        session.commit()
-        session.refresh(db_key)
+        await session.commit()
+        await session.refresh(db_key)
         key_id = str(db_key.id)
 
     logger.info("API key created: id=%s user=%s name=%s", key_id, user.user_id, body.name)
@@ -168,14 +168,14 @@ async def list_api_keys(
     from app.models.api_key import APIKey
     from sqlmodel import select
 
-    with _get_db_session() as session:
+    async with _get_db_session() as session:
         stmt = (
             select(APIKey)
             .where(APIKey.user_id == user.user_id)
             .where(APIKey.is_active == True)  # noqa: E712
             .order_by(APIKey.created_at.desc())
         )
-        rows = session.exec(stmt).all()
+        rows = (await session.exec(stmt)).all()
 
     user_keys = []
     for row in rows:
@@ -210,9 +210,9 @@ async def delete_api_key(
     """Delete an API key belonging to the authenticated user."""
     from app.models.api_key import APIKey
 
-    with _get_db_session() as session:
+    async with _get_db_session() as session:
         try:
-            row = session.get(APIKey, int(key_id))
+            row = await session.get(APIKey, int(key_id))
         except (ValueError, TypeError):
             row = None
 
@@ -232,7 +232,7 @@ async def delete_api_key(
         row.is_active = False
         row.revoked_at = datetime.now(timezone.utc)
         session.add(row)
-        session.commit()
+        await session.commit()
 
     logger.info("API key revoked: id=%s user=%s", key_id, user.user_id)
     return {"message": f"API key '{key_id}' deleted successfully."}
@@ -53,6 +53,7 @@ from app.models.state import (
     Session as ChatSession, SessionRead,
 )
 from app.services.metering_service import metering_service
+from app.services.session_service import stamp_message_tokens
 from app.services.copilot_service import copilot_service
 from app.services.serial_metering import (
     MeteringStrategy, CreditExhaustedException, ActivationRequiredException, UnprovisionedException,
@@ -566,6 +567,7 @@ def _persist_message(
         provider=provider,
         model=model,
     )
+    stamp_message_tokens(session, msg)
     db.add(msg)
     session.total_message_count = (session.total_message_count or 0) + 1
     db.add(session)
@@ -601,6 +603,8 @@ def _persist_messages_atomic(
         provider=usage.provider if usage else None,
         model=usage.model if usage else None,
     )
+    stamp_message_tokens(session, user_msg)
+    stamp_message_tokens(session, assistant_msg)
     db.add(user_msg)
     db.add(assistant_msg)
     session.total_message_count = (session.total_message_count or 0) + 2
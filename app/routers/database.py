@@ -13,19 +13,28 @@ import asyncio
 import json
 import logging
 import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.config import settings
-from app.core.database import get_session_context
+from app.core.database import async_session_context, get_session_context
 from app.models.database_connection import DatabaseConnection
 from app.models.dataset import DatasetRecord as DBDatasetRecord, DatasetStatus
-from app.services.db_connector import get_db_connector
+from app.services.db_connector import DatabaseConnector, DirectQuery, get_db_connector
 from app.services.db_credential_service import encrypt_password
+from app.services.sql_service import (
+    MAX_ROW_LIMIT,
+    MAX_STREAM_ROW_LIMIT,
+    STREAM_FORMATS,
+    negotiate_stream_format,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -81,6 +90,7 @@ class ExtractTableSpec(BaseModel):
     table: str
     schema_name: Optional[str] = Field(default=None, alias="schema")
     row_limit: Optional[int] = None
+    partitioned: bool = False  # Split large tables into concurrent key-range queries
 
 
 class ExtractRequest(BaseModel):
@@ -115,10 +125,10 @@ def _conn_to_response(conn: DatabaseConnection) -> ConnectionResponse:
     )
 
 
-def _get_connection(connection_id: str) -> DatabaseConnection:
+async def _get_connection(connection_id: str) -> DatabaseConnection:
     """Fetch a connection by ID or raise 404."""
-    with get_session_context() as session:
-        conn = session.get(DatabaseConnection, connection_id)
+    async with async_session_context() as session:
+        conn = await session.get(DatabaseConnection, connection_id)
         if not conn:
             raise HTTPException(status_code=404, detail="Connection not found")
         # Detach from session so we can use it outside the context
@@ -144,10 +154,10 @@ async def create_connection(body: ConnectionCreate) -> ConnectionResponse:
         ssl_mode=body.ssl_mode,
         extra_options=body.extra_options,
     )
-    with get_session_context() as session:
+    async with async_session_context() as session:
         session.add(conn)
-        session.commit()
-        session.refresh(conn)
+        await session.commit()
+        await session.refresh(conn)
         return _conn_to_response(conn)
 
 
@@ -155,21 +165,21 @@ async def create_connection(body: ConnectionCreate) -> ConnectionResponse:
 async def list_connections() -> List[ConnectionResponse]:
     from sqlmodel import select
 
-    with get_session_context() as session:
-        rows = session.exec(select(DatabaseConnection)).all()
+    async with async_session_context() as session:
+        rows = (await session.exec(select(DatabaseConnection))).all()
         return [_conn_to_response(r) for r in rows]
 
 
 @router.get("/connections/{connection_id}", summary="Get connection details")
 async def get_connection(connection_id: str) -> ConnectionResponse:
-    conn = _get_connection(connection_id)
+    conn = await _get_connection(connection_id)
     return _conn_to_response(conn)
 
 
 @router.put("/connections/{connection_id}", summary="Update connection")
 async def update_connection(connection_id: str, body: ConnectionUpdate) -> ConnectionResponse:
-    with get_session_context() as session:
-        conn = session.get(DatabaseConnection, connection_id)
+    async with async_session_context() as session:
+        conn = await session.get(DatabaseConnection, connection_id)
         if not conn:
             raise HTTPException(status_code=404, detail="Connection not found")
 
@@ -196,8 +206,8 @@ async def update_connection(connection_id: str, body: ConnectionUpdate) -> Conne
         conn.error_message = None
 
         session.add(conn)
-        session.commit()
-        session.refresh(conn)
+        await session.commit()
+        await session.refresh(conn)
 
         # Dispose cached engine so next use picks up new config
         get_db_connector().dispose_engine(connection_id)
@@ -207,12 +217,12 @@ async def update_connection(connection_id: str, body: ConnectionUpdate) -> Conne
 
 @router.delete("/connections/{connection_id}", status_code=204, summary="Delete connection")
 async def delete_connection(connection_id: str):
-    with get_session_context() as session:
-        conn = session.get(DatabaseConnection, connection_id)
+    async with async_session_context() as session:
+        conn = await session.get(DatabaseConnection, connection_id)
         if not conn:
             raise HTTPException(status_code=404, detail="Connection not found")
-        session.delete(conn)
-        session.commit()
+        await session.delete(conn)
+        await session.commit()
     get_db_connector().dispose_engine(connection_id)
 
 
@@ -222,13 +232,13 @@ async def delete_connection(connection_id: str):
 
 @router.post("/connections/{connection_id}/test", summary="Test database connectivity")
 async def test_connection(connection_id: str) -> Dict[str, Any]:
-    conn = _get_connection(connection_id)
+    conn = await _get_connection(connection_id)
     connector = get_db_connector()
     result = connector.test_connection(conn)
 
     # Update connection status in DB
-    with get_session_context() as session:
-        db_conn = session.get(DatabaseConnection, connection_id)
+    async with async_session_context() as session:
+        db_conn = await session.get(DatabaseConnection, connection_id)
         if db_conn:
             now = datetime.now(timezone.utc)
             if result["ok"]:
@@ -240,7 +250,7 @@ async def test_connection(connection_id: str) -> Dict[str, Any]:
                 db_conn.error_message = result["error"]
             db_conn.updated_at = now
             session.add(db_conn)
-            session.commit()
+            await session.commit()
 
     return result
 
@@ -254,7 +264,7 @@ async def introspect_schema(
     connection_id: str,
     schema: Optional[str] = Query(default=None, description="Schema name (default: public for Postgres)"),
 ) -> Dict[str, Any]:
-    conn = _get_connection(connection_id)
+    conn = await _get_connection(connection_id)
     connector = get_db_connector()
 
     timed_out = False
@@ -279,13 +289,13 @@ async def introspect_schema(
         raise HTTPException(status_code=502, detail=f"Schema introspection failed: {e}")
 
     # Update table_count
-    with get_session_context() as session:
-        db_conn = session.get(DatabaseConnection, connection_id)
+    async with async_session_context() as session:
+        db_conn = await session.get(DatabaseConnection, connection_id)
         if db_conn:
             db_conn.table_count = len(tables)
             db_conn.updated_at = datetime.now(timezone.utc)
             session.add(db_conn)
-            session.commit()
+            await session.commit()
 
     result: Dict[str, Any] = {
         "tables": [t.to_dict() for t in tables],
@@ -318,48 +328,84 @@ def _partial_introspect(connector, conn, schema):
 # Direct query on connected database
 # ---------------------------------------------------------------------------
 
+# Client-side wait for each round-trip; also set as the session statement
+# timeout so the database stops the query itself
+DIRECT_QUERY_TIMEOUT_S = 30.0
+DIRECT_QUERY_BATCH_ROWS = 5_000
+
+
 class DirectQueryRequest(BaseModel):
     sql: str = Field(..., min_length=1, max_length=10000)
-    limit: int = Field(default=1000, ge=1, le=10000)
+    # JSON bodies are capped at MAX_ROW_LIMIT; streamed formats go higher
+    limit: int = Field(default=1000, ge=1, le=MAX_STREAM_ROW_LIMIT)
 
 
-@router.post("/connections/{connection_id}/query", summary="Run read-only SQL against connected database")
-async def direct_query(connection_id: str, body: DirectQueryRequest) -> Dict[str, Any]:
-    conn = _get_connection(connection_id)
+def _query_error(e: Exception) -> HTTPException:
+    error_msg = str(e)
+    # Don't leak internal connection details
+    if "password" in error_msg.lower() or "connection" in error_msg.lower():
+        error_msg = "Query execution failed. Check your SQL syntax and database connection."
+    return HTTPException(status_code=502, detail=error_msg)
+
+
+@router.post(
+    "/connections/{connection_id}/query",
+    summary="Run read-only SQL against connected database",
+    response_model=None,
+)
+async def direct_query(
+    connection_id: str,
+    body: DirectQueryRequest,
+    accept: Optional[str] = Header(None),
+) -> Union[Dict[str, Any], StreamingResponse]:
+    """Run a read-only query through a server-side cursor.
+
+    Send ``Accept: application/vnd.apache.arrow.stream`` or
+    ``Accept: application/x-ndjson`` to stream the result in batches instead
+    of the default JSON body. A timeout or client disconnect cancels the
+    statement on the database.
+    """
+    conn = await _get_connection(connection_id)
     connector = get_db_connector()
+    fmt = negotiate_stream_format(accept)
 
     # Validate SQL is read-only
-    from app.services.db_connector import DatabaseConnector
     try:
         DatabaseConnector.validate_readonly_sql(body.sql)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    if fmt is None and body.limit > MAX_ROW_LIMIT:
+        raise HTTPException(
+            status_code=422,
+            detail=f"JSON results are limited to {MAX_ROW_LIMIT} rows; request Arrow or NDJSON for more",
+        )
 
     # Apply LIMIT wrapper
     sql_with_limit = f"SELECT * FROM ({body.sql}) _q LIMIT {body.limit}"
+    query = DirectQuery(connector.get_engine(conn), sql_with_limit, DIRECT_QUERY_TIMEOUT_S)
+
+    if fmt is not None:
+        return await _start_query_stream(query, fmt)
 
     def _execute():
-        engine = connector.get_engine(conn)
-        from sqlalchemy import text
-        with engine.connect() as db_conn:
-            result = db_conn.execute(text(sql_with_limit))
+        try:
+            result = query.execute()
             columns = list(result.keys())
             rows = [list(row) for row in result.fetchall()]
             return columns, rows
+        finally:
+            query.close()
 
     try:
         columns, rows = await asyncio.wait_for(
             asyncio.to_thread(_execute),
-            timeout=30.0,
+            timeout=DIRECT_QUERY_TIMEOUT_S,
         )
     except asyncio.TimeoutError:
-        raise HTTPException(status_code=504, detail="Query timed out after 30 seconds")
+        await asyncio.to_thread(query.cancel)
+        raise HTTPException(status_code=504, detail=f"Query timed out after {DIRECT_QUERY_TIMEOUT_S:g} seconds")
     except Exception as e:
-        error_msg = str(e)
-        # Don't leak internal connection details
-        if "password" in error_msg.lower() or "connection" in error_msg.lower():
-            error_msg = "Query execution failed. Check your SQL syntax and database connection."
-        raise HTTPException(status_code=502, detail=error_msg)
+        raise _query_error(e)
 
     return {
         "columns": columns,
@@ -369,114 +415,258 @@ async def direct_query(connection_id: str, body: DirectQueryRequest) -> Dict[str
     }
 
 
+async def _start_query_stream(query: DirectQuery, fmt: str) -> StreamingResponse:
+    """Run the query up to its first chunk, then stream the rest.
+
+    Errors before the first chunk still map to 504/502. Every driver call
+    runs on one dedicated thread, since a DBAPI connection and its cursor
+    aren't safe to hand between threads mid-result.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vz-direct-query")
+
+    def _start():
+        query.execute()
+        chunks = query.iter_chunks(fmt, DIRECT_QUERY_BATCH_ROWS)
+        return chunks, next(chunks, None)
+
+    started = False
+    try:
+        chunks, first = await asyncio.wait_for(
+            loop.run_in_executor(executor, _start),
+            timeout=DIRECT_QUERY_TIMEOUT_S,
+        )
+        started = True
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Query timed out after {DIRECT_QUERY_TIMEOUT_S:g} seconds")
+    except Exception as e:
+        raise _query_error(e)
+    finally:
+        if not started:
+            # Timeout, error, or the client went away before the first chunk
+            loop.run_in_executor(None, query.cancel)
+            executor.submit(query.close)
+            executor.shutdown(wait=False)
+
+    async def _stream():
+        finished = False
+        try:
+            chunk = first
+            while chunk is not None:
+                yield chunk
+                chunk = await asyncio.wait_for(
+                    loop.run_in_executor(executor, next, chunks, None),
+                    timeout=DIRECT_QUERY_TIMEOUT_S,
+                )
+            finished = True
+        except asyncio.TimeoutError:
+            logger.warning("Direct query stalled for %gs mid-stream; cancelling", DIRECT_QUERY_TIMEOUT_S)
+            raise
+        finally:
+            if not finished:
+                # Timeout, error or client disconnect. Not awaited: on
+                # disconnect this runs inside an already-cancelled scope.
+                loop.run_in_executor(None, query.cancel)
+            executor.submit(chunks.close)
+            executor.submit(query.close)
+            executor.shutdown(wait=False)
+
+    return StreamingResponse(_stream(), media_type=STREAM_FORMATS[fmt])
+
+
 # ---------------------------------------------------------------------------
 # Extract → Pipeline
 # ---------------------------------------------------------------------------
 
-def _run_extraction_pipeline(
-    connection_id: str,
-    extractions: List[Dict[str, Any]],
-):
-    """Background task: extract tables and run pipeline for each."""
-    import asyncio
+# Seconds between coalesced DatasetRecord status writes
+STATUS_FLUSH_INTERVAL_S = 0.5
+
+# Stage semaphores, per event loop (asyncio primitives bind to one loop)
+_stage_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _slots(key: str, limit: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _stage_slots.setdefault(loop, {})
+    if key not in slots:
+        slots[key] = asyncio.Semaphore(max(limit, 1))
+    return slots[key]
+
+
+class _StatusBatch:
+    """Coalesces DatasetRecord status updates and writes them in one session.
+
+    Updates for the same dataset merge (last status wins, metadata merged);
+    ``flush`` writes everything pending in a worker thread.
+    """
+
+    def __init__(self, connection_id: str):
+        self.connection_id = connection_id
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._synced = False
+
+    def update(
+        self,
+        dataset_id: str,
+        status: str,
+        metadata: Dict[str, Any],
+        replace_metadata: bool = False,
+        **fields: Any,
+    ) -> None:
+        entry = self._pending.setdefault(dataset_id, {"metadata": {}, "fields": {}})
+        if replace_metadata:
+            entry["metadata"] = {}
+            entry["replace"] = True
+        entry["status"] = status
+        entry["metadata"].update(metadata)
+        entry["fields"].update(fields)
+        if status == DatasetStatus.READY.value:
+            self._synced = True
+
+    async def run(self, stop: asyncio.Event, interval_s: float = STATUS_FLUSH_INTERVAL_S) -> None:
+        """Flush every ``interval_s`` until ``stop`` is set, then once more."""
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval_s)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+        await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending and not self._synced:
+            return
+        pending, self._pending = self._pending, {}
+        synced, self._synced = self._synced, False
+        try:
+            await asyncio.to_thread(self._write, pending, synced)
+        except Exception as e:
+            logger.error("Failed to write extraction status for %s: %s", list(pending), e, exc_info=True)
+
+    def _write(self, pending: Dict[str, Dict[str, Any]], synced: bool) -> None:
+        now = datetime.now(timezone.utc)
+        with get_session_context() as session:
+            for dataset_id, entry in pending.items():
+                rec = session.get(DBDatasetRecord, dataset_id)
+                if not rec:
+                    continue
+                existing_meta = {}
+                if rec.metadata_json and not entry.get("replace"):
+                    existing_meta = json.loads(rec.metadata_json)
+                existing_meta.update(entry["metadata"])
+                rec.status = entry["status"]
+                rec.metadata_json = json.dumps(existing_meta, default=str)
+                for name, value in entry["fields"].items():
+                    setattr(rec, name, value)
+                rec.updated_at = now
+                session.add(rec)
+            if synced:
+                # Update last_sync_at on connection
+                db_conn = session.get(DatabaseConnection, self.connection_id)
+                if db_conn:
+                    db_conn.last_sync_at = now
+                    session.add(db_conn)
+            session.commit()
+
+
+def _processed_file_metadata(dataset_id: str, processed_path: Path) -> Dict[str, Any]:
+    """DuckDB metadata for the processed parquet ({} on failure)."""
+    try:
+        from app.services.duckdb_service import ephemeral_duckdb_service
+        with ephemeral_duckdb_service() as duckdb:
+            return duckdb.get_file_metadata(processed_path)
+    except Exception as meta_err:
+        logger.warning("Could not get DuckDB metadata for %s: %s", dataset_id, meta_err)
+        return {}
+
+
+async def _extract_and_process(
+    spec: Dict[str, Any],
+    conn: DatabaseConnection,
+    statuses: _StatusBatch,
+) -> bool:
+    """Extract one table, then run its pipeline. Failures stay with this dataset."""
     from app.services.pipeline_service import get_pipeline_service
 
-    conn = _get_connection(connection_id)
+    dataset_id = spec["dataset_id"]
+    table_name = spec.get("table") or spec.get("custom_sql", "custom_query")
     connector = get_db_connector()
-    pipeline = get_pipeline_service()
-
-    for spec in extractions:
-        dataset_id = spec["dataset_id"]
-        table_name = spec.get("table") or spec.get("custom_sql", "custom_query")
-        try:
-            # Mandate M1: write raw parquet to {data_directory}/{dataset_id}.parquet
-            output_path = Path(settings.data_directory) / f"{dataset_id}.parquet"
+    try:
+        # Mandate M1: write raw parquet to {data_directory}/{dataset_id}.parquet
+        output_path = Path(settings.data_directory) / f"{dataset_id}.parquet"
 
+        # Stage 1: extraction, bounded per source connection
+        async with _slots(f"extract:{conn.id}", settings.db_extract_concurrency):
             # Bug 2: Set extracting status with table context before extraction
-            with get_session_context() as session:
-                rec = session.get(DBDatasetRecord, dataset_id)
-                if rec:
-                    rec.status = DatasetStatus.EXTRACTING.value
-                    existing_meta = json.loads(rec.metadata_json) if rec.metadata_json else {}
-                    existing_meta.update({"phase": "extracting", "table": table_name})
-                    rec.metadata_json = json.dumps(existing_meta, default=str)
-                    rec.updated_at = datetime.now(timezone.utc)
-                    session.add(rec)
-                    session.commit()
-
-            connector.extract_table(
+            statuses.update(
+                dataset_id, DatasetStatus.EXTRACTING.value, {"phase": "extracting", "table": table_name},
+            )
+            await asyncio.to_thread(
+                connector.extract_table,
                 connection=conn,
                 table_name=spec.get("table", ""),
                 output_path=output_path,
                 schema=spec.get("schema"),
                 custom_sql=spec.get("custom_sql"),
                 row_limit=spec.get("row_limit"),
+                partitioned=spec.get("partitioned", False),
             )
 
-            # Bug 2: Update status to processing after extraction completes
-            with get_session_context() as session:
-                rec = session.get(DBDatasetRecord, dataset_id)
-                if rec:
-                    rec.status = DatasetStatus.INDEXING.value
-                    rec.file_size_bytes = output_path.stat().st_size if output_path.exists() else 0
-                    existing_meta = json.loads(rec.metadata_json) if rec.metadata_json else {}
-                    existing_meta.update({"phase": "processing", "table": table_name})
-                    rec.metadata_json = json.dumps(existing_meta, default=str)
-                    rec.updated_at = datetime.now(timezone.utc)
-                    session.add(rec)
-                    session.commit()
-
-            # Run pipeline (creates processed.parquet, PII scan, compliance)
-            loop = asyncio.new_event_loop()
-            try:
-                loop.run_until_complete(pipeline.run_full_pipeline(dataset_id))
-            finally:
-                loop.close()
+        # Bug 2: Update status to processing after extraction completes
+        statuses.update(
+            dataset_id, DatasetStatus.INDEXING.value, {"phase": "processing", "table": table_name},
+            file_size_bytes=output_path.stat().st_size if output_path.exists() else 0,
+        )
 
+        # Stage 2: pipeline (creates processed.parquet, PII scan, compliance), bounded by CPU
+        processed_path = Path(settings.processed_directory) / dataset_id / "processed.parquet"
+        async with _slots("pipeline", settings.db_pipeline_concurrency):
+            await get_pipeline_service().run_full_pipeline(dataset_id)
             # Bug 1: Query DuckDB for metadata before marking ready
-            processed_path = Path(settings.processed_directory) / dataset_id / "processed.parquet"
-            file_metadata = {}
-            try:
-                from app.services.duckdb_service import ephemeral_duckdb_service
-                with ephemeral_duckdb_service() as duckdb:
-                    file_metadata = duckdb.get_file_metadata(processed_path)
-            except Exception as meta_err:
-                logger.warning("Could not get DuckDB metadata for %s: %s", dataset_id, meta_err)
-
-            # Mark ready with metadata
-            with get_session_context() as session:
-                rec = session.get(DBDatasetRecord, dataset_id)
-                if rec:
-                    rec.status = DatasetStatus.READY.value
-                    rec.processed_path = str(processed_path)
-                    existing_meta = json.loads(rec.metadata_json) if rec.metadata_json else {}
-                    existing_meta.update(file_metadata)
-                    existing_meta["phase"] = "ready"
-                    rec.metadata_json = json.dumps(existing_meta, default=str)
-                    rec.updated_at = datetime.now(timezone.utc)
-                    session.add(rec)
-                    session.commit()
-
-            # Update last_sync_at on connection
-            with get_session_context() as session:
-                db_conn = session.get(DatabaseConnection, connection_id)
-                if db_conn:
-                    db_conn.last_sync_at = datetime.now(timezone.utc)
-                    session.add(db_conn)
-                    session.commit()
+            file_metadata = await asyncio.to_thread(_processed_file_metadata, dataset_id, processed_path)
 
-            logger.info("Extraction + pipeline complete for dataset %s", dataset_id)
+        # Mark ready with metadata
+        statuses.update(
+            dataset_id, DatasetStatus.READY.value, {**file_metadata, "phase": "ready"},
+            processed_path=str(processed_path),
+        )
+        logger.info("Extraction + pipeline complete for dataset %s", dataset_id)
+        return True
 
-        except Exception as e:
-            logger.error("Extraction failed for dataset %s: %s", dataset_id, e, exc_info=True)
-            with get_session_context() as session:
-                rec = session.get(DBDatasetRecord, dataset_id)
-                if rec:
-                    rec.status = DatasetStatus.ERROR.value
-                    rec.metadata_json = json.dumps({"error": str(e)})
-                    rec.updated_at = datetime.now(timezone.utc)
-                    session.add(rec)
-                    session.commit()
+    except Exception as e:
+        logger.error("Extraction failed for dataset %s: %s", dataset_id, e, exc_info=True)
+        statuses.update(dataset_id, DatasetStatus.ERROR.value, {"error": str(e)}, replace_metadata=True)
+        return False
+
+
+async def _run_extraction_pipeline(
+    connection_id: str,
+    extractions: List[Dict[str, Any]],
+):
+    """Background task: extract tables and run the pipeline for each, concurrently.
+
+    Runs on the application loop as a two-stage scheduler: extraction is
+    limited per connection (``db_extract_concurrency``) and the pipeline
+    stage by ``db_pipeline_concurrency``, so one table's pipeline overlaps
+    the next table's extraction. Status changes are written in batches.
+    """
+    conn = await _get_connection(connection_id)
+    statuses = _StatusBatch(connection_id)
+    stop = asyncio.Event()
+    flusher = asyncio.create_task(statuses.run(stop))
+    try:
+        results = await asyncio.gather(
+            *(_extract_and_process(spec, conn, statuses) for spec in extractions)
+        )
+    finally:
+        stop.set()
+        await flusher
+    logger.info(
+        "Extraction for connection %s finished: %d/%d datasets ready",
+        connection_id, sum(results), len(extractions),
+    )
 
 
 @router.post("/connections/{connection_id}/extract", status_code=202, summary="Extract tables to datasets")
@@ -485,7 +675,7 @@ async def extract_tables(
     body: ExtractRequest,
     background_tasks: BackgroundTasks,
 ) -> Dict[str, Any]:
-    _get_connection(connection_id)
+    await _get_connection(connection_id)
 
     if not body.tables and not body.custom_sql:
         raise HTTPException(status_code=422, detail="Provide 'tables' or 'custom_sql'")
@@ -508,7 +698,7 @@ async def extract_tables(
         dataset_name = body.dataset_name or "Custom Query"
 
         # Create DatasetRecord
-        with get_session_context() as session:
+        async with async_session_context() as session:
             rec = DBDatasetRecord(
                 id=dataset_id,
                 original_filename=f"{dataset_name}.parquet",
@@ -524,7 +714,7 @@ async def extract_tables(
                 }),
             )
             session.add(rec)
-            session.commit()
+            await session.commit()
 
         extractions.append({
             "dataset_id": dataset_id,
@@ -536,7 +726,7 @@ async def extract_tables(
             dataset_id = str(uuid.uuid4())[:8]
             table_label = f"{spec.schema_name}.{spec.table}" if spec.schema_name else spec.table
 
-            with get_session_context() as session:
+            async with async_session_context() as session:
                 rec = DBDatasetRecord(
                     id=dataset_id,
                     original_filename=f"{table_label}.parquet",
@@ -551,13 +741,14 @@ async def extract_tables(
                     }),
                 )
                 session.add(rec)
-                session.commit()
+                await session.commit()
 
             extractions.append({
                 "dataset_id": dataset_id,
                 "table": spec.table,
                 "schema": spec.schema_name,
                 "row_limit": spec.row_limit,
+                "partitioned": spec.partitioned,
             })
             dataset_ids.append(dataset_id)
 
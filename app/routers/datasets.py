@@ -65,7 +65,7 @@ async def list_datasets(
     """List all datasets with their processing status. Optionally include facet counts."""
     try:
         records = await asyncio.wait_for(
-            asyncio.to_thread(processing.list_datasets),
+            processing.list_datasets_async(),
             timeout=5.0,
         )
     except asyncio.TimeoutError:
@@ -162,7 +162,7 @@ async def upload_dataset(
         # Update actual file size after write completes
         record.file_size_bytes = bytes_written
         storage_fn = record.upload_path.name
-        processing._save_record(record, storage_fn)
+        await processing._save_record_async(record, storage_fn)
 
         # Magic-byte content-type validation (match bulk upload behavior)
         if not _check_magic_bytes(magic_header, extension):
@@ -267,12 +267,12 @@ async def process_dataset_task(dataset_id: str, skip_indexing: bool = False):
         return
 
     # Check if the batch was confirmed while extraction was in progress
-    from app.core.database import get_session_context
+    from app.core.database import async_session_context
     from app.models.dataset import DatasetRecord as DBDatasetRecord
 
     should_index = False
-    with get_session_context() as session:
-        db_row = session.get(DBDatasetRecord, dataset_id)
+    async with async_session_context() as session:
+        db_row = await session.get(DBDatasetRecord, dataset_id)
         if db_row and db_row.confirmed_at and db_row.status == DatasetStatus.PREVIEW_READY.value:
             logger.info(
                 "Auto-indexing dataset %s (batch confirmed during extraction)",
@@ -281,7 +281,7 @@ async def process_dataset_task(dataset_id: str, skip_indexing: bool = False):
             db_row.status = DatasetStatus.INDEXING.value
             db_row.updated_at = datetime.now(timezone.utc)
             session.add(db_row)
-            session.commit()
+            await session.commit()
             should_index = True
 
     if should_index:
@@ -479,7 +479,7 @@ async def batch_upload(
             # Update actual file size
             record.file_size_bytes = bytes_written
             storage_fn = record.upload_path.name
-            processing._save_record(record, storage_fn)
+            await processing._save_record_async(record, storage_fn)
 
             # Queue background extraction (sequential — one file at a time)
             from app.services.processing_queue import get_processing_queue
@@ -593,7 +593,7 @@ async def get_batch_status(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     """BQ-108: Get aggregated status of all datasets in a batch."""
-    result = batch_service.get_batch_status(batch_id)
+    result = await batch_service.get_batch_status(batch_id)
     if result is None:
         raise HTTPException(status_code=404, detail="Batch not found")
     return result
@@ -607,10 +607,10 @@ async def confirm_batch(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     """BQ-109: Confirm all preview_ready datasets in a batch."""
-    if not batch_service.batch_belongs_to_user(batch_id, user.user_id):
+    if not await batch_service.batch_belongs_to_user(batch_id, user.user_id):
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    result = batch_service.confirm_batch(batch_id, user.user_id)
+    result = await batch_service.confirm_batch(batch_id, user.user_id)
 
     # Queue indexing for each confirmed dataset (sequential)
     from app.services.processing_queue import get_processing_queue
@@ -627,7 +627,7 @@ async def get_dataset(
     processing: ProcessingService = Depends(get_processing_service),
 ):
     """Get metadata for a specific dataset."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise VectorAIzError("VAI-UX-001", detail=f"Dataset '{dataset_id}' not found")
 
@@ -653,7 +653,7 @@ async def get_dataset_status(
     processing: ProcessingService = Depends(get_processing_service)
 ):
     """Get processing status for a dataset (for polling)."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise VectorAIzError("VAI-UX-001", detail=f"Dataset '{dataset_id}' not found")
 
@@ -710,7 +710,7 @@ async def confirm_dataset(
     preview_ready → 202, indexing → 202 (no-op), ready → 200 (no-op),
     extracting → 409, error → 409, cancelled → 404.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
@@ -739,17 +739,17 @@ async def confirm_dataset(
 
     if status_val == DatasetStatus.PREVIEW_READY.value:
         # Transition to indexing
-        processing._set_status(dataset_id, DatasetStatus.INDEXING)
+        await processing._set_status_async(dataset_id, DatasetStatus.INDEXING)
         # Record confirmation
         from app.models.dataset import DatasetRecord as DBDatasetRecord
-        from app.core.database import get_session_context
-        with get_session_context() as session:
-            db_row = session.get(DBDatasetRecord, dataset_id)
+        from app.core.database import async_session_context
+        async with async_session_context() as session:
+            db_row = await session.get(DBDatasetRecord, dataset_id)
             if db_row:
                 db_row.confirmed_at = datetime.now(timezone.utc)
                 db_row.confirmed_by = user.user_id
                 session.add(db_row)
-                session.commit()
+                await session.commit()
 
         from app.services.processing_queue import get_processing_queue
         await get_processing_queue().submit(dataset_id, index_only=True)
@@ -775,7 +775,7 @@ async def run_processing_pipeline(
     Run the full processing pipeline on a dataset.
     This includes DuckDB analysis, PII scan, compliance, attestation, and listing metadata.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -811,7 +811,7 @@ async def process_full_pipeline(
     Runs DuckDB analysis, PII scan, and compliance check in background.
     Returns a job ID for tracking progress via GET /pipeline-status.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -864,7 +864,7 @@ async def get_dataset_sample(
     preview_service: PreviewService = Depends(get_preview_service),
 ):
     """Get sample rows from a dataset. PII columns are masked by default."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -912,7 +912,7 @@ async def get_dataset_statistics(
     processing: ProcessingService = Depends(get_processing_service),
 ):
     """Get column statistics for a dataset."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -946,7 +946,7 @@ async def get_dataset_profile(
     """
     Get detailed column profiles including null analysis, uniqueness, and semantic types.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -981,7 +981,7 @@ async def generate_dataset_attestation(
     _meter: MeterDecision = Depends(metered("setup")),
 ):
     """Get quality attestation report for a dataset."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1008,7 +1008,7 @@ async def get_dataset_compliance(
     processing: ProcessingService = Depends(get_processing_service)
 ):
     """Get compliance report for a dataset, based on PII scan results."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1033,7 +1033,7 @@ async def generate_listing_metadata(
     _meter: MeterDecision = Depends(metered("setup")),
 ):
     """Generate marketplace-ready listing metadata for a dataset."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1061,7 +1061,7 @@ async def get_dataset_searchability(
     """
     Get searchability score indicating how well the dataset can be semantically searched.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -1096,7 +1096,7 @@ async def get_dataset_full_metadata(
     Get comprehensive metadata including basic info, column profiles, and searchability.
     This is the complete dataset analysis endpoint.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -1132,7 +1132,7 @@ async def get_dataset_content(
     Get extracted content for document types (PDF, Word, PowerPoint).
     Returns text blocks and tables extracted from the document.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1174,7 +1174,7 @@ async def index_dataset(
     as a background asyncio task. Check status via GET /{dataset_id}/index.
     Requires X-API-Key header.
     """
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -1219,7 +1219,7 @@ async def get_index_status(
     indexing: IndexingService = Depends(get_indexing_service),
 ):
     """Get the indexing status for a dataset."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1234,7 +1234,7 @@ async def delete_index(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete the search index for a dataset. Requires X-API-Key header."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
     
@@ -1252,7 +1252,7 @@ async def delete_dataset(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a dataset and its files. Handles cancellation for pre-ready states."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -1265,15 +1265,15 @@ async def delete_dataset(
         DatasetStatus.PREVIEW_READY.value,
         DatasetStatus.INDEXING.value,
     ):
-        processing._set_status(dataset_id, DatasetStatus.CANCELLED)
+        await processing._set_status_async(dataset_id, DatasetStatus.CANCELLED)
 
     success = processing.delete_dataset(dataset_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete dataset")
 
-    # Rebuild facets async after dataset removal
-    from app.services.facet_service import rebuild_facets_async
-    rebuild_facets_async()
+    # Drop the dataset's facet contribution
+    from app.services.facet_service import remove_dataset_facets
+    remove_dataset_facets(dataset_id)
 
     return {"message": f"Dataset '{dataset_id}' deleted successfully"}
 
@@ -1300,7 +1300,7 @@ async def publish_to_marketplace(
     - **model_provider**: AI model used for analysis ("local", "anthropic", etc.)
     """
     # Verify dataset exists and is ready
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
@@ -1346,7 +1346,7 @@ async def get_dataset_readiness(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Get combined readiness report: schema + PII risk + quality scorecard + statistical profile."""
-    record = processing.get_dataset(dataset_id)
+    record = await processing.get_dataset_async(dataset_id)
     if not record:
         raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
 
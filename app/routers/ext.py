@@ -215,7 +215,7 @@ async def ext_search(
         400: {"model": ConnectivityErrorResponse, "description": "Forbidden SQL (non-SELECT) or query too long"},
         401: {"model": ConnectivityErrorResponse, "description": "Invalid, revoked, or expired token"},
         403: {"model": ConnectivityErrorResponse, "description": "Token lacks ext:sql scope"},
-        408: {"model": ConnectivityErrorResponse, "description": "Query timed out"},
+        408: {"model": ConnectivityErrorResponse, "description": "Query timed out (interrupted server-side)"},
         429: {"model": ConnectivityErrorResponse, "description": "Rate limited or IP blocked"},
         503: {"model": ConnectivityErrorResponse, "description": "Service unavailable"},
     },
@@ -234,7 +234,9 @@ async def ext_sql(
             return _error_response(ConnectivityError("ip_blocked", "Too many auth failures"), request_id)
         raw_token = _extract_token(authorization)
         token = orch.validate_token(raw_token)
-        return await orch.execute_sql(token, body, client_ip=client_ip)
+        return await orch.execute_sql(
+            token, body, client_ip=client_ip, is_disconnected=request.is_disconnected,
+        )
     except ConnectivityError as e:
         _record_auth_failure_if_needed(e, request)
         return _error_response(e, request_id)
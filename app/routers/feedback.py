@@ -14,7 +14,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel import select
 
 from app.auth.api_key_auth import AuthenticatedUser, get_current_user
-from app.core.database import get_session_context
+from app.core.database import async_session_context
 from app.models.feedback import Feedback
 
 logger = logging.getLogger(__name__)
@@ -27,10 +27,10 @@ async def list_feedback(
     _user: AuthenticatedUser = Depends(get_current_user),
 ):
     """List all feedback entries (requires API key auth)."""
-    with get_session_context() as session:
-        results = session.exec(
+    async with async_session_context() as session:
+        results = (await session.exec(
             select(Feedback).order_by(Feedback.created_at.desc())
-        ).all()
+        )).all()
 
         return {
             "feedback": [
@@ -2,10 +2,12 @@
 SQL Query API endpoints for power users.
 
 BQ-110: All sync SQLService calls wrapped via run_sync().
+BQ-VZ-PERF: /query negotiates Arrow IPC / NDJSON streaming via the Accept header.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, Optional
 from pydantic import BaseModel
 
 from app.core.async_utils import run_sync
@@ -16,7 +18,11 @@ from app.services.sql_service import (
     QueryTimeoutError,
     DEFAULT_ROW_LIMIT,
     MAX_ROW_LIMIT,
+    MAX_STREAM_ROW_LIMIT,
+    STREAM_FORMATS,
+    negotiate_stream_format,
 )
+from app.services.query_supervisor import QueryCancelledError
 from app.auth.api_key_auth import get_current_user, AuthenticatedUser
 from app.services.serial_metering import metered, MeterDecision
 
@@ -32,6 +38,48 @@ class SQLQueryRequest(BaseModel):
     offset: int = 0
 
 
+async def _execute(
+    sql_service: SQLService,
+    query: str,
+    dataset_id: Optional[str],
+    limit: int,
+    offset: int,
+    accept: Optional[str],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+):
+    """Run a query, streaming it when the client asked for Arrow/NDJSON.
+
+    Streams run under the QuerySupervisor, so a slow stream or a client that
+    goes away interrupts the DuckDB query instead of leaving it running.
+    """
+    fmt = negotiate_stream_format(accept)
+    try:
+        if fmt is None:
+            return await run_sync(
+                sql_service.execute_query,
+                query, dataset_id, limit, offset,
+            )
+        chunks = await sql_service.stream_query(
+            query, fmt, dataset_id, limit, offset,
+            is_disconnected=is_disconnected,
+        )
+        return StreamingResponse(chunks, media_type=STREAM_FORMATS[fmt])
+    except SQLValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
+    except QueryCancelledError as e:
+        if e.reason == "timeout":
+            raise HTTPException(status_code=408, detail=f"Query timed out after {e.elapsed_ms}ms")
+        raise HTTPException(status_code=499, detail="Query cancelled")
+    except (QueryTimeoutError, TimeoutError) as e:
+        raise HTTPException(status_code=408, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ConnectionError:
+        raise HTTPException(status_code=503, detail="SQL service unavailable")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+
+
 @router.get("/tables")
 async def list_tables(
     sql_service: SQLService = Depends(get_sql_service),
@@ -69,9 +117,11 @@ async def get_table_schema(
 @router.post("/query")
 async def execute_query_post(
     request: SQLQueryRequest,
+    http_request: Request,
     sql_service: SQLService = Depends(get_sql_service),
     user: AuthenticatedUser = Depends(get_current_user),
     _meter: MeterDecision = Depends(metered("data")),
+    accept: Optional[str] = Header(None),
 ):
     """
     Execute a SQL SELECT query (POST method).
@@ -79,56 +129,42 @@ async def execute_query_post(
     Use this for complex queries. Only SELECT statements are allowed.
     Queries are validated for safety before execution.
     Requires X-API-Key header.
+
+    Send ``Accept: application/vnd.apache.arrow.stream`` or
+    ``Accept: application/x-ndjson`` to stream the result instead of the
+    default JSON body (row cap raised to MAX_STREAM_ROW_LIMIT).
     """
-    try:
-        result = await run_sync(
-            sql_service.execute_query,
-            request.query, request.dataset_id, request.limit, request.offset,
-        )
-        return result
-    except SQLValidationError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
-    except (QueryTimeoutError, TimeoutError) as e:
-        raise HTTPException(status_code=408, detail=str(e))
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except ConnectionError:
-        raise HTTPException(status_code=503, detail="SQL service unavailable")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+    return await _execute(
+        sql_service, request.query, request.dataset_id,
+        request.limit, request.offset, accept,
+        is_disconnected=http_request.is_disconnected,
+    )
 
 
 @router.get("/query")
 async def execute_query_get(
+    http_request: Request,
     q: str = Query(..., description="SQL SELECT query"),
     dataset_id: Optional[str] = Query(None, description="Target dataset (optional)"),
-    limit: int = Query(DEFAULT_ROW_LIMIT, ge=1, le=MAX_ROW_LIMIT, description="Max rows"),
+    limit: int = Query(
+        DEFAULT_ROW_LIMIT, ge=1, le=MAX_STREAM_ROW_LIMIT,
+        description=f"Max rows (JSON responses are capped at {MAX_ROW_LIMIT})",
+    ),
     offset: int = Query(0, ge=0, description="Row offset for pagination"),
     sql_service: SQLService = Depends(get_sql_service),
     user: AuthenticatedUser = Depends(get_current_user),
+    accept: Optional[str] = Header(None),
 ):
     """
     Execute a SQL SELECT query (GET method).
 
     For simple queries. Use POST for complex queries with special characters.
-    Requires X-API-Key header.
+    Requires X-API-Key header. Supports the same Accept negotiation as POST.
     """
-    try:
-        result = await run_sync(
-            sql_service.execute_query,
-            q, dataset_id, limit, offset,
-        )
-        return result
-    except SQLValidationError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
-    except (QueryTimeoutError, TimeoutError) as e:
-        raise HTTPException(status_code=408, detail=str(e))
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except ConnectionError:
-        raise HTTPException(status_code=503, detail="SQL service unavailable")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+    return await _execute(
+        sql_service, q, dataset_id, limit, offset, accept,
+        is_disconnected=http_request.is_disconnected,
+    )
 
 
 @router.post("/validate")
@@ -164,6 +200,11 @@ async def sql_help():
         "limits": {
             "default_row_limit": DEFAULT_ROW_LIMIT,
             "max_row_limit": MAX_ROW_LIMIT,
+            "max_stream_row_limit": MAX_STREAM_ROW_LIMIT,
+        },
+        "result_formats": {
+            "application/json": "Default JSON body",
+            **{media_type: f"Streamed ({fmt})" for fmt, media_type in STREAM_FORMATS.items()},
         },
         "examples": [
             {
@@ -1191,7 +1191,7 @@ class AllAIToolExecutor:
 
     async def _handle_submit_feedback(self, tool_input: dict) -> ToolResult:
         """Store user feedback and optionally forward to ai.market."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.feedback import Feedback
 
         category = tool_input.get("category", "other")
@@ -1205,10 +1205,10 @@ class AllAIToolExecutor:
             user_id=self.user.user_id,
         )
 
-        with get_session_context() as session:
+        async with async_session_context() as session:
             session.add(fb)
-            session.commit()
-            session.refresh(fb)
+            await session.commit()
+            await session.refresh(fb)
 
         # Non-blocking forward to ai.market if configured
         forwarded = False
@@ -1230,11 +1230,11 @@ class AllAIToolExecutor:
                     )
                     if resp.status_code < 400:
                         forwarded = True
-                        with get_session_context() as session:
-                            fb_record = session.get(Feedback, fb.id)
+                        async with async_session_context() as session:
+                            fb_record = await session.get(Feedback, fb.id)
                             if fb_record:
                                 fb_record.forwarded = True
-                                session.commit()
+                                await session.commit()
         except Exception as e:
             logger.warning("Failed to forward feedback to ai.market: %s", e)
 
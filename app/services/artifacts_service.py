@@ -7,6 +7,8 @@ Manages creation, storage, retrieval, and lifecycle of artifacts
 Storage: filesystem under {data_dir}/artifacts/{artifact_id}/
   - metadata.json (schema_version: 1)
   - content.{ext} (ext from format enum, NEVER from user input)
+Index: {data_dir}/artifacts/.index.db — SQLite copy of every metadata.json,
+  used for listing/quota/cleanup; rebuilt from the sidecars on reconcile.
 
 Security:
   - Filename is display-only, NEVER used in filesystem paths
@@ -19,23 +21,28 @@ PHASE: BQ-VZ-ARTIFACTS Phase 1
 CREATED: 2026-03-06
 """
 
+import base64
 import hashlib
 import json
 import logging
 import os
 import re
 import shutil
+import sqlite3
 import tempfile
+import threading
 import time
 import uuid
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from app.config import settings
+from app.utils.sanitization import sql_quote_literal
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +52,18 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 MAX_ARTIFACT_SIZE_BYTES = 50 * 1024 * 1024  # 50 MB
+MAX_EXPORT_ROWS = 10_000_000
+XLSX_MAX_ROWS = 1_048_575  # Excel sheet limit, minus the header row
+EXPORT_BATCH_ROWS = 10_000
+# How often a running COPY export's file size is checked against the cap
+EXPORT_SIZE_POLL_S = 0.02
 MAX_ARTIFACTS_PER_USER = 100
 MAX_CREATES_PER_MIN = 5
 MAX_FILENAME_LENGTH = 255
 ARTIFACT_TTL_DAYS = 7
 SCHEMA_VERSION = 1
 EXPORT_DIR = Path("/data/export")
+INDEX_DB_NAME = ".index.db"
 
 FILENAME_CHARSET = re.compile(r'^[a-zA-Z0-9._-]+$')
 SCRIPT_TAG_RE = re.compile(r'<script\b[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
@@ -114,6 +127,183 @@ class Artifact:
         return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
 
 
+# ---------------------------------------------------------------------------
+# Metadata index (SQLite)
+# ---------------------------------------------------------------------------
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    format TEXT NOT NULL,
+    starred INTEGER NOT NULL,
+    expired INTEGER NOT NULL,
+    meta_mtime_ns INTEGER NOT NULL,
+    meta_size INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_artifacts_user_created
+    ON artifacts (user_id, created_at DESC, id DESC);
+"""
+
+
+def _encode_cursor(created_at: str, artifact_id: str) -> str:
+    raw = json.dumps([created_at, artifact_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, artifact_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), str(artifact_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+class ArtifactIndex:
+    """
+    SQLite index of artifact metadata.
+
+    The metadata.json sidecars stay the source of truth; each row carries
+    the sidecar's (mtime_ns, size) stamp so reconcile() only re-reads the
+    sidecars that changed behind the index's back.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.created = not db_path.exists()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_INDEX_SCHEMA)
+        self._conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator["ArtifactIndex"]:
+        """Commit the index changes only if the enclosed filesystem work succeeds."""
+        with self._lock:
+            try:
+                yield self
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def upsert(self, artifact: "Artifact", meta_path, st: Optional[os.stat_result] = None) -> None:
+        st = st or os.stat(meta_path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                artifact.id, artifact.user_id, artifact.created_at, artifact.format,
+                int(artifact.starred), int(artifact.expired),
+                # vars() rather than asdict(): fields are flat, and this runs
+                # once per artifact on a cold reconcile
+                st.st_mtime_ns, st.st_size, json.dumps(vars(artifact)),
+            ),
+        )
+
+    def remove(self, artifact_id: str) -> None:
+        self._conn.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,))
+
+    def count(self, user_id: str, include_expired: bool = False) -> int:
+        sql = "SELECT COUNT(*) FROM artifacts WHERE user_id = ?"
+        if not include_expired:
+            sql += " AND expired = 0"
+        with self._lock:
+            return self._conn.execute(sql, (user_id,)).fetchone()[0]
+
+    def page(
+        self,
+        user_id: str,
+        include_expired: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        fmt: Optional[str] = None,
+        starred: Optional[bool] = None,
+    ) -> Tuple[List["Artifact"], Optional[str]]:
+        """One page, newest first. Returns the artifacts and the next-page cursor."""
+        where, params = ["user_id = ?"], [user_id]
+        if not include_expired:
+            where.append("expired = 0")
+        if fmt is not None:
+            where.append("format = ?")
+            params.append(fmt)
+        if starred is not None:
+            where.append("starred = ?")
+            params.append(int(starred))
+        if cursor:
+            # Row-value comparison keeps the (created_at, id) index usable
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        sql = (
+            f"SELECT data FROM artifacts WHERE {' AND '.join(where)} "
+            "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit + 1, offset)).fetchall()
+        artifacts = [Artifact.from_dict(json.loads(r[0])) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and artifacts:
+            next_cursor = _encode_cursor(artifacts[-1].created_at, artifacts[-1].id)
+        return artifacts, next_cursor
+
+    def unstarred(self) -> List[Tuple[str, str]]:
+        """(id, created_at) of every unstarred artifact, for TTL cleanup."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, created_at FROM artifacts WHERE starred = 0"
+            ).fetchall()
+
+    def reconcile(self, artifacts_dir: Path) -> Dict[str, int]:
+        """Bring the index in line with the sidecars on disk."""
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute(
+                    "SELECT id, meta_mtime_ns, meta_size FROM artifacts"
+                )
+            }
+        stats = {"added": 0, "updated": 0, "removed": 0, "skipped": 0}
+        seen = set()
+        with self.transaction():
+            with os.scandir(artifacts_dir) as entries:
+                for entry in entries:
+                    # Dot-prefixed entries are in-flight temp dirs (and the index)
+                    if entry.name.startswith(".") or not entry.is_dir():
+                        continue
+                    meta_path = os.path.join(entry.path, "metadata.json")
+                    try:
+                        st = os.stat(meta_path)
+                    except FileNotFoundError:
+                        continue
+                    seen.add(entry.name)
+                    if known.get(entry.name) == (st.st_mtime_ns, st.st_size):
+                        continue
+                    try:
+                        with open(meta_path, "r", encoding="utf-8") as f:
+                            artifact = Artifact.from_dict(json.load(f))
+                        if artifact.id != entry.name:
+                            raise ValueError("id does not match directory")
+                    except Exception:
+                        logger.warning("Skipping corrupt artifact metadata: %s", meta_path)
+                        seen.discard(entry.name)
+                        stats["skipped"] += 1
+                        continue
+                    self.upsert(artifact, meta_path, st)
+                    stats["updated" if entry.name in known else "added"] += 1
+            for artifact_id in known.keys() - seen:
+                self.remove(artifact_id)
+                stats["removed"] += 1
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 # ---------------------------------------------------------------------------
 # ArtifactsService
 # ---------------------------------------------------------------------------
@@ -123,6 +313,8 @@ class ArtifactsService:
         self._artifacts_dir = Path(settings.data_directory) / "artifacts"
         self._artifacts_dir.mkdir(parents=True, exist_ok=True)
         self._rate_limits: Dict[str, List[float]] = defaultdict(list)
+        self._artifact_index: Optional[ArtifactIndex] = None
+        self._index_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Validation helpers
@@ -177,33 +369,31 @@ class ArtifactsService:
 
     def _check_quota(self, user_id: str) -> None:
         """Enforce max artifacts per user."""
-        count = sum(
-            1 for a in self._iter_artifacts(user_id)
-            if not a.expired
-        )
-        if count >= MAX_ARTIFACTS_PER_USER:
+        if self._index().count(user_id) >= MAX_ARTIFACTS_PER_USER:
             raise PermissionError(f"Artifact quota exceeded: max {MAX_ARTIFACTS_PER_USER} per user")
 
-    def _iter_artifacts(self, user_id: str) -> List[Artifact]:
-        """Iterate over all artifacts for a user by scanning the artifacts directory."""
-        artifacts = []
-        if not self._artifacts_dir.exists():
-            return artifacts
-        for entry in self._artifacts_dir.iterdir():
-            if not entry.is_dir():
-                continue
-            meta_path = entry / "metadata.json"
-            if not meta_path.exists():
-                continue
-            try:
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                artifact = Artifact.from_dict(data)
-                if artifact.user_id == user_id:
-                    artifacts.append(artifact)
-            except Exception:
-                logger.warning("Skipping corrupt artifact metadata: %s", meta_path)
-        return artifacts
+    def _index(self) -> ArtifactIndex:
+        """Open (or reopen, if the artifacts dir moved) the metadata index."""
+        db_path = self._artifacts_dir / INDEX_DB_NAME
+        with self._index_lock:
+            index = self._artifact_index
+            if index is None or index.db_path != db_path:
+                if index is not None:
+                    index.close()
+                index = ArtifactIndex(db_path)
+                if index.created:
+                    # First run against an existing artifacts dir: backfill
+                    stats = index.reconcile(self._artifacts_dir)
+                    logger.info("Artifact index built: %s", stats)
+                self._artifact_index = index
+            return index
+
+    def reconcile_index(self) -> Dict[str, int]:
+        """Fix drift between the index and the sidecars (run at startup)."""
+        stats = self._index().reconcile(self._artifacts_dir)
+        if any(stats.values()):
+            logger.info("Artifact index reconciled: %s", stats)
+        return stats
 
     def _get_artifact_dir(self, artifact_id: str) -> Path:
         """Get the directory for an artifact. Validates UUID format."""
@@ -272,43 +462,133 @@ class ArtifactsService:
         return dest_real
 
     @staticmethod
-    def _write_export(records: Iterable[dict], fmt: ArtifactFormat, dest: Path) -> None:
-        """Write query records in the requested export format."""
-        rows = list(records)
-        columns = list(rows[0].keys()) if rows else []
-
-        if fmt == ArtifactFormat.CSV:
-            import csv
-            with open(dest, "w", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=columns)
-                writer.writeheader()
-                writer.writerows(rows)
-            return
+    def _size_cap_error(max_bytes: int) -> ValueError:
+        return ValueError(f"Query result exceeds {max_bytes // (1024*1024)}MB limit")
+
+    @classmethod
+    def _check_export_caps(cls, rows: int, size_bytes: int, max_rows: int, max_bytes: int) -> None:
+        if rows > max_rows:
+            raise ValueError(f"Query result exceeds {max_rows:,} row limit")
+        if size_bytes > max_bytes:
+            raise cls._size_cap_error(max_bytes)
+
+    @classmethod
+    def _write_export(
+        cls,
+        conn,
+        query: str,
+        fmt: ArtifactFormat,
+        dest: Path,
+        max_rows: int = MAX_EXPORT_ROWS,
+        max_bytes: int = MAX_ARTIFACT_SIZE_BYTES,
+    ) -> int:
+        """Stream query results to ``dest`` in the requested export format.
+
+        CSV and Parquet are written by DuckDB's COPY, interrupted as soon as
+        the file outgrows the byte cap; JSON and XLSX are fed one record
+        batch at a time, so at most a batch is ever held in Python. Raises
+        ValueError once the row or byte cap is crossed and returns the
+        number of rows written.
+        """
+        if fmt in (ArtifactFormat.CSV, ArtifactFormat.PARQUET):
+            options = (
+                "FORMAT CSV, HEADER" if fmt == ArtifactFormat.CSV
+                else "FORMAT PARQUET, COMPRESSION ZSTD"
+            )
+            # One row past the cap is enough to know it was exceeded. No temp
+            # file, so the watcher sees the bytes as they are written.
+            rows = cls._copy_with_size_cap(
+                conn,
+                f"COPY (SELECT * FROM ({query}) AS _q LIMIT {max_rows + 1}) "
+                f"TO '{sql_quote_literal(str(dest))}' ({options}, USE_TMP_FILE false)",
+                dest, max_bytes,
+            )
+            cls._check_export_caps(rows, dest.stat().st_size, max_rows, max_bytes)
+            return rows
+
+        reader = conn.execute(query).fetch_record_batch(EXPORT_BATCH_ROWS)
+        rows = 0
 
         if fmt == ArtifactFormat.XLSX:
             from openpyxl import Workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.append(columns)
-            for row in rows:
-                ws.append([row.get(column) for column in columns])
+            max_rows = min(max_rows, XLSX_MAX_ROWS)
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet()
+            ws.append(reader.schema.names)
+            try:
+                for batch in reader:
+                    rows += batch.num_rows
+                    cls._check_export_caps(rows, 0, max_rows, max_bytes)
+                    for row in zip(*(column.to_pylist() for column in batch.columns)):
+                        ws.append(list(row))
+            except BaseException:
+                ws.close()  # finish the streamed sheet so its temp file is released
+                raise
             wb.save(dest)
-            return
+            cls._check_export_caps(rows, dest.stat().st_size, max_rows, max_bytes)
+            return rows
 
         if fmt == ArtifactFormat.JSON:
-            with open(dest, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, default=str)
-            return
-
-        if fmt == ArtifactFormat.PARQUET:
-            import pyarrow as pa
-            import pyarrow.parquet as pq
-            table = pa.Table.from_pylist(rows)
-            pq.write_table(table, dest)
-            return
+            size = 0
+            with open(dest, "wb") as f:
+                f.write(b"[")
+                for batch in reader:
+                    chunk = ", ".join(
+                        json.dumps(row, ensure_ascii=False, default=str)
+                        for row in batch.to_pylist()
+                    ).encode("utf-8")
+                    if rows and chunk:
+                        chunk = b", " + chunk
+                    rows += batch.num_rows
+                    size += len(chunk)
+                    cls._check_export_caps(rows, size, max_rows, max_bytes)
+                    f.write(chunk)
+                f.write(b"]")
+            return rows
 
         raise ValueError(f"Unsupported export format: {fmt.value}")
 
+    @classmethod
+    def _copy_with_size_cap(cls, conn, copy_sql: str, dest: Path, max_bytes: int) -> int:
+        """Run a COPY, interrupting it once ``dest`` grows past ``max_bytes``.
+
+        The file is checked every EXPORT_SIZE_POLL_S, so the overshoot is at
+        most what DuckDB writes in one interval. Returns the rows copied.
+        """
+        done = threading.Event()
+        overflow = threading.Event()
+
+        def _watch() -> None:
+            while not done.wait(EXPORT_SIZE_POLL_S):
+                try:
+                    size = dest.stat().st_size
+                except FileNotFoundError:
+                    continue
+                if size > max_bytes:
+                    overflow.set()
+                    conn.interrupt()
+                    return
+
+        watcher = threading.Thread(target=_watch, name="export-size-cap", daemon=True)
+        watcher.start()
+        try:
+            return conn.execute(copy_sql).fetchone()[0]
+        except Exception:
+            if overflow.is_set():
+                raise cls._size_cap_error(max_bytes)
+            raise
+        finally:
+            done.set()
+            watcher.join()
+
+    @staticmethod
+    def _sha256_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -374,9 +654,11 @@ class ArtifactsService:
                 encoding="utf-8",
             )
 
-            # Atomic rename
+            # Atomic rename; the index row commits only if the rename succeeds
             final_dir = self._get_artifact_dir(artifact_id)
-            os.rename(str(temp_dir), str(final_dir))
+            with self._index().transaction() as index:
+                index.upsert(artifact, meta_path)
+                os.rename(str(temp_dir), str(final_dir))
 
             self._record_create(user_id)
             logger.info("Artifact created: id=%s user=%s file=%s", artifact_id, user_id, filename)
@@ -428,7 +710,7 @@ class ArtifactsService:
         try:
             content_file = temp_dir / f"content.{fmt.value}"
 
-            # Execute query and stream to CSV
+            # Execute query and stream to the export format
             from app.services.duckdb_service import ephemeral_duckdb_service
             from app.services.sql_sandbox import SQLSandbox
             from app.services.processing_service import get_processing_service
@@ -437,9 +719,9 @@ class ArtifactsService:
             records = proc_svc.list_datasets()
             allowed = SQLSandbox.build_allowed_tables([r.id for r in records])
             sandbox = SQLSandbox(allowed_tables=allowed)
-            is_valid, error = sandbox.validate(query)
-            if not is_valid:
-                raise ValueError(f"SQL validation failed: {error}")
+            verdict = sandbox.check(query)
+            if not verdict.is_valid:
+                raise ValueError(f"SQL validation failed: {verdict.error}")
 
             with ephemeral_duckdb_service() as duckdb_svc:
                 conn = duckdb_svc.create_ephemeral_connection()
@@ -449,30 +731,18 @@ class ArtifactsService:
                     datasets = sql_svc._resolve_datasets(None)
                     SQLService._create_views(conn, datasets)
 
-                    result = conn.execute(query)
-                    columns = [desc[0] for desc in result.description]
-                    records = []
-                    while True:
-                        batch = result.fetchmany(1000)
-                        if not batch:
-                            break
-                        records.extend(dict(zip(columns, row)) for row in batch)
-
-                    self._write_export(records, fmt, export_dest)
-                    if export_dest.stat().st_size > MAX_ARTIFACT_SIZE_BYTES:
-                        raise ValueError(
-                            f"Query result exceeds {MAX_ARTIFACT_SIZE_BYTES // (1024*1024)}MB limit"
-                        )
-                    shutil.copyfile(export_dest, content_file)
+                    # Written into the temp dir first so a capped or failed
+                    # export never leaves a partial file in /data/export
+                    self._write_export(conn, verdict.clean_sql, fmt, content_file)
                 finally:
                     conn.close()
 
             # Measure actual size and hash
-            content_bytes = content_file.read_bytes()
-            size_bytes = len(content_bytes)
+            size_bytes = content_file.stat().st_size
             if size_bytes == 0:
                 raise ValueError("Query returned no results")
-            content_hash = hashlib.sha256(content_bytes).hexdigest()
+            content_hash = self._sha256_file(content_file)
+            shutil.copyfile(content_file, export_dest)
 
             # Build metadata
             artifact = Artifact(
@@ -499,7 +769,9 @@ class ArtifactsService:
             )
 
             final_dir = self._get_artifact_dir(artifact_id)
-            os.rename(str(temp_dir), str(final_dir))
+            with self._index().transaction() as index:
+                index.upsert(artifact, meta_path)
+                os.rename(str(temp_dir), str(final_dir))
 
             self._record_create(user_id)
             logger.info(
@@ -521,11 +793,26 @@ class ArtifactsService:
         limit: int = 50,
     ) -> List[Artifact]:
         """List artifacts for a user, sorted by created_at desc."""
-        artifacts = self._iter_artifacts(user_id)
-        if not include_expired:
-            artifacts = [a for a in artifacts if not a.expired]
-        artifacts.sort(key=lambda a: a.created_at, reverse=True)
-        return artifacts[offset:offset + limit]
+        artifacts, _ = self._index().page(
+            user_id, include_expired=include_expired, limit=limit, offset=offset,
+        )
+        return artifacts
+
+    def list_artifacts_page(
+        self,
+        user_id: str,
+        include_expired: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fmt: Optional[str] = None,
+        starred: Optional[bool] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Artifact], Optional[str]]:
+        """Keyset-paginated listing: pass the returned cursor to get the next page."""
+        return self._index().page(
+            user_id, include_expired=include_expired, limit=limit, offset=offset,
+            cursor=cursor, fmt=fmt, starred=starred,
+        )
 
     def get_artifact(self, artifact_id: str, user_id: str) -> Artifact:
         """Get artifact metadata, enforcing user scoping."""
@@ -546,7 +833,9 @@ class ArtifactsService:
         """Delete an artifact and its files."""
         self._load_artifact(artifact_id, user_id)  # Validates ownership
         artifact_dir = self._get_artifact_dir(artifact_id)
-        shutil.rmtree(artifact_dir, ignore_errors=True)
+        with self._index().transaction() as index:
+            index.remove(artifact_id)
+            shutil.rmtree(artifact_dir, ignore_errors=True)
         logger.info("Artifact deleted: id=%s user=%s", artifact_id, user_id)
         return True
 
@@ -556,10 +845,12 @@ class ArtifactsService:
         artifact.starred = starred
         artifact_dir = self._get_artifact_dir(artifact_id)
         meta_path = artifact_dir / "metadata.json"
-        meta_path.write_text(
-            json.dumps(artifact.to_dict(), indent=2),
-            encoding="utf-8",
-        )
+        with self._index().transaction() as index:
+            meta_path.write_text(
+                json.dumps(artifact.to_dict(), indent=2),
+                encoding="utf-8",
+            )
+            index.upsert(artifact, meta_path)
         return artifact
 
     def cleanup_expired(self) -> int:
@@ -568,28 +859,23 @@ class ArtifactsService:
         removed = 0
         if not self._artifacts_dir.exists():
             return 0
-        for entry in self._artifacts_dir.iterdir():
-            if not entry.is_dir() or entry.name.startswith("."):
-                continue
-            meta_path = entry / "metadata.json"
-            if not meta_path.exists():
-                continue
+        # Picks up sidecars edited or removed outside the service
+        self.reconcile_index()
+        index = self._index()
+        for artifact_id, created_at in index.unstarred():
             try:
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                artifact = Artifact.from_dict(data)
-                if artifact.starred:
-                    continue
-                created = datetime.fromisoformat(artifact.created_at)
+                created = datetime.fromisoformat(created_at)
                 if created.tzinfo is None:
                     created = created.replace(tzinfo=timezone.utc)
                 age_days = (now - created).total_seconds() / 86400
                 if age_days > ARTIFACT_TTL_DAYS:
-                    shutil.rmtree(entry, ignore_errors=True)
+                    with index.transaction():
+                        index.remove(artifact_id)
+                        shutil.rmtree(self._get_artifact_dir(artifact_id), ignore_errors=True)
                     removed += 1
-                    logger.info("Expired artifact cleaned up: %s (age=%.1fd)", artifact.id, age_days)
+                    logger.info("Expired artifact cleaned up: %s (age=%.1fd)", artifact_id, age_days)
             except Exception:
-                logger.warning("Error checking artifact expiry: %s", entry.name)
+                logger.warning("Error checking artifact expiry: %s", artifact_id)
         return removed
 
 
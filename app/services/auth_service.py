@@ -54,16 +54,16 @@ class AuthService:
         Returns the created User object.
         Raises ValueError if username already exists.
         """
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
         from sqlmodel import select
 
         username = username.strip().lower()
 
-        with get_session_context() as session:
-            existing = session.exec(
+        async with async_session_context() as session:
+            existing = (await session.exec(
                 select(User).where(User.username == username)
-            ).first()
+            )).first()
             if existing:
                 raise ValueError(f"Username '{username}' already exists")
 
@@ -76,8 +76,8 @@ class AuthService:
                 is_active=True,
             )
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            await session.commit()
+            await session.refresh(user)
 
             logger.info("User created: username=%s role=%s", username, role)
             return user
@@ -88,16 +88,16 @@ class AuthService:
         Returns the User on success, None on failure.
         Updates last_login_at on successful authentication.
         """
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
         from sqlmodel import select
 
         username = username.strip().lower()
 
-        with get_session_context() as session:
-            user = session.exec(
+        async with async_session_context() as session:
+            user = (await session.exec(
                 select(User).where(User.username == username)
-            ).first()
+            )).first()
 
             if not user or not user.is_active:
                 return None
@@ -108,76 +108,71 @@ class AuthService:
             # Update last_login_at
             user.last_login_at = datetime.now(timezone.utc)
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            await session.commit()
+            await session.refresh(user)
 
             return user
 
     async def get_user_by_id(self, user_id: str):
         """Look up a user by their UUID."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
 
-        with get_session_context() as session:
-            user = session.get(User, user_id)
-            if user:
-                # Detach from session by accessing all fields
-                _ = user.id, user.username, user.display_name, user.role
-                _ = user.is_active, user.created_at, user.last_login_at, user.pw_hash
-            return user
+        async with async_session_context() as session:
+            return await session.get(User, user_id)
 
     async def list_users(self):
         """List all users (admin only)."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
         from sqlmodel import select
 
-        with get_session_context() as session:
-            users = session.exec(select(User)).all()
+        async with async_session_context() as session:
+            users = (await session.exec(select(User))).all()
             return list(users)
 
     async def deactivate_user(self, user_id: str) -> bool:
         """Deactivate a user account. Returns True if successful."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
 
-        with get_session_context() as session:
-            user = session.get(User, user_id)
+        async with async_session_context() as session:
+            user = await session.get(User, user_id)
             if not user:
                 return False
 
             user.is_active = False
             session.add(user)
-            session.commit()
+            await session.commit()
 
             logger.info("User deactivated: user_id=%s username=%s", user_id, user.username)
             return True
 
     async def reset_password(self, user_id: str, new_password: str) -> bool:
         """Reset a user's password. Returns True if successful."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
 
-        with get_session_context() as session:
-            user = session.get(User, user_id)
+        async with async_session_context() as session:
+            user = await session.get(User, user_id)
             if not user:
                 return False
 
             user.pw_hash = hash_password(new_password)
             session.add(user)
-            session.commit()
+            await session.commit()
 
             logger.info("Password reset: user_id=%s username=%s", user_id, user.username)
             return True
 
     async def needs_setup(self) -> bool:
         """Check if the users table is empty (needs first admin setup)."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.user import User
         from sqlmodel import select, func
 
-        with get_session_context() as session:
-            count = session.exec(select(func.count()).select_from(User)).one()
+        async with async_session_context() as session:
+            count = (await session.exec(select(func.count()).select_from(User))).one()
             return count == 0
 
 
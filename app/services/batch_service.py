@@ -172,17 +172,17 @@ class BatchService:
         processing._save_record(record, storage_fn)
         return record
 
-    def get_batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+    async def get_batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """Aggregate status of all datasets in a batch."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
 
-        with get_session_context() as session:
+        async with async_session_context() as session:
             stmt = (
                 select(DBDatasetRecord)
                 .where(DBDatasetRecord.batch_id == batch_id)
                 .order_by(DBDatasetRecord.created_at)
             )
-            rows = session.exec(stmt).all()
+            rows = (await session.exec(stmt)).all()
 
         if not rows:
             return None
@@ -205,25 +205,25 @@ class BatchService:
             "items": items,
         }
 
-    def confirm_batch(self, batch_id: str, user_id: str) -> Dict[str, Any]:
+    async def confirm_batch(self, batch_id: str, user_id: str) -> Dict[str, Any]:
         """Confirm all preview_ready datasets in a batch. Returns counts.
 
         Race-condition fix: items still in UPLOADED/EXTRACTING get confirmed_at
         stamped so that process_dataset_task auto-indexes after extraction.
         """
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
 
         confirmed = 0
         already = 0
         skipped_error = 0
         pending_confirm = 0
 
-        with get_session_context() as session:
+        async with async_session_context() as session:
             stmt = (
                 select(DBDatasetRecord)
                 .where(DBDatasetRecord.batch_id == batch_id)
             )
-            rows = session.exec(stmt).all()
+            rows = (await session.exec(stmt)).all()
 
             now = datetime.now(timezone.utc)
             for row in rows:
@@ -253,17 +253,17 @@ class BatchService:
                 elif row.status == DatasetStatus.ERROR.value:
                     skipped_error += 1
 
-            session.commit()
+            await session.commit()
 
         # Gather IDs that need indexing
         confirmed_ids = []
-        with get_session_context() as session:
+        async with async_session_context() as session:
             stmt = (
                 select(DBDatasetRecord)
                 .where(DBDatasetRecord.batch_id == batch_id)
                 .where(DBDatasetRecord.status == DatasetStatus.INDEXING.value)
             )
-            rows = session.exec(stmt).all()
+            rows = (await session.exec(stmt)).all()
             confirmed_ids = [r.id for r in rows]
 
         return {
@@ -275,17 +275,17 @@ class BatchService:
             "confirmed_ids": confirmed_ids,
         }
 
-    def batch_belongs_to_user(self, batch_id: str, user_id: str) -> bool:
+    async def batch_belongs_to_user(self, batch_id: str, user_id: str) -> bool:
         """Check if any datasets in the batch exist (ownership placeholder)."""
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
 
-        with get_session_context() as session:
+        async with async_session_context() as session:
             stmt = (
                 select(DBDatasetRecord)
                 .where(DBDatasetRecord.batch_id == batch_id)
                 .limit(1)
             )
-            row = session.exec(stmt).first()
+            row = (await session.exec(stmt)).first()
             return row is not None
 
 
@@ -132,6 +132,11 @@ def _get_db_session():
     return get_session_context()
 
 
+def _get_async_db_session():
+    from app.core.database import async_session_context
+    return async_session_context()
+
+
 class BillingService:
     """
     Manages Stripe usage-based billing and persistent usage tracking.
@@ -472,13 +477,13 @@ class BillingService:
 
         summary = UsageSummary(user_id=user_id)
 
-        with _get_db_session() as session:
+        async with _get_async_db_session() as session:
             stmt = (
                 select(BillingUsage)
                 .where(BillingUsage.user_id == user_id)
                 .order_by(BillingUsage.created_at.asc())
             )
-            rows = session.exec(stmt).all()
+            rows = (await session.exec(stmt)).all()
 
         for row in rows:
             try:
@@ -7,7 +7,7 @@ Runs locally, produces a compliance report per dataset.
 import json
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Set, Any
+from typing import Dict, List, Optional, Set, Any
 
 from app.models.compliance_schemas import ComplianceReport, RegulationFlag
 
@@ -75,13 +75,19 @@ class ComplianceService:
     Analyzes PII scan results and maps them to regulation-specific compliance flags.
     """
 
-    async def generate_compliance_report(self, dataset_id: str) -> ComplianceReport:
+    async def generate_compliance_report(
+        self,
+        dataset_id: str,
+        pii_results: Optional[Dict[str, Any]] = None,
+    ) -> ComplianceReport:
         """
         Generate a compliance report for a dataset based on its PII scan.
 
-        If no PII scan exists, returns an all-clear report.
+        If no PII scan exists, returns an all-clear report. Pass *pii_results*
+        when the scan was just run to skip reading pii_scan.json back.
         """
-        pii_results = self._load_pii_scan(dataset_id)
+        if pii_results is None:
+            pii_results = self._load_pii_scan(dataset_id)
         pii_entities = self._extract_pii_entities(pii_results)
 
         # Build regulation flags
@@ -11,11 +11,11 @@ Created: 2026-01-25
 
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from app.models.state import Message, MessageRole
-from app.services.session_service import SessionService
+from app.models.state import Message, MessageRole, Session
+from app.services.session_service import SessionService, estimate_tokens
 from app.services.allie_provider import BaseAllieProvider, get_allie_provider
 
 logger = logging.getLogger(__name__)
@@ -57,6 +57,17 @@ class ContextConfig:
     chars_per_token: float = 4.0  # Estimation heuristic
 
 
+@dataclass
+class _WindowPlan:
+    """Pieces of a truncated context window, before the summary is chosen."""
+    session: Optional[Session]
+    head: List[Message]  # system prompt + existing system messages that fit
+    middle: List[Message]
+    recent: List[Message]
+    dropped_count: int  # conversation messages older than the window
+    summary_through: int  # cumulative_tokens boundary of the dropped history
+
+
 # =============================================================================
 # Context Window Manager
 # =============================================================================
@@ -108,9 +119,7 @@ class ContextWindowManager:
         Returns:
             Estimated token count
         """
-        if not text:
-            return 0
-        return max(1, int(len(text) / self.config.chars_per_token))
+        return estimate_tokens(text, self.config.chars_per_token)
 
     def calculate_message_tokens(self, message: Message) -> int:
         """
@@ -134,6 +143,13 @@ class ContextWindowManager:
     ) -> ContextWindow:
         """
         Build a context window for a session.
+
+        Token counts and per-session running sums are stamped at insert
+        time, so this never loads or re-counts the full history: the
+        session's total decides whether truncation is needed, and the
+        newest messages that fit are selected in SQL. Dropped history is
+        represented by the session's cached rolling summary when it covers
+        exactly the dropped range, otherwise by a placeholder.
         
         Args:
             session_id: Session to build context for
@@ -143,227 +159,206 @@ class ContextWindowManager:
         Returns:
             ContextWindow with messages fitting in budget
         """
-        max_tokens = max_tokens or self.config.max_tokens
-        
-        # Get all messages from session
-        all_messages = self.session_service.get_messages(session_id, limit=1000)
-        
-        if not all_messages:
-            messages = []
-            if include_system_prompt:
-                messages.append(Message(
-                    session_id=session_id,
-                    role=MessageRole.SYSTEM,
-                    content=include_system_prompt,
-                    token_count=self.estimate_tokens(include_system_prompt)
-                ))
-            return ContextWindow(
-                messages=messages,
-                total_tokens=sum(self.calculate_message_tokens(m) for m in messages),
-                truncated=False
-            )
+        window, plan = self._plan_window(session_id, max_tokens, include_system_prompt)
+        if plan is None:
+            return window
 
-        # Calculate tokens for all messages
-        for msg in all_messages:
-            if msg.token_count is None:
-                msg.token_count = self.estimate_tokens(msg.content)
-
-        total_tokens = sum(msg.token_count for msg in all_messages)
-        
-        # Add system prompt tokens if provided
-        system_prompt_tokens = self.estimate_tokens(include_system_prompt) if include_system_prompt else 0
-        
-        # If everything fits, return all
-        if total_tokens + system_prompt_tokens <= max_tokens:
-            messages = list(all_messages)
-            if include_system_prompt:
-                messages.insert(0, Message(
-                    session_id=session_id,
-                    role=MessageRole.SYSTEM,
-                    content=include_system_prompt,
-                    token_count=system_prompt_tokens
-                ))
-            return ContextWindow(
-                messages=messages,
-                total_tokens=total_tokens + system_prompt_tokens,
-                truncated=False
-            )
-
-        # Need to truncate - build sliding window
-        return self._build_sliding_window(
-            session_id=session_id,
-            messages=all_messages,
-            max_tokens=max_tokens,
-            system_prompt=include_system_prompt,
-            system_prompt_tokens=system_prompt_tokens
-        )
+        summary = None
+        if plan.dropped_count:
+            summary = self._cached_summary(plan) or self._summarize_messages_sync(plan.dropped_count)
+        return self._assemble_window(session_id, plan, summary)
 
-    def _build_sliding_window(
+    def _plan_window(
         self,
         session_id: UUID,
-        messages: List[Message],
-        max_tokens: int,
+        max_tokens: Optional[int],
         system_prompt: Optional[str],
-        system_prompt_tokens: int
-    ) -> ContextWindow:
+    ) -> Tuple[Optional[ContextWindow], Optional[_WindowPlan]]:
         """
-        Build a sliding window when messages exceed budget.
-        
+        Decide what goes into the window.
+
+        Returns a finished ContextWindow when no summary is involved (the
+        whole history fits, or the budget can't even hold the most recent
+        messages); otherwise a _WindowPlan for _assemble_window.
+
         Priority:
         1. System prompt (always keep)
         2. Recent messages (keep last N)
         3. Middle messages (fill remaining budget)
         4. Old messages (summarize if needed)
         """
-        result_messages: List[Message] = []
-        current_tokens = 0
+        max_tokens = max_tokens or self.config.max_tokens
+        session = self.session_service.get_session(session_id)
+        total_tokens = (session.total_tokens or 0) if session else 0
 
-        # 1. Add system prompt
+        system_prompt_tokens = self.estimate_tokens(system_prompt) if system_prompt else 0
+        head: List[Message] = []
         if system_prompt:
-            result_messages.append(Message(
+            head.append(Message(
                 session_id=session_id,
                 role=MessageRole.SYSTEM,
                 content=system_prompt,
                 token_count=system_prompt_tokens
             ))
-            current_tokens += system_prompt_tokens
 
-        # 2. Separate existing system messages and conversation
-        existing_system = [m for m in messages if m.role == MessageRole.SYSTEM]
-        conversation = [m for m in messages if m.role != MessageRole.SYSTEM]
-        
-        # Add existing system messages
+        # If everything fits, return all
+        if total_tokens + system_prompt_tokens <= max_tokens:
+            messages = head + self.session_service.get_messages(session_id, limit=1000)
+            return ContextWindow(
+                messages=messages,
+                total_tokens=sum(self.calculate_message_tokens(m) for m in messages),
+                truncated=False
+            ), None
+
+        # Existing system messages, in order, while they fit
+        current_tokens = system_prompt_tokens
+        existing_system = self.session_service.get_system_messages(session_id)
         for sys_msg in existing_system:
             if current_tokens + sys_msg.token_count <= max_tokens:
-                result_messages.append(sys_msg)
+                head.append(sys_msg)
                 current_tokens += sys_msg.token_count
 
-        # 3. Reserve space for recent messages (always keep)
+        # Newest conversation messages whose total fits what's left after
+        # the summary reserve; the last N are kept regardless
+        conversation = self.session_service.get_conversation_window(
+            session_id,
+            max_tokens=max_tokens - current_tokens - self.config.summary_buffer_tokens,
+            min_recent=self.config.min_recent_messages,
+            system_tokens=sum(m.token_count for m in existing_system),
+        )
         min_recent = min(self.config.min_recent_messages, len(conversation))
         recent_messages = conversation[-min_recent:] if min_recent > 0 else []
+        middle_selected = conversation[:-min_recent] if min_recent > 0 else conversation
         recent_tokens = sum(m.token_count for m in recent_messages)
 
-        # 4. Calculate remaining budget for middle messages
-        budget_after_recent = max_tokens - current_tokens - recent_tokens - self.config.summary_buffer_tokens
-        
         # Edge case: not enough room even for recent
+        budget_after_recent = max_tokens - current_tokens - recent_tokens - self.config.summary_buffer_tokens
         if budget_after_recent < 0:
             logger.warning(
                 f"Context extremely tight: system={current_tokens}, recent={recent_tokens}, max={max_tokens}"
             )
-            result_messages.extend(recent_messages)
             return ContextWindow(
-                messages=result_messages,
+                messages=head + recent_messages,
                 total_tokens=current_tokens + recent_tokens,
                 truncated=True,
                 summary=None
-            )
+            ), None
+
+        dropped_count = self.session_service.count_conversation_messages(session_id) - len(conversation)
+        if conversation:
+            oldest = conversation[0]
+            summary_through = oldest.cumulative_tokens - oldest.token_count
+        else:
+            summary_through = total_tokens
+        return None, _WindowPlan(
+            session=session,
+            head=head,
+            middle=middle_selected,
+            recent=recent_messages,
+            dropped_count=dropped_count,
+            summary_through=summary_through,
+        )
 
-        # 5. Fill middle with older messages (working backwards)
-        middle_candidates = conversation[:-min_recent] if min_recent > 0 else conversation
-        middle_selected: List[Message] = []
-        
-        for msg in reversed(middle_candidates):
-            if budget_after_recent >= msg.token_count:
-                middle_selected.insert(0, msg)
-                budget_after_recent -= msg.token_count
-            else:
-                # No more room
-                break
-
-        # 6. Identify messages that didn't fit (need summarization)
-        num_selected = len(middle_selected)
-        messages_to_summarize = middle_candidates[:len(middle_candidates) - num_selected]
-        
-        # 7. Summarize if we dropped messages
-        summary = None
-        if messages_to_summarize:
-            summary = self._summarize_messages_sync(messages_to_summarize)
-            if summary:
-                summary_msg = Message(
-                    session_id=session_id,
-                    role=MessageRole.SYSTEM,
-                    content=f"[Previous conversation summary]\n{summary}",
-                    token_count=self.estimate_tokens(summary) + 30  # overhead
-                )
-                result_messages.append(summary_msg)
-                current_tokens += summary_msg.token_count
-
-        # 8. Assemble final list
-        result_messages.extend(middle_selected)
-        result_messages.extend(recent_messages)
-        
-        final_tokens = sum(self.calculate_message_tokens(m) for m in result_messages)
+    @staticmethod
+    def _cached_summary(plan: _WindowPlan) -> Optional[str]:
+        """The session's rolling summary, if it covers exactly the dropped history."""
+        session = plan.session
+        if session and session.context_summary and session.context_summary_through == plan.summary_through:
+            return session.context_summary
+        return None
+
+    def _assemble_window(
+        self,
+        session_id: UUID,
+        plan: _WindowPlan,
+        summary: Optional[str],
+    ) -> ContextWindow:
+        """Assemble head, summary, middle and recent messages into a window."""
+        result_messages = list(plan.head)
+        if summary:
+            result_messages.append(Message(
+                session_id=session_id,
+                role=MessageRole.SYSTEM,
+                content=f"[Previous conversation summary]\n{summary}",
+                token_count=self.estimate_tokens(summary) + 30  # overhead
+            ))
+        result_messages.extend(plan.middle)
+        result_messages.extend(plan.recent)
 
         return ContextWindow(
             messages=result_messages,
-            total_tokens=final_tokens,
+            total_tokens=sum(self.calculate_message_tokens(m) for m in result_messages),
             truncated=True,
             summary=summary
         )
 
-    def _summarize_messages_sync(self, messages: List[Message]) -> Optional[str]:
+    def _summarize_messages_sync(self, message_count: int) -> Optional[str]:
         """
-        Synchronously summarize messages (for use in sync context).
+        Placeholder summary for dropped history (for use in sync context).
         
-        Note: This blocks - for async contexts, use summarize_messages_async.
+        Note: build_context_async generates and caches real summaries.
         """
-        if not messages:
+        if not message_count:
             return None
+        return f"(Older context from {message_count} messages was summarized for brevity)"
 
-        # Build conversation text
+    @staticmethod
+    def _conversation_text(messages: List[Message], previous_summary: Optional[str] = None) -> str:
         conversation_lines = []
+        if previous_summary:
+            conversation_lines.append(f"Earlier summary: {previous_summary}")
         for msg in messages:
             role_label = msg.role.value.capitalize()
             conversation_lines.append(f"{role_label}: {msg.content}")
         
         conversation_text = "\n".join(conversation_lines)
         
-        # Truncate if too long
         if len(conversation_text) > 4000:
             conversation_text = conversation_text[:4000] + "\n[truncated...]"
+        return conversation_text
+
+    async def _generate_summary(
+        self,
+        messages: List[Message],
+        previous_summary: Optional[str] = None,
+    ) -> str:
+        """Ask the Allie provider for a summary. Raises on provider errors."""
+        conversation_text = self._conversation_text(messages, previous_summary)
+        prompt = f"""Summarize the following conversation history into a concise paragraph (2-3 sentences).
+Retain key facts, user requests, and important decisions. Omit pleasantries.
+
+Conversation:
+{conversation_text}
 
+Summary:"""
 
-        # Always return a placeholder in sync context (use summarize_messages_async for real summaries)
-        return f"(Older context from {len(messages)} messages was summarized for brevity)"
+        parts: list[str] = []
+        async for chunk in self.allie_provider.stream(message=prompt):
+            if chunk.text:
+                parts.append(chunk.text)
+        return "".join(parts).strip()
 
-    async def summarize_messages_async(self, messages: List[Message]) -> Optional[str]:
+    async def summarize_messages_async(
+        self,
+        messages: List[Message],
+        previous_summary: Optional[str] = None,
+    ) -> Optional[str]:
         """
         Asynchronously summarize messages.
         
         Args:
             messages: Messages to summarize
+            previous_summary: Summary of the history before ``messages``,
+                folded into the new summary
             
         Returns:
             Summary text or None
         """
         if not messages:
-            return None
-
-        conversation_lines = []
-        for msg in messages:
-            role_label = msg.role.value.capitalize()
-            conversation_lines.append(f"{role_label}: {msg.content}")
-        
-        conversation_text = "\n".join(conversation_lines)
-        
-        if len(conversation_text) > 4000:
-            conversation_text = conversation_text[:4000] + "\n[truncated...]"
-
-        prompt = f"""Summarize the following conversation history into a concise paragraph (2-3 sentences).
-Retain key facts, user requests, and important decisions. Omit pleasantries.
-
-Conversation:
-{conversation_text}
-
-Summary:"""
+            return previous_summary
 
         try:
-            parts: list[str] = []
-            async for chunk in self.allie_provider.stream(message=prompt):
-                if chunk.text:
-                    parts.append(chunk.text)
-            return "".join(parts).strip()
+            return await self._generate_summary(messages, previous_summary)
         except Exception as e:
             logger.error(f"Failed to summarize messages: {e}")
             return f"(Older context from {len(messages)} messages was truncated)"
@@ -375,11 +370,47 @@ Summary:"""
         include_system_prompt: Optional[str] = None
     ) -> ContextWindow:
         """
-        Async version of build_context with proper async summarization.
+        Async version of build_context with real, cached summarization.
+
+        The summary is rolled forward: when more history has dropped out
+        since it was cached, only the newly dropped messages are summarized
+        together with the cached summary.
         """
-        # For now, delegate to sync version
-        # Full async implementation would require async session_service
-        return self.build_context(session_id, max_tokens, include_system_prompt)
+        window, plan = self._plan_window(session_id, max_tokens, include_system_prompt)
+        if plan is None:
+            return window
+
+        summary = None
+        if plan.dropped_count:
+            summary = self._cached_summary(plan)
+            if summary is None:
+                summary = await self._roll_summary(session_id, plan)
+        return self._assemble_window(session_id, plan, summary)
+
+    async def _roll_summary(self, session_id: UUID, plan: _WindowPlan) -> Optional[str]:
+        """Extend (or rebuild) the session's cached summary up to plan.summary_through."""
+        session = plan.session
+        previous = None
+        after = -1
+        if (
+            session
+            and session.context_summary
+            and session.context_summary_through is not None
+            and session.context_summary_through < plan.summary_through
+        ):
+            previous = session.context_summary
+            after = session.context_summary_through
+
+        dropped = self.session_service.get_conversation_range(session_id, after, plan.summary_through)
+        try:
+            summary = await self._generate_summary(dropped, previous) if dropped else previous
+        except Exception as e:
+            logger.error(f"Failed to summarize messages: {e}")
+            return self._summarize_messages_sync(plan.dropped_count)
+
+        if summary:
+            self.session_service.save_context_summary(session_id, summary, plan.summary_through)
+        return summary
 
 
 # =============================================================================
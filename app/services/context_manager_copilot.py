@@ -21,6 +21,8 @@ SPEC: ALLAI-PERSONALITY-SPEC-v2.1 Section 5
 import logging
 import os
 import re
+import threading
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from app.models.copilot import StateSnapshot
@@ -68,6 +70,31 @@ def _cap_selection_total(selection: Dict[str, Any]) -> Dict[str, Any]:
     return selection
 
 
+# ---------------------------------------------------------------------------
+# Schema graph cache
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class _SchemaSnapshot:
+    """Dataset summary, table schemas and joins for one dataset state."""
+
+    fingerprint: tuple
+    dataset_list: List[Dict[str, Any]]
+    tables: List[Dict[str, Any]]
+    joins: List[Dict[str, Any]]
+
+
+_schema_snapshot: Optional[_SchemaSnapshot] = None
+_schema_snapshot_lock = threading.Lock()
+
+
+def invalidate_schema_graph() -> None:
+    """Drop the cached schema graph; the next message rebuilds it."""
+    global _schema_snapshot
+    with _schema_snapshot_lock:
+        _schema_snapshot = None
+
+
 class CoPilotContextManager:
     """Builds runtime context for Allie's prompt."""
 
@@ -216,13 +243,23 @@ class CoPilotContextManager:
         return caps
 
     @staticmethod
-    def _get_all_datasets_summary() -> List[Dict[str, Any]]:
-        """Fetch all non-deleted datasets with metadata from DB."""
-        try:
-            from app.services.processing_service import get_processing_service
-            svc = get_processing_service()
+    def _get_schema_snapshot() -> _SchemaSnapshot:
+        """Return the schema snapshot for the current dataset state.
+
+        Rebuilt from one ``list_datasets()`` pass only when the dataset
+        state fingerprint has moved since the last build.
+        """
+        global _schema_snapshot
+        from app.services.processing_service import get_processing_service
+
+        svc = get_processing_service()
+        with _schema_snapshot_lock:
+            fingerprint = svc.dataset_state_fingerprint()
+            if _schema_snapshot is not None and _schema_snapshot.fingerprint == fingerprint:
+                return _schema_snapshot
+
             records = svc.list_datasets()
-            return [
+            dataset_list = [
                 {
                     "id": r.id,
                     "filename": r.original_filename,
@@ -234,6 +271,24 @@ class CoPilotContextManager:
                 }
                 for r in records
             ]
+            tables = [
+                CoPilotContextManager._build_table_schema(record)
+                for record in records
+                if CoPilotContextManager._is_queryable_dataset(record)
+            ]
+            _schema_snapshot = _SchemaSnapshot(
+                fingerprint=fingerprint,
+                dataset_list=dataset_list,
+                tables=tables,
+                joins=CoPilotContextManager._detect_likely_joins(tables),
+            )
+            return _schema_snapshot
+
+    @staticmethod
+    def _get_all_datasets_summary() -> List[Dict[str, Any]]:
+        """Fetch all non-deleted datasets with metadata from DB."""
+        try:
+            return list(CoPilotContextManager._get_schema_snapshot().dataset_list)
         except Exception as e:
             logger.warning("Failed to fetch dataset list for context: %s", e)
             return []
@@ -268,21 +323,8 @@ class CoPilotContextManager:
     def _build_full_schema_graph(active_dataset_id: Optional[str] = None) -> Dict[str, Any]:
         """Collect schemas for all SQL-ready datasets and infer likely joins."""
         try:
-            from app.services.processing_service import get_processing_service
-
-            svc = get_processing_service()
-            records = svc.list_datasets()
-            ready_records = [
-                record
-                for record in records
-                if CoPilotContextManager._is_queryable_dataset(record)
-            ]
-
-            tables = [
-                CoPilotContextManager._build_table_schema(record)
-                for record in ready_records
-            ]
-            joins = CoPilotContextManager._detect_likely_joins(tables)
+            snapshot = CoPilotContextManager._get_schema_snapshot()
+            tables = list(snapshot.tables)
 
             if active_dataset_id:
                 tables.sort(
@@ -296,7 +338,7 @@ class CoPilotContextManager:
                 "active_dataset_id": active_dataset_id,
                 "table_count": len(tables),
                 "tables": tables,
-                "joins": joins,
+                "joins": list(snapshot.joins),
             }
         except Exception as e:
             logger.warning("Failed to build full schema graph: %s", e)
@@ -353,22 +395,42 @@ class CoPilotContextManager:
 
     @staticmethod
     def _detect_likely_joins(tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Infer likely foreign-key joins across loaded dataset tables."""
+        """Infer likely foreign-key joins across loaded dataset tables.
+
+        Candidates come from two inverted indexes — dataset-name token to
+        tables that have an ``id`` column, and column name to tables — so
+        each column only visits tables it could actually join, instead of
+        every other table. Output order matches a source-by-source scan.
+        """
         joins: List[Dict[str, Any]] = []
         seen: set[tuple[str, str, str, str]] = set()
-        table_index = {
-            table["dataset_id"]: {
-                "table_name": table["table_name"],
-                "display_name": table["display_name"],
-                "columns": [col.get("name") for col in table.get("columns", []) if col.get("name")],
-                "column_set": {col.get("name") for col in table.get("columns", []) if col.get("name")},
-                "tokens": CoPilotContextManager._dataset_name_tokens(table["display_name"]),
-            }
-            for table in tables
-        }
-
-        for source in tables:
-            source_meta = table_index[source["dataset_id"]]
+        metas: List[Dict[str, Any]] = []
+        # token -> positions of tables whose name has it and that have an "id" column
+        id_tables_by_token: Dict[str, List[int]] = {}
+        # column name -> positions of tables that have it
+        tables_by_column: Dict[str, List[int]] = {}
+
+        for pos, table in enumerate(tables):
+            columns = list(dict.fromkeys(
+                col.get("name") for col in table.get("columns", []) if col.get("name")
+            ))
+            tokens = CoPilotContextManager._dataset_name_tokens(table["display_name"])
+            metas.append(
+                {
+                    "dataset_id": table["dataset_id"],
+                    "table_name": table["table_name"],
+                    "display_name": table["display_name"],
+                    "columns": columns,
+                    "tokens": tokens,
+                }
+            )
+            for column_name in columns:
+                tables_by_column.setdefault(column_name, []).append(pos)
+            if "id" in columns:
+                for token in tokens:
+                    id_tables_by_token.setdefault(token, []).append(pos)
+
+        for source_pos, source_meta in enumerate(metas):
             for column_name in source_meta["columns"]:
                 normalized_column = column_name.lower()
                 if normalized_column == "id":
@@ -376,11 +438,12 @@ class CoPilotContextManager:
 
                 if normalized_column.endswith("_id"):
                     fk_tokens = CoPilotContextManager._column_fk_tokens(normalized_column)
-                    for target in tables:
-                        if target["dataset_id"] == source["dataset_id"]:
-                            continue
-                        target_meta = table_index[target["dataset_id"]]
-                        if "id" not in target_meta["column_set"]:
+                    candidates: set[int] = set()
+                    for token in fk_tokens:
+                        candidates.update(id_tables_by_token.get(token, ()))
+                    for target_pos in sorted(candidates):
+                        target_meta = metas[target_pos]
+                        if target_meta["dataset_id"] == source_meta["dataset_id"]:
                             continue
                         if CoPilotContextManager._tokens_match_target(fk_tokens, target_meta["tokens"]):
                             CoPilotContextManager._append_join(
@@ -395,13 +458,11 @@ class CoPilotContextManager:
                                 reason="fk_name_match",
                             )
 
-                for target in tables:
-                    if target["dataset_id"] == source["dataset_id"]:
-                        continue
-                    target_meta = table_index[target["dataset_id"]]
-                    if column_name not in target_meta["column_set"]:
-                        continue
-                    if normalized_column in {"id", "created_at", "updated_at"}:
+                if normalized_column in {"created_at", "updated_at"}:
+                    continue
+                for target_pos in tables_by_column[column_name]:
+                    target_meta = metas[target_pos]
+                    if target_meta["dataset_id"] == source_meta["dataset_id"]:
                         continue
                     if source_meta["table_name"] >= target_meta["table_name"]:
                         continue
@@ -9,17 +9,25 @@ Phase: BQ-VZ-DB-CONNECT
 Created: 2026-02-25
 """
 
+import io
+import json
 import logging
+import os
+import shutil
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote, quote_plus, urlencode
 
 import pyarrow as pa
 import pyarrow.parquet as pq
 import sqlglot
 from sqlalchemy import create_engine, event, inspect, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, CursorResult, Engine
 
 from app.config import settings
 from app.models.database_connection import DatabaseConnection
@@ -40,6 +48,36 @@ _PG_TYPE_MAP = {
 # Columns with these types are skipped entirely
 _SKIP_TYPES = {"bytea", "blob", "binary", "varbinary", "longblob", "mediumblob", "tinyblob"}
 
+# Introspected data types → extraction column kinds (Mandate M2). Types not
+# listed are resolved once from the first non-null value the cursor returns.
+_DB_TYPE_KINDS = {
+    "boolean": "bool",
+    "smallint": "int", "integer": "int", "bigint": "int",
+    "tinyint": "int", "mediumint": "int", "int": "int", "year": "int",
+    "real": "float", "double precision": "float", "double": "float", "float": "float",
+    "numeric": "decimal", "decimal": "decimal",
+    "date": "date",
+    "timestamp without time zone": "timestamp", "timestamp with time zone": "timestamp",
+    "timestamp": "timestamp", "datetime": "timestamp",
+    "time without time zone": "text", "time with time zone": "text", "time": "text",
+    "character varying": "text", "character": "text", "text": "text",
+    "varchar": "text", "char": "text", "tinytext": "text", "mediumtext": "text",
+    "longtext": "text", "enum": "text", "set": "text", "uuid": "text",
+    "json": "json", "jsonb": "json", "array": "json",
+}
+
+# Arrow type written for each column kind
+_KIND_ARROW_TYPES = {
+    "bool": pa.bool_(),
+    "int": pa.int64(),
+    "float": pa.float64(),
+    "decimal": pa.float64(),
+    "timestamp": pa.timestamp("us"),
+    "date": pa.date32(),
+    "text": pa.string(),
+    "json": pa.string(),
+}
+
 # SQL statement types that are absolutely forbidden
 _BLOCKED_STATEMENT_TYPES = frozenset({
     "INSERT", "UPDATE", "DELETE", "DROP", "ALTER", "TRUNCATE",
@@ -109,19 +147,17 @@ class DatabaseConnector:
     """Manages external database connections for data extraction."""
 
     SUPPORTED_TYPES = {"postgresql", "mysql"}
+    EXTRACT_BATCH_ROWS = 10_000  # Rows per fetchmany() round-trip / RecordBatch
 
     def __init__(self):
         self._engines: Dict[str, Engine] = {}
 
-    def _build_url(self, connection: DatabaseConnection) -> str:
+    def _build_url(self, connection: DatabaseConnection, driver: Optional[str] = None) -> str:
         """Build SQLAlchemy connection URL from a DatabaseConnection."""
         password = decrypt_password(connection.password_encrypted)
-        if connection.db_type == "mysql":
-            driver = "mysql+pymysql"
-        else:
-            driver = "postgresql+psycopg2"
+        if driver is None:
+            driver = "mysql+pymysql" if connection.db_type == "mysql" else "postgresql+psycopg2"
         # URL-encode password to handle special characters
-        from urllib.parse import quote_plus
         encoded_password = quote_plus(password)
         return f"{driver}://{connection.username}:{encoded_password}@{connection.host}:{connection.port}/{connection.database}"
 
@@ -142,6 +178,21 @@ class DatabaseConnector:
                 args["ssl"] = {"ssl": True}
         return args
 
+    def _native_uri(self, connection: DatabaseConnection) -> str:
+        """Build the URI for the native Arrow readers (ADBC / connectorx).
+
+        They open their own connections, bypassing the engine's connect
+        listeners, so PostgreSQL gets read-only and the statement timeout as
+        startup options instead (M4). MySQL has no equivalent; its queries
+        are generated or already passed validate_readonly_sql.
+        """
+        uri = self._build_url(connection, driver=connection.db_type)
+        if connection.db_type == "postgresql":
+            args = self._connect_args(connection)
+            options = f"{args['options']} -c default_transaction_read_only=on"
+            uri += "?" + urlencode({"sslmode": args["sslmode"], "options": options}, quote_via=quote)
+        return uri
+
     def get_engine(self, connection: DatabaseConnection) -> Engine:
         """Create or return cached SQLAlchemy engine with read-only enforcement."""
         if connection.id in self._engines:
@@ -151,7 +202,9 @@ class DatabaseConnector:
         connect_args = self._connect_args(connection)
 
         engine_kwargs: dict = {
-            "pool_size": 2,
+            # Up to db_extract_concurrency tables, each with up to
+            # db_extract_max_partitions cursors, extract at once
+            "pool_size": max(2, settings.db_extract_concurrency * settings.db_extract_max_partitions),
             "max_overflow": 1,
             "pool_timeout": 10,
             "pool_recycle": 300,
@@ -455,6 +508,27 @@ class DatabaseConnector:
             logger.warning("Row count estimate failed for %s.%s: %s", schema, table_name, e)
             return 0
 
+    @staticmethod
+    def _table_column_types(
+        engine: Engine, db_type: str, schema: Optional[str], table_name: str
+    ) -> Dict[str, str]:
+        """Introspected ``{column: data_type}`` for one table ({} on failure)."""
+        try:
+            with engine.connect() as conn:
+                if db_type != "postgresql" and not schema:
+                    schema = conn.execute(text("SELECT DATABASE()")).scalar()
+                rows = conn.execute(
+                    text(
+                        "SELECT column_name, data_type FROM information_schema.columns "
+                        "WHERE table_schema = :schema AND table_name = :table"
+                    ),
+                    {"schema": schema or "public", "table": table_name},
+                ).fetchall()
+            return {name: str(data_type).lower() for name, data_type in rows}
+        except Exception as e:
+            logger.warning("Column type lookup failed for %s.%s: %s", schema, table_name, e)
+            return {}
+
     def extract_table(
         self,
         connection: DatabaseConnection,
@@ -463,9 +537,21 @@ class DatabaseConnector:
         schema: Optional[str] = None,
         custom_sql: Optional[str] = None,
         row_limit: Optional[int] = None,
+        partitioned: bool = False,
     ) -> Path:
-        """Extract table data to a Parquet file. Returns path to parquet."""
+        """Extract table data to a Parquet file. Returns path to parquet.
+
+        ``partitioned`` splits a large table on a numeric/date key and runs
+        the range queries concurrently (see _extract_partitioned); tables
+        without a usable key, or too small to split, use one cursor.
+        """
         max_rows = settings.db_extract_max_rows
+        engine = self.get_engine(connection)
+        native_uri = self._native_uri(connection)
+        column_types: Dict[str, str] = {}
+
+        # Apply row limit (user-specified or system max)
+        effective_limit = min(row_limit, max_rows) if row_limit else max_rows
 
         if custom_sql:
             self.validate_readonly_sql(custom_sql)
@@ -476,164 +562,528 @@ class DatabaseConnector:
                 query = f'SELECT * FROM "{sch}"."{table_name}"'
             else:
                 query = f'SELECT * FROM `{table_name}`'
+            column_types = self._table_column_types(engine, connection.db_type, sch, table_name)
+
+            if partitioned:
+                path = self._extract_partitioned(
+                    connection, engine, query, sch, table_name, output_path,
+                    column_types, effective_limit, native_uri,
+                )
+                if path is not None:
+                    return path
 
-        # Apply row limit (user-specified or system max)
-        effective_limit = min(row_limit, max_rows) if row_limit else max_rows
         if effective_limit:
             query = f"SELECT * FROM ({query}) _sub LIMIT {effective_limit}"
 
-        engine = self.get_engine(connection)
-        return self._stream_to_parquet(engine, connection.db_type, query, output_path)
+        return self._stream_to_parquet(
+            engine, connection.db_type, query, output_path,
+            column_types=column_types, native_uri=native_uri,
+        )
 
-    def _stream_to_parquet(
-        self, engine: Engine, db_type: str, query: str, output_path: Path
-    ) -> Path:
-        """Execute query with server-side cursor, write Arrow batches to Parquet."""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        batch_size = 10_000
-        writer: Optional[pq.ParquetWriter] = None
-        total_rows = 0
+    # ------------------------------------------------------------------
+    # Partitioned range extraction
+    # ------------------------------------------------------------------
+
+    def _extract_partitioned(
+        self,
+        connection: DatabaseConnection,
+        engine: Engine,
+        query: str,
+        schema: Optional[str],
+        table_name: str,
+        output_path: Path,
+        column_types: Dict[str, str],
+        limit: Optional[int],
+        native_uri: Optional[str],
+    ) -> Optional[Path]:
+        """Extract ``query`` (a plain table SELECT) as concurrent key-range parts.
+
+        The partition count is the smallest of db_extract_max_partitions, the
+        engine's pool size and estimated rows (or the row limit, if smaller)
+        / db_extract_partition_min_rows. Each part is its own read-only
+        transaction, so the result is not one snapshot. With a row limit,
+        every part may return up to the whole limit, since key ranges are
+        rarely evenly filled; the combined file keeps the first ``limit``
+        rows. Returns None when the table should be extracted with a single
+        cursor instead.
+        """
+        key = self._partition_key(connection, engine, schema, table_name)
+        if key is None:
+            return None
+        column, estimated_rows = key
+        n = min(
+            settings.db_extract_max_partitions,
+            engine.pool.size(),
+            min(estimated_rows, limit or estimated_rows)
+            // max(settings.db_extract_partition_min_rows, 1),
+        )
+        if n < 2:
+            return None
+
+        quote = '"' if query.startswith('SELECT * FROM "') else "`"
+        quoted = f"{quote}{column}{quote}"
+        with engine.connect() as conn:
+            lo, hi = conn.execute(text(f"SELECT MIN({quoted}), MAX({quoted}) FROM ({query}) _t")).fetchone()
+        if lo is None:
+            return None
+        predicates = self._range_predicates(quoted, lo, hi, n)
+        if len(predicates) < 2:
+            return None
+
+        parts_dir = output_path.with_name(f".{output_path.name}.parts")
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        parts = [parts_dir / f"part-{i:04d}.parquet" for i in range(len(predicates))]
+        part_queries = [
+            f"{query} WHERE {predicate}" + (f" LIMIT {limit}" if limit else "")
+            for predicate in predicates
+        ]
+        logger.info(
+            "Extracting %s in %d partitions on %s (~%d rows)",
+            table_name, len(parts), column, estimated_rows,
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=len(parts), thread_name_prefix="db-extract") as pool:
+                list(pool.map(
+                    lambda args: self._stream_to_parquet(
+                        engine, connection.db_type, args[0], args[1],
+                        column_types=column_types, native_uri=native_uri,
+                    ),
+                    zip(part_queries, parts),
+                ))
+            self._combine_parts(parts, output_path, limit)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        return output_path
+
+    def _partition_key(
+        self,
+        connection: DatabaseConnection,
+        engine: Engine,
+        schema: Optional[str],
+        table_name: str,
+    ) -> Optional[Tuple[str, int]]:
+        """Pick ``(column, estimated_rows)``: a numeric/date primary key or indexed column."""
+        info = next(
+            (t for t in self.introspect_schema(connection, schema) if t.name == table_name), None,
+        )
+        if info is None:
+            return None
+        kinds = {c["name"]: _DB_TYPE_KINDS.get(str(c.get("type", "")).lower()) for c in info.columns}
+        pk_columns = (info.primary_key or {}).get("constrained_columns") or []
+        candidates = pk_columns[:1] + self._indexed_columns(
+            engine, connection.db_type, info.schema, table_name,
+        )
+        for column in candidates:
+            if kinds.get(column) in ("int", "date", "timestamp"):
+                return column, info.estimated_rows
+        return None
 
+    @staticmethod
+    def _indexed_columns(
+        engine: Engine, db_type: str, schema: Optional[str], table_name: str
+    ) -> List[str]:
+        """Leading columns of the table's indexes ([] on failure)."""
         try:
             with engine.connect() as conn:
-                result = conn.execution_options(stream_results=True).execute(text(query))
-                col_names = list(result.keys())
-
-                while True:
-                    rows = result.fetchmany(batch_size)
-                    if not rows:
-                        break
-
-                    # Convert rows to column-oriented dict for Arrow
-                    col_data: Dict[str, list] = {name: [] for name in col_names}
-                    for row in rows:
-                        for i, name in enumerate(col_names):
-                            col_data[name].append(row[i])
-
-                    # Build Arrow arrays with type mapping (M2)
-                    arrays = []
-                    fields = []
-                    for name in col_names:
-                        values = col_data[name]
-                        arr, field = self._to_arrow_column(name, values)
-                        if arr is not None:
-                            arrays.append(arr)
-                            fields.append(field)
-
-                    if not arrays:
-                        break
-
-                    arrow_schema = pa.schema(fields)
-                    batch = pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
-
-                    if writer is None:
-                        writer = pq.ParquetWriter(str(output_path), arrow_schema)
-                    writer.write_batch(batch)
-                    total_rows += len(rows)
+                if db_type == "postgresql":
+                    rows = conn.execute(
+                        text(
+                            "SELECT a.attname FROM pg_index i "
+                            "JOIN pg_class c ON c.oid = i.indrelid "
+                            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                            "JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = i.indkey[0] "
+                            "WHERE n.nspname = :schema AND c.relname = :table "
+                            "ORDER BY i.indisunique DESC"
+                        ),
+                        {"schema": schema or "public", "table": table_name},
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        text(
+                            "SELECT COLUMN_NAME FROM information_schema.STATISTICS "
+                            "WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table "
+                            "AND SEQ_IN_INDEX = 1 ORDER BY NON_UNIQUE"
+                        ),
+                        {"schema": schema or conn.execute(text("SELECT DATABASE()")).scalar(), "table": table_name},
+                    ).fetchall()
+            return [row[0] for row in rows]
+        except Exception as e:
+            logger.warning("Index lookup failed for %s.%s: %s", schema, table_name, e)
+            return []
+
+    @staticmethod
+    def _range_predicates(column: str, lo: Any, hi: Any, n: int) -> List[str]:
+        """Split ``[lo, hi]`` into up to ``n`` equal-width WHERE predicates.
 
+        The first part also takes NULL keys and the last is open-ended, so
+        every row falls in exactly one part.
+        """
+        import datetime as dt
+
+        if isinstance(lo, bool):
+            return []
+        if isinstance(lo, int):
+            cuts = [lo + (hi - lo + 1) * i // n for i in range(1, n)]
+        elif isinstance(lo, datetime):
+            cuts = [lo + (hi - lo) * i / n for i in range(1, n)]
+        elif isinstance(lo, dt.date):
+            cuts = [lo + dt.timedelta(days=(hi - lo).days * i // n) for i in range(1, n)]
+        else:
+            return []
+
+        def literal(value: Any) -> str:
+            if isinstance(value, int):
+                return str(value)
+            return f"'{value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()}'"
+
+        cuts = sorted({c for c in cuts if lo < c <= hi})
+        if not cuts:
+            return []
+        predicates = [f"({column} < {literal(cuts[0])} OR {column} IS NULL)"]
+        for low, high in zip(cuts, cuts[1:]):
+            predicates.append(f"{column} >= {literal(low)} AND {column} < {literal(high)}")
+        predicates.append(f"{column} >= {literal(cuts[-1])}")
+        return predicates
+
+    def _combine_parts(self, parts: List[Path], output_path: Path, limit: Optional[int]) -> int:
+        """Concatenate part files into ``output_path`` under one unified schema."""
+        files = [pq.ParquetFile(p) for p in parts if p.exists()]
+        files = [f for f in files if f.metadata.num_rows > 0 and f.schema_arrow.names != ["_empty"]]
+        arrow_schema = self._unify_part_schemas(files)
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            remaining = limit
+            for f in files:
+                for batch in f.iter_batches(batch_size=self.EXTRACT_BATCH_ROWS):
+                    if remaining is not None:
+                        batch = batch.slice(0, remaining)
+                        remaining -= batch.num_rows
+                    yield pa.RecordBatch.from_arrays(
+                        [
+                            batch.column(field.name).cast(field.type)
+                            if field.name in batch.schema.names
+                            else pa.nulls(batch.num_rows, type=field.type)
+                            for field in arrow_schema
+                        ],
+                        schema=arrow_schema,
+                    )
+                    if remaining == 0:
+                        return
+
+        partial = output_path.with_name(output_path.name + ".partial")
+        try:
+            total_rows = self._write_batches(batches(), partial)
+            if total_rows == 0:
+                empty_table = pa.table({"_empty": pa.array([], type=pa.string())})
+                pq.write_table(empty_table, str(partial))
+            os.replace(partial, output_path)
         finally:
-            if writer:
-                writer.close()
+            partial.unlink(missing_ok=True)
+        logger.info("Combined %d partitions (%d rows) into %s", len(parts), total_rows, output_path)
+        return total_rows
+
+    @staticmethod
+    def _unify_part_schemas(files: List[pq.ParquetFile]) -> pa.Schema:
+        """One schema across parts whose untyped columns were sniffed separately.
+
+        A part where a column is entirely NULL does not vote on its type;
+        columns whose types still disagree become strings.
+        """
+        first: Dict[str, pa.DataType] = {}
+        voted: Dict[str, List[pa.DataType]] = {}
+        for f in files:
+            meta = f.metadata
+            for j, field in enumerate(f.schema_arrow):
+                nulls = 0
+                for g in range(meta.num_row_groups):
+                    stats = meta.row_group(g).column(j).statistics
+                    nulls += stats.null_count if stats is not None and stats.has_null_count else 0
+                first.setdefault(field.name, field.type)
+                if nulls < meta.num_rows:
+                    voted.setdefault(field.name, []).append(field.type)
+        fields = []
+        for name, first_type in first.items():
+            types = set(voted.get(name, [first_type]))
+            fields.append(pa.field(name, types.pop() if len(types) == 1 else pa.string()))
+        return pa.schema(fields)
+
+    def _stream_to_parquet(
+        self,
+        engine: Engine,
+        db_type: str,
+        query: str,
+        output_path: Path,
+        column_types: Optional[Dict[str, str]] = None,
+        native_uri: Optional[str] = None,
+    ) -> Path:
+        """Execute query and write Arrow batches to a zstd-compressed Parquet file.
 
-        if total_rows == 0:
-            # Write an empty parquet so pipeline can still process
-            if not output_path.exists():
+        With ``native_uri`` and ADBC / connectorx importable, the driver builds
+        the Arrow batches itself; if that fails the DBAPI cursor path runs.
+        The cursor path fetches plain tuples from a server-side cursor and
+        fixes the schema once from ``cursor.description``, ``column_types``
+        (introspected data types) and the first batch.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = output_path.with_name(output_path.name + ".partial")
+        total_rows: Optional[int] = None
+
+        reader = self._native_reader(db_type) if native_uri else None
+        if reader and settings.db_extract_engine == "auto":
+            try:
+                batches = (
+                    self._conform_batch(b) for b in self._native_batches(reader, query, native_uri)
+                )
+                total_rows = self._write_batches(batches, partial)
+            except Exception as e:
+                logger.warning("%s extraction failed, falling back to DBAPI cursor: %s", reader, e)
+                partial.unlink(missing_ok=True)
+
+        try:
+            if total_rows is None:
+                total_rows = self._write_batches(
+                    self._cursor_batches(engine, query, column_types or {}), partial,
+                )
+            if total_rows == 0:
+                # Write an empty parquet so pipeline can still process
                 empty_table = pa.table({"_empty": pa.array([], type=pa.string())})
-                pq.write_table(empty_table, str(output_path))
+                pq.write_table(empty_table, str(partial))
+            os.replace(partial, output_path)
+        finally:
+            partial.unlink(missing_ok=True)
 
         logger.info("Extracted %d rows to %s", total_rows, output_path)
         return output_path
 
     @staticmethod
-    def _to_arrow_column(name: str, values: list):
-        """Convert a column's values to an Arrow array, applying type mapping (M2).
-
-        Returns (array, field) or (None, None) if the column should be skipped.
-        """
-        if not values:
-            arr = pa.array([], type=pa.string())
-            return arr, pa.field(name, pa.string())
+    def _write_batches(batches: Iterator[pa.RecordBatch], path: Path) -> int:
+        """Write batches to ``path``, one row group per ``parquet_row_group_size_mb``."""
+        writer: Optional[pq.ParquetWriter] = None
+        target_bytes = settings.parquet_row_group_size_mb * 1024 * 1024
+        pending: List[pa.RecordBatch] = []
+        pending_bytes = 0
+        total_rows = 0
+        try:
+            for batch in batches:
+                if writer is None:
+                    writer = pq.ParquetWriter(str(path), batch.schema, compression="zstd")
+                pending.append(batch)
+                pending_bytes += batch.nbytes
+                total_rows += batch.num_rows
+                if pending_bytes >= target_bytes:
+                    writer.write_table(pa.Table.from_batches(pending))
+                    pending, pending_bytes = [], 0
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending))
+        finally:
+            if writer:
+                writer.close()
+        return total_rows
 
-        # Sample first non-None value for type detection
-        sample = None
-        for v in values:
-            if v is not None:
-                sample = v
-                break
+    def _cursor_batches(
+        self, engine: Engine, query: str, column_types: Dict[str, str]
+    ) -> Iterator[pa.RecordBatch]:
+        """Yield RecordBatches built column-wise from raw DBAPI tuples."""
+        raw = engine.raw_connection()
+        try:
+            cursor = self._server_side_cursor(raw, engine.dialect.name)
+            try:
+                cursor.execute(query)
+                rows = cursor.fetchmany(self.EXTRACT_BATCH_ROWS)
+                # psycopg2 named cursors only fill description after a fetch
+                names = [d[0] for d in cursor.description or ()]
+                kinds: Optional[List[str]] = None
+                while rows:
+                    columns = list(zip(*rows))
+                    if kinds is None:
+                        kinds = self._column_kinds(names, columns, column_types)
+                        keep = [i for i, kind in enumerate(kinds) if kind != "skip"]
+                        if not keep:
+                            return
+                        arrow_schema = pa.schema(
+                            [pa.field(names[i], _KIND_ARROW_TYPES[kinds[i]]) for i in keep]
+                        )
+                    yield pa.RecordBatch.from_arrays(
+                        [self._column_array(kinds[i], columns[i]) for i in keep],
+                        schema=arrow_schema,
+                    )
+                    rows = cursor.fetchmany(self.EXTRACT_BATCH_ROWS)
+            finally:
+                cursor.close()
+        finally:
+            # Returning to the pool rolls back the read-only transaction
+            raw.close()
 
-        if sample is None:
-            arr = pa.array(values, type=pa.string())
-            return arr, pa.field(name, pa.string())
+    @staticmethod
+    def _server_side_cursor(raw, dialect: str):
+        """Open a cursor that streams rows instead of buffering the result set."""
+        if dialect == "postgresql":
+            return raw.cursor(name=f"vz_extract_{uuid.uuid4().hex[:12]}")
+        if dialect == "mysql":
+            import pymysql.cursors
+            return raw.cursor(pymysql.cursors.SSCursor)
+        return raw.cursor()
+
+    @classmethod
+    def _column_kinds(
+        cls, names: List[str], columns: List[Sequence], column_types: Dict[str, str]
+    ) -> List[str]:
+        """Resolve each column's kind from its data type, else its first value."""
+        kinds = []
+        for name, values in zip(names, columns):
+            data_type = column_types.get(name, "")
+            if data_type in _SKIP_TYPES:
+                kind = "skip"
+            else:
+                kind = _DB_TYPE_KINDS.get(data_type) or cls._value_kind(
+                    next((v for v in values if v is not None), None)
+                )
+            if kind == "skip":
+                logger.warning("Skipping binary column '%s'", name)
+            kinds.append(kind)
+        return kinds
 
-        type(sample).__name__.lower()
+    @staticmethod
+    def _value_kind(sample: Any) -> str:
+        """Column kind for a sample Python value (None → text)."""
+        import datetime as dt
+        import decimal
 
-        # Skip binary columns (M2: BYTEA/BLOB → skip)
         if isinstance(sample, (bytes, bytearray, memoryview)):
-            logger.warning("Skipping binary column '%s'", name)
-            return None, None
-
-        # Handle specific Python types
+            return "skip"
         if isinstance(sample, bool):
-            arr = pa.array(values, type=pa.bool_())
-            return arr, pa.field(name, pa.bool_())
-
+            return "bool"
         if isinstance(sample, int):
-            arr = pa.array(values, type=pa.int64())
-            return arr, pa.field(name, pa.int64())
-
+            return "int"
         if isinstance(sample, float):
-            arr = pa.array(values, type=pa.float64())
-            return arr, pa.field(name, pa.float64())
-
-        # DECIMAL/Numeric → FLOAT64 (M2)
-        import decimal
+            return "float"
         if isinstance(sample, decimal.Decimal):
-            float_values = [float(v) if v is not None else None for v in values]
-            arr = pa.array(float_values, type=pa.float64())
-            return arr, pa.field(name, pa.float64())
-
-        # datetime → timestamp (TIMESTAMPTZ → UTC per M2)
+            return "decimal"
         if isinstance(sample, datetime):
-            # Normalize to UTC
-            utc_values = []
-            for v in values:
-                if v is not None and isinstance(v, datetime):
-                    if v.tzinfo is not None:
-                        v = v.astimezone(timezone.utc).replace(tzinfo=None)
-                    utc_values.append(v)
-                else:
-                    utc_values.append(v)
-            arr = pa.array(utc_values, type=pa.timestamp("us"))
-            return arr, pa.field(name, pa.timestamp("us"))
-
-        import datetime as dt
+            return "timestamp"
         if isinstance(sample, dt.date):
-            arr = pa.array(values, type=pa.date32())
-            return arr, pa.field(name, pa.date32())
-
-        if isinstance(sample, dt.time):
-            str_values = [str(v) if v is not None else None for v in values]
-            arr = pa.array(str_values, type=pa.string())
-            return arr, pa.field(name, pa.string())
-
-        # UUID → TEXT (M2)
-        import uuid
-        if isinstance(sample, uuid.UUID):
-            str_values = [str(v) if v is not None else None for v in values]
-            arr = pa.array(str_values, type=pa.string())
-            return arr, pa.field(name, pa.string())
-
-        # JSONB, JSON, ARRAY, HSTORE, ENUM, unknown → TEXT (M2)
+            return "date"
         if isinstance(sample, (list, dict)):
-            import json
-            str_values = [json.dumps(v) if v is not None else None for v in values]
-            arr = pa.array(str_values, type=pa.string())
-            return arr, pa.field(name, pa.string())
+            return "json"
+        return "text"
+
+    @staticmethod
+    def _column_array(kind: str, values: Sequence) -> pa.Array:
+        """Build one column's Arrow array with the kind's explicit type (M2)."""
+        if kind == "decimal":
+            # DECIMAL/Numeric → FLOAT64: infer decimal128 in C, then cast
+            try:
+                return pa.array(values).cast(pa.float64())
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                return pa.array([float(v) if v is not None else None for v in values], type=pa.float64())
+        if kind == "timestamp":
+            # TIMESTAMPTZ → UTC; a driver returns a column either all-aware or all-naive
+            sample = next((v for v in values if v is not None), None)
+            if getattr(sample, "tzinfo", None) is not None:
+                values = [
+                    v.astimezone(timezone.utc).replace(tzinfo=None)
+                    if v is not None and v.tzinfo is not None else v
+                    for v in values
+                ]
+            return pa.array(values, type=pa.timestamp("us"))
+        if kind == "json":
+            return pa.array(
+                [v if v is None or isinstance(v, str) else json.dumps(v, default=str) for v in values],
+                type=pa.string(),
+            )
+        if kind == "text":
+            # TIME, UUID, ENUM, unknown → TEXT
+            try:
+                return pa.array(values, type=pa.string())
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                return pa.array([str(v) if v is not None else None for v in values], type=pa.string())
+        return pa.array(values, type=_KIND_ARROW_TYPES[kind])
+
+    @classmethod
+    def _to_arrow_column(cls, name: str, values: list):
+        """Convert a column's values to an Arrow array, applying type mapping (M2).
 
-        # Default: cast to string
-        str_values = [str(v) if v is not None else None for v in values]
-        arr = pa.array(str_values, type=pa.string())
-        return arr, pa.field(name, pa.string())
+        Returns (array, field) or (None, None) if the column should be skipped.
+        """
+        kind = cls._value_kind(next((v for v in values if v is not None), None))
+        if kind == "skip":
+            logger.warning("Skipping binary column '%s'", name)
+            return None, None
+        arr = cls._column_array(kind, values)
+        return arr, pa.field(name, arr.type)
+
+    @staticmethod
+    def _native_reader(db_type: str) -> Optional[str]:
+        """Name the importable native Arrow reader for ``db_type``, if any."""
+        if db_type == "postgresql":
+            try:
+                import adbc_driver_postgresql.dbapi  # noqa: F401
+                return "adbc"
+            except ImportError:
+                pass
+        if db_type in ("postgresql", "mysql"):
+            try:
+                import connectorx  # noqa: F401
+                return "connectorx"
+            except ImportError:
+                pass
+        return None
+
+    def _native_batches(self, reader: str, query: str, uri: str) -> Iterator[pa.RecordBatch]:
+        """Yield the driver's own Arrow batches for ``query``.
+
+        ADBC streams; connectorx materialises the result (bounded by
+        ``db_extract_max_rows``) and is then re-chunked.
+        """
+        if reader == "adbc":
+            import adbc_driver_postgresql.dbapi as adbc
+
+            with adbc.connect(uri) as conn, conn.cursor() as cursor:
+                cursor.execute(query)
+                yield from cursor.fetch_record_batch()
+        else:
+            import connectorx as cx
+
+            table = cx.read_sql(uri, query, return_type="arrow")
+            yield from table.to_batches(max_chunksize=self.EXTRACT_BATCH_ROWS)
+
+    @classmethod
+    def _conform_batch(cls, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """Map a native reader's Arrow types onto the extraction types (M2)."""
+        arrays, fields = [], []
+        for field, column in zip(batch.schema, batch.columns):
+            arr = cls._conform_array(field.name, column)
+            if arr is not None:
+                arrays.append(arr)
+                fields.append(pa.field(field.name, arr.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=pa.schema(fields))
+
+    @staticmethod
+    def _conform_array(name: str, arr: pa.Array) -> Optional[pa.Array]:
+        t = arr.type
+        if pa.types.is_binary(t) or pa.types.is_large_binary(t) or pa.types.is_fixed_size_binary(t):
+            logger.warning("Skipping binary column '%s'", name)
+            return None
+        if pa.types.is_boolean(t):
+            return arr
+        if pa.types.is_integer(t):
+            return arr.cast(pa.int64())
+        if pa.types.is_floating(t) or pa.types.is_decimal(t):
+            return arr.cast(pa.float64())
+        if pa.types.is_timestamp(t):
+            # Zoned timestamps drop the zone and keep their UTC values
+            return arr.cast(pa.timestamp("us"), safe=False)
+        if pa.types.is_date(t):
+            return arr.cast(pa.date32())
+        if pa.types.is_nested(t):
+            return pa.array(
+                [json.dumps(v, default=str) if v is not None else None for v in arr.to_pylist()],
+                type=pa.string(),
+            )
+        try:
+            return arr.cast(pa.string())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return pa.array([str(v) if v is not None else None for v in arr.to_pylist()], type=pa.string())
 
     @staticmethod
     def validate_readonly_sql(sql: str) -> None:
@@ -683,6 +1133,124 @@ class DatabaseConnector:
                     raise ValueError(f"Blocked SQL operation: {node_type}")
 
 
+class DirectQuery:
+    """One read-only query on its own pooled connection, cancellable from
+    another thread while it runs.
+
+    The database enforces ``timeout_s`` itself through a session statement
+    timeout. ``cancel`` stops the running statement server-side (psycopg2's
+    cancel request — what ``pg_cancel_backend`` does — ``KILL QUERY`` on
+    MySQL, ``interrupt()`` on SQLite), so a client-side timeout or a dropped
+    client doesn't leave it running on the database.
+
+    ``execute``, the fetches and ``close`` must run on the same thread;
+    only ``cancel`` is meant to be called from elsewhere.
+    """
+
+    def __init__(self, engine: Engine, sql: str, timeout_s: float):
+        self._engine = engine
+        self._sql = sql
+        self._timeout_ms = max(int(timeout_s * 1000), 1)
+        self._lock = threading.Lock()
+        self._conn: Optional[Connection] = None
+        self._result: Optional[CursorResult] = None
+        self._cancelled = False
+
+    def execute(self) -> CursorResult:
+        """Check out a connection, set the statement timeout and start the query."""
+        conn = self._engine.connect()
+        with self._lock:
+            self._conn = conn
+            if self._cancelled:
+                raise RuntimeError("Query cancelled")
+        dialect = self._engine.dialect.name
+        if dialect == "postgresql":
+            # LOCAL: reverts with the transaction when the connection returns to the pool
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {self._timeout_ms}")
+        elif dialect == "mysql":
+            conn.exec_driver_sql(f"SET SESSION MAX_EXECUTION_TIME = {self._timeout_ms}")
+        # Server-side cursor: PostgreSQL named cursor, PyMySQL SSCursor
+        self._result = conn.execute(text(self._sql), execution_options={"stream_results": True})
+        return self._result
+
+    def cancel(self) -> None:
+        """Stop the running statement on the server. Safe to call at any time."""
+        with self._lock:
+            self._cancelled = True
+            conn = self._conn
+        if conn is None or conn.closed:
+            return
+        dialect = self._engine.dialect.name
+        try:
+            driver_conn = conn.connection.driver_connection
+            if dialect == "postgresql":
+                driver_conn.cancel()
+            elif dialect == "mysql":
+                # KILL must come from another session; the target keeps its connection
+                with self._engine.connect() as killer:
+                    killer.exec_driver_sql(f"KILL QUERY {int(driver_conn.thread_id())}")
+            elif dialect == "sqlite":
+                driver_conn.interrupt()
+        except Exception as e:
+            logger.warning("Failed to cancel direct query: %s", e)
+
+    def close(self) -> None:
+        """Return the connection to the pool, or discard it after a cancel."""
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            if self._cancelled:
+                # Mid-result or in an aborted transaction: don't reuse it
+                conn.invalidate()
+            elif self._engine.dialect.name == "mysql":
+                if self._result is not None:
+                    self._result.close()
+                conn.exec_driver_sql("SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+        except Exception as e:
+            logger.warning("Discarding direct query connection: %s", e)
+            conn.invalidate()
+        finally:
+            conn.close()
+
+    def iter_chunks(self, fmt: str, batch_rows: int) -> Iterator[bytes]:
+        """Encode the started result as an Arrow IPC stream or NDJSON.
+
+        One chunk per ``fetchmany(batch_rows)``; column types come from the
+        first batch (M2), binary columns are dropped from Arrow output.
+        """
+        names = list(self._result.keys())
+        if fmt == "ndjson":
+            while True:
+                rows = self._result.fetchmany(batch_rows)
+                if not rows:
+                    return
+                yield "".join(
+                    json.dumps(dict(zip(names, row)), default=str) + "\n" for row in rows
+                ).encode("utf-8")
+
+        rows = self._result.fetchmany(batch_rows)
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        kinds = DatabaseConnector._column_kinds(names, columns, {})
+        keep = [i for i, kind in enumerate(kinds) if kind != "skip"]
+        schema = pa.schema([pa.field(names[i], _KIND_ARROW_TYPES[kinds[i]]) for i in keep])
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            while rows:
+                columns = list(zip(*rows))
+                writer.write_batch(pa.RecordBatch.from_arrays(
+                    [DatabaseConnector._column_array(kinds[i], columns[i]) for i in keep],
+                    schema=schema,
+                ))
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate(0)
+                rows = self._result.fetchmany(batch_rows)
+        # Remaining bytes: schema (for empty results) + end-of-stream marker
+        yield sink.getvalue()
+
+
 # Singleton
 _connector: Optional[DatabaseConnector] = None
 
@@ -1,7 +1,9 @@
 import duckdb
 import logging
 import re
+import uuid
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
@@ -14,6 +16,24 @@ from app.utils.sanitization import sql_quote_literal
 
 _log = logging.getLogger(__name__)
 
+# Rows sampled for the estimated in-memory size of a dataset
+MEMORY_SAMPLE_ROWS = 1000
+
+
+@dataclass
+class DatasetProfile:
+    """Statistics from one profiling pass over a dataset.
+
+    Column profiles, searchability, the memory estimate and the PII scan's
+    schema are all derived from this instead of re-reading the file.
+    ``row_count`` is exact when known without a full scan (Parquet footer,
+    or a file smaller than the profiling limit), otherwise ``None``.
+    """
+    columns: List[Dict[str, Any]]
+    column_profiles: List[Dict[str, Any]]
+    sample_bytes: Optional[int]
+    row_count: Optional[int] = None
+
 
 class DuckDBService:
     """DuckDB connection manager with production settings."""
@@ -74,19 +94,65 @@ class DuckDBService:
             return ext[1:]  # Remove the dot
         return None
     
-    def _register_excel(self, filepath: str) -> str:
-        """Read an Excel file via pandas and register it as a DuckDB view.
+    def _excel_parquet(self, filepath: str, sheet: Optional[str] = None) -> Path:
+        """Stream an Excel workbook (or one sheet) into a cached temp Parquet file.
 
-        Returns the view name to use in SQL queries.
+        The cache is keyed by path, mtime, size and sheet, so repeated reads
+        of an unchanged upload skip the conversion. Stale files are swept by
+        cleanup_dataset_temp like any other temp file.
+        """
+        import hashlib
+        import os
+
+        from app.services.streaming_processor import StreamingSpreadsheetProcessor
+
+        src = Path(filepath).resolve()
+        st = src.stat()
+        key = hashlib.sha1(
+            f"{src}\0{st.st_mtime_ns}\0{st.st_size}\0{sheet or ''}".encode()
+        ).hexdigest()[:24]
+        temp_dir = Path(settings.data_directory) / "temp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        dest = temp_dir / f"excel_{key}.parquet"
+        if dest.exists():
+            os.utime(dest)  # Keep it clear of the stale-file sweep
+            return dest
+
+        # Unique per call: threads of one process may convert the same workbook
+        partial = dest.with_name(f"{dest.name}.{uuid.uuid4().hex}.partial")
+        try:
+            with StreamingSpreadsheetProcessor(src) as processor:
+                processor.write_parquet(partial, sheet=sheet)
+            os.replace(partial, dest)
+        finally:
+            if partial.exists():
+                partial.unlink()
+        return dest
+
+    def _register_excel(self, filepath: str, sheet: Optional[str] = None) -> str:
+        """Register an Excel workbook (or one sheet) as a DuckDB view.
+
+        The workbook is streamed to Parquet (see _excel_parquet) rather than
+        loaded into a DataFrame. Without ``sheet``, several non-empty sheets
+        are unioned with a ``sheet`` column. Returns the view name to use in
+        SQL queries.
         """
         self._excel_view_counter += 1
         view_name = f"_excel_view_{self._excel_view_counter}"
-        ext = Path(filepath).suffix.lower()
-        engine = "xlrd" if ext == ".xls" else "openpyxl"
-        df = pd.read_excel(filepath, engine=engine)
-        self.connection.register(view_name, df)
+        parquet = sql_quote_literal(str(self._excel_parquet(filepath, sheet)))
+        self.connection.execute(
+            f"CREATE OR REPLACE TEMP VIEW {view_name} AS SELECT * FROM read_parquet('{parquet}')"
+        )
         return view_name
 
+    def register_excel_sheets(self, filepath: str) -> Dict[str, str]:
+        """Register every sheet of a workbook as its own view: {sheet name: view name}."""
+        from app.services.streaming_processor import StreamingSpreadsheetProcessor
+
+        with StreamingSpreadsheetProcessor(Path(filepath)) as processor:
+            sheets = processor.sheet_names
+        return {sheet: self._register_excel(filepath, sheet) for sheet in sheets}
+
     # Safety invariant: ALLOWED_READ_TYPES is the exhaustive set of file types
     # that may be interpolated into SQL via get_read_function(). The filepath is
     # always escaped via sql_quote_literal AND must originate from our controlled
@@ -97,7 +163,8 @@ class DuckDBService:
     def get_read_function(self, file_type: str, filepath: str) -> str:
         """Get the appropriate DuckDB read function for a file type.
 
-        For Excel files, registers via pandas and returns the view name.
+        For Excel files, registers a view over the streamed workbook and
+        returns the view name.
         For other types, returns the DuckDB reader function call with escaped path.
 
         The file_type MUST be in ALLOWED_READ_TYPES. The filepath MUST come from
@@ -250,7 +317,20 @@ class DuckDBService:
             for row in schema_result
         ]
 
-        result = {
+        result = self._build_file_metadata(filepath, file_type, row_count, columns)
+        self._metadata_cache[cache_key] = (mtime, result)
+        return result
+
+    @staticmethod
+    def _build_file_metadata(
+        filepath: Path,
+        file_type: str,
+        row_count: int,
+        columns: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Basic metadata dict for *filepath* from an already-known row count and schema."""
+        file_stat = filepath.stat()
+        return {
             "id": filepath.stem,
             "filename": filepath.name,
             "filepath": str(filepath),
@@ -263,9 +343,6 @@ class DuckDBService:
             "modified_at": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
             "status": "ready",
         }
-
-        self._metadata_cache[cache_key] = (mtime, result)
-        return result
     
     def get_dataset_by_id(self, dataset_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific dataset by its ID (filename without extension)."""
@@ -353,6 +430,15 @@ class DuckDBService:
         Args:
             max_rows: Maximum rows to scan for profiling (default 100,000).
         """
+        return self.profile_dataset(filepath, max_rows).column_profiles
+
+    def profile_dataset(self, filepath: Path, max_rows: int = 100_000) -> DatasetProfile:
+        """Profile *filepath* in one pass over its first *max_rows* rows.
+
+        The rows are read from the file once into a temp table; every column's
+        counts and min/max then come from a single aggregate over it, and the
+        sample-value and memory queries run against it instead of the file.
+        """
         file_type = self.detect_file_type(filepath)
         if not file_type:
             raise ValueError(f"Unsupported file type: {filepath.suffix}")
@@ -360,74 +446,99 @@ class DuckDBService:
         read_func = self.get_read_function(file_type, str(filepath))
         max_rows = int(max_rows)
 
-        # Use a row-limited subquery to avoid full-scanning huge files
-        source = f"(SELECT * FROM {read_func} LIMIT {max_rows})"
-
         # Get column names and types
         schema = self.connection.execute(f"DESCRIBE SELECT * FROM {read_func}").fetchall()
+        columns = [
+            {
+                "name": row[0],
+                "type": row[1],
+                "nullable": row[2] == "YES" if len(row) > 2 else True,
+            }
+            for row in schema
+        ]
 
-        profiles = []
-        for col_info in schema:
-            col_name = col_info[0]
-            col_type = col_info[1]
-
-            # Escape column name for SQL (double any embedded quotes)
-            safe_name = col_name.replace('"', '""')
-            escaped_col = f'"{safe_name}"'
-
-            # Get column statistics in a single query
-            stats_query = f"""
-                SELECT
-                    COUNT(*) as total_count,
-                    COUNT({escaped_col}) as non_null_count,
-                    COUNT(DISTINCT {escaped_col}) as distinct_count,
-                    MIN({escaped_col}::VARCHAR) as min_value,
-                    MAX({escaped_col}::VARCHAR) as max_value
-                FROM {source}
-            """
-            stats = self.connection.execute(stats_query).fetchone()
-
+        # Use a row-limited sample to avoid full-scanning huge files
+        sample = f"_profile_{uuid.uuid4().hex}"
+        self.connection.execute(
+            f"CREATE TEMP TABLE {sample} AS SELECT * FROM {read_func} LIMIT {max_rows}"
+        )
+        try:
+            escaped_cols = ['"{}"'.format(c["name"].replace('"', '""')) for c in columns]
+            aggregates = ["COUNT(*)"]
+            for escaped_col in escaped_cols:
+                aggregates += [
+                    f"COUNT({escaped_col})",
+                    f"COUNT(DISTINCT {escaped_col})",
+                    f"MIN({escaped_col}::VARCHAR)",
+                    f"MAX({escaped_col}::VARCHAR)",
+                ]
+            stats = self.connection.execute(
+                f"SELECT {', '.join(aggregates)} FROM {sample}"
+            ).fetchone()
             total_count = stats[0]
-            non_null_count = stats[1]
-            distinct_count = stats[2]
-            min_value = stats[3]
-            max_value = stats[4]
-
-            null_count = total_count - non_null_count
-            null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
-            uniqueness_ratio = (distinct_count / non_null_count) if non_null_count > 0 else 0
-
-            # Get sample values (up to 5 distinct non-null values)
-            sample_query = f"""
-                SELECT DISTINCT {escaped_col}::VARCHAR as val
-                FROM {source}
-                WHERE {escaped_col} IS NOT NULL
-                LIMIT 5
-            """
-            sample_result = self.connection.execute(sample_query).fetchall()
-            sample_values = [row[0] for row in sample_result]
-            
-            # Infer semantic type
-            semantic_type = self._infer_semantic_type(col_name, col_type, sample_values)
-            
-            profiles.append({
-                "name": col_name,
-                "type": col_type,
-                "semantic_type": semantic_type,
-                "total_count": total_count,
-                "non_null_count": non_null_count,
-                "null_count": null_count,
-                "null_percentage": round(null_percentage, 2),
-                "distinct_count": distinct_count,
-                "uniqueness_ratio": round(uniqueness_ratio, 4),
-                "is_unique": uniqueness_ratio == 1.0 and non_null_count > 0,
-                "is_potential_id": uniqueness_ratio > 0.95 and non_null_count > 0,
-                "min_value": min_value,
-                "max_value": max_value,
-                "sample_values": sample_values,
-            })
-        
-        return profiles
+
+            profiles = []
+            for i, (col, escaped_col) in enumerate(zip(columns, escaped_cols)):
+                non_null_count, distinct_count, min_value, max_value = stats[1 + 4 * i:5 + 4 * i]
+
+                null_count = total_count - non_null_count
+                null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
+                uniqueness_ratio = (distinct_count / non_null_count) if non_null_count > 0 else 0
+
+                # Get sample values (up to 5 distinct non-null values)
+                sample_result = self.connection.execute(f"""
+                    SELECT DISTINCT {escaped_col}::VARCHAR as val
+                    FROM {sample}
+                    WHERE {escaped_col} IS NOT NULL
+                    LIMIT 5
+                """).fetchall()
+                sample_values = [row[0] for row in sample_result]
+
+                # Infer semantic type
+                semantic_type = self._infer_semantic_type(col["name"], col["type"], sample_values)
+
+                profiles.append({
+                    "name": col["name"],
+                    "type": col["type"],
+                    "semantic_type": semantic_type,
+                    "total_count": total_count,
+                    "non_null_count": non_null_count,
+                    "null_count": null_count,
+                    "null_percentage": round(null_percentage, 2),
+                    "distinct_count": distinct_count,
+                    "uniqueness_ratio": round(uniqueness_ratio, 4),
+                    "is_unique": uniqueness_ratio == 1.0 and non_null_count > 0,
+                    "is_potential_id": uniqueness_ratio > 0.95 and non_null_count > 0,
+                    "min_value": min_value,
+                    "max_value": max_value,
+                    "sample_values": sample_values,
+                })
+
+            # Approximate in-memory size of the first rows
+            try:
+                mem_result = self.connection.execute(f"""
+                    SELECT SUM(LENGTH(t.*::VARCHAR)) as total_bytes
+                    FROM (SELECT * FROM {sample} LIMIT {MEMORY_SAMPLE_ROWS}) t
+                """).fetchone()
+                sample_bytes = int(mem_result[0]) if mem_result and mem_result[0] else 0
+            except Exception:
+                sample_bytes = None
+        finally:
+            self.connection.execute(f"DROP TABLE IF EXISTS {sample}")
+
+        if file_type == "parquet":
+            row_count = pq.ParquetFile(str(filepath)).metadata.num_rows
+        elif total_count < max_rows:
+            row_count = total_count
+        else:
+            row_count = None
+
+        return DatasetProfile(
+            columns=columns,
+            column_profiles=profiles,
+            sample_bytes=sample_bytes,
+            row_count=row_count,
+        )
 
     def _infer_semantic_type(
         self, 
@@ -497,12 +608,19 @@ class DuckDBService:
         
         return "unknown"
 
-    def calculate_searchability_score(self, filepath: Path) -> Dict[str, Any]:
+    def calculate_searchability_score(
+        self,
+        filepath: Path,
+        profiles: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         """
         Calculate a searchability score (0-100) indicating how well the dataset can be searched.
         Higher scores mean better semantic search potential.
+
+        Pass already-computed column *profiles* to score without re-profiling.
         """
-        profiles = self.get_column_profile(filepath)
+        if profiles is None:
+            profiles = self.get_column_profile(filepath)
         
         score = 0
         max_score = 100
@@ -587,39 +705,43 @@ class DuckDBService:
             "factors": factors,
         }
 
-    def get_enhanced_metadata(self, filepath: Path) -> Dict[str, Any]:
+    def get_enhanced_metadata(
+        self,
+        filepath: Path,
+        profile_source: Optional[Path] = None,
+    ) -> Dict[str, Any]:
         """
         Get comprehensive metadata including basic info, column profiles, and searchability.
+
+        Args:
+            profile_source: A Parquet copy of *filepath* (e.g. the pipeline's
+                processed.parquet) to compute statistics from instead of
+                re-reading *filepath*; its footer supplies the row count.
         """
+        profile = self.profile_dataset(profile_source or filepath)
+
         # Basic metadata
-        basic = self.get_file_metadata(filepath)
-        
-        # Column profiles
-        profiles = self.get_column_profile(filepath)
-        
+        if profile_source is not None and profile.row_count is not None:
+            basic = self._build_file_metadata(
+                filepath, self.detect_file_type(filepath), profile.row_count, profile.columns,
+            )
+        else:
+            basic = self.get_file_metadata(filepath)
+
         # Searchability score
-        searchability = self.calculate_searchability_score(filepath)
-        
+        searchability = self.calculate_searchability_score(filepath, profiles=profile.column_profiles)
+
         # Calculate estimated memory size (rough estimate)
-        file_type = self.detect_file_type(filepath)
-        read_func = self.get_read_function(file_type, str(filepath))
-        
-        # Get approximate memory usage
-        try:
-            mem_query = f"""
-                SELECT
-                    SUM(LENGTH(t.*::VARCHAR)) as total_bytes
-                FROM (SELECT * FROM {read_func} LIMIT 1000) t
-            """
-            mem_result = self.connection.execute(mem_query).fetchone()
-            sample_bytes = mem_result[0] if mem_result and mem_result[0] else 0
-            estimated_memory_bytes = int(sample_bytes * basic['row_count'] / 1000) if basic['row_count'] > 1000 else sample_bytes
-        except Exception:
+        if profile.sample_bytes is None:
             estimated_memory_bytes = basic.get('size_bytes', 0)
-        
+        elif basic['row_count'] > MEMORY_SAMPLE_ROWS:
+            estimated_memory_bytes = int(profile.sample_bytes * basic['row_count'] / MEMORY_SAMPLE_ROWS)
+        else:
+            estimated_memory_bytes = profile.sample_bytes
+
         return {
             **basic,
-            "column_profiles": profiles,
+            "column_profiles": profile.column_profiles,
             "searchability": searchability,
             "estimated_memory_bytes": estimated_memory_bytes,
             "estimated_memory_mb": round(estimated_memory_bytes / (1024 * 1024), 2),
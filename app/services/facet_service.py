@@ -2,14 +2,25 @@
 Faceted Metadata Filter Service (BQ-VZ-HYBRID-SEARCH Phase 1A)
 ==============================================================
 Pre-computes facet counts on dataset ingest for fast filtering.
-Stores aggregated JSON at /data/facets.json, rebuilt on dataset add/remove.
+
+Each dataset contributes one bucket per facet. Contributions are applied
+as deltas when a dataset becomes ready, its PII scan or quality scorecard
+changes, or it is deleted; the aggregate counts live in memory and are
+persisted (with the contributions) at /data/facets.json. rebuild_facets()
+recomputes everything from scratch and is the reference for the deltas.
+
+Several uvicorn workers share facets.json: each reloads its copy when the
+file changes on disk, and deltas are applied under an exclusive file lock.
 """
 
+import fcntl
 import json
 import logging
+import os
 import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Iterator, Optional, Dict, Any, Tuple
 
 from app.config import settings
 
@@ -17,6 +28,9 @@ logger = logging.getLogger(__name__)
 
 _facets_lock = threading.Lock()
 
+FACET_NAMES = ("file_type", "column_count", "row_count_bucket", "has_pii", "quality_score_bucket")
+MAX_FACET_VALUES = 50  # High-cardinality facets keep their top 50 values
+
 
 def _facets_path() -> Path:
     return Path(settings.data_directory) / "facets.json"
@@ -50,88 +64,212 @@ def _bucket_quality_score(score: Optional[float]) -> str:
     return "poor"
 
 
-def rebuild_facets() -> Dict[str, Any]:
-    """
-    Rebuild facet counts from all datasets.
-
-    Scans /data/processed/*/pipeline_status.json and sketch_profile.json
-    to compute facet counts. Async-safe, <5s for 100 datasets.
-    """
-    from app.services.processing_service import get_processing_service
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, inode, size) of *path*, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
 
-    processing = get_processing_service()
-    records = processing.list_datasets()
 
-    facets: Dict[str, Dict[str, int]] = {
-        "file_type": {},
-        "column_count": {},
-        "row_count_bucket": {},
-        "has_pii": {"true": 0, "false": 0},
-        "quality_score_bucket": {},
-    }
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception:
+        return None
 
-    for record in records:
-        # file_type facet
-        ft = record.file_type or "unknown"
-        facets["file_type"][ft] = facets["file_type"].get(ft, 0) + 1
 
-        # Parse metadata_json for column_count and row_count
+def _dataset_contribution(record) -> Dict[str, str]:
+    """The bucket one dataset adds to each facet."""
+    # column_count / row_count: in-memory records carry a ``metadata`` dict,
+    # DB rows the serialized ``metadata_json``
+    meta = getattr(record, "metadata", None)
+    if not isinstance(meta, dict):
         meta = {}
-        if record.metadata_json:
+        raw = getattr(record, "metadata_json", None)
+        if raw:
             try:
-                meta = json.loads(record.metadata_json) if isinstance(record.metadata_json, str) else record.metadata_json
+                meta = json.loads(raw) if isinstance(raw, str) else raw
             except (json.JSONDecodeError, TypeError):
                 pass
+        if not isinstance(meta, dict):
+            meta = {}
+
+    contribution = {"file_type": record.file_type or "unknown"}
 
-        # column_count facet
-        col_count = meta.get("column_count")
-        if col_count is not None:
-            bucket = str(col_count) if col_count <= 20 else "20+"
-            facets["column_count"][bucket] = facets["column_count"].get(bucket, 0) + 1
+    col_count = meta.get("column_count")
+    if col_count is not None:
+        contribution["column_count"] = str(col_count) if col_count <= 20 else "20+"
 
-        # row_count_bucket facet
-        row_count = meta.get("row_count")
-        bucket = _bucket_row_count(row_count)
-        facets["row_count_bucket"][bucket] = facets["row_count_bucket"].get(bucket, 0) + 1
+    contribution["row_count_bucket"] = _bucket_row_count(meta.get("row_count"))
 
-        # has_pii facet - check pii_scan.json
-        dataset_dir = Path(settings.processed_directory) / record.id
-        pii_path = dataset_dir / "pii_scan.json"
+    dataset_dir = Path(settings.processed_directory) / record.id
+    pii_data = _load_json(dataset_dir / "pii_scan.json") or {}
+    try:
+        has_pii = pii_data.get("total_pii_findings", 0) > 0
+    except TypeError:
         has_pii = False
-        if pii_path.exists():
-            try:
-                with open(pii_path) as f:
-                    pii_data = json.load(f)
-                has_pii = pii_data.get("total_pii_findings", 0) > 0
-            except Exception:
-                pass
-        facets["has_pii"]["true" if has_pii else "false"] += 1
+    contribution["has_pii"] = "true" if has_pii else "false"
 
-        # quality_score_bucket facet - check quality_scorecard.json
-        quality_path = dataset_dir / "quality_scorecard.json"
-        quality_score = None
-        if quality_path.exists():
-            try:
-                with open(quality_path) as f:
-                    quality_data = json.load(f)
-                quality_score = quality_data.get("overall_score")
-            except Exception:
-                pass
-        bucket = _bucket_quality_score(quality_score)
-        facets["quality_score_bucket"][bucket] = facets["quality_score_bucket"].get(bucket, 0) + 1
-
-    # For high-cardinality facets, keep top 50
-    for key in facets:
-        if len(facets[key]) > 50:
-            sorted_items = sorted(facets[key].items(), key=lambda x: x[1], reverse=True)[:50]
-            facets[key] = dict(sorted_items)
-
-    # Persist
-    facets_file = _facets_path()
-    facets_file.parent.mkdir(parents=True, exist_ok=True)
-    with _facets_lock:
-        with open(facets_file, "w") as f:
-            json.dump(facets, f, indent=2)
+    quality_data = _load_json(dataset_dir / "quality_scorecard.json") or {}
+    contribution["quality_score_bucket"] = _bucket_quality_score(quality_data.get("overall_score"))
+    return contribution
+
+
+class FacetIndex:
+    """In-memory facet counts maintained from per-dataset contributions."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Signature of facets.json as last loaded or saved by this process
+        self.signature: Optional[Tuple[int, int, int]] = None
+        self.contributions: Dict[str, Dict[str, str]] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._view: Optional[Dict[str, Dict[str, int]]] = None
+        self.reset({})
+
+    def reset(self, contributions: Dict[str, Dict[str, str]]) -> None:
+        self.contributions = {}
+        self.counts = {name: {} for name in FACET_NAMES}
+        self.counts["has_pii"] = {"true": 0, "false": 0}
+        for dataset_id, contribution in contributions.items():
+            self._add(dataset_id, contribution)
+        self._view = None
+
+    def _add(self, dataset_id: str, contribution: Dict[str, str]) -> None:
+        self.contributions[dataset_id] = contribution
+        for facet, value in contribution.items():
+            bucket = self.counts.setdefault(facet, {})
+            bucket[value] = bucket.get(value, 0) + 1
+
+    def _subtract(self, dataset_id: str) -> None:
+        for facet, value in self.contributions.pop(dataset_id, {}).items():
+            bucket = self.counts.get(facet, {})
+            bucket[value] = bucket.get(value, 0) - 1
+            if bucket[value] <= 0 and facet != "has_pii":
+                del bucket[value]
+
+    def apply(self, dataset_id: str, contribution: Optional[Dict[str, str]]) -> bool:
+        """Replace one dataset's contribution (None removes it). Returns True if changed."""
+        if self.contributions.get(dataset_id) == contribution:
+            return False
+        self._subtract(dataset_id)
+        if contribution is not None:
+            self._add(dataset_id, contribution)
+        self._view = None
+        return True
+
+    def view(self) -> Dict[str, Dict[str, int]]:
+        """Facet counts as served to clients (top values of wide facets only)."""
+        if self._view is None:
+            view = {}
+            for facet, bucket in self.counts.items():
+                if len(bucket) > MAX_FACET_VALUES:
+                    bucket = dict(sorted(bucket.items(), key=lambda x: x[1], reverse=True)[:MAX_FACET_VALUES])
+                view[facet] = dict(bucket)
+            self._view = view
+        return self._view
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"facets": self.view(), "contributions": self.contributions}, f, indent=2)
+        os.replace(tmp, self.path)
+        self.signature = _signature(self.path)
+
+    @classmethod
+    def load(cls, path: Path) -> "FacetIndex":
+        index = cls(path)
+        index.signature = _signature(path)
+        data = _load_json(path)
+        if isinstance(data, dict) and isinstance(data.get("contributions"), dict):
+            index.reset(data["contributions"])
+        elif data:
+            # Pre-delta facets.json (counts only): serve it while a one-off
+            # rebuild recovers the per-dataset contributions
+            index._view = data
+            rebuild_facets_async()
+        return index
+
+
+_index: Optional[FacetIndex] = None
+
+
+def _get_index() -> FacetIndex:
+    """The index for the current data directory, reloaded if facets.json changed
+    since this process last read or wrote it (caller holds _facets_lock)."""
+    global _index
+    path = _facets_path()
+    if _index is None or _index.path != path or _index.signature != _signature(path):
+        _index = FacetIndex.load(path)
+    return _index
+
+
+@contextmanager
+def _locked_index() -> Iterator[FacetIndex]:
+    """The current index, held exclusively across processes for a read-modify-write."""
+    path = _facets_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _facets_lock, open(path.with_name(path.name + ".lock"), "w") as lock_f:
+        fcntl.flock(lock_f, fcntl.LOCK_EX)
+        try:
+            yield _get_index()
+        finally:
+            fcntl.flock(lock_f, fcntl.LOCK_UN)
+
+
+def update_dataset_facets(dataset_id: str, record=None) -> None:
+    """Re-derive one dataset's contribution (after processing, PII scan or scoring)."""
+    if record is None:
+        from app.services.processing_service import get_processing_service
+        record = get_processing_service().get_dataset(dataset_id)
+    contribution = _dataset_contribution(record) if record is not None else None
+    with _locked_index() as index:
+        if index.apply(dataset_id, contribution):
+            index.save()
+
+
+def update_dataset_facets_async(dataset_id: str, record=None) -> None:
+    """Apply one dataset's facet delta in a background thread."""
+    def _run():
+        try:
+            update_dataset_facets(dataset_id, record)
+        except Exception as e:
+            logger.warning("Facet update failed for %s: %s", dataset_id, e)
+
+    threading.Thread(target=_run, daemon=True, name="facet-update").start()
+
+
+def remove_dataset_facets(dataset_id: str) -> None:
+    """Drop a deleted dataset's contribution."""
+    with _locked_index() as index:
+        if index.apply(dataset_id, None):
+            index.save()
+
+
+def rebuild_facets() -> Dict[str, Any]:
+    """
+    Rebuild facet counts from all datasets.
+
+    Reads every dataset's metadata, pii_scan.json and quality_scorecard.json
+    — O(datasets) file I/O, so only used for recovery and upgrades; normal
+    changes go through update_dataset_facets / remove_dataset_facets.
+    """
+    from app.services.processing_service import get_processing_service
+
+    processing = get_processing_service()
+    records = processing.list_datasets()
+    contributions = {record.id: _dataset_contribution(record) for record in records}
+
+    with _locked_index() as index:
+        index.reset(contributions)
+        index.save()
+        facets = index.view()
 
     logger.info("Facets rebuilt: %d datasets", len(records))
     return facets
@@ -145,13 +283,11 @@ def rebuild_facets_async() -> None:
 
 def get_facets() -> Dict[str, Any]:
     """Get cached facet counts. Returns empty if not yet computed."""
-    facets_file = _facets_path()
-    if not facets_file.exists():
-        return {}
-
     try:
         with _facets_lock:
-            with open(facets_file) as f:
-                return json.load(f)
+            index = _get_index()
+            if not index.contributions and not index.path.exists():
+                return {}
+            return index.view()
     except Exception:
         return {}
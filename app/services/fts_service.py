@@ -3,104 +3,396 @@ Full-Text Search Service (BQ-VZ-HYBRID-SEARCH Phase 1A)
 =======================================================
 DuckDB FTS for structured data BM25 search.
 Creates persistent FTS indexes per dataset in background.
+
+BQ-VZ-PERF: Index state (status + source-Parquet fingerprint) is persisted in
+``fts_state.json`` next to ``fts.duckdb`` so it survives restarts, and a build
+is skipped when the source is unchanged. Builds run in a bounded worker pool,
+write to a temp database and are swapped in atomically, so readers never
+open a half-built index.
+
+BQ-VZ-PERF: Searches borrow read-only connections from a per-dataset pool
+(idle connections are evicted after ``fts_pool_idle_s`` and whenever the
+index file is swapped), bind the query text as a parameter instead of
+splicing it into the SQL, and fan out across datasets in a bounded pool
+for global search.
 """
 
+import hashlib
+import json
 import logging
+import os
 import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 import duckdb
 
 from app.config import settings
+from app.utils.sanitization import sql_quote_literal
 
 logger = logging.getLogger(__name__)
 
+FTS_DB_NAME = "fts.duckdb"
+FTS_STATE_NAME = "fts_state.json"
 
-# Track FTS index status per dataset
+# Track FTS index status per dataset (write-through cache of fts_state.json)
 _fts_status: Dict[str, str] = {}  # dataset_id -> "building" | "ready" | "unavailable"
 _fts_lock = threading.Lock()
 
+# Bounded build pool + in-flight builds (one per dataset)
+_build_pool: Optional[ThreadPoolExecutor] = None
+_pending_builds: Dict[str, Future] = {}
+
+# Query fan-out pool for multi-dataset searches
+_search_pool: Optional[ThreadPoolExecutor] = None
+
+_BM25_SQL = """
+    SELECT rowid, *, fts_main_data.match_bm25(rowid, ?) AS score
+    FROM data
+    WHERE score IS NOT NULL
+    ORDER BY score DESC
+    LIMIT ?
+"""
+
 
 def _get_fts_db_path(dataset_id: str) -> Path:
     """Get the path to the FTS DuckDB database for a dataset."""
-    return Path(settings.processed_directory) / dataset_id / "fts.duckdb"
+    return Path(settings.processed_directory) / dataset_id / FTS_DB_NAME
+
+
+def _get_fts_state_path(dataset_id: str) -> Path:
+    """Get the path to the persisted FTS state for a dataset."""
+    return Path(settings.processed_directory) / dataset_id / FTS_STATE_NAME
+
+
+def _source_fingerprint(parquet_path: Path) -> str:
+    """Cheap identity of the source Parquet: path, size and mtime."""
+    st = Path(parquet_path).stat()
+    raw = f"{Path(parquet_path).resolve()}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _read_state(dataset_id: str) -> Dict[str, Any]:
+    """Load the persisted state, or {} if missing/corrupt."""
+    try:
+        return json.loads(_get_fts_state_path(dataset_id).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(dataset_id: str, state: Dict[str, Any]) -> None:
+    """Persist state atomically (temp file + os.replace)."""
+    path = _get_fts_state_path(dataset_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{FTS_STATE_NAME}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, path)
+
+
+def _load_status(dataset_id: str) -> str:
+    """Status from disk: "ready" only if the state says so and the index exists."""
+    state = _read_state(dataset_id)
+    if state.get("status") == "ready" and _get_fts_db_path(dataset_id).exists():
+        return "ready"
+    return "unavailable"
 
 
 def get_fts_status(dataset_id: str) -> str:
     """Get the FTS index status for a dataset."""
     with _fts_lock:
-        return _fts_status.get(dataset_id, "unavailable")
+        status = _fts_status.get(dataset_id)
+    if status is None:
+        status = _load_status(dataset_id)
+        with _fts_lock:
+            status = _fts_status.setdefault(dataset_id, status)
+    return status
+
 
+def _get_build_pool() -> ThreadPoolExecutor:
+    global _build_pool
+    with _fts_lock:
+        if _build_pool is None:
+            _build_pool = ThreadPoolExecutor(
+                max_workers=max(1, int(settings.fts_build_workers)),
+                thread_name_prefix="fts-build",
+            )
+        return _build_pool
 
-def build_fts_index(dataset_id: str, parquet_path: Path) -> None:
+
+def build_fts_index(dataset_id: str, parquet_path: Path, force: bool = False) -> Optional[Future]:
     """
-    Build FTS index for a dataset in a background thread.
+    Build FTS index for a dataset in the background build pool.
 
     Creates a persistent DuckDB database with FTS extension and indexes
-    all text-like columns for BM25 search.
+    all text-like columns for BM25 search. Skipped when the persisted state
+    for the same source fingerprint shows a ready index, or that the source
+    has no text columns to index (unless ``force``). Returns the build
+    future, or None when skipped.
     """
+    fingerprint = _source_fingerprint(parquet_path)
+    if not force:
+        state = _read_state(dataset_id)
+        if state.get("source_fingerprint") == fingerprint and (
+            (state.get("status") == "ready" and _get_fts_db_path(dataset_id).exists())
+            or (state.get("status") == "unavailable" and state.get("reason") == "no_text_columns")
+        ):
+            with _fts_lock:
+                _fts_status[dataset_id] = state["status"]
+            logger.info("FTS index for dataset %s is up to date — skipping rebuild", dataset_id)
+            return None
+
+    pool = _get_build_pool()
+    with _fts_lock:
+        pending = _pending_builds.get(dataset_id)
+        if pending is not None and not pending.done():
+            return pending
+        # Keep serving an existing index while the replacement builds
+        if _fts_status.get(dataset_id) != "ready":
+            _fts_status[dataset_id] = "building"
+        future = pool.submit(_build, dataset_id, Path(parquet_path), fingerprint)
+        _pending_builds[dataset_id] = future
+    future.add_done_callback(lambda f: _forget_pending(dataset_id, f))
+    return future
+
+
+def _forget_pending(dataset_id: str, future: Future) -> None:
+    with _fts_lock:
+        if _pending_builds.get(dataset_id) is future:
+            del _pending_builds[dataset_id]
+
+
+def _set_status(dataset_id: str, status: str, **extra: Any) -> None:
+    state = {"status": status, "updated_at": datetime.now(timezone.utc).isoformat(), **extra}
+    try:
+        _write_state(dataset_id, state)
+    except OSError as e:
+        logger.warning("Could not persist FTS state for %s: %s", dataset_id, e)
     with _fts_lock:
-        _fts_status[dataset_id] = "building"
+        _fts_status[dataset_id] = status
+
+
+def _build(dataset_id: str, parquet_path: Path, fingerprint: str) -> None:
+    """Build into a temp database, then atomically swap it into place."""
+    fts_db_path = _get_fts_db_path(dataset_id)
+    tmp_path = fts_db_path.with_name(f".{FTS_DB_NAME}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        fts_db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def _build():
+        con = duckdb.connect(str(tmp_path))
         try:
-            fts_db_path = _get_fts_db_path(dataset_id)
-            fts_db_path.parent.mkdir(parents=True, exist_ok=True)
+            con.execute("INSTALL fts")
+            con.execute("LOAD fts")
 
-            # Remove existing FTS db if present
-            if fts_db_path.exists():
-                fts_db_path.unlink()
+            # Import data from parquet
+            escaped = sql_quote_literal(str(parquet_path))
+            con.execute(
+                f"CREATE TABLE data AS SELECT * FROM read_parquet('{escaped}')"
+            )
 
-            con = duckdb.connect(str(fts_db_path))
-            try:
-                con.execute("INSTALL fts")
-                con.execute("LOAD fts")
-
-                # Import data from parquet
-                con.execute(
-                    f"CREATE TABLE data AS SELECT * FROM read_parquet('{parquet_path}')"
-                )
-
-                # Detect text columns (VARCHAR type)
-                cols = con.execute(
-                    "SELECT column_name, data_type FROM information_schema.columns "
-                    "WHERE table_name = 'data'"
-                ).fetchall()
-
-                text_cols = [
-                    c[0] for c in cols
-                    if "VARCHAR" in c[1].upper() or "TEXT" in c[1].upper()
-                ]
-
-                if not text_cols:
-                    logger.info("No text columns found for FTS in dataset %s", dataset_id)
-                    with _fts_lock:
-                        _fts_status[dataset_id] = "unavailable"
-                    return
-
-                # Create FTS index on all text columns
-                col_list = ", ".join(f"'{c}'" for c in text_cols)
-                con.execute(
-                    f"PRAGMA create_fts_index('data', 'rowid', {col_list})"
-                )
-
-                with _fts_lock:
-                    _fts_status[dataset_id] = "ready"
-                logger.info(
-                    "FTS index ready for dataset %s (%d text columns)",
-                    dataset_id, len(text_cols),
-                )
-            finally:
-                con.close()
-
-        except Exception as e:
-            logger.error("FTS index build failed for %s: %s", dataset_id, e, exc_info=True)
+            # Detect text columns (VARCHAR type)
+            cols = con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = 'data'"
+            ).fetchall()
+
+            text_cols = [
+                c[0] for c in cols
+                if "VARCHAR" in c[1].upper() or "TEXT" in c[1].upper()
+            ]
+
+            if not text_cols:
+                logger.info("No text columns found for FTS in dataset %s", dataset_id)
+                _set_status(dataset_id, "unavailable", source_fingerprint=fingerprint,
+                            reason="no_text_columns")
+                return
+
+            # Create FTS index on all text columns
+            col_list = ", ".join(f"'{sql_quote_literal(c)}'" for c in text_cols)
+            con.execute(
+                f"PRAGMA create_fts_index('data', 'rowid', {col_list})"
+            )
+            con.execute("CHECKPOINT")
+        finally:
+            con.close()
+
+        # Atomic swap: open read-only handles keep the old file until closed
+        os.replace(tmp_path, fts_db_path)
+        if _reader_pool is not None:
+            _reader_pool.invalidate(dataset_id)
+        _set_status(
+            dataset_id, "ready",
+            source_fingerprint=fingerprint,
+            text_columns=text_cols,
+            built_at=datetime.now(timezone.utc).isoformat(),
+        )
+        logger.info(
+            "FTS index ready for dataset %s (%d text columns)",
+            dataset_id, len(text_cols),
+        )
+
+    except Exception as e:
+        logger.error("FTS index build failed for %s: %s", dataset_id, e, exc_info=True)
+        # A previous index (if any) is still intact and consistent with its state
+        if _load_status(dataset_id) != "ready":
+            _set_status(dataset_id, "unavailable", reason="build_failed")
+        else:
             with _fts_lock:
-                _fts_status[dataset_id] = "unavailable"
+                _fts_status[dataset_id] = "ready"
+    finally:
+        for leftover in (tmp_path, tmp_path.with_name(tmp_path.name + ".wal")):
+            try:
+                leftover.unlink()
+            except FileNotFoundError:
+                pass
 
-    thread = threading.Thread(target=_build, daemon=True, name=f"fts-{dataset_id}")
-    thread.start()
+
+def _index_identity(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, size, mtime_ns) of an index file; changes on every swap."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _open_reader(fts_db_path: Path) -> duckdb.DuckDBPyConnection:
+    """Open a read-only search connection on an FTS index.
+
+    The index is ATTACHed to a private in-memory database rather than opened
+    with ``duckdb.connect(path)``: DuckDB caches database instances by path,
+    so after an atomic swap a plain connect would keep returning the old
+    index for as long as any pooled connection to it is alive.
+    """
+    con = duckdb.connect()
+    try:
+        con.execute("LOAD fts")
+        escaped = sql_quote_literal(str(fts_db_path))
+        con.execute(f"ATTACH '{escaped}' AS fts_index (READ_ONLY)")
+        con.execute("USE fts_index")
+    except Exception:
+        con.close()
+        raise
+    return con
+
+
+class FTSReaderPool:
+    """
+    Idle read-only FTS connections, pooled per dataset.
+
+    A connection is checked out for exactly one query at a time. Idle
+    connections are kept up to ``max_idle`` per dataset and closed once they
+    have been idle for ``idle_s`` seconds or the index file they were opened
+    on has been replaced (detected by file identity, so a swap by another
+    process is noticed too).
+    """
+
+    def __init__(self, max_idle: int, idle_s: float):
+        self.max_idle = max_idle
+        self.idle_s = idle_s
+        self._lock = threading.Lock()
+        # dataset_id -> (index identity, [(conn, returned_at), ...])
+        self._idle: Dict[str, Tuple[Tuple[int, int, int], List[Tuple[Any, float]]]] = {}
+        self._stats = {"opened": 0, "reused": 0, "evicted": 0}
+
+    def acquire(self, dataset_id: str, fts_db_path: Path) -> Tuple[Any, Tuple[int, int, int]]:
+        """Return ``(conn, identity)``; pass both back to ``release``."""
+        identity = _index_identity(fts_db_path)
+        if identity is None:
+            raise FileNotFoundError(str(fts_db_path))
+        stale: List[Any] = []
+        conn = None
+        with self._lock:
+            entry = self._idle.get(dataset_id)
+            if entry is not None and entry[0] != identity:
+                stale.extend(c for c, _ in entry[1])
+                del self._idle[dataset_id]
+            elif entry is not None and entry[1]:
+                conn = entry[1].pop()[0]
+                self._stats["reused"] += 1
+            stale.extend(self._sweep_locked())
+        self._close_all(stale)
+        if conn is None:
+            conn = _open_reader(fts_db_path)
+            with self._lock:
+                self._stats["opened"] += 1
+        return conn, identity
+
+    def release(self, dataset_id: str, conn: Any, identity: Tuple[int, int, int], healthy: bool = True) -> None:
+        """Return a connection; it is closed instead if stale, broken or surplus."""
+        keep = False
+        if healthy:
+            with self._lock:
+                entry = self._idle.setdefault(dataset_id, (identity, []))
+                if entry[0] == identity and len(entry[1]) < self.max_idle:
+                    entry[1].append((conn, time.monotonic()))
+                    keep = True
+        if not keep:
+            self._close_all([conn])
+
+    def invalidate(self, dataset_id: str) -> None:
+        """Close all idle connections for a dataset (e.g. after a rebuild)."""
+        with self._lock:
+            entry = self._idle.pop(dataset_id, None)
+        if entry is not None:
+            self._close_all([c for c, _ in entry[1]])
+
+    def sweep(self) -> int:
+        """Close connections idle for longer than ``idle_s``. Returns the count."""
+        with self._lock:
+            stale = self._sweep_locked()
+        self._close_all(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            entries, self._idle = list(self._idle.values()), {}
+        self._close_all([c for _, conns in entries for c, _ in conns])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(conns) for _, conns in self._idle.values())
+            return {**self._stats, "idle": idle}
+
+    def _sweep_locked(self) -> List[Any]:
+        cutoff = time.monotonic() - self.idle_s
+        stale: List[Any] = []
+        for dataset_id in list(self._idle):
+            identity, conns = self._idle[dataset_id]
+            fresh = [(c, t) for c, t in conns if t >= cutoff]
+            stale.extend(c for c, t in conns if t < cutoff)
+            if fresh:
+                self._idle[dataset_id] = (identity, fresh)
+            else:
+                del self._idle[dataset_id]
+        self._stats["evicted"] += len(stale)
+        return stale
+
+    @staticmethod
+    def _close_all(conns: Iterable[Any]) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_reader_pool: Optional[FTSReaderPool] = None
+
+
+def get_fts_reader_pool() -> FTSReaderPool:
+    """Get the process-wide FTS reader pool."""
+    global _reader_pool
+    with _fts_lock:
+        if _reader_pool is None:
+            _reader_pool = FTSReaderPool(
+                max_idle=max(1, int(settings.fts_pool_max_idle)),
+                idle_s=float(settings.fts_pool_idle_s),
+            )
+        return _reader_pool
 
 
 def search_fts(
@@ -121,35 +413,60 @@ def search_fts(
     if not fts_db_path.exists():
         return []
 
+    pool = get_fts_reader_pool()
     try:
-        con = duckdb.connect(str(fts_db_path), read_only=True)
-        try:
-            con.execute("LOAD fts")
+        con, identity = pool.acquire(dataset_id, fts_db_path)
+    except Exception as e:
+        logger.warning("FTS search failed for dataset %s: %s", dataset_id, e)
+        return []
+
+    healthy = True
+    try:
+        result = con.execute(_BM25_SQL, [query, int(limit)])
+        col_names = [desc[0] for desc in result.description]
+        return [dict(zip(col_names, row)) for row in result.fetchall()]
+    except Exception as e:
+        healthy = False
+        logger.warning("FTS search failed for dataset %s: %s", dataset_id, e)
+        return []
+    finally:
+        pool.release(dataset_id, con, identity, healthy=healthy)
 
-            # Use the FTS match_bm25 function
-            safe_query = query.replace("'", "''")
-            result = con.execute(
-                f"""
-                SELECT *, fts_main_data.match_bm25(rowid, '{safe_query}') AS score
-                FROM data
-                WHERE score IS NOT NULL
-                ORDER BY score DESC
-                LIMIT {int(limit)}
-                """
-            ).fetchall()
 
-            # Get column names
-            col_names = [desc[0] for desc in con.description]
+def _get_search_pool() -> ThreadPoolExecutor:
+    global _search_pool
+    with _fts_lock:
+        if _search_pool is None:
+            _search_pool = ThreadPoolExecutor(
+                max_workers=max(1, int(settings.fts_search_workers)),
+                thread_name_prefix="fts-search",
+            )
+        return _search_pool
 
-            rows = []
-            for row in result:
-                row_dict = dict(zip(col_names, row))
-                rows.append(row_dict)
 
-            return rows
-        finally:
-            con.close()
+def search_fts_many(
+    query: str,
+    dataset_ids: List[str],
+    limit: int = 20,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    BM25 search across several datasets in parallel.
 
-    except Exception as e:
-        logger.warning("FTS search failed for dataset %s: %s", dataset_id, e)
-        return []
+    Returns ``{dataset_id: rows}`` for datasets with a ready index and at
+    least one match; each row list is ranked by that dataset's BM25 score.
+    """
+    ready = [d for d in dict.fromkeys(dataset_ids) if get_fts_status(d) == "ready"]
+    if not ready:
+        return {}
+    if len(ready) == 1:
+        rows = search_fts(query, ready[0], limit=limit)
+        return {ready[0]: rows} if rows else {}
+
+    pool = _get_search_pool()
+    futures = {d: pool.submit(search_fts, query, d, limit) for d in ready}
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for dataset_id, future in futures.items():
+        rows = future.result()  # search_fts never raises
+        if rows:
+            results[dataset_id] = rows
+    return results
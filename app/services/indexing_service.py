@@ -172,6 +172,9 @@ class IndexingService:
                 payloads=payloads,
             )
 
+        # Cached rerank scores refer to the previous index
+        self._invalidate_rerank_cache(dataset_id)
+
         # Trigger FTS index build in background
         self._trigger_fts_build(dataset_id, filepath)
 
@@ -200,6 +203,12 @@ class IndexingService:
         except Exception as e:
             logger.warning("FTS index build trigger failed for %s: %s", dataset_id, e)
 
+    @staticmethod
+    def _invalidate_rerank_cache(dataset_id: str) -> None:
+        """Drop cached cross-encoder scores for a re-indexed dataset."""
+        from app.services.reranker_service import invalidate_rerank_cache
+        invalidate_rerank_cache(dataset_id)
+
     def _detect_text_columns(self, filepath: Path) -> List[str]:
         """
         Auto-detect columns suitable for text search.
@@ -379,6 +388,8 @@ class IndexingService:
             if progress_callback:
                 progress_callback(total_indexed)
 
+        self._invalidate_rerank_cache(dataset_id)
+
         end_time = datetime.utcnow()
         duration = (end_time - start_time).total_seconds()
 
@@ -459,6 +470,7 @@ class IndexingService:
     def delete_dataset_index(self, dataset_id: str) -> bool:
         """Delete the vector index for a dataset."""
         collection_name = f"dataset_{dataset_id}"
+        self._invalidate_rerank_cache(dataset_id)
         return self.qdrant_service.delete_collection(collection_name)
     
     def get_index_status(self, dataset_id: str) -> Dict[str, Any]:
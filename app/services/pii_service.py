@@ -10,7 +10,7 @@ Updated: January 19, 2026 - Added privacy_score calculation
 Updated: February 7, 2026 - Added per-column PII config persistence (BQ-065)
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 import json
@@ -359,12 +359,17 @@ class PIIService:
         self,
         filepath: Path,
         sample_size: int = DEFAULT_SAMPLE_SIZE,
+        columns: Optional[List[Tuple[str, str]]] = None,
+        total_rows: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Column-aware structured PII scan.
 
         Uses the Presidio analyzer on each column with type-aware heuristics.
         Applies configurable score thresholds and excluded patterns from settings.
         Sensor IDs and similar domain-specific patterns are excluded by default.
+
+        Callers that already profiled *filepath* pass its ``(name, type)``
+        *columns* and *total_rows* so only the sample is read from the file.
         """
         pii_settings = self.get_pii_settings()
         threshold = pii_settings.get("score_threshold", DEFAULT_SCORE_THRESHOLD)
@@ -382,15 +387,17 @@ class PIIService:
                 raise ValueError(f"Unsupported file type: {filepath.suffix}")
             read_func = duckdb.get_read_function(file_type, str(filepath))
 
-            schema = duckdb.connection.execute(
-                f"DESCRIBE SELECT * FROM {read_func}"
-            ).fetchall()
-            columns = [(row[0], row[1]) for row in schema]
-
-            count_result = duckdb.connection.execute(
-                f"SELECT COUNT(*) FROM {read_func}"
-            ).fetchone()
-            total_rows = count_result[0] if count_result else 0
+            if columns is None:
+                schema = duckdb.connection.execute(
+                    f"DESCRIBE SELECT * FROM {read_func}"
+                ).fetchall()
+                columns = [(row[0], row[1]) for row in schema]
+
+            if total_rows is None:
+                count_result = duckdb.connection.execute(
+                    f"SELECT COUNT(*) FROM {read_func}"
+                ).fetchone()
+                total_rows = count_result[0] if count_result else 0
 
             sample_query = (
                 f"SELECT * FROM {read_func} "
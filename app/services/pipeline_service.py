@@ -3,6 +3,8 @@ Pipeline Orchestration Service for vectorAIz
 =============================================
 BQ-088: Orchestrates the full data processing pipeline.
 BQ-117: Pipeline robustness — validate steps, atomic status, canonical status field.
+BQ-VZ-PERF: Single analysis pass — Parquet inputs reused, profile shared by all steps.
+BQ-VZ-PERF: In-memory status store with coalesced, durable snapshots.
 
 - DuckDB analyze/process
 - PII scan
@@ -12,19 +14,27 @@ BQ-117: Pipeline robustness — validate steps, atomic status, canonical status
 
 Features progress tracking, graceful degradation, and per-step status.
 """
+import asyncio
+import copy
 import fcntl
 import json
 import logging
 import os
+import shutil
 import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
+import pyarrow.parquet as pq
+
 from app.config import settings
 from app.services.duckdb_service import ephemeral_duckdb_service
 from app.services.pii_service import get_pii_service
 from app.services.compliance_service import get_compliance_service
+from app.services.facet_service import update_dataset_facets_async
 from app.services.attestation_service import get_attestation_service
 from app.services.listing_metadata_service import get_listing_metadata_service
 from app.services.sketch_service import get_sketch_service
@@ -50,6 +60,12 @@ PIPELINE_FAILED = "failed"
 FULL_PIPELINE_STEPS = ["analyze_process", "pii_scan", "compliance_check"]
 EXTENDED_PIPELINE_STEPS = ["duckdb_analysis", "sketch_profile", "pii_scan", "quality_check", "compliance_report", "attestation", "listing_metadata"]
 
+# Overall statuses after which a pipeline makes no further transitions
+TERMINAL_PIPELINE_STATUSES = frozenset({PIPELINE_SUCCESS, PIPELINE_PARTIAL, PIPELINE_FAILED})
+
+# Longest a non-terminal transition waits in memory before reaching disk
+STATUS_FLUSH_INTERVAL_S = 0.5
+
 
 def _atomic_write_json(path: Path, data: dict) -> None:
     """Write JSON to *path* atomically using temp-file + os.replace, with flock."""
@@ -107,6 +123,189 @@ def _read_modify_write_json(path: Path, modifier) -> dict:
             fcntl.flock(lock_f, fcntl.LOCK_UN)
 
 
+class PipelineStatusStore:
+    """Authoritative pipeline state in memory, snapshotted to disk in batches.
+
+    Each transition mutates the dataset's state in memory and bumps its
+    version; a flusher thread writes every dirty dataset's latest snapshot
+    at most once per ``flush_interval_s``, so a burst of step updates costs
+    one fsynced write. Terminal statuses are written through immediately.
+
+    Only pipelines this process is running are served from memory. Any
+    other status file (written by another worker, or left by a run before
+    a restart) is read from its snapshot, and re-read whenever the file
+    changes on disk. A finished pipeline is dropped from memory once its
+    terminal snapshot has been written.
+
+    States are keyed by status-file path.
+    """
+
+    def __init__(self, flush_interval_s: float = STATUS_FLUSH_INTERVAL_S):
+        self._flush_interval_s = flush_interval_s
+        self._states: Dict[Path, Dict[str, Any]] = {}
+        # Paths this process writes; everything else is a cached snapshot
+        self._owned: set = set()
+        # (mtime_ns, inode, size) of each cached snapshot when it was read
+        self._signatures: Dict[Path, tuple] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        # Serialises disk writes so an older snapshot never replaces a newer one
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Current state for *path*, (re)read from its snapshot unless owned. Lock held."""
+        if path in self._owned:
+            return self._states[path]
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._states.pop(path, None)
+            self._signatures.pop(path, None)
+            return None
+        signature = (st.st_mtime_ns, st.st_ino, st.st_size)
+        state = self._states.get(path)
+        if state is None or self._signatures.get(path) != signature:
+            state = _read_json_locked(path)
+            state.setdefault("version", 0)
+            self._states[path] = state
+            self._signatures[path] = signature
+        return state
+
+    def get(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Copy of the current state, or None if no pipeline has run.
+
+        Raises ``json.JSONDecodeError`` / ``OSError`` for an unreadable snapshot.
+        """
+        with self._lock:
+            state = self._load(path)
+            return copy.deepcopy(state) if state is not None else None
+
+    def exists(self, path: Path) -> bool:
+        with self._lock:
+            return path in self._owned or path.exists()
+
+    def put(self, path: Path, state: Dict[str, Any], durable: bool = False) -> None:
+        """Replace the state for *path* (e.g. a fresh pipeline run)."""
+        def _replace(current: Dict[str, Any]) -> None:
+            current.clear()
+            current.update(state)
+
+        self.update(path, _replace, durable)
+
+    def update(self, path: Path, modifier, durable: bool = False) -> Dict[str, Any]:
+        """Apply *modifier* to the state in place and bump its version.
+
+        The change reaches disk with the next batch, or before returning
+        when *durable*. Returns a copy of the new state.
+        """
+        with self._lock:
+            try:
+                state = self._load(path)
+            except (json.JSONDecodeError, OSError):
+                state = None
+            if state is None:
+                state = self._states[path] = {}
+            self._owned.add(path)
+            self._signatures.pop(path, None)
+            version = state.get("version", 0)
+            modifier(state)
+            state["version"] = version + 1
+            self._dirty.add(path)
+            result = copy.deepcopy(state)
+            if not durable and not self._closed:
+                self._ensure_flusher()
+                self._wake.notify()
+        if durable or self._closed:
+            self.flush(path)
+        return result
+
+    def flush(self, path: Optional[Path] = None) -> None:
+        """Write the latest snapshot of *path* (or of every dirty state) to disk."""
+        with self._flush_lock:
+            with self._lock:
+                paths = [path] if path is not None else list(self._dirty)
+                snapshots = []
+                for p in paths:
+                    if p in self._dirty:
+                        self._dirty.discard(p)
+                        snapshots.append((p, copy.deepcopy(self._states[p])))
+            for p, snapshot in snapshots:
+                try:
+                    _atomic_write_json(p, snapshot)
+                except OSError as e:
+                    logger.warning("Pipeline status snapshot failed for %s: %s", p, e)
+                    with self._lock:
+                        self._dirty.add(p)
+                    continue
+                if snapshot.get("status") in TERMINAL_PIPELINE_STATUSES:
+                    self._release(p, snapshot["version"])
+
+    def _release(self, path: Path, version: int) -> None:
+        """Forget a finished pipeline whose snapshot on disk is current."""
+        with self._lock:
+            state = self._states.get(path)
+            if (
+                path in self._owned
+                and path not in self._dirty
+                and state is not None
+                and state.get("version") == version
+            ):
+                self._owned.discard(path)
+                del self._states[path]
+
+    def close(self) -> None:
+        """Stop the flusher and write every pending snapshot."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """Start the flusher thread on first use. Lock held."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="pipeline-status", daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+            # Let the transitions of the next interval pile up, then write once
+            time.sleep(self._flush_interval_s)
+            self.flush()
+
+
+_status_store: Optional[PipelineStatusStore] = None
+_status_store_lock = threading.Lock()
+
+
+def get_pipeline_status_store() -> PipelineStatusStore:
+    """Get the process-wide PipelineStatusStore."""
+    global _status_store
+    if _status_store is None:
+        with _status_store_lock:
+            if _status_store is None:
+                _status_store = PipelineStatusStore()
+    return _status_store
+
+
+def flush_pipeline_status() -> None:
+    """Write pending pipeline status snapshots (called on shutdown)."""
+    if _status_store is not None:
+        _status_store.close()
+
+
 class PipelineService:
     """Orchestrates the multi-step data processing pipeline."""
 
@@ -154,7 +353,7 @@ class PipelineService:
             },
         }
 
-        _atomic_write_json(self._status_file(dataset_id), state)
+        get_pipeline_status_store().put(self._status_file(dataset_id), state)
         logger.info("Pipeline state initialized for %s with steps: %s", dataset_id, steps)
         return state
 
@@ -165,10 +364,11 @@ class PipelineService:
         status: str,
         error_message: Optional[str] = None,
     ):
-        """Update a single step's status in the pipeline state file (atomic RMW)."""
+        """Update a single step's status in the pipeline status store."""
         status_file = self._status_file(dataset_id)
+        store = get_pipeline_status_store()
 
-        if not status_file.exists():
+        if not store.exists(status_file):
             self._init_pipeline_state(dataset_id, FULL_PIPELINE_STEPS)
 
         now = datetime.now(timezone.utc).isoformat()
@@ -195,13 +395,11 @@ class PipelineService:
 
             state["updated_at"] = now
 
-        _read_modify_write_json(status_file, _modify)
+        store.update(status_file, _modify)
         logger.info("Pipeline step '%s' for %s: %s", step_name, dataset_id, status)
 
     def _update_status(self, dataset_id: str, status: str, message: str, data: Dict[str, Any] = None):
-        """Updates the pipeline status file (overall status and message) atomically."""
-        dataset_dir = self._get_dataset_dir(dataset_id)
-        dataset_dir.mkdir(parents=True, exist_ok=True)
+        """Updates the overall status and message; terminal statuses are written through."""
         status_file = self._status_file(dataset_id)
 
         now = datetime.now(timezone.utc).isoformat()
@@ -215,7 +413,9 @@ class PipelineService:
             if data:
                 state.update(data)
 
-        _read_modify_write_json(status_file, _modify)
+        get_pipeline_status_store().update(
+            status_file, _modify, durable=status in TERMINAL_PIPELINE_STATUSES,
+        )
         logger.info("Pipeline status for %s: %s - %s", dataset_id, status, message)
 
     def _compute_overall_status(self, steps: Dict[str, Any]) -> str:
@@ -252,7 +452,8 @@ class PipelineService:
 
         Uses ``duckdb_service.get_read_function`` to pick the right reader
         (read_csv_auto, read_json_auto, read_parquet, or pandas-Excel) instead
-        of blindly assuming parquet.
+        of blindly assuming parquet. A valid Parquet input (DB and streaming
+        extractions) is reused as-is instead of being rewritten.
 
         Raises on failure so the caller can mark the step as failed.
         """
@@ -261,6 +462,9 @@ class PipelineService:
             if not file_type:
                 raise ValueError(f"Unsupported file type: {filepath.suffix}")
 
+            if file_type == "parquet" and self._reuse_parquet(filepath, output_path):
+                return
+
             read_func = duckdb.get_read_function(file_type, str(filepath))
             escaped_output = sql_quote_literal(str(output_path))
 
@@ -269,6 +473,50 @@ class PipelineService:
                 f"TO '{escaped_output}' (FORMAT PARQUET, COMPRESSION ZSTD)"
             )
 
+    @staticmethod
+    def _reuse_parquet(filepath: Path, output_path: Path) -> bool:
+        """Hard-link (or copy) a readable Parquet *filepath* to *output_path*.
+
+        Returns False when the footer can't be read or has no columns, so the
+        caller falls back to rewriting the file through DuckDB.
+        """
+        try:
+            if pq.ParquetFile(str(filepath)).metadata.num_columns == 0:
+                return False
+        except Exception as e:
+            logger.warning("Parquet input %s is not reusable, rewriting: %s", filepath, e)
+            return False
+
+        if output_path.exists():
+            if os.path.samefile(filepath, output_path):
+                return True
+            output_path.unlink()
+        try:
+            os.link(filepath, output_path)
+        except OSError:
+            # Different filesystem (or no hard-link support): plain byte copy
+            shutil.copyfile(filepath, output_path)
+        return True
+
+    def _analyze_and_process(self, filepath: Path, dataset_dir: Path, processed_parquet_path: Path) -> Dict[str, Any]:
+        """Step 1 body: write a validated processed.parquet, then analysis.json.
+
+        The analysis is profiled from processed.parquet, so the raw file is
+        read once; the returned metadata feeds the PII step.
+        """
+        # Generate processed parquet using correct reader per file type
+        self._generate_processed_parquet(filepath, processed_parquet_path)
+
+        # BQ-117: Validate output exists and is non-empty
+        self._validate_parquet(processed_parquet_path)
+
+        with ephemeral_duckdb_service() as duckdb:
+            metadata = duckdb.get_enhanced_metadata(filepath, profile_source=processed_parquet_path)
+
+        # Save analysis output
+        _atomic_write_json(dataset_dir / "analysis.json", metadata)
+        return metadata
+
     @staticmethod
     def _validate_parquet(path: Path) -> None:
         """Assert *path* exists and is non-empty. Raises ``RuntimeError`` on failure."""
@@ -316,17 +564,10 @@ class PipelineService:
         self._set_step_status(dataset_id, "analyze_process", STEP_RUNNING)
         try:
             self._update_status(dataset_id, PIPELINE_RUNNING, "Step 1/3: Analyzing and processing dataset...")
-            with ephemeral_duckdb_service() as duckdb:
-                metadata = duckdb.get_enhanced_metadata(filepath)
-
-            # Save analysis output
-            _atomic_write_json(dataset_dir / "analysis.json", metadata)
-
-            # Generate processed parquet using correct reader per file type
-            self._generate_processed_parquet(filepath, processed_parquet_path)
-
-            # BQ-117: Validate output exists and is non-empty
-            self._validate_parquet(processed_parquet_path)
+            # DuckDB work runs off the event loop so concurrent pipelines overlap
+            analysis = await asyncio.to_thread(
+                self._analyze_and_process, filepath, dataset_dir, processed_parquet_path,
+            )
 
             self._set_step_status(dataset_id, "analyze_process", STEP_SUCCESS)
         except Exception as e:
@@ -344,8 +585,13 @@ class PipelineService:
         self._set_step_status(dataset_id, "pii_scan", STEP_RUNNING)
         try:
             self._update_status(dataset_id, PIPELINE_RUNNING, "Step 2/3: Scanning for PII...")
-            scan_target = processed_parquet_path if processed_parquet_path.exists() else filepath
-            pii_scan_result = self.pii_service.scan_structured(scan_target)
+            # Schema and row count come from the step 1 profile of processed.parquet
+            pii_scan_result = await asyncio.to_thread(
+                self.pii_service.scan_structured,
+                processed_parquet_path,
+                columns=[(c["name"], c["type"]) for c in analysis["columns"]],
+                total_rows=analysis["row_count"],
+            )
 
             _atomic_write_json(pii_scan_path, pii_scan_result)
             self._set_step_status(dataset_id, "pii_scan", STEP_SUCCESS)
@@ -363,13 +609,16 @@ class PipelineService:
             }
             _atomic_write_json(pii_scan_path, pii_scan_result)
             logger.info("Wrote empty PII results for %s to allow compliance step", dataset_id)
+        update_dataset_facets_async(dataset_id)
 
         # ---- Step 3: Compliance Check ----
         compliance_report_path = dataset_dir / "compliance_report.json"
         self._set_step_status(dataset_id, "compliance_check", STEP_RUNNING)
         try:
             self._update_status(dataset_id, PIPELINE_RUNNING, "Step 3/3: Running compliance check...")
-            compliance_report = await self.compliance_service.generate_compliance_report(dataset_id)
+            compliance_report = await self.compliance_service.generate_compliance_report(
+                dataset_id, pii_results=pii_scan_result,
+            )
 
             report_data = (
                 compliance_report.model_dump()
@@ -408,24 +657,23 @@ class PipelineService:
                 - output_files: dict of file_type -> path (if exists)
         """
         dataset_dir = self._get_dataset_dir(dataset_id)
-        status_file = self._status_file(dataset_id)
 
-        if not status_file.exists():
+        try:
+            state = get_pipeline_status_store().get(self._status_file(dataset_id))
+        except (json.JSONDecodeError, OSError):
             return {
                 "dataset_id": dataset_id,
                 "status": PIPELINE_FAILED,
-                "message": "No pipeline run found for this dataset.",
+                "message": "Could not read pipeline status file.",
                 "steps": {},
                 "output_files": {},
             }
 
-        try:
-            state = _read_json_locked(status_file)
-        except (json.JSONDecodeError, OSError):
+        if state is None:
             return {
                 "dataset_id": dataset_id,
                 "status": PIPELINE_FAILED,
-                "message": "Could not read pipeline status file.",
+                "message": "No pipeline run found for this dataset.",
                 "steps": {},
                 "output_files": {},
             }
@@ -513,8 +761,13 @@ class PipelineService:
         self._set_step_status(dataset_id, "pii_scan", STEP_RUNNING)
         try:
             self._update_status(dataset_id, PIPELINE_RUNNING, f"Step 3/{total_steps}: Scanning for PII...")
-            pii_scan_result = self.pii_service.scan_structured(filepath)
+            pii_scan_result = self.pii_service.scan_structured(
+                filepath,
+                columns=[(c["name"], c["type"]) for c in metadata["columns"]],
+                total_rows=metadata["row_count"],
+            )
             _atomic_write_json(dataset_dir / "pii_scan.json", pii_scan_result)
+            update_dataset_facets_async(dataset_id)
             self._set_step_status(dataset_id, "pii_scan", STEP_SUCCESS)
         except Exception as e:
             logger.error("PII scan failed for %s: %s", dataset_id, e, exc_info=True)
@@ -27,7 +27,7 @@ from dataclasses import asdict
 from multiprocessing import Queue
 from multiprocessing.connection import Connection
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 # Use spawn to avoid inheriting the parent's event loop and open file descriptors.
 # Fork inherits the parent's uvicorn event loop state which can cause deadlocks.
@@ -93,12 +93,46 @@ def _set_memory_limit(limit_mb: int) -> None:
     )
 
 
+def _descendants(pid: int, known: Sequence["psutil.Process"] = ()) -> List["psutil.Process"]:
+    """Every process below the worker (e.g. its extraction pool).
+
+    Processes from an earlier snapshot (*known*) are kept, so a pool is
+    still found after the worker that spawned it has exited.
+    """
+    procs = {p.pid: p for p in known}
+    try:
+        for child in psutil.Process(pid).children(recursive=True):
+            procs.setdefault(child.pid, child)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        pass
+    return list(procs.values())
+
+
+def _signal_tree(pid: int, children: Sequence["psutil.Process"], sig: int) -> bool:
+    """Send *sig* to the worker's *children*, then the worker.
+
+    Children go first so none is orphaned by a worker that dies at once.
+    Returns False if the worker is already gone.
+    """
+    for child in children:
+        try:
+            child.send_signal(sig)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    try:
+        os.kill(pid, sig)
+    except OSError:
+        return False
+    return True
+
+
 class MemoryMonitor:
     """Monitors a worker subprocess RSS from the parent process.
 
     Runs in a daemon thread; polls RSS every ``poll_interval_s`` seconds.
     If RSS exceeds ``limit_mb * 2`` → SIGTERM.  If still alive after
-    ``grace_s`` seconds → SIGKILL.  Logs the high-water mark on stop.
+    ``grace_s`` seconds → SIGKILL.  Both go to the worker's child processes
+    first, then the worker.  Logs the high-water mark on stop.
     """
 
     def __init__(
@@ -144,12 +178,14 @@ class MemoryMonitor:
             return
 
         sigterm_sent_at: Optional[float] = None
+        children: List[psutil.Process] = []
 
         while not self._stop_event.is_set():
             try:
                 rss = proc.memory_info().rss
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 break
+            rss += self._children_rss(proc)
 
             if rss > self._high_water_bytes:
                 self._high_water_bytes = rss
@@ -161,10 +197,7 @@ class MemoryMonitor:
                         "Worker pid %d still alive after SIGTERM + %.0fs grace — sending SIGKILL",
                         self._pid, self._grace_s,
                     )
-                    try:
-                        os.kill(self._pid, signal.SIGKILL)
-                    except OSError:
-                        pass
+                    _signal_tree(self._pid, _descendants(self._pid, children), signal.SIGKILL)
                     break
             elif rss > self._hard_limit_bytes:
                 logger.warning(
@@ -173,14 +206,28 @@ class MemoryMonitor:
                     rss / (1024 * 1024),
                     self._hard_limit_bytes / (1024 * 1024),
                 )
-                try:
-                    os.kill(self._pid, signal.SIGTERM)
-                except OSError:
+                children = _descendants(self._pid)
+                if not _signal_tree(self._pid, children, signal.SIGTERM):
                     break
                 sigterm_sent_at = time.monotonic()
 
             self._stop_event.wait(self._poll_interval)
 
+    @staticmethod
+    def _children_rss(proc: "psutil.Process") -> int:
+        """RSS of the worker's own pool processes (e.g. PDF page extraction)."""
+        total = 0
+        try:
+            children = proc.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return 0
+        for child in children:
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
 
 # ---------------------------------------------------------------------------
 # Serialization helpers for IPC via Queue
@@ -606,7 +653,10 @@ class ProcessWorkerManager:
                 control_parent,   # read end for poll/recv
                 settings.process_worker_memory_limit_mb,
             ),
-            daemon=True,
+            # Large PDFs are extracted on a page-range pool inside the worker,
+            # and daemonic processes may not have children. shutdown() and
+            # the memory monitor signal the pool along with the worker.
+            daemon=settings.pdf_extract_workers <= 1,
         )
         proc.start()
         self._active_processes.append(proc)
@@ -678,7 +728,8 @@ class ProcessWorkerManager:
     def shutdown(self, wait: bool = True) -> None:
         for proc in self._active_processes:
             if proc.is_alive():
-                proc.terminate()
+                # Pool processes first, so none outlive the worker
+                _signal_tree(proc.pid, _descendants(proc.pid), signal.SIGTERM)
                 if wait:
                     proc.join(timeout=10)
         self._active_processes.clear()
@@ -850,11 +901,10 @@ class WorkerHandle:
             self._cleanup()
             return
 
-        # 3. SIGTERM
+        # 3. SIGTERM (worker and its pool)
         logger.warning("Worker pid %d did not exit in %ds — sending SIGTERM", pid, self.grace_period_s)
-        try:
-            os.kill(pid, signal.SIGTERM)
-        except OSError:
+        children = _descendants(pid)
+        if not _signal_tree(pid, children, signal.SIGTERM):
             self._cleanup()
             return
 
@@ -868,10 +918,7 @@ class WorkerHandle:
 
         # 4. SIGKILL
         logger.error("Worker pid %d still alive after SIGTERM — sending SIGKILL", pid)
-        try:
-            os.kill(pid, signal.SIGKILL)
-        except OSError:
-            pass
+        _signal_tree(pid, _descendants(pid, children), signal.SIGKILL)
         self._cleanup()
 
     def wait(self, timeout: Optional[float] = None) -> None:
@@ -269,12 +269,12 @@ class ProcessingQueue:
             return
 
         # Auto-index if batch was confirmed during extraction
-        from app.core.database import get_session_context
+        from app.core.database import async_session_context
         from app.models.dataset import DatasetRecord as DBDatasetRecord
 
         should_index = False
-        with get_session_context() as session:
-            db_row = session.get(DBDatasetRecord, dataset_id)
+        async with async_session_context() as session:
+            db_row = await session.get(DBDatasetRecord, dataset_id)
             if (
                 db_row
                 and db_row.confirmed_at
@@ -287,7 +287,7 @@ class ProcessingQueue:
                 db_row.status = DatasetStatus.INDEXING.value
                 db_row.updated_at = datetime.now(timezone.utc)
                 session.add(db_row)
-                session.commit()
+                await session.commit()
                 should_index = True
 
         if should_index:
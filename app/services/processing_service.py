@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import json
 import csv
+import threading
 
 import os, psutil
 
@@ -36,6 +37,18 @@ def log_mem_state(phase: str):
 # Backward-compat alias — existing code references ProcessingStatus
 ProcessingStatus = DatasetStatus
 
+# Bumped on every dataset record write made through ProcessingService.
+# Caches of derived views (e.g. the Copilot schema graph) compare it via
+# ProcessingService.dataset_state_fingerprint().
+_dataset_state_version = 0
+_dataset_state_lock = threading.Lock()
+
+
+def _bump_dataset_state() -> None:
+    global _dataset_state_version
+    with _dataset_state_lock:
+        _dataset_state_version += 1
+
 
 class DatasetRecord:
     """
@@ -239,6 +252,42 @@ class ProcessingService:
         from app.core.database import get_session_context
         return get_session_context()
 
+    @staticmethod
+    def _get_async_session():
+        from app.core.database import async_session_context
+        return async_session_context()
+
+    @staticmethod
+    def _apply_record(existing, rec: DatasetRecord, storage_filename: str) -> None:
+        """Copy an in-memory DatasetRecord onto its existing DB row."""
+        existing.original_filename = rec.original_filename
+        existing.storage_filename = storage_filename
+        existing.file_type = rec.file_type
+        existing.status = rec.status.value if isinstance(rec.status, DatasetStatus) else rec.status
+        existing.processed_path = str(rec.processed_path) if rec.processed_path else None
+
+        metadata = dict(rec.metadata)
+        if rec.document_content:
+            metadata["document_content"] = rec.document_content
+        if rec.error:
+            metadata["error"] = rec.error
+        existing.metadata_json = json.dumps(metadata, default=str)
+        existing.updated_at = datetime.now(timezone.utc)
+
+        if rec.upload_path:
+            try:
+                existing.file_size_bytes = os.path.getsize(rec.upload_path)
+            except OSError:
+                pass
+
+        # BQ-108+109 fields
+        existing.batch_id = rec.batch_id
+        existing.relative_path = rec.relative_path
+        existing.preview_text = rec.preview_text
+        existing.preview_metadata = json.dumps(rec.preview_metadata, default=str) if rec.preview_metadata else None
+        existing.confirmed_at = rec.confirmed_at
+        existing.confirmed_by = rec.confirmed_by
+
     def _save_record(self, rec: DatasetRecord, storage_filename: str) -> None:
         """Upsert a DatasetRecord into the database."""
         from app.models.dataset import DatasetRecord as DBDatasetRecord
@@ -248,34 +297,7 @@ class ProcessingService:
             with self._get_session() as session:
                 existing = session.get(DBDatasetRecord, rec.id)
                 if existing is not None:
-                    existing.original_filename = rec.original_filename
-                    existing.storage_filename = storage_filename
-                    existing.file_type = rec.file_type
-                    existing.status = rec.status.value if isinstance(rec.status, DatasetStatus) else rec.status
-                    existing.processed_path = str(rec.processed_path) if rec.processed_path else None
-
-                    metadata = dict(rec.metadata)
-                    if rec.document_content:
-                        metadata["document_content"] = rec.document_content
-                    if rec.error:
-                        metadata["error"] = rec.error
-                    existing.metadata_json = json.dumps(metadata, default=str)
-                    existing.updated_at = datetime.now(timezone.utc)
-
-                    if rec.upload_path:
-                        try:
-                            existing.file_size_bytes = os.path.getsize(rec.upload_path)
-                        except OSError:
-                            pass
-
-                    # BQ-108+109 fields
-                    existing.batch_id = rec.batch_id
-                    existing.relative_path = rec.relative_path
-                    existing.preview_text = rec.preview_text
-                    existing.preview_metadata = json.dumps(rec.preview_metadata, default=str) if rec.preview_metadata else None
-                    existing.confirmed_at = rec.confirmed_at
-                    existing.confirmed_by = rec.confirmed_by
-
+                    self._apply_record(existing, rec, storage_filename)
                     session.add(existing)
                 else:
                     db_rec = _record_to_db(rec, storage_filename)
@@ -286,6 +308,28 @@ class ProcessingService:
             _sqlite_retry(_do)
         else:
             _do()
+        _bump_dataset_state()
+
+    async def _save_record_async(self, rec: DatasetRecord, storage_filename: str) -> None:
+        """Upsert a DatasetRecord from a coroutine (async session, async retry)."""
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+        from app.core.database import _sqlite_retry_async, _is_sqlite
+
+        async def _do():
+            async with self._get_async_session() as session:
+                existing = await session.get(DBDatasetRecord, rec.id)
+                if existing is not None:
+                    self._apply_record(existing, rec, storage_filename)
+                    session.add(existing)
+                else:
+                    session.add(_record_to_db(rec, storage_filename))
+                await session.commit()
+
+        if _is_sqlite:
+            await _sqlite_retry_async(_do)
+        else:
+            await _do()
+        _bump_dataset_state()
 
     # ------------------------------------------------------------------
     # CRUD
@@ -326,6 +370,16 @@ class ProcessingService:
                 return None
             return _db_to_record(db_row)
 
+    async def get_dataset_async(self, dataset_id: str) -> Optional[DatasetRecord]:
+        """Get a dataset record by ID without blocking the event loop."""
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+
+        async with self._get_async_session() as session:
+            db_row = await session.get(DBDatasetRecord, dataset_id)
+            if db_row is None or db_row.id == "__migrated__":
+                return None
+            return _db_to_record(db_row)
+
     def list_datasets(self) -> list[DatasetRecord]:
         """List all dataset records."""
         from app.models.dataset import DatasetRecord as DBDatasetRecord
@@ -341,6 +395,37 @@ class ProcessingService:
             rows = session.exec(stmt).all()
             return [_db_to_record(r) for r in rows]
 
+    async def list_datasets_async(self) -> list[DatasetRecord]:
+        """List all dataset records without blocking the event loop."""
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+        from sqlmodel import select
+
+        async with self._get_async_session() as session:
+            stmt = (
+                select(DBDatasetRecord)
+                .where(DBDatasetRecord.id != "__migrated__")
+                .where(DBDatasetRecord.status != "deleted")
+                .order_by(DBDatasetRecord.created_at.desc())
+            )
+            rows = (await session.exec(stmt)).all()
+            return [_db_to_record(r) for r in rows]
+
+    def dataset_state_fingerprint(self) -> tuple:
+        """Cheap token that changes whenever any dataset record changes.
+
+        Combines the in-process write counter with the table's row count and
+        newest ``updated_at``, so writes made outside this service (routers,
+        batch confirmation, other workers) are noticed too.
+        """
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+        from sqlalchemy import func
+        from sqlmodel import select
+
+        with self._get_session() as session:
+            count, last_updated = session.exec(
+                select(func.count(), func.max(DBDatasetRecord.updated_at))
+            ).one()
+        return (_dataset_state_version, count, last_updated)
 
     def find_by_filename(self, filename: str) -> Optional["DatasetRecord"]:
         """Find an existing non-deleted dataset with the same original filename."""
@@ -381,6 +466,7 @@ class ProcessingService:
             if db_row:
                 session.delete(db_row)
                 session.commit()
+        _bump_dataset_state()
         return True
 
     def _is_cancelled(self, dataset_id: str) -> bool:
@@ -392,6 +478,13 @@ class ProcessingService:
                 return True
         return False
 
+    async def _is_cancelled_async(self, dataset_id: str) -> bool:
+        """Async twin of ``_is_cancelled`` for coroutines."""
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+        async with self._get_async_session() as session:
+            db_row = await session.get(DBDatasetRecord, dataset_id)
+            return bool(db_row and db_row.status == DatasetStatus.CANCELLED.value)
+
     def _set_status(self, dataset_id: str, status: DatasetStatus) -> None:
         """Atomically set dataset status in DB."""
         from app.models.dataset import DatasetRecord as DBDatasetRecord
@@ -410,6 +503,27 @@ class ProcessingService:
             _sqlite_retry(_do)
         else:
             _do()
+        _bump_dataset_state()
+
+    async def _set_status_async(self, dataset_id: str, status: DatasetStatus) -> None:
+        """Async twin of ``_set_status`` for coroutines."""
+        from app.models.dataset import DatasetRecord as DBDatasetRecord
+        from app.core.database import _sqlite_retry_async, _is_sqlite
+
+        async def _do():
+            async with self._get_async_session() as session:
+                db_row = await session.get(DBDatasetRecord, dataset_id)
+                if db_row:
+                    db_row.status = status.value
+                    db_row.updated_at = datetime.now(timezone.utc)
+                    session.add(db_row)
+                    await session.commit()
+
+        if _is_sqlite:
+            await _sqlite_retry_async(_do)
+        else:
+            await _do()
+        _bump_dataset_state()
 
     def _enrich_metadata_from_duckdb(self, record: DatasetRecord) -> None:
         """Populate record.metadata with row_count, column_count, size_bytes from DuckDB."""
@@ -501,14 +615,14 @@ class ProcessingService:
         if streaming fails (M10 graceful degradation).
         """
         log_mem_state("Pre-Processing")
-        record = self.get_dataset(dataset_id)
+        record = await self.get_dataset_async(dataset_id)
         if not record:
             raise ValueError(f"Dataset {dataset_id} not found")
 
         if not record.upload_path or not record.upload_path.exists():
             record.status = DatasetStatus.ERROR
             record.error = "Upload file not found"
-            self._save_record(record, record.upload_path.name if record.upload_path else f"{dataset_id}")
+            await self._save_record_async(record, record.upload_path.name if record.upload_path else f"{dataset_id}")
             return record
 
         # Populate file_size_bytes from disk so fallback size checks are accurate
@@ -519,14 +633,14 @@ class ProcessingService:
                 pass
 
         # Check cancellation before starting
-        if self._is_cancelled(dataset_id):
+        if await self._is_cancelled_async(dataset_id):
             record.status = DatasetStatus.CANCELLED
             return record
 
         # Phase 1: Extract
         record.status = DatasetStatus.EXTRACTING
         record.updated_at = datetime.now(timezone.utc)
-        self._save_record(record, record.upload_path.name if record.upload_path else f"{dataset_id}")
+        await self._save_record_async(record, record.upload_path.name if record.upload_path else f"{dataset_id}")
 
         try:
             file_type = record.file_type.lower()
@@ -582,28 +696,28 @@ class ProcessingService:
             _log.error("Processing failed for %s: %s", dataset_id, e, exc_info=True)
             record.updated_at = datetime.now(timezone.utc)
             storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-            self._save_record(record, storage_fn)
+            await self._save_record_async(record, storage_fn)
             return record
 
         # Check cancellation between phases
-        if self._is_cancelled(dataset_id):
+        if await self._is_cancelled_async(dataset_id):
             record.status = DatasetStatus.CANCELLED
             storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-            self._save_record(record, storage_fn)
+            await self._save_record_async(record, storage_fn)
             return record
 
         if skip_indexing:
             record.status = DatasetStatus.PREVIEW_READY
             record.updated_at = datetime.now(timezone.utc)
             storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-            self._save_record(record, storage_fn)
+            await self._save_record_async(record, storage_fn)
             return record
 
         # Phase 2: Index
         record.status = DatasetStatus.INDEXING
         record.updated_at = datetime.now(timezone.utc)
         storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-        self._save_record(record, storage_fn)
+        await self._save_record_async(record, storage_fn)
 
         try:
             # Run indexing in thread pool so embedding computation
@@ -622,7 +736,7 @@ class ProcessingService:
             record.updated_at = datetime.now(timezone.utc)
 
         storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-        self._save_record(record, storage_fn)
+        await self._save_record_async(record, storage_fn)
         return record
 
     def _extract_in_memory(self, record: DatasetRecord, file_type: str) -> None:
@@ -1000,18 +1114,18 @@ class ProcessingService:
 
     async def run_index_phase(self, dataset_id: str) -> DatasetRecord:
         """Run only the index phase (called after confirm)."""
-        record = self.get_dataset(dataset_id)
+        record = await self.get_dataset_async(dataset_id)
         if not record:
             raise ValueError(f"Dataset {dataset_id} not found")
 
-        if self._is_cancelled(dataset_id):
+        if await self._is_cancelled_async(dataset_id):
             record.status = DatasetStatus.CANCELLED
             return record
 
         record.status = DatasetStatus.INDEXING
         record.updated_at = datetime.now(timezone.utc)
         storage_fn = record.upload_path.name if record.upload_path else f"{dataset_id}"
-        self._save_record(record, storage_fn)
+        await self._save_record_async(record, storage_fn)
 
         try:
             # Run indexing in thread pool so embedding computation
@@ -1019,16 +1133,16 @@ class ProcessingService:
             await asyncio.get_event_loop().run_in_executor(
                 None, self._run_indexing, record,
             )
-            if self._is_cancelled(dataset_id):
+            if await self._is_cancelled_async(dataset_id):
                 record.status = DatasetStatus.CANCELLED
             else:
                 record.status = DatasetStatus.READY
                 # Bug 1: Populate metadata with DuckDB file stats at write time
                 self._enrich_metadata_from_duckdb(record)
-                # BQ-VZ-HYBRID-SEARCH: Rebuild facets after new dataset is ready
+                # BQ-VZ-HYBRID-SEARCH: Add the new dataset's facet contribution
                 try:
-                    from app.services.facet_service import rebuild_facets_async
-                    rebuild_facets_async()
+                    from app.services.facet_service import update_dataset_facets_async
+                    update_dataset_facets_async(dataset_id, record=record)
                 except Exception:
                     pass  # Non-critical
             record.updated_at = datetime.now(timezone.utc)
@@ -1038,7 +1152,7 @@ class ProcessingService:
             record.error = f"Indexing failed: {err_detail}" if err_detail else "Indexing failed"
             record.updated_at = datetime.now(timezone.utc)
 
-        self._save_record(record, storage_fn)
+        await self._save_record_async(record, storage_fn)
         return record
 
     # Maximum time (seconds) allowed for converting a file to Parquet.
@@ -1079,6 +1193,7 @@ class ProcessingService:
 
             if recovered:
                 session.commit()
+                _bump_dataset_state()
             return recovered
 
     def _extract_tabular(self, record: DatasetRecord):
@@ -1348,26 +1463,23 @@ class ProcessingService:
                 temp_csv.unlink()
 
     def _process_spreadsheet(self, record: DatasetRecord):
-        """Process Excel spreadsheets (.xlsx, .xls) via pandas."""
-        import pandas as pd
+        """Stream Excel spreadsheets (.xlsx, .xls) to Parquet, sheet by sheet.
+
+        A workbook with several non-empty sheets becomes one table with a
+        ``sheet`` column; a single-sheet workbook keeps its plain columns.
+        """
+        from app.services.streaming_processor import StreamingSpreadsheetProcessor
 
         parquet_filename = f"{record.id}.parquet"
         record.processed_path = self.processed_dir / parquet_filename
+        partial_path = self.processed_dir / f"{record.id}.parquet.partial"
 
-        ext = record.upload_path.suffix.lower()
-
-        # Select the right engine: openpyxl for .xlsx, xlrd for .xls
-        engine = "xlrd" if ext == ".xls" else "openpyxl"
-
+        processor = StreamingSpreadsheetProcessor(record.upload_path)
         try:
-            xlsx = pd.ExcelFile(record.upload_path, engine=engine)
-            sheet_names = xlsx.sheet_names
-
-            # Read first sheet
-            df = pd.read_excel(xlsx, sheet_name=0)
-
-            # Save to Parquet
-            df.to_parquet(record.processed_path, compression='zstd', index=False)
+            with processor:
+                sheet_names = processor.sheet_names
+                sheet_rows = processor.write_parquet(partial_path)
+            partial_path.replace(record.processed_path)
 
             with ephemeral_duckdb_service() as duckdb:
                 metadata = duckdb.get_file_metadata(record.processed_path)
@@ -1375,12 +1487,17 @@ class ProcessingService:
                 metadata["original_format"] = record.file_type
                 metadata["sheet_names"] = sheet_names
                 metadata["sheets_count"] = len(sheet_names)
+                metadata["sheet_row_counts"] = sheet_rows
+                if processor.widened:
+                    metadata["widened_columns"] = processor.widened
                 record.metadata = metadata
 
         except Exception as e:
+            if partial_path.exists():
+                partial_path.unlink()
             raise ValueError(
                 f"Excel processing failed for {record.original_filename} "
-                f"(engine={engine}): {e}"
+                f"(engine={processor.engine}): {e}"
             )
 
 
@@ -8,11 +8,16 @@ Dimensions:
 - Validity: type conformance (DuckDB types match actual data)
 - Consistency: cross-column rules (e.g., start < end dates)
 - Uniqueness: HLL-based approximate unique ratio
+
+Every aggregate rule (null counts, cross-column violations, approximate
+distinct counts) is compiled into a single SELECT, so a dataset is scanned
+once for rules plus once for the Pandera sample, regardless of width.
 """
 import json
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandera as pa
 from pydantic import BaseModel, Field
@@ -24,6 +29,27 @@ logger = logging.getLogger(__name__)
 
 SAMPLE_LIMIT = 100_000
 
+# Cross-column rules: (start, end) must not be reversed
+DATE_PAIRS = [
+    ("start_date", "end_date"),
+    ("start_time", "end_time"),
+    ("created_at", "updated_at"),
+    ("begin_date", "end_date"),
+]
+MIN_MAX_PAIRS = [("min_value", "max_value"), ("low", "high"), ("min", "max")]
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+@dataclass(frozen=True)
+class _Rule:
+    """One aggregate expression evaluated over the whole dataset."""
+    key: Tuple[str, ...]
+    sql: str
+    optional: bool = False  # a failure skips the rule instead of failing validation
+
 
 # ── Pydantic models ─────────────────────────────────────────────────
 
@@ -80,27 +106,25 @@ class QualityContractService:
             ).fetchall()
             columns = [(row[0], row[1]) for row in schema_rows]
 
-            # Get row count
-            row_count = duckdb.connection.execute(
-                f"SELECT COUNT(*) FROM {read_func}"
-            ).fetchone()[0]
+            # All aggregate rules in one scan; row count included
+            rules = self._plan_rules(columns, sketch_profile)
+            results = self._evaluate_rules(duckdb.connection, read_func, rules)
+            row_count = results[("rows",)]
 
             if row_count == 0:
                 return self._empty_scorecard(dataset_id)
 
-            # ── 1. Completeness (SQL aggregate) ────────────────────
-            completeness = self._check_completeness(duckdb, read_func, columns, row_count)
+            # ── 1. Completeness (null counts) ──────────────────────
+            completeness = self._check_completeness(columns, row_count, results)
 
             # ── 2. Validity (Pandera sample validation) ────────────
             validity = self._check_validity(duckdb, read_func, columns)
 
             # ── 3. Consistency (cross-column rules) ────────────────
-            consistency = self._check_consistency(duckdb, read_func, columns)
+            consistency = self._check_consistency(rules, results)
 
             # ── 4. Uniqueness (HLL-based or SQL) ──────────────────
-            uniqueness = self._check_uniqueness(
-                duckdb, read_func, columns, row_count, sketch_profile
-            )
+            uniqueness = self._check_uniqueness(columns, row_count, sketch_profile, results)
 
         # Build per-column scores
         column_scores = self._build_column_scores(
@@ -133,26 +157,116 @@ class QualityContractService:
         with open(output_path, "w") as f:
             json.dump(scorecard.model_dump(), f, indent=2)
 
+        from app.services.facet_service import update_dataset_facets_async
+        update_dataset_facets_async(dataset_id)
+
         logger.info(
             "Quality scorecard for %s: overall=%.2f grade=%s",
             dataset_id, overall, grade,
         )
         return scorecard
 
+    # ── Rule planning ────────────────────────────────────────────────
+
+    def _plan_rules(self, columns, sketch_profile) -> List[_Rule]:
+        """Compile every aggregate check for a dataset into rule expressions."""
+        rules = [_Rule(("rows",), "COUNT(*)")]
+
+        for col_name, _col_type in columns:
+            rules.append(_Rule(
+                ("nulls", col_name), f"COUNT(*) FILTER (WHERE {_quote_ident(col_name)} IS NULL)",
+            ))
+
+        col_names = {c[0].lower(): c[0] for c in columns}
+        for start_key, end_key in DATE_PAIRS:
+            if start_key in col_names and end_key in col_names:
+                start_col, end_col = col_names[start_key], col_names[end_key]
+                s, e = _quote_ident(start_col), _quote_ident(end_col)
+                rules.append(_Rule(
+                    ("order", start_col, end_col),
+                    f"COUNT(*) FILTER (WHERE {s} IS NOT NULL AND {e} IS NOT NULL AND {s} > {e})",
+                ))
+        for min_key, max_key in MIN_MAX_PAIRS:
+            if min_key in col_names and max_key in col_names:
+                min_col, max_col = col_names[min_key], col_names[max_key]
+                lo, hi = _quote_ident(min_col), _quote_ident(max_col)
+                rules.append(_Rule(
+                    ("range", min_col, max_col),
+                    f"COUNT(*) FILTER (WHERE {lo} IS NOT NULL AND {hi} IS NOT NULL "
+                    f"AND CAST({lo} AS DOUBLE) > CAST({hi} AS DOUBLE))",
+                    optional=True,  # Skip if cast fails
+                ))
+
+        # Columns without an HLL estimate in the sketch profile
+        sketched = {
+            c["column_name"] for c in (sketch_profile or {}).get("columns", [])
+        }
+        for col_name, _col_type in columns:
+            if col_name not in sketched:
+                rules.append(_Rule(
+                    ("distinct", col_name), f"APPROX_COUNT_DISTINCT({_quote_ident(col_name)})",
+                    optional=True,
+                ))
+        return rules
+
+    @staticmethod
+    def _evaluate_rules(conn, read_func, rules: List[_Rule], batched: bool = True) -> Dict[tuple, Any]:
+        """Evaluate rules in as few scans as possible.
+
+        Normally one SELECT computes every rule. If that fails, the required
+        rules are retried together and the optional ones (e.g. a CAST that
+        cannot parse a column) are bisected until each failing rule is on its
+        own and maps to its exception — the same outcome as checking every
+        rule separately. With ``batched=False`` every rule gets its own query.
+        """
+        def scan(group: List[_Rule]) -> Dict[tuple, Any]:
+            select = ", ".join(rule.sql for rule in group)
+            row = conn.execute(f"SELECT {select} FROM {read_func}").fetchone()
+            return dict(zip((rule.key for rule in group), row))
+
+        if batched:
+            try:
+                return scan(rules)
+            except Exception as e:
+                logger.debug("Batched quality scan failed (%s) — splitting optional rules", e)
+            required = [rule for rule in rules if not rule.optional]
+            optional = [rule for rule in rules if rule.optional]
+            results = scan(required)
+            if results[("rows",)] == 0:
+                return results  # Empty dataset: nothing else is scored
+        else:
+            results = scan(rules[:1])
+            if results[("rows",)] == 0:
+                return results
+            for rule in rules[1:]:
+                if not rule.optional:
+                    results.update(scan([rule]))
+            optional = [rule for rule in rules if rule.optional]
+
+        pending = [optional] if batched else [[rule] for rule in optional]
+        while pending:
+            group = pending.pop()
+            if not group:
+                continue
+            try:
+                results.update(scan(group))
+            except Exception as e:
+                if len(group) == 1:
+                    results[group[0].key] = e
+                else:
+                    mid = len(group) // 2
+                    pending += [group[:mid], group[mid:]]
+        return results
+
     # ── Dimension checks ─────────────────────────────────────────────
 
-    def _check_completeness(self, duckdb, read_func, columns, row_count) -> DimensionScore:
+    def _check_completeness(self, columns, row_count, results) -> DimensionScore:
         """Check null rates per column."""
         details = []
         col_null_rates = {}
 
         for col_name, _col_type in columns:
-            safe_name = col_name.replace('"', '""')
-            escaped = f'"{safe_name}"'
-            result = duckdb.connection.execute(
-                f'SELECT COUNT(*) - COUNT({escaped}) FROM {read_func}'
-            ).fetchone()
-            null_count = result[0] if result else 0
+            null_count = results[("nulls", col_name)] or 0
             null_rate = null_count / row_count if row_count > 0 else 0
             col_null_rates[col_name] = null_rate
 
@@ -228,64 +342,24 @@ class QualityContractService:
 
         return DimensionScore(score=round(score, 4), details=details)
 
-    def _check_consistency(self, duckdb, read_func, columns) -> DimensionScore:
+    def _check_consistency(self, rules, results) -> DimensionScore:
         """Check cross-column consistency rules."""
         details = []
         checks_passed = 0
         checks_total = 0
 
-        col_names = {c[0].lower(): c[0] for c in columns}
-        {c[0].lower(): c[1].lower() for c in columns}
-
-        # Rule: start_date < end_date patterns
-        date_pairs = [
-            ("start_date", "end_date"),
-            ("start_time", "end_time"),
-            ("created_at", "updated_at"),
-            ("begin_date", "end_date"),
-        ]
-        for start_key, end_key in date_pairs:
-            if start_key in col_names and end_key in col_names:
-                start_col = col_names[start_key]
-                end_col = col_names[end_key]
-                safe_start = f'"{start_col.replace(chr(34), chr(34)+chr(34))}"'
-                safe_end = f'"{end_col.replace(chr(34), chr(34)+chr(34))}"'
-
-                result = duckdb.connection.execute(
-                    f"SELECT COUNT(*) FROM {read_func} "
-                    f"WHERE {safe_start} IS NOT NULL AND {safe_end} IS NOT NULL "
-                    f"AND {safe_start} > {safe_end}"
-                ).fetchone()
-                violations = result[0] if result else 0
-                checks_total += 1
-                if violations == 0:
-                    checks_passed += 1
-                else:
-                    details.append(f"{start_col} > {end_col} in {violations} rows")
-
-        # Rule: min < max patterns
-        min_max_pairs = [("min_value", "max_value"), ("low", "high"), ("min", "max")]
-        for min_key, max_key in min_max_pairs:
-            if min_key in col_names and max_key in col_names:
-                min_col = col_names[min_key]
-                max_col = col_names[max_key]
-                safe_min = f'"{min_col.replace(chr(34), chr(34)+chr(34))}"'
-                safe_max = f'"{max_col.replace(chr(34), chr(34)+chr(34))}"'
-
-                try:
-                    result = duckdb.connection.execute(
-                        f"SELECT COUNT(*) FROM {read_func} "
-                        f"WHERE {safe_min} IS NOT NULL AND {safe_max} IS NOT NULL "
-                        f"AND CAST({safe_min} AS DOUBLE) > CAST({safe_max} AS DOUBLE)"
-                    ).fetchone()
-                    violations = result[0] if result else 0
-                    checks_total += 1
-                    if violations == 0:
-                        checks_passed += 1
-                    else:
-                        details.append(f"{min_col} > {max_col} in {violations} rows")
-                except Exception:
-                    pass  # Skip if cast fails
+        for rule in rules:
+            kind = rule.key[0]
+            if kind not in ("order", "range"):
+                continue
+            violations = results[rule.key]
+            if isinstance(violations, Exception):
+                continue  # Optional rule whose cast failed
+            checks_total += 1
+            if not violations:
+                checks_passed += 1
+            else:
+                details.append(f"{rule.key[1]} > {rule.key[2]} in {violations} rows")
 
         if checks_total == 0:
             # No cross-column rules applicable → perfect score
@@ -294,7 +368,7 @@ class QualityContractService:
         score = checks_passed / checks_total
         return DimensionScore(score=round(score, 4), details=details)
 
-    def _check_uniqueness(self, duckdb, read_func, columns, row_count, sketch_profile) -> DimensionScore:
+    def _check_uniqueness(self, columns, row_count, sketch_profile, results) -> DimensionScore:
         """Check uniqueness using HLL estimates or SQL APPROX_COUNT_DISTINCT."""
         details = []
         uniqueness_ratios = {}
@@ -315,17 +389,14 @@ class QualityContractService:
                     uniqueness_ratios[col_name] = min(ratio, 1.0)
                     continue
 
-            # Fallback: SQL approx
-            safe_name = f'"{col_name.replace(chr(34), chr(34)+chr(34))}"'
-            try:
-                result = duckdb.connection.execute(
-                    f"SELECT APPROX_COUNT_DISTINCT({safe_name}) FROM {read_func}"
-                ).fetchone()
-                distinct = result[0] if result else 0
-                ratio = distinct / row_count if row_count > 0 else 0
-                uniqueness_ratios[col_name] = min(ratio, 1.0)
-            except Exception:
+            # Fallback: SQL approx (from the batched scan)
+            distinct = results.get(("distinct", col_name))
+            if isinstance(distinct, Exception):
                 uniqueness_ratios[col_name] = 0.0
+                continue
+            distinct = distinct or 0
+            ratio = distinct / row_count if row_count > 0 else 0
+            uniqueness_ratios[col_name] = min(ratio, 1.0)
 
         # Score: average uniqueness ratio
         # Datasets with some high-cardinality columns are good
@@ -12,7 +12,7 @@ import logging
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import duckdb
 
@@ -43,6 +43,7 @@ from app.services.connectivity_token_service import (
     ConnectivityTokenError,
     verify_token,
 )
+from app.services.query_supervisor import QueryCancelledError, get_query_supervisor
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,7 @@ class QueryOrchestrator:
             max_concurrent_per_token=settings.connectivity_max_concurrent,
         )
         self.metrics = get_connectivity_metrics()
+        self.supervisor = get_query_supervisor()
 
     def _check_enabled(self) -> None:
         """Raise if connectivity is disabled."""
@@ -121,19 +123,19 @@ class QueryOrchestrator:
             self.rate_limiter.record_request(token.id, "list_datasets")
 
             from app.services.processing_service import get_processing_service
-            from app.core.database import get_session_context
+            from app.core.database import async_session_context
             from app.models.dataset import DatasetRecord as DBDatasetRecord
             from sqlmodel import select
 
             get_processing_service()
 
             # Query only externally_queryable datasets
-            with get_session_context() as session:
+            async with async_session_context() as session:
                 stmt = select(DBDatasetRecord).where(
                     DBDatasetRecord.externally_queryable == True,  # noqa: E712
                     DBDatasetRecord.status == "ready",
                 )
-                db_records = session.exec(stmt).all()
+                db_records = (await session.exec(stmt)).all()
 
             # Check which have vectors
             from app.services.qdrant_service import get_qdrant_service
@@ -356,9 +358,18 @@ class QueryOrchestrator:
     # ------------------------------------------------------------------
 
     async def execute_sql(
-        self, token: ConnectivityToken, req: SQLQueryRequest, client_ip: str = "127.0.0.1"
+        self,
+        token: ConnectivityToken,
+        req: SQLQueryRequest,
+        client_ip: str = "127.0.0.1",
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
     ) -> SQLResponse:
-        """Execute read-only SQL (§5.2)."""
+        """Execute read-only SQL (§5.2).
+
+        The query runs under the QuerySupervisor: on timeout or when
+        ``is_disconnected()`` reports the client gone, the DuckDB connection
+        is interrupted so the worker thread is freed immediately.
+        """
         self._check_enabled()
         self._enforce_scope(token, "ext:sql")
         self._enforce_rate_limit(token, "execute_sql", client_ip)
@@ -396,13 +407,13 @@ class QueryOrchestrator:
             allowed_tables = SQLSandbox.build_allowed_tables(queryable_ids)
             sandbox = SQLSandbox(allowed_tables)
 
-            # External-mode validation
-            is_valid, error = sandbox.validate_external(req.sql)
-            if not is_valid:
-                raise ConnectivityError("forbidden_sql", error)
+            # External-mode validation (verdict is cached per SQL text + table set)
+            verdict = sandbox.check_external(req.sql, max_length)
+            if not verdict.is_valid:
+                raise ConnectivityError("forbidden_sql", verdict.error)
 
             # Wrap with enforced LIMIT (M27)
-            clean_sql = req.sql.strip().rstrip(";").strip()
+            clean_sql = verdict.clean_sql
             wrapped_sql = f"SELECT * FROM ({clean_sql}) AS __ext_q LIMIT {max_rows}"
 
             # Execute on ephemeral connection with tighter limits (M30)
@@ -428,18 +439,15 @@ class QueryOrchestrator:
                             f"AS SELECT * FROM read_parquet('{escaped}')"
                         )
 
-                # Execute with timeout
-                import asyncio
-                result = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None, lambda: conn.execute(wrapped_sql)
-                    ),
-                    timeout=timeout_s,
+                # Execute with timeout — interrupted on the DuckDB side, not abandoned
+                columns, rows_raw = await self.supervisor.execute(
+                    conn,
+                    wrapped_sql,
+                    timeout_s,
+                    query_id=request_id,
+                    is_disconnected=is_disconnected,
                 )
 
-                rows_raw = result.fetchall()
-                columns = [desc[0] for desc in result.description]
-
                 # Serialize values
                 rows = []
                 for row in rows_raw:
@@ -455,8 +463,34 @@ class QueryOrchestrator:
 
                 truncated = len(rows) >= max_rows
 
-            except asyncio.TimeoutError:
-                raise ConnectivityError("query_timeout", f"Query exceeded {timeout_s}s timeout")
+            except QueryCancelledError as e:
+                self.metrics.record_error(
+                    "query_timeout" if e.reason == "timeout" else "query_cancelled"
+                )
+                audit_log(
+                    tool_name="execute_sql", token_id=token.id,
+                    dataset_id=req.dataset_id, duration_ms=e.elapsed_ms,
+                    row_count=None,
+                    error_code="query_timeout" if e.reason == "timeout" else "query_cancelled",
+                    request_id=request_id, sql=req.sql,
+                )
+                if e.reason == "timeout":
+                    raise ConnectivityError(
+                        "query_timeout",
+                        f"Query exceeded {timeout_s}s timeout",
+                        {"cancelled": True, "reason": e.reason},
+                    )
+                raise ConnectivityError(
+                    "query_cancelled",
+                    "Query was cancelled before completing",
+                    {"cancelled": True, "reason": e.reason},
+                )
+            except duckdb.OutOfMemoryException:
+                raise ConnectivityError(
+                    "query_memory_exceeded",
+                    f"Query exceeded the {memory_mb}MB memory limit",
+                    {"max_memory_mb": memory_mb},
+                )
             except duckdb.Error as e:
                 error_msg = str(e)
                 # Redact internal paths
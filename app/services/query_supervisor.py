@@ -0,0 +1,251 @@
+"""
+Query Supervisor — interruptible execution of DuckDB queries.
+
+``asyncio.wait_for`` around ``run_in_executor`` only abandons the awaiting
+coroutine; the DuckDB query keeps running in the worker thread, holding the
+thread and its memory until it finishes on its own. The supervisor tracks
+the connection behind every in-flight query and calls
+``DuckDBPyConnection.interrupt()`` on timeout, client disconnect or task
+cancellation, then waits for the worker to actually return before raising.
+
+Phase: BQ-VZ-PERF — Interruptible SQL timeouts
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+# How often the disconnect callback is polled while a query runs
+DISCONNECT_POLL_INTERVAL_S = 0.25
+
+# How long to wait for the worker thread to unwind after interrupt()
+INTERRUPT_GRACE_S = 5.0
+
+T = TypeVar("T")
+
+# Returned by next() once a streamed query is exhausted
+_END = object()
+
+
+class QueryCancelledError(Exception):
+    """Raised when a supervised query was interrupted before completing.
+
+    ``reason`` is one of ``"timeout"``, ``"client_disconnect"`` or
+    ``"cancelled"`` (task cancellation / explicit ``cancel()``).
+    """
+
+    def __init__(self, reason: str, query_id: str, elapsed_ms: int):
+        self.reason = reason
+        self.query_id = query_id
+        self.elapsed_ms = elapsed_ms
+        super().__init__(f"Query {query_id} cancelled ({reason}) after {elapsed_ms}ms")
+
+
+@dataclass
+class _ActiveQuery:
+    query_id: str
+    conn: duckdb.DuckDBPyConnection
+    started_at: float = field(default_factory=time.monotonic)
+    cancel_reason: Optional[str] = None
+
+
+class QuerySupervisor:
+    """Tracks in-flight DuckDB queries and interrupts them on demand."""
+
+    def __init__(self, executor: Optional[Executor] = None):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._active: Dict[str, _ActiveQuery] = {}
+        self._cancelled_total: Dict[str, int] = {}
+
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of in-flight queries and cancellation counters."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "active": [
+                    {"query_id": q.query_id, "running_ms": int((now - q.started_at) * 1000)}
+                    for q in self._active.values()
+                ],
+                "cancelled_total": dict(self._cancelled_total),
+            }
+
+    def cancel(self, query_id: str, reason: str = "cancelled") -> bool:
+        """Interrupt an in-flight query. Returns False if it is not running."""
+        with self._lock:
+            active = self._active.get(query_id)
+            if active is None:
+                return False
+            if active.cancel_reason is None:
+                active.cancel_reason = reason
+        try:
+            active.conn.interrupt()
+        except Exception as e:  # connection may have just closed
+            logger.debug("interrupt() failed for query %s: %s", query_id, e)
+        return True
+
+    async def execute(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        sql: str,
+        timeout_s: float,
+        *,
+        query_id: Optional[str] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Tuple[List[str], List[tuple]]:
+        """Run ``sql`` on ``conn`` in a worker thread under supervision.
+
+        Returns ``(columns, rows)``. Raises QueryCancelledError if the query
+        was interrupted; duckdb.Error propagates unchanged for genuine query
+        failures. The worker thread has returned by the time this raises
+        (bounded by INTERRUPT_GRACE_S).
+        """
+        query_id = query_id or uuid.uuid4().hex[:12]
+        active = self._start(query_id, conn)
+
+        def _run() -> Tuple[List[str], List[tuple]]:
+            result = conn.execute(sql)
+            rows = result.fetchall()
+            columns = [desc[0] for desc in result.description]
+            return columns, rows
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, _run)
+        try:
+            await self._wait(active, future, active.started_at + timeout_s, is_disconnected)
+            return self._result(active, future)
+        finally:
+            self._finish(active)
+
+    async def stream(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        open_chunks: Callable[[], Iterator[T]],
+        timeout_s: float,
+        *,
+        query_id: Optional[str] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[T]:
+        """Start a streamed query on ``conn`` and pull its chunks under supervision.
+
+        ``open_chunks()`` starts the query and returns an iterator over its
+        encoded results; it and every ``next()`` run in worker threads, and
+        ``timeout_s`` bounds each of those calls. Time spent suspended at
+        ``yield`` (a slow client) doesn't count. Raises QueryCancelledError
+        like execute(); closing ``conn`` is left to the caller.
+        """
+        query_id = query_id or uuid.uuid4().hex[:12]
+        active = self._start(query_id, conn)
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, open_chunks)
+            await self._wait(active, future, time.monotonic() + timeout_s, is_disconnected)
+            chunks = self._result(active, future)
+            while True:
+                future = loop.run_in_executor(self._executor, next, chunks, _END)
+                await self._wait(active, future, time.monotonic() + timeout_s, is_disconnected)
+                chunk = self._result(active, future)
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            self._finish(active)
+
+    def _start(self, query_id: str, conn: duckdb.DuckDBPyConnection) -> _ActiveQuery:
+        active = _ActiveQuery(query_id=query_id, conn=conn)
+        with self._lock:
+            self._active[query_id] = active
+        return active
+
+    async def _wait(
+        self,
+        active: _ActiveQuery,
+        future: "asyncio.Future",
+        deadline: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+    ) -> None:
+        """Wait for the worker, interrupting on deadline, disconnect or cancellation."""
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.cancel(active.query_id, "timeout")
+                    break
+                wait_s = remaining
+                if is_disconnected is not None:
+                    wait_s = min(wait_s, DISCONNECT_POLL_INTERVAL_S)
+                done, _ = await asyncio.wait({future}, timeout=wait_s)
+                if done:
+                    return
+                if is_disconnected is not None and await is_disconnected():
+                    self.cancel(active.query_id, "client_disconnect")
+                    break
+        except asyncio.CancelledError:
+            self.cancel(active.query_id, "cancelled")
+            await self._drain(future, active.query_id)
+            raise
+
+        await self._drain(future, active.query_id)
+
+    @staticmethod
+    def _result(active: _ActiveQuery, future: "asyncio.Future") -> Any:
+        """The worker's result, or QueryCancelledError if it was interrupted."""
+        try:
+            if future.done():
+                # A query that finished in the same instant it was
+                # interrupted keeps its result.
+                return future.result()
+        except Exception:
+            # Interrupted queries surface as InterruptException (or, mid-fetch,
+            # as other duckdb errors, possibly re-wrapped by the callable);
+            # only genuine failures propagate.
+            if active.cancel_reason is None:
+                raise
+
+        elapsed_ms = int((time.monotonic() - active.started_at) * 1000)
+        raise QueryCancelledError(active.cancel_reason, active.query_id, elapsed_ms)
+
+    async def _drain(self, future: "asyncio.Future", query_id: str) -> None:
+        """Wait (bounded) for the interrupted worker to return."""
+        done, _ = await asyncio.wait({future}, timeout=INTERRUPT_GRACE_S)
+        if done:
+            future.exception()  # mark retrieved; callers re-read via result()
+        else:
+            logger.warning(
+                "Query %s did not stop within %.1fs of interrupt()", query_id, INTERRUPT_GRACE_S,
+            )
+            # Retrieve the eventual exception so it is not reported as unhandled
+            future.add_done_callback(lambda f: f.exception())
+
+    def _finish(self, active: _ActiveQuery) -> None:
+        with self._lock:
+            self._active.pop(active.query_id, None)
+            if active.cancel_reason is not None:
+                self._cancelled_total[active.cancel_reason] = (
+                    self._cancelled_total.get(active.cancel_reason, 0) + 1
+                )
+
+
+# Singleton
+_supervisor: Optional[QuerySupervisor] = None
+
+
+def get_query_supervisor() -> QuerySupervisor:
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = QuerySupervisor()
+    return _supervisor
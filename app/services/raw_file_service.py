@@ -34,6 +34,11 @@ def _get_db_session():
     return get_session_context()
 
 
+def _get_async_db_session():
+    from app.core.database import async_session_context
+    return async_session_context()
+
+
 def _compute_sha256(file_path: str) -> str:
     """Compute SHA256 hex digest of a file using streaming 8KB chunks."""
     h = hashlib.sha256()
@@ -190,16 +195,16 @@ class RawFileService:
         extractor = MetadataExtractor()
         metadata = await extractor.extract(raw_file)
 
-        with _get_db_session() as session:
-            stored_raw_file = session.exec(
+        async with _get_async_db_session() as session:
+            stored_raw_file = (await session.exec(
                 select(RawFile).where(RawFile.id == file_id)
-            ).first()
+            )).first()
             if stored_raw_file is None:
                 raise FileNotFoundError(f"Raw file not found: {file_id}")
 
             stored_raw_file.metadata_ = metadata
             session.add(stored_raw_file)
-            session.commit()
+            await session.commit()
 
         logger.info("Generated %s metadata for file %s", metadata.get("source", "unknown"), file_id)
         return metadata
@@ -3,13 +3,19 @@ Cross-Encoder Reranker Service (BQ-VZ-HYBRID-SEARCH Phase 1A)
 =============================================================
 Lazy-loaded cross-encoder model for reranking search results.
 Includes circuit breaker: if reranking exceeds timeout, returns un-reranked results.
+Scores are cached per (query, point, text) so repeated queries skip the model.
 """
 
+import hashlib
 import logging
+import queue
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple
+
+from cachetools import LRUCache
 
 from app.config import settings
 
@@ -17,6 +23,145 @@ logger = logging.getLogger(__name__)
 
 RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
+# Score cache: (dataset_id, generation, normalized query, point id, text hash,
+# backend) -> cross-encoder score. A dataset's generation is bumped on
+# re-index so its entries stop matching and age out of the LRU.
+_score_cache_lock = threading.Lock()
+_score_cache: "LRUCache[tuple, float]" = LRUCache(maxsize=max(1, settings.reranker_cache_size))
+_score_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+_dataset_generations: Dict[str, int] = {}
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def _score_key(query_norm: str, doc: Dict[str, Any], text: str, backend: Optional[str]) -> tuple:
+    dataset_id = str(doc.get("dataset_id") or "")
+    point_id = doc.get("point_id") or f"{dataset_id}:{doc.get('row_index')}"
+    text_hash = hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+    return (
+        dataset_id, _dataset_generations.get(dataset_id, 0),
+        query_norm, str(point_id), text_hash, backend,
+    )
+
+
+def invalidate_rerank_cache(dataset_id: Optional[str] = None) -> None:
+    """Forget cached scores for one dataset (after re-index), or all of them."""
+    with _score_cache_lock:
+        if dataset_id is None:
+            _score_cache.clear()
+            _dataset_generations.clear()
+        else:
+            _dataset_generations[dataset_id] = _dataset_generations.get(dataset_id, 0) + 1
+
+
+def rerank_cache_info() -> Dict[str, Any]:
+    """Hit/miss counters, hit rate and current size of the score cache."""
+    with _score_cache_lock:
+        lookups = _score_cache_stats["hits"] + _score_cache_stats["misses"]
+        return {
+            **_score_cache_stats,
+            "hit_rate": round(_score_cache_stats["hits"] / lookups, 4) if lookups else 0.0,
+            "size": len(_score_cache),
+            "maxsize": _score_cache.maxsize,
+        }
+
+
+@dataclass
+class _RerankJob:
+    """One rerank() call's pairs, waiting in the scorer queue."""
+    pairs: List[Tuple[str, str]]
+    done: threading.Event = field(default_factory=threading.Event)
+    scores: Optional[List[float]] = None
+    error: Optional[BaseException] = None
+    cancelled: bool = False
+
+
+class _RerankWorker:
+    """
+    Long-lived scorer thread that micro-batches pairs across callers.
+
+    Jobs arriving within ``batch_window_s`` of each other are scored in one
+    ``predict`` call (up to ``max_batch_pairs`` pairs per call). Jobs whose
+    caller gave up are flagged cancelled and dropped before each call, so
+    an abandoned request stops consuming CPU at the next batch boundary.
+    """
+
+    def __init__(self, predict, batch_window_s: float, max_batch_pairs: int):
+        self._predict = predict
+        self._batch_window_s = batch_window_s
+        self._max_batch_pairs = max(1, max_batch_pairs)
+        self._queue: "queue.Queue[Optional[_RerankJob]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="reranker", daemon=True)
+        self._thread.start()
+        self.stats = {"batches": 0, "pairs": 0, "jobs": 0, "cancelled_jobs": 0}
+
+    def submit(self, pairs: List[Tuple[str, str]]) -> _RerankJob:
+        job = _RerankJob(pairs=pairs)
+        self._queue.put(job)
+        return job
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            n_pairs = len(job.pairs)
+            deadline = time.monotonic() + self._batch_window_s
+            while n_pairs < self._max_batch_pairs:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                jobs.append(nxt)
+                n_pairs += len(nxt.pairs)
+            self._score(jobs)
+
+    def _score(self, jobs: List[_RerankJob]) -> None:
+        """Score jobs in predict() calls of at most max_batch_pairs pairs."""
+        results: Dict[int, List[float]] = {id(j): [] for j in jobs}
+        pending = [(j, i) for j in jobs for i in range(len(j.pairs))]
+        while pending:
+            # Drop pairs of jobs abandoned since the last call
+            live = [(j, i) for j, i in pending if not j.cancelled]
+            for j in {id(j): j for j, _ in pending if j.cancelled}.values():
+                self.stats["cancelled_jobs"] += 1
+                j.done.set()
+            pending = live
+            if not pending:
+                break
+            chunk, pending = pending[:self._max_batch_pairs], pending[self._max_batch_pairs:]
+            try:
+                scores = self._predict([j.pairs[i] for j, i in chunk])
+            except Exception as e:
+                failed = {id(j): j for j, _ in chunk}
+                for j in failed.values():
+                    j.error = e
+                    j.done.set()
+                pending = [(j, i) for j, i in pending if id(j) not in failed]
+                continue
+            self.stats["batches"] += 1
+            self.stats["pairs"] += len(chunk)
+            for (j, _), score in zip(chunk, scores):
+                results[id(j)].append(float(score))
+                if len(results[id(j)]) == len(j.pairs):
+                    j.scores = results[id(j)]
+                    self.stats["jobs"] += 1
+                    j.done.set()
+
 
 class RerankerService:
     """Reranks search results using a cross-encoder model with timeout protection."""
@@ -24,10 +169,15 @@ class RerankerService:
     def __init__(self):
         self._model = None
         self._load_time: Optional[float] = None
+        self._backend: Optional[str] = None
         self._consecutive_timeouts: int = 0
         self._circuit_open: bool = False
         # Circuit breaker: open after 3 consecutive timeouts, reset on success
         self._circuit_threshold: int = 3
+        self._worker: Optional[_RerankWorker] = None
+        self._worker_lock = threading.Lock()
+        self._batch_window_s = settings.reranker_batch_window_ms / 1000.0
+        self._max_batch_pairs = settings.reranker_max_batch_pairs
 
     @property
     def model(self):
@@ -37,19 +187,52 @@ class RerankerService:
         return self._model
 
     def _load_model(self):
-        """Load the cross-encoder model."""
+        """Load the cross-encoder model (ONNX int8 when configured and available)."""
         from sentence_transformers import CrossEncoder
 
         start = time.time()
         logger.info("Loading reranker model: %s ...", RERANKER_MODEL)
         print(f"Loading reranker model: {RERANKER_MODEL}...", file=sys.stderr)
 
-        self._model = CrossEncoder(RERANKER_MODEL)
+        max_length = settings.reranker_max_length or None
+        backend = settings.reranker_backend
+        if backend == "onnx_int8":
+            try:
+                self._model = CrossEncoder(
+                    RERANKER_MODEL,
+                    backend="onnx",
+                    model_kwargs={"file_name": settings.reranker_onnx_file},
+                    max_length=max_length,
+                )
+            except Exception as e:
+                # optimum/onnxruntime missing or no export available
+                logger.warning("ONNX int8 reranker unavailable (%s) — using torch backend", e)
+                backend = "torch"
+        if backend == "torch":
+            self._model = CrossEncoder(RERANKER_MODEL, max_length=max_length)
+        self._backend = backend
 
         self._load_time = time.time() - start
-        logger.info("Reranker model loaded in %.2fs", self._load_time)
+        logger.info("Reranker model loaded in %.2fs (%s backend)", self._load_time, backend)
         print(f"Reranker model loaded in {self._load_time:.2f}s", file=sys.stderr)
 
+    def _predict(self, pairs: List[Tuple[str, str]]):
+        return self.model.predict(pairs)
+
+    def _get_worker(self) -> _RerankWorker:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = _RerankWorker(
+                    self._predict, self._batch_window_s, self._max_batch_pairs,
+                )
+            return self._worker
+
+    def _record_timeout(self) -> None:
+        self._consecutive_timeouts += 1
+        if self._consecutive_timeouts >= self._circuit_threshold:
+            self._circuit_open = True
+            logger.error("Reranker circuit breaker OPENED after %d consecutive timeouts", self._circuit_threshold)
+
     def rerank(
         self,
         query: str,
@@ -84,38 +267,50 @@ class RerankerService:
         timeout_ms = settings.reranker_timeout_ms
 
         try:
-            # Build query-document pairs
-            pairs = []
+            # Build query-document pairs and look up cached scores
+            query_norm = _normalize_query(query)
+            pairs, keys = [], []
             for doc in documents:
                 text = doc.get(text_key, "")
                 if not text:
                     text = str(doc.get("row_data", ""))
                 pairs.append((query, text))
 
+            # Load the model (first call only) outside the timeout budget
+            self.model
+
+            scores: List[Optional[float]] = [None] * len(documents)
+            with _score_cache_lock:
+                for i, (doc, (_, text)) in enumerate(zip(documents, pairs)):
+                    key = _score_key(query_norm, doc, text, self._backend)
+                    keys.append(key)
+                    scores[i] = _score_cache.get(key)
+                n_hits = sum(s is not None for s in scores)
+                _score_cache_stats["hits"] += n_hits
+                _score_cache_stats["misses"] += len(scores) - n_hits
+            misses = [i for i, s in enumerate(scores) if s is None]
+
             start = time.time()
             timeout_sec = timeout_ms / 1000.0
 
-            # Run predict() in a thread with hard timeout.
-            # Don't use context manager — __exit__ calls shutdown(wait=True)
-            # which blocks until the worker finishes, defeating the timeout.
-            pool = ThreadPoolExecutor(max_workers=1)
-            future = pool.submit(self.model.predict, pairs)
-            try:
-                scores = future.result(timeout=timeout_sec)
-            except FuturesTimeoutError:
-                # Fire-and-forget: let the worker finish on its own
-                pool.shutdown(wait=False, cancel_futures=True)
-                logger.warning(
-                    "Reranker hard timeout after %dms — returning un-reranked results",
-                    timeout_ms,
-                )
-                self._consecutive_timeouts += 1
-                if self._consecutive_timeouts >= self._circuit_threshold:
-                    self._circuit_open = True
-                    logger.error("Reranker circuit breaker OPENED after %d consecutive timeouts", self._circuit_threshold)
-                return documents[:top_k]
-            else:
-                pool.shutdown(wait=False)
+            # Score the misses on the shared worker; on timeout flag the job
+            # so the worker skips whatever of it has not been scored yet.
+            if misses:
+                job = self._get_worker().submit([pairs[i] for i in misses])
+                if not job.done.wait(timeout_sec):
+                    job.cancelled = True
+                    logger.warning(
+                        "Reranker hard timeout after %dms — returning un-reranked results",
+                        timeout_ms,
+                    )
+                    self._record_timeout()
+                    return documents[:top_k]
+                if job.error is not None:
+                    raise job.error
+                with _score_cache_lock:
+                    for i, score in zip(misses, job.scores):
+                        scores[i] = score
+                        _score_cache[keys[i]] = score
 
             elapsed_ms = (time.time() - start) * 1000
 
@@ -124,10 +319,7 @@ class RerankerService:
                     "Reranker exceeded timeout: %.0fms > %dms — results still used but timeout counted",
                     elapsed_ms, timeout_ms,
                 )
-                self._consecutive_timeouts += 1
-                if self._consecutive_timeouts >= self._circuit_threshold:
-                    self._circuit_open = True
-                    logger.error("Reranker circuit breaker OPENED after %d consecutive timeouts", self._circuit_threshold)
+                self._record_timeout()
             else:
                 # Reset on success within timeout
                 self._consecutive_timeouts = 0
@@ -141,14 +333,15 @@ class RerankerService:
 
             scored_docs.sort(key=lambda x: x["rerank_score"], reverse=True)
 
-            logger.debug("Reranked %d docs in %.0fms", len(documents), elapsed_ms)
+            logger.debug(
+                "Reranked %d docs (%d cached) in %.0fms",
+                len(documents), len(documents) - len(misses), elapsed_ms,
+            )
             return scored_docs[:top_k]
 
         except Exception as e:
             logger.error("Reranker failed: %s — returning un-reranked results", e)
-            self._consecutive_timeouts += 1
-            if self._consecutive_timeouts >= self._circuit_threshold:
-                self._circuit_open = True
+            self._record_timeout()
             return documents[:top_k]
 
     def reset_circuit_breaker(self):
@@ -159,13 +352,25 @@ class RerankerService:
     def is_loaded(self) -> bool:
         return self._model is not None
 
+    def close(self) -> None:
+        """Stop the scorer thread (a new one starts on the next rerank)."""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.close()
+
     def get_info(self) -> Dict[str, Any]:
+        worker = self._worker
         return {
             "model_name": RERANKER_MODEL,
+            "backend": self._backend,
             "loaded": self.is_loaded(),
             "load_time_seconds": self._load_time,
             "circuit_open": self._circuit_open,
             "consecutive_timeouts": self._consecutive_timeouts,
+            "queue_depth": worker.queue_depth() if worker else 0,
+            "batching": dict(worker.stats) if worker else None,
+            "cache": rerank_cache_info(),
         }
 
 
@@ -136,6 +136,7 @@ class SearchService:
                     all_results.append({
                         "dataset_id": ds_id,
                         "dataset_name": dataset_info.get("filename", ds_id),
+                        "point_id": result.get("id"),
                         "score": round(result["score"], 4),
                         "row_index": result["payload"].get("row_index"),
                         "text_content": result["payload"].get("text_content"),
@@ -152,33 +153,22 @@ class SearchService:
                 logger.warning("Search failed for %s: %s", collection_name, e)
                 continue
 
-        # Stage 4: FTS merge (if enabled and index ready)
-        if settings.fts_enabled and dataset_id:
+        # Stage 4: FTS merge (if enabled and index ready) — BM25 fans out
+        # across every searched dataset and is fused with the vector ranking
+        # by reciprocal rank.
+        if settings.fts_enabled:
             try:
-                from app.services.fts_service import search_fts, get_fts_status
-                if get_fts_status(dataset_id) == "ready":
-                    fts_results = search_fts(query, dataset_id, limit=fetch_limit)
-                    if fts_results:
-                        stages_active.append("fts_bm25")
-                        # Merge FTS results — deduplicate by row_index
-                        existing_rows = {r.get("row_index") for r in all_results}
-                        dataset_info = self._get_dataset_info(dataset_id)
-                        for fts_row in fts_results:
-                            row_idx = fts_row.get("rowid")
-                            if row_idx not in existing_rows:
-                                all_results.append({
-                                    "dataset_id": dataset_id,
-                                    "dataset_name": dataset_info.get("filename", dataset_id),
-                                    "score": round(fts_row.get("score", 0.0), 4),
-                                    "row_index": row_idx,
-                                    "text_content": str(fts_row),
-                                    "row_data": fts_row,
-                                })
+                from app.services.fts_service import search_fts_many
+                fts_datasets = [c.replace("dataset_", "") for c in collections]
+                fts_by_dataset = search_fts_many(query, fts_datasets, limit=fetch_limit)
+                if fts_by_dataset:
+                    stages_active.append("fts_bm25")
+                    all_results = self._rrf_merge(all_results, fts_by_dataset)
             except Exception as e:
                 logger.warning("FTS merge failed: %s", e)
 
-        # Sort by score before reranking
-        all_results.sort(key=lambda x: x["score"], reverse=True)
+        # Sort by fused rank (or raw score when nothing was fused) before reranking
+        all_results.sort(key=lambda x: x.get("rrf_score", x["score"]), reverse=True)
 
         # Cap candidates to reranker_top_k BEFORE passing to reranker
         # This ensures the cross-encoder never processes more than top_k pairs
@@ -221,6 +211,53 @@ class SearchService:
             "stages_active": stages_active,
         }
 
+    def _rrf_merge(
+        self,
+        vector_results: List[Dict[str, Any]],
+        fts_by_dataset: Dict[str, List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Reciprocal-rank fusion of the vector ranking with per-dataset BM25
+        rankings. Raw BM25 scores are not comparable across datasets (or with
+        cosine scores), so only ranks contribute: each list adds
+        ``1 / (hybrid_rrf_k + rank)`` to a row's ``rrf_score``. Rows are
+        deduplicated by (dataset_id, row_index).
+        """
+        k = settings.hybrid_rrf_k
+        merged: Dict[Any, Dict[str, Any]] = {}
+
+        ranked = sorted(vector_results, key=lambda x: x["score"], reverse=True)
+        for rank, result in enumerate(ranked, start=1):
+            key = (result["dataset_id"], result.get("row_index"))
+            if key in merged:
+                continue
+            result["rrf_score"] = 1.0 / (k + rank)
+            merged[key] = result
+
+        for ds_id, fts_rows in fts_by_dataset.items():
+            dataset_info = self._get_dataset_info(ds_id)
+            for rank, fts_row in enumerate(fts_rows, start=1):
+                row_idx = fts_row.get("rowid")
+                contribution = 1.0 / (k + rank)
+                existing = merged.get((ds_id, row_idx))
+                if existing is not None:
+                    existing["rrf_score"] += contribution
+                    continue
+                row_data = {c: v for c, v in fts_row.items() if c not in ("rowid", "score")}
+                merged[(ds_id, row_idx)] = {
+                    "dataset_id": ds_id,
+                    "dataset_name": dataset_info.get("filename", ds_id),
+                    "score": round(fts_row.get("score", 0.0), 4),
+                    "row_index": row_idx,
+                    "text_content": str(row_data),
+                    "row_data": row_data,
+                    "rrf_score": contribution,
+                }
+
+        for result in merged.values():
+            result["rrf_score"] = round(result["rrf_score"], 6)
+        return list(merged.values())
+
     def search_dataset(
         self,
         dataset_id: str,
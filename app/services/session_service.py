@@ -13,11 +13,36 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timezone
 
+from sqlalchemy import case, or_
+from sqlalchemy.orm import aliased
 from sqlmodel import Session as DBSession, select, func, desc
 
 from app.models.state import Session, Message, MessageRole
 
 
+# Estimation heuristic shared with ContextWindowManager (~4 chars per token)
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: Optional[str], chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    """Estimate token count from text length (0 for empty text)."""
+    if not text:
+        return 0
+    return max(1, int(len(text) / chars_per_token))
+
+
+def stamp_message_tokens(session: Session, message: Message) -> None:
+    """Fill in token_count and cumulative_tokens before a message is inserted.
+
+    Advances session.total_tokens, so the caller must add both objects in
+    the same commit. Every code path that inserts a Message calls this.
+    """
+    if message.token_count is None:
+        message.token_count = estimate_tokens(message.content)
+    session.total_tokens = (session.total_tokens or 0) + message.token_count
+    message.cumulative_tokens = session.total_tokens
+
+
 class SessionService:
     """
     Service for managing Chat Sessions and Messages.
@@ -205,6 +230,7 @@ class SessionService:
         )
         
         # Update session stats
+        stamp_message_tokens(session, message)
         session.total_message_count += 1
         session.updated_at = datetime.now(timezone.utc)
         
@@ -249,6 +275,122 @@ class SessionService:
         )
         return list(self.db.exec(statement).all())
 
+    def get_system_messages(self, session_id: UUID) -> List[Message]:
+        """Get a session's system messages, ordered chronologically."""
+        statement = (
+            select(Message)
+            .where(Message.session_id == session_id)
+            .where(Message.role == MessageRole.SYSTEM)
+            .order_by(Message.cumulative_tokens, Message.created_at)
+        )
+        return list(self.db.exec(statement).all())
+
+    def count_conversation_messages(self, session_id: UUID) -> int:
+        """Count a session's non-system messages."""
+        statement = (
+            select(func.count())
+            .select_from(Message)
+            .where(Message.session_id == session_id)
+            .where(Message.role != MessageRole.SYSTEM)
+        )
+        return self.db.exec(statement).one()
+
+    def get_conversation_window(
+        self,
+        session_id: UUID,
+        max_tokens: int,
+        min_recent: int = 0,
+        system_tokens: int = 0,
+    ) -> List[Message]:
+        """
+        Get the newest non-system messages whose token total fits a budget.
+
+        One query: a window SUM over messages ordered newest-first gives each
+        message the token total from it to the end of the conversation; rows
+        whose total is within ``max_tokens`` are kept. The newest
+        ``min_recent`` messages are always kept, even over budget. Rows are
+        pre-filtered to a range on the (session_id, cumulative_tokens) index.
+        System messages also count toward cumulative_tokens, so
+        ``system_tokens`` (their session total) widens that range to stay
+        exact.
+
+        Args:
+            session_id: UUID of the session
+            max_tokens: Token budget for the returned messages
+            min_recent: Number of newest messages to keep regardless of budget
+            system_tokens: Sum of token_count over the session's system messages
+
+        Returns:
+            Messages in chronological order
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return []
+        floor = (session.total_tokens or 0) - max_tokens - system_tokens
+        is_conversation = (Message.session_id == session_id, Message.role != MessageRole.SYSTEM)
+        newest_first = (desc(Message.cumulative_tokens), desc(Message.created_at))
+
+        lower_bound = floor
+        if min_recent > 0:
+            # Widen the range to reach the min_recent-th newest message (or
+            # everything, when there are fewer) so the recency keep still applies
+            nth_recent = (
+                select(Message.cumulative_tokens)
+                .where(*is_conversation)
+                .order_by(*newest_first)
+                .offset(min_recent - 1)
+                .limit(1)
+                .scalar_subquery()
+            )
+            nth_recent = func.coalesce(nth_recent, -1)
+            lower_bound = case((nth_recent < floor, nth_recent), else_=floor)
+        ranked = (
+            select(
+                Message,
+                func.sum(Message.token_count)
+                .over(order_by=newest_first, rows=(None, 0))
+                .label("suffix_tokens"),
+                func.row_number().over(order_by=newest_first).label("recency"),
+            )
+            .where(*is_conversation)
+            .where(Message.cumulative_tokens >= lower_bound)
+            .subquery()
+        )
+        windowed = aliased(Message, ranked)
+        statement = (
+            select(windowed)
+            .where(or_(ranked.c.recency <= min_recent, ranked.c.suffix_tokens <= max_tokens))
+            .order_by(ranked.c.cumulative_tokens, ranked.c.created_at)
+        )
+        return list(self.db.exec(statement).all())
+
+    def get_conversation_range(
+        self,
+        session_id: UUID,
+        after_tokens: int,
+        through_tokens: int,
+    ) -> List[Message]:
+        """Get non-system messages with after_tokens < cumulative_tokens <= through_tokens."""
+        statement = (
+            select(Message)
+            .where(Message.session_id == session_id)
+            .where(Message.role != MessageRole.SYSTEM)
+            .where(Message.cumulative_tokens > after_tokens)
+            .where(Message.cumulative_tokens <= through_tokens)
+            .order_by(Message.cumulative_tokens, Message.created_at)
+        )
+        return list(self.db.exec(statement).all())
+
+    def save_context_summary(self, session_id: UUID, summary: str, through_tokens: int) -> None:
+        """Cache the rolling summary of history up to cumulative_tokens == through_tokens."""
+        session = self.get_session(session_id)
+        if not session:
+            return
+        session.context_summary = summary
+        session.context_summary_through = through_tokens
+        self.db.add(session)
+        self.db.commit()
+
     def count_tokens(self, session_id: UUID) -> int:
         """
         Calculate total tokens used in a session.
@@ -14,13 +14,23 @@ Rules (enforced by pattern matching + optional AST validation):
 When sqlglot is available, an additional AST validation pass verifies statement
 types, table references, and function calls at the structural level.
 
+Verdicts are memoized in a process-wide LRU (BQ-VZ-PERF): agents, MCP and
+Copilot repeat the same statements constantly, and the regex + sqlglot pass
+is pure given the SQL text, the allowed table set and the rule sets. All
+three are part of the cache key, so changing datasets or the blocked
+function/statement lists can never serve a stale verdict.
+
 PHASE: BQ-ALLAI-B0 — Security Infrastructure
 CREATED: 2026-02-16
 """
 
 import logging
 import re
-from typing import Set, Tuple
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Set, Tuple
+
+from cachetools import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +95,60 @@ _CTE_NAME_PATTERN = re.compile(
 )
 
 
+# Pseudo-tables that may appear after FROM/JOIN without being datasets
+_PSEUDO_TABLES = frozenset({"dual", "generate_series", "range", "unnest"})
+
+VALIDATION_CACHE_SIZE = 2048
+
+
+@dataclass(frozen=True)
+class SandboxVerdict:
+    """Cached outcome of validating one SQL statement.
+
+    ``tables`` are the dataset tables the statement references (CTE names and
+    pseudo-tables excluded); ``clean_sql`` is the statement with surrounding
+    whitespace and trailing semicolons removed, ready for LIMIT wrapping.
+    """
+
+    is_valid: bool
+    error: str
+    tables: FrozenSet[str]
+    clean_sql: str
+
+
+_cache_lock = threading.Lock()
+_validation_cache: "LRUCache[tuple, SandboxVerdict]" = LRUCache(maxsize=VALIDATION_CACHE_SIZE)
+_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def _rules_fingerprint() -> tuple:
+    """Snapshot of the rule sets — changes whenever an allow/block list changes."""
+    return (
+        frozenset(BLOCKED_STATEMENTS),
+        frozenset(BLOCKED_FUNCTIONS),
+        frozenset(EXTERNAL_BLOCKED_FUNCTIONS),
+        frozenset(EXTERNAL_BLOCKED_PATTERNS),
+        frozenset(EXTERNAL_BLOCKED_SCHEMAS),
+        SQLGLOT_AVAILABLE,
+    )
+
+
+def invalidate_validation_cache() -> None:
+    """Drop every cached verdict (e.g. after patching rule sets in place)."""
+    with _cache_lock:
+        _validation_cache.clear()
+
+
+def validation_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the verdict cache."""
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_validation_cache)}
+
+
+def _clean_sql(sql: str) -> str:
+    return sql.strip().rstrip(";").strip()
+
+
 class SQLSandbox:
     """
     Validates SQL queries before execution.
@@ -100,6 +164,25 @@ class SQLSandbox:
                            (e.g., {"dataset_abc123", "dataset_def456"})
         """
         self.allowed_tables = {t.lower() for t in allowed_tables}
+        # Dataset-set version for the verdict cache key
+        self._tables_key: FrozenSet[str] = frozenset(self.allowed_tables)
+
+    def check(self, sql: str) -> SandboxVerdict:
+        """Validate (internal mode) and return the full, possibly cached, verdict."""
+        return self._cached(("internal", 0), sql, self._validate_uncached)
+
+    def check_external(self, sql: str, max_length: int = 4096) -> SandboxVerdict:
+        """Validate (external mode) and return the full, possibly cached, verdict."""
+        # Length depends on the raw text, so it is checked outside the cache
+        if sql and sql.strip() and len(sql) > max_length:
+            return SandboxVerdict(
+                False, f"SQL exceeds maximum length of {max_length} characters",
+                frozenset(), _clean_sql(sql),
+            )
+        return self._cached(
+            ("external", max_length), sql,
+            lambda s: self._validate_external_uncached(s, max_length),
+        )
 
     def validate(self, sql: str) -> Tuple[bool, str]:
         """
@@ -107,6 +190,54 @@ class SQLSandbox:
 
         Returns: (is_valid, error_message)
         """
+        verdict = self.check(sql)
+        return verdict.is_valid, verdict.error
+
+    def _cached(self, mode: tuple, sql: str, validator) -> SandboxVerdict:
+        """Look up / populate the verdict cache.
+
+        The key normalizes only surrounding whitespace: every check is
+        insensitive to it, while inner whitespace can matter (comments).
+        """
+        normalized = (sql or "").strip()
+        key = (mode, normalized, self._tables_key, _rules_fingerprint())
+        with _cache_lock:
+            verdict = _validation_cache.get(key)
+            if verdict is not None:
+                _cache_stats["hits"] += 1
+                return verdict
+            _cache_stats["misses"] += 1
+
+        is_valid, error = validator(normalized)
+        verdict = SandboxVerdict(
+            is_valid=is_valid,
+            error=error,
+            tables=self._referenced_tables(_clean_sql(normalized)) if is_valid else frozenset(),
+            clean_sql=_clean_sql(normalized),
+        )
+        with _cache_lock:
+            _validation_cache[key] = verdict
+        return verdict
+
+    @staticmethod
+    def _cte_names(sql_stripped: str) -> Set[str]:
+        cte_names = set()
+        for match in _CTE_NAME_PATTERN.finditer(sql_stripped):
+            name = match.group(1) or match.group(2)
+            if name:
+                cte_names.add(name.lower())
+        return cte_names
+
+    def _referenced_tables(self, sql_stripped: str) -> FrozenSet[str]:
+        """Dataset tables named in FROM/JOIN clauses (CTEs and pseudo-tables excluded)."""
+        cte_names = self._cte_names(sql_stripped)
+        return frozenset(
+            t.lower() for _, t in _TABLE_REF_PATTERN.findall(sql_stripped)
+            if t.lower() not in _PSEUDO_TABLES and t.lower() not in cte_names
+        )
+
+    def _validate_uncached(self, sql: str) -> Tuple[bool, str]:
+        """Internal-mode checks (no cache)."""
         if not sql or not sql.strip():
             return False, "Empty SQL query"
 
@@ -145,17 +276,13 @@ class SQLSandbox:
 
         # 5. Table access validation — extract table references and verify
         # First, extract CTE alias names so they're treated as "allowed"
-        cte_names = set()
-        for match in _CTE_NAME_PATTERN.finditer(sql_stripped):
-            name = match.group(1) or match.group(2)
-            if name:
-                cte_names.add(name.lower())
+        cte_names = self._cte_names(sql_stripped)
 
         table_refs = _TABLE_REF_PATTERN.findall(sql_stripped)
         for schema, table_name in table_refs:
             table_lower = table_name.lower()
             # Skip common SQL pseudo-tables, subquery aliases, and CTE names
-            if table_lower in ("dual", "generate_series", "range", "unnest"):
+            if table_lower in _PSEUDO_TABLES:
                 continue
             if table_lower in cte_names:
                 continue
@@ -182,6 +309,11 @@ class SQLSandbox:
 
         BQ-MCP-RAG: §4.3 external mode.
         """
+        verdict = self.check_external(sql, max_length)
+        return verdict.is_valid, verdict.error
+
+    def _validate_external_uncached(self, sql: str, max_length: int = 4096) -> Tuple[bool, str]:
+        """External-mode checks (no cache)."""
         if not sql or not sql.strip():
             return False, "Empty SQL query"
 
@@ -190,7 +322,7 @@ class SQLSandbox:
             return False, f"SQL exceeds maximum length of {max_length} characters"
 
         # Run all standard checks first
-        is_valid, error = self.validate(sql)
+        is_valid, error = self._validate_uncached(sql)
         if not is_valid:
             return is_valid, error
 
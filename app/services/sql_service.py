@@ -5,16 +5,22 @@ Allows safe SELECT queries against processed datasets.
 Uses ephemeral DuckDB connections with views — no SQL rewriting.
 """
 
+import asyncio
+import io
 import re
-from typing import Optional, List, Dict, Any, Tuple
+from functools import partial
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Tuple
 from datetime import datetime
 from pathlib import Path
 
 import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from app.config import settings
 from app.services.duckdb_service import ephemeral_duckdb_service
 from app.services.processing_service import get_processing_service, ProcessingService, ProcessingStatus
+from app.services.query_supervisor import get_query_supervisor
 from app.utils.sanitization import sql_quote_literal
 
 
@@ -61,6 +67,37 @@ DATASET_ID_REGEX = re.compile(r'^[a-zA-Z0-9_-]+$')
 # Default limits
 DEFAULT_ROW_LIMIT = 1000
 MAX_ROW_LIMIT = 10000
+
+# Streamed result formats (content-negotiated via Accept header).
+# Rows never pass through Python objects, so the cap can be much higher.
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_FORMATS = {"arrow": ARROW_STREAM_MEDIA_TYPE, "ndjson": NDJSON_MEDIA_TYPE}
+MAX_STREAM_ROW_LIMIT = 1_000_000
+STREAM_BATCH_ROWS = 10_000
+# Longest DuckDB may spend starting a streamed query or producing one chunk
+# (matches run_sync's default); a slow client reading the response is not timed
+STREAM_TIMEOUT_S = 30
+
+
+def negotiate_stream_format(accept: Optional[str]) -> Optional[str]:
+    """Pick a streamed result format from the Accept header.
+
+    Returns "arrow" or "ndjson", or None for the default JSON body. Media
+    ranges are honoured in the order given; quality values are ignored.
+    """
+    if not accept:
+        return None
+    for media_range in accept.split(","):
+        media_type = media_range.split(";", 1)[0].strip().lower()
+        for fmt, stream_type in STREAM_FORMATS.items():
+            if media_type == stream_type:
+                return fmt
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+    return None
+
+
 class SQLValidationError(Exception):
     """Raised when SQL query fails validation."""
     pass
@@ -319,6 +356,170 @@ class SQLService:
             finally:
                 conn.close()
 
+    def connect(self) -> "duckdb.DuckDBPyConnection":
+        """Open an ephemeral connection for ``open_stream(conn=...)``; the caller closes it."""
+        with ephemeral_duckdb_service() as duckdb_svc:
+            return duckdb_svc.create_ephemeral_connection()
+
+    def open_stream(
+        self,
+        query: str,
+        fmt: str,
+        dataset_id: Optional[str] = None,
+        limit: int = DEFAULT_ROW_LIMIT,
+        offset: int = 0,
+        conn: Optional["duckdb.DuckDBPyConnection"] = None,
+    ) -> Iterator[bytes]:
+        """
+        Execute a SQL query and return an iterator of encoded result chunks.
+
+        Validation, view creation and query start happen eagerly so errors
+        raise here (before any response bytes are sent). The returned iterator
+        pulls one record batch at a time from DuckDB. Unless *conn* is given,
+        it owns an ephemeral connection, closing it when exhausted or
+        garbage-collected.
+
+        Args:
+            query: SQL SELECT query
+            fmt: "arrow" (Arrow IPC stream) or "ndjson" (one JSON object per line)
+            dataset_id: If provided, query runs against this dataset only
+            limit: Maximum rows to return (capped at MAX_STREAM_ROW_LIMIT)
+            offset: Row offset for pagination
+            conn: Connection to run on, left open (see stream_query())
+
+        Raises:
+            SQLValidationError: Query fails validation (400)
+            ValueError: Unknown format, dataset not found, or query failed (400)
+        """
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Unsupported result format: {fmt}")
+
+        is_valid, error = self.validate_query(query)
+        if not is_valid:
+            raise SQLValidationError(error)
+
+        limit = min(limit, MAX_STREAM_ROW_LIMIT)
+        _ds_views = self._resolve_datasets(dataset_id)
+
+        clean_query = self._strip_trailing_semicolons(query)
+        wrapped_query = self._wrap_with_pagination(clean_query, limit, offset)
+        if fmt == "ndjson":
+            # DuckDB renders each row as a JSON object natively (vectorized)
+            wrapped_query = f"SELECT to_json(_r) AS __row FROM ({wrapped_query}) AS _r"
+
+        close = None
+        if conn is None:
+            conn = self.connect()
+            close = conn.close
+        try:
+            self._create_views(conn, _ds_views)
+            reader = conn.execute(wrapped_query).fetch_record_batch(STREAM_BATCH_ROWS)
+        except duckdb.Error as e:
+            if close is not None:
+                close()
+            raise ValueError(f"Query execution failed: {self._redact(str(e))}")
+        except Exception:
+            if close is not None:
+                close()
+            raise
+
+        if fmt == "arrow":
+            return self._iter_arrow_ipc(reader, close)
+        return self._iter_ndjson(reader, close)
+
+    async def stream_query(
+        self,
+        query: str,
+        fmt: str,
+        dataset_id: Optional[str] = None,
+        limit: int = DEFAULT_ROW_LIMIT,
+        offset: int = 0,
+        *,
+        timeout_s: float = STREAM_TIMEOUT_S,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Run open_stream() under the QuerySupervisor.
+
+        ``timeout_s`` bounds starting the query and producing each chunk,
+        not the time the client takes to read them; on timeout, client
+        disconnect or cancellation the DuckDB query is interrupted
+        (QueryCancelledError). Returns once the first chunk is
+        ready, so query errors still raise before any response bytes are
+        sent. The connection is closed however the stream ends.
+        """
+        conn = await asyncio.to_thread(self.connect)
+        chunks = get_query_supervisor().stream(
+            conn,
+            partial(self.open_stream, query, fmt, dataset_id, limit, offset, conn=conn),
+            timeout_s,
+            is_disconnected=is_disconnected,
+        )
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except BaseException:
+            await chunks.aclose()
+            conn.close()
+            raise
+        return self._iter_supervised(conn, first, chunks)
+
+    @staticmethod
+    async def _iter_supervised(
+        conn: "duckdb.DuckDBPyConnection", first: Optional[bytes], chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Yield the primed first chunk, then the rest; close the connection at the end."""
+        try:
+            if first is not None:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            await chunks.aclose()
+            conn.close()
+
+    @staticmethod
+    def _iter_arrow_ipc(
+        reader: pa.RecordBatchReader, close: Optional[Callable[[], None]] = None
+    ) -> Iterator[bytes]:
+        """Encode record batches as an Arrow IPC stream, one chunk per batch."""
+        sink = io.BytesIO()
+        try:
+            with pa.ipc.new_stream(sink, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    yield sink.getvalue()
+                    sink.seek(0)
+                    sink.truncate(0)
+            # Remaining bytes: schema (for empty results) + end-of-stream marker
+            yield sink.getvalue()
+        finally:
+            if close is not None:
+                close()
+
+    @staticmethod
+    def _iter_ndjson(
+        reader: pa.RecordBatchReader, close: Optional[Callable[[], None]] = None
+    ) -> Iterator[bytes]:
+        """Join the pre-rendered JSON rows of each batch into one NDJSON chunk."""
+        try:
+            for batch in reader:
+                if batch.num_rows == 0:
+                    continue
+                rows = batch.column(0)
+                lines = pa.ListArray.from_arrays(
+                    pa.array([0, len(rows)], type=pa.int32()), rows,
+                )
+                yield pc.binary_join(lines, "\n")[0].as_py().encode("utf-8") + b"\n"
+        finally:
+            if close is not None:
+                close()
+
+    def _redact(self, error_msg: str) -> str:
+        """Hide the processed-data directory in user-facing error messages."""
+        return error_msg.replace(str(self.processed_dir), "[data]")
+
     def _serialize_results(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Serialize query results to JSON-compatible format."""
         serialized = []
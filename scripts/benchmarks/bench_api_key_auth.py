@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local API Key Auth Benchmark (BQ-VZ-PERF)
+=========================================
+
+Creates N local users with one ``vz_`` key each in a SQLite state DB and
+drives get_current_user from C concurrent clients, reporting authenticated
+requests per second:
+  1. Old miss   — the previous validation: sync session on the event loop,
+                  select key, load user, commit a last_used_at write
+  2. New miss   — read-only joined lookup in a worker thread, last_used_at
+                  recorded in memory and bulk-flushed
+  3. Cached     — verified key served from the key_id + digest cache
+
+Miss paths clear the cache before every request (a cold cache, or every
+key after auth_cache_ttl).
+
+Usage:
+    python scripts/benchmarks/bench_api_key_auth.py [--keys 50]
+        [--clients 32] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_api_key_auth_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+os.environ.setdefault("VECTORAIZ_AUTH_ENABLED", "true")
+
+from datetime import datetime, timezone  # noqa: E402
+from unittest.mock import patch  # noqa: E402
+
+from sqlmodel import SQLModel, select  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.auth import api_key_auth as auth  # noqa: E402
+from app.core.database import get_engine, get_session_context  # noqa: E402
+from app.models.local_auth import LocalAPIKey, LocalUser  # noqa: E402
+
+
+def _seed(n: int) -> list:
+    keys = []
+    with get_session_context() as session:
+        for i in range(n):
+            user = LocalUser(username=f"user{i}", password_hash="x")
+            session.add(user)
+            session.flush()
+            key_id, secret = f"k{i:07d}", f"{i:032d}"
+            session.add(LocalAPIKey(
+                user_id=user.id, key_id=key_id, key_hash=auth.hmac_hash_secret(secret),
+            ))
+            keys.append(f"vz_{key_id}_{secret}")
+        session.commit()
+    return keys
+
+
+async def _old_validate(api_key: str):
+    """The pre-change _validate_local_key: blocking read + write on the loop."""
+    key_id, secret = auth._parse_local_key(api_key)
+    with get_session_context() as session:
+        key_record = session.exec(select(LocalAPIKey).where(
+            LocalAPIKey.key_id == key_id, LocalAPIKey.revoked_at.is_(None),
+        )).first()
+        if not key_record or key_record.key_hash != auth.hmac_hash_secret(secret):
+            return None
+        user = session.get(LocalUser, key_record.user_id)
+        if not user or not user.is_active:
+            return None
+        key_record.last_used_at = datetime.now(timezone.utc)
+        session.add(key_record)
+        session.commit()
+        return auth.AuthenticatedUser(user_id=user.id, key_id=key_id, scopes=["read", "write"])
+
+
+def _request(api_key: str) -> Request:
+    return Request({"type": "http", "headers": [(b"x-api-key", api_key.encode())]})
+
+
+async def _rps(keys: list, clients: int, total: int, cold: bool) -> float:
+    per_client = total // clients
+
+    async def client(c: int) -> None:
+        for i in range(per_client):
+            if cold:
+                auth.api_key_cache.clear()
+            user = await auth.get_current_user(_request(keys[(c + i) % len(keys)]))
+            assert user.user_id
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(clients)))
+    return per_client * clients / (time.perf_counter() - start)
+
+
+async def _main(args) -> None:
+    SQLModel.metadata.create_all(get_engine())
+    keys = _seed(args.keys)
+    print(f"{args.keys} keys, {args.clients} concurrent clients, {args.requests:,} requests")
+
+    with patch.object(auth, "_validate_local_key", _old_validate):
+        old = await _rps(keys, args.clients, args.requests, cold=True)
+    new = await _rps(keys, args.clients, args.requests, cold=True)
+    flushed = await auth.flush_last_used()
+    cached = await _rps(keys, args.clients, args.requests * 10, cold=False)
+
+    print(f"  old miss (write per auth)   : {old:10,.0f} req/s")
+    print(f"  new miss (read-only, thread): {new:10,.0f} req/s  ({new / old:,.1f}x)"
+          f"  — {flushed} keys flushed in one UPDATE batch")
+    print(f"  cached (key_id + digest)    : {cached:10,.0f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--keys", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Artifact Listing Benchmark (BQ-VZ-PERF)
+=======================================
+
+Seeds N artifact directories (default 50,000 spread over 10 users) and
+measures, for one user's listing:
+  1. Scan      — the old path: walk every directory, parse every sidecar
+  2. Index     — first page, a deep keyset page and a filtered page from
+                 the SQLite metadata index
+  3. Reconcile — cold index build, and a no-drift reconcile pass
+
+Usage:
+    python scripts/benchmarks/bench_artifact_list.py [--artifacts 50000]
+        [--users 10] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_artifacts_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+from app.services.artifacts_service import (  # noqa: E402
+    INDEX_DB_NAME,
+    SCHEMA_VERSION,
+    Artifact,
+    ArtifactsService,
+)
+
+FORMATS = ["txt", "csv", "json", "md"]
+
+
+def _seed(root: Path, n: int, users: int) -> None:
+    start = datetime.now(timezone.utc) - timedelta(days=3)
+    for i in range(n):
+        artifact_id = str(uuid.uuid4())
+        d = root / artifact_id
+        d.mkdir()
+        fmt = FORMATS[i % len(FORMATS)]
+        (d / f"content.{fmt}").write_text(f"content {i}")
+        meta = Artifact(
+            id=artifact_id, schema_version=SCHEMA_VERSION, filename=f"file{i}.{fmt}",
+            format=fmt, size_bytes=10, content_hash="0" * 64,
+            created_at=(start + timedelta(seconds=i)).isoformat(),
+            source="bench", source_ref=None, description=None, dataset_refs=[],
+            user_id=f"user{i % users}", starred=i % 17 == 0, expired=False,
+        )
+        (d / "metadata.json").write_text(json.dumps(meta.to_dict()))
+
+
+def _scan_list(root: Path, user_id: str, limit: int):
+    """The pre-index listing: parse every sidecar, filter, sort, slice."""
+    artifacts = []
+    for entry in root.iterdir():
+        meta_path = entry / "metadata.json"
+        if not entry.is_dir() or not meta_path.exists():
+            continue
+        with open(meta_path, "r", encoding="utf-8") as f:
+            artifact = Artifact.from_dict(json.load(f))
+        if artifact.user_id == user_id and not artifact.expired:
+            artifacts.append(artifact)
+    artifacts.sort(key=lambda a: a.created_at, reverse=True)
+    return artifacts[:limit]
+
+
+def _ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--artifacts", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    svc = ArtifactsService()
+    root = svc._artifacts_dir
+    print(f"Seeding {args.artifacts:,} artifacts under {root} ...")
+    _seed(root, args.artifacts, args.users)
+
+    scan = _ms(lambda: _scan_list(root, "user0", 50), args.repeat)
+    print(f"  scan   (first page)         : {scan:10.1f} ms")
+
+    start = time.perf_counter()
+    svc.reconcile_index()
+    print(f"  index  cold build           : {(time.perf_counter() - start) * 1000:10.1f} ms")
+    assert (root / INDEX_DB_NAME).exists()
+
+    first = _ms(lambda: svc.list_artifacts_page("user0", limit=50), args.repeat)
+
+    # Walk to the middle of the user's listing, then time that page
+    cursor = None
+    for _ in range(args.artifacts // args.users // 100):
+        _, cursor = svc.list_artifacts_page("user0", limit=50, cursor=cursor)
+    deep = _ms(lambda: svc.list_artifacts_page("user0", limit=50, cursor=cursor), args.repeat)
+    filtered = _ms(
+        lambda: svc.list_artifacts_page("user0", limit=50, fmt="csv", starred=True), args.repeat,
+    )
+    reconcile = _ms(svc.reconcile_index, 1)
+
+    print(f"  index  first page           : {first:10.2f} ms  ({scan / first:,.0f}x)")
+    print(f"  index  deep keyset page     : {deep:10.2f} ms")
+    print(f"  index  filtered page        : {filtered:10.2f} ms")
+    print(f"  reconcile (no drift)        : {reconcile:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
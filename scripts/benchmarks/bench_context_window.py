@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Chat Context Window Benchmark (BQ-VZ-PERF)
+==========================================
+
+Seeds one chat session with N messages (default 10,000) in a SQLite state
+DB and measures ContextWindowManager.build_context latency:
+  1. Load     — the old path: load the whole history as ORM rows, then
+                sum and slide the window in Python
+  2. Windowed — session total + one windowed SQL query for the newest
+                messages that fit, with a placeholder summary
+  3. Cached   — same, with the session's rolling summary cached
+
+Usage:
+    python scripts/benchmarks/bench_context_window.py [--messages 10000]
+        [--budget 4000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_context_window_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+
+from sqlmodel import Session as DBSession, SQLModel, create_engine  # noqa: E402
+
+from app.core.database import _migrate_message_token_sums  # noqa: E402
+from app.models.state import MessageRole  # noqa: E402
+from app.services.context_manager import ContextWindowManager  # noqa: E402
+from app.services.session_service import SessionService  # noqa: E402
+
+
+def _seed(svc: SessionService, n: int):
+    rng = random.Random(3)
+    session = svc.create_session(title="bench")
+    for i in range(n):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        words = rng.randint(5, 120) if role == MessageRole.USER else rng.randint(40, 400)
+        svc.add_message(session.id, role, " ".join(["token"] * words))
+    return session
+
+
+def _load_all(manager: ContextWindowManager, session_id, budget: int):
+    """The pre-windowed path: every message as an ORM row, summed in Python."""
+    messages = manager.session_service.get_messages(session_id, limit=10**9)
+    for msg in messages:
+        if msg.token_count is None:
+            msg.token_count = manager.estimate_tokens(msg.content)
+    total = sum(m.token_count for m in messages)
+    if total <= budget:
+        return messages
+    selected, used = [], manager.config.summary_buffer_tokens
+    for msg in reversed(messages):
+        if used + msg.token_count > budget:
+            break
+        selected.append(msg)
+        used += msg.token_count
+    return list(reversed(selected))
+
+
+def _ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--budget", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{_tmp}/vai_state.db")
+    SQLModel.metadata.create_all(engine)
+    _migrate_message_token_sums(engine)
+
+    with DBSession(engine) as db:
+        svc = SessionService(db)
+        print(f"Seeding one session with {args.messages:,} messages ...")
+        session = _seed(svc, args.messages)
+        manager = ContextWindowManager(svc)
+
+        window = manager.build_context(session.id, max_tokens=args.budget)
+        print(f"  window: {window.message_count} messages, {window.total_tokens} tokens")
+
+        def build():
+            db.expire_all()  # no identity-map shortcuts between runs
+            manager.build_context(session.id, max_tokens=args.budget)
+
+        def load():
+            db.expire_all()
+            _load_all(manager, session.id, args.budget)
+
+        old = _ms(load, max(1, args.repeat // 4))
+        windowed = _ms(build, args.repeat)
+        plan = manager._plan_window(session.id, args.budget, None)[1]
+        svc.save_context_summary(session.id, "cached summary", plan.summary_through)
+        cached = _ms(build, args.repeat)
+
+    print(f"  load (full history)         : {old:10.1f} ms")
+    print(f"  windowed (placeholder)      : {windowed:10.2f} ms  ({old / windowed:,.0f}x)")
+    print(f"  windowed (cached summary)   : {cached:10.2f} ms  ({old / cached:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Copilot Schema Graph Benchmark (BQ-VZ-PERF)
+===========================================
+
+Seeds N ready dataset records (default 1,000) and measures the schema graph
+that CoPilotContextManager builds for every Copilot message:
+  1. Rebuild  — the old path: list_datasets(), re-parse every record's
+                metadata, compare every column against every other table
+  2. Indexed  — cold snapshot build with inverted-index join inference
+  3. Cached   — fingerprint hit (what an unchanged dataset state costs)
+
+Usage:
+    python scripts/benchmarks/bench_copilot_context.py [--datasets 1000]
+        [--columns 25] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_copilot_ctx_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.core.database import get_engine, get_session_context  # noqa: E402
+from app.models.dataset import DatasetRecord as DBDatasetRecord, DatasetStatus  # noqa: E402
+from app.services.context_manager_copilot import (  # noqa: E402
+    CoPilotContextManager,
+    invalidate_schema_graph,
+)
+from app.services.processing_service import get_processing_service  # noqa: E402
+
+ENTITIES = [
+    "customers", "orders", "invoices", "products", "accounts", "vendors",
+    "shipments", "payments", "employees", "regions", "campaigns", "tickets",
+]
+SHARED = ["region", "country", "sku", "email", "currency", "channel", "segment"]
+
+
+def _seed(n: int, columns: int) -> None:
+    rng = random.Random(7)
+    with get_session_context() as session:
+        for i in range(n):
+            entity = rng.choice(ENTITIES)
+            names = ["id"] + [f"{rng.choice(ENTITIES)[:-1]}_id" for _ in range(3)]
+            names += rng.sample(SHARED, 2)
+            names += [f"{entity}_metric_{i}_{k}" for k in range(columns - len(names))]
+            names = list(dict.fromkeys(names))
+            metadata = {
+                "row_count": 1000,
+                "column_count": len(names),
+                "column_names": names,
+                "dtypes": {name: "VARCHAR" for name in names},
+            }
+            session.add(DBDatasetRecord(
+                id=f"ds{i:05d}",
+                original_filename=f"{entity}_{i}.csv",
+                storage_filename=f"ds{i:05d}_{entity}_{i}.csv",
+                file_type="csv",
+                status=DatasetStatus.READY.value,
+                processed_path=os.path.join(_tmp, "processed", f"ds{i:05d}.parquet"),
+                metadata_json=json.dumps(metadata),
+            ))
+        session.commit()
+
+
+def _pairwise_joins(tables):
+    """The pre-index inference: every column against every other table."""
+    cm = CoPilotContextManager
+    joins, seen = [], set()
+    for source in tables:
+        columns = [c["name"] for c in source["columns"]]
+        for column_name in columns:
+            lowered = column_name.lower()
+            if lowered == "id":
+                continue
+            fk_tokens = cm._column_fk_tokens(lowered) if lowered.endswith("_id") else None
+            for target in tables:
+                if target["dataset_id"] == source["dataset_id"]:
+                    continue
+                target_columns = {c["name"] for c in target["columns"]}
+                if fk_tokens and "id" in target_columns and cm._tokens_match_target(
+                    fk_tokens, cm._dataset_name_tokens(target["display_name"])
+                ):
+                    key = (source["table_name"], column_name, target["table_name"], "id")
+                    if key not in seen:
+                        seen.add(key)
+                        joins.append(key)
+                if (
+                    column_name in target_columns
+                    and lowered not in {"created_at", "updated_at"}
+                    and source["table_name"] < target["table_name"]
+                ):
+                    key = (source["table_name"], column_name, target["table_name"], column_name)
+                    if key not in seen:
+                        seen.add(key)
+                        joins.append(key)
+    return joins
+
+
+def _rebuild_old():
+    records = get_processing_service().list_datasets()
+    tables = [
+        CoPilotContextManager._build_table_schema(r)
+        for r in records
+        if CoPilotContextManager._is_queryable_dataset(r)
+    ]
+    return _pairwise_joins(tables)
+
+
+def _build_cold():
+    invalidate_schema_graph()
+    return CoPilotContextManager._build_full_schema_graph()
+
+
+def _ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--datasets", type=int, default=1000)
+    parser.add_argument("--columns", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    SQLModel.metadata.create_all(get_engine())
+    print(f"Seeding {args.datasets:,} datasets x {args.columns} columns ...")
+    _seed(args.datasets, args.columns)
+
+    graph = _build_cold()
+    assert len(graph["joins"]) == len(_rebuild_old())
+    print(f"  tables: {graph['table_count']:,}  joins: {len(graph['joins']):,}")
+
+    old = _ms(_rebuild_old, max(1, args.repeat // 2))
+    cold = _ms(_build_cold, args.repeat)
+    warm = _ms(
+        lambda: CoPilotContextManager._build_full_schema_graph(active_dataset_id="ds00042"),
+        args.repeat,
+    )
+
+    print(f"  rebuild (pairwise joins)    : {old:10.1f} ms")
+    print(f"  indexed (cold snapshot)     : {cold:10.1f} ms  ({old / cold:,.1f}x)")
+    print(f"  cached  (fingerprint hit)   : {warm:10.2f} ms  ({old / warm:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Database Extraction Benchmark (BQ-VZ-PERF)
+==========================================
+
+Extracts a synthetic SQLite table (default 1M rows x 8 columns: ints,
+floats, short and long text, dates and a nullable column) to Parquet:
+  1. Legacy — SQLAlchemy Row batches pivoted into per-column lists in
+              Python, types sniffed per batch, uncompressed ParquetWriter
+  2. Cursor — DatabaseConnector._stream_to_parquet: raw DBAPI tuples,
+              schema fixed once, explicit-type columns, zstd row groups
+
+Reports wall time, rows/s and output size. SQLite keeps the network out
+of the measurement, so this is the Python-side cost per row (300k rows:
+1.54s / 29.9 MB vs 1.16s / 1.9 MB, of which 0.47s is sqlite3's own
+fetchmany). The native ADBC/connectorx readers need a PostgreSQL/MySQL
+server and are not run.
+
+Usage:
+    python scripts/benchmarks/bench_db_extract.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_db_extract_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.services.db_connector import DatabaseConnector  # noqa: E402
+
+COLUMN_TYPES = {
+    "id": "bigint", "qty": "integer", "price": "double precision", "ratio": "real",
+    "sku": "text", "description": "text", "day": "text", "note": "text",
+}
+
+
+def _make_source(path: Path, rows: int) -> None:
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE items (id INTEGER, qty INTEGER, price REAL, ratio REAL, "
+        "sku TEXT, description TEXT, day TEXT, note TEXT)"
+    )
+    con.execute(
+        "WITH RECURSIVE r(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM r WHERE i < ?) "
+        "INSERT INTO items SELECT i, i % 1000, i * 0.37, (i % 97) / 97.0, "
+        "'SKU-' || (i % 50000), 'item description number ' || i || ' with some padding text', "
+        "date('2020-01-01', '+' || (i % 1500) || ' days'), "
+        "CASE WHEN i % 7 = 0 THEN NULL ELSE 'note ' || (i % 13) END FROM r",
+        (rows - 1,),
+    )
+    con.commit()
+    con.close()
+
+
+def _legacy_extract(engine, query: str, output_path: Path) -> int:
+    """The pre-change loop: Row pivot + per-batch sniffing, uncompressed."""
+    writer = None
+    total_rows = 0
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(text(query))
+            col_names = list(result.keys())
+            while True:
+                rows = result.fetchmany(10_000)
+                if not rows:
+                    break
+                col_data = {name: [] for name in col_names}
+                for row in rows:
+                    for i, name in enumerate(col_names):
+                        col_data[name].append(row[i])
+                arrays, fields = [], []
+                for name in col_names:
+                    arr, field = DatabaseConnector._to_arrow_column(name, col_data[name])
+                    if arr is not None:
+                        arrays.append(arr)
+                        fields.append(field)
+                schema = pa.schema(fields)
+                if writer is None:
+                    writer = pq.ParquetWriter(str(output_path), schema, compression="none")
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                total_rows += len(rows)
+    finally:
+        if writer:
+            writer.close()
+    return total_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    source = Path(_tmp) / "source.db"
+    print(f"Generating {args.rows:,} rows in SQLite ...")
+    _make_source(source, args.rows)
+    engine = create_engine(f"sqlite:///{source}")
+    query = "SELECT * FROM items"
+
+    legacy_out = Path(_tmp) / "legacy.parquet"
+    start = time.perf_counter()
+    _legacy_extract(engine, query, legacy_out)
+    legacy = time.perf_counter() - start
+
+    cursor_out = Path(_tmp) / "cursor.parquet"
+    start = time.perf_counter()
+    DatabaseConnector()._stream_to_parquet(engine, "sqlite", query, cursor_out, column_types=COLUMN_TYPES)
+    cursor = time.perf_counter() - start
+
+    assert pq.read_table(legacy_out).equals(pq.read_table(cursor_out))
+    for label, elapsed, out in (("legacy", legacy, legacy_out), ("cursor", cursor, cursor_out)):
+        print(f"  {label} : {elapsed:7.2f}s  {args.rows / elapsed:12,.0f} rows/s  "
+              f"{out.stat().st_size / 1e6:7.1f} MB")
+    print(f"  speedup: {legacy / cursor:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
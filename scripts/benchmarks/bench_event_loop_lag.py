@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Event Loop Lag Under Dataset Status Polling Benchmark (BQ-VZ-PERF)
+==================================================================
+
+Seeds N dataset records in a SQLite state DB (WAL, as in production) and
+runs C concurrent GET /api/datasets/{id}/status polls (default 200) against
+the route coroutine, while a probe task measures how late the event loop
+wakes it up every 5 ms:
+  1. Sync  — get_dataset() opens a blocking Session on the loop
+  2. Async — get_dataset_async() on the aiosqlite engine
+
+A background writer keeps flipping statuses from a worker thread so polls
+contend for the database the way extraction does. Reports poll throughput
+and loop lag (p50 / p99 / max).
+
+Usage:
+    python scripts/benchmarks/bench_event_loop_lag.py [--datasets 200]
+        [--clients 200] [--polls 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_event_loop_lag_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+from unittest.mock import patch  # noqa: E402
+
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.core.database import close_async_db, get_engine, get_session_context  # noqa: E402
+from app.models.dataset import DatasetRecord as DBDatasetRecord, DatasetStatus  # noqa: E402
+from app.routers.datasets import get_dataset_status  # noqa: E402
+from app.services.processing_service import ProcessingService  # noqa: E402
+
+PROBE_INTERVAL_S = 0.005
+
+
+def _seed(n: int) -> list:
+    ids = [f"lag{i:05d}" for i in range(n)]
+    with get_session_context() as session:
+        for dataset_id in ids:
+            session.add(DBDatasetRecord(
+                id=dataset_id, original_filename=f"{dataset_id}.csv",
+                storage_filename=f"{dataset_id}.csv", file_type="csv",
+                file_size_bytes=1024, status=DatasetStatus.EXTRACTING.value,
+            ))
+        session.commit()
+    return ids
+
+
+def _writer(ids: list, stop: threading.Event) -> None:
+    """Status churn from a worker thread, like the processing queue."""
+    svc = ProcessingService.__new__(ProcessingService)
+    statuses = (DatasetStatus.EXTRACTING, DatasetStatus.PREVIEW_READY)
+    i = 0
+    while not stop.is_set():
+        svc._set_status(ids[i % len(ids)], statuses[i % 2])
+        i += 1
+        time.sleep(0.002)
+
+
+async def _run(ids: list, clients: int, polls: int) -> tuple:
+    processing = ProcessingService.__new__(ProcessingService)
+    lags = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            start = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL_S)
+            lags.append(max(0.0, loop.time() - start - PROBE_INTERVAL_S))
+
+    async def client(c: int) -> None:
+        for i in range(polls):
+            result = await get_dataset_status(ids[(c + i) % len(ids)], processing=processing)
+            assert result["status"]
+
+    stop = threading.Event()
+    writer = threading.Thread(target=_writer, args=(ids, stop), daemon=True)
+    writer.start()
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(clients)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    stop.set()
+    writer.join()
+
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    return clients * polls / elapsed, statistics.median(lags_ms), p99, lags_ms[-1]
+
+
+async def _main(args) -> None:
+    SQLModel.metadata.create_all(get_engine())
+    ids = _seed(args.datasets)
+    print(f"{args.datasets} datasets, {args.clients} concurrent pollers x {args.polls} polls")
+
+    async def sync_get_dataset_async(self, dataset_id):
+        return self.get_dataset(dataset_id)
+
+    with patch.object(ProcessingService, "get_dataset_async", sync_get_dataset_async):
+        old = await _run(ids, args.clients, args.polls)
+    new = await _run(ids, args.clients, args.polls)
+    await close_async_db()
+
+    for label, (rps, p50, p99, worst) in (("sync session ", old), ("async session", new)):
+        print(f"  {label}: {rps:8,.0f} polls/s   loop lag p50 {p50:6.1f} ms"
+              f"  p99 {p99:7.1f} ms  max {worst:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--datasets", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
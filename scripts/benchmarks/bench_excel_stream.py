@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Excel Ingestion Benchmark (BQ-VZ-PERF)
+======================================
+
+Writes a workbook (default 1M rows x 8 columns on a data sheet, plus a
+small second sheet) and converts it to Parquet two ways, each in a fresh
+process so peak RSS is comparable:
+  1. pandas     — the old path: read_excel(sheet 0) + to_parquet
+  2. streaming  — StreamingSpreadsheetProcessor.write_parquet (all sheets,
+                  unioned with a ``sheet`` column)
+
+Reports wall time and peak RSS (ru_maxrss) per mode.
+
+Usage:
+    python scripts/benchmarks/bench_excel_stream.py [--rows 1000000]
+        [--batch-size 10000] [--skip-pandas]
+"""
+
+import argparse
+import datetime as dt
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_excel_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+CATEGORIES = ["north", "south", "east", "west", "central"]
+
+
+def _write_workbook(path: Path, rows: int) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("transactions")
+    ws.append(["id", "customer", "region", "amount", "qty", "discount", "created_at", "paid"])
+    start = dt.datetime(2024, 1, 1)
+    for i in range(rows):
+        ws.append([
+            i, f"cust_{i % 20000}", CATEGORIES[i % 5], round(i * 0.37 % 1000, 2), i % 17,
+            None if i % 9 else 0.1, start + dt.timedelta(minutes=i), i % 3 != 0,
+        ])
+    summary = wb.create_sheet("summary")
+    summary.append(["region", "amount"])
+    for region in CATEGORIES:
+        summary.append([region, 1.0])
+    wb.save(path)
+
+
+def _pandas(src: str, dest: str, _batch_size: int) -> int:
+    import pandas as pd
+
+    df = pd.read_excel(src, sheet_name=0, engine="openpyxl")
+    df.to_parquet(dest, compression="zstd", index=False)
+    return len(df)
+
+
+def _streaming(src: str, dest: str, batch_size: int) -> int:
+    from app.services.streaming_processor import StreamingSpreadsheetProcessor
+
+    with StreamingSpreadsheetProcessor(Path(src), batch_size=batch_size) as proc:
+        return sum(proc.write_parquet(Path(dest)).values())
+
+
+def _child(mode: str, src: str, dest: str, batch_size: int, conn) -> None:
+    fn = {"pandas": _pandas, "streaming": _streaming}[mode]
+    start = time.perf_counter()
+    rows = fn(src, dest, batch_size)
+    elapsed = time.perf_counter() - start
+    conn.send((rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def _measure(mode: str, src: Path, batch_size: int):
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    dest = Path(_tmp) / f"{mode}.parquet"
+    proc = ctx.Process(target=_child, args=(mode, str(src), str(dest), batch_size, child))
+    proc.start()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--skip-pandas", action="store_true")
+    args = parser.parse_args()
+
+    src = Path(_tmp) / "bench.xlsx"
+    print(f"Writing {args.rows:,}-row workbook ...")
+    t0 = time.perf_counter()
+    _write_workbook(src, args.rows)
+    print(f"  {src.stat().st_size / 1e6:.0f} MB in {time.perf_counter() - t0:.0f}s\n")
+
+    modes = ["streaming"] if args.skip_pandas else ["pandas", "streaming"]
+    for mode in modes:
+        rows, elapsed, rss_mb = _measure(mode, src, args.batch_size)
+        print(f"  {mode:<10}: {rows:>10,} rows  {elapsed:7.1f}s  peak RSS {rss_mb:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
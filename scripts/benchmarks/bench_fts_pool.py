@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+FTS Connection Pool Benchmark (BQ-VZ-PERF)
+==========================================
+
+Measures BM25 queries per second against real DuckDB FTS indexes:
+  1. Unpooled — connect + LOAD fts + query + close per search (the old path)
+  2. Pooled   — search_fts() with pooled read-only connections
+  3. Global   — N datasets searched one after another vs search_fts_many()
+
+Requires the DuckDB ``fts`` extension to be installable.
+
+Usage:
+    python scripts/benchmarks/bench_fts_pool.py [--rows 50000] [--datasets 8]
+                                                [--threads 4] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_fts_pool_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+import duckdb  # noqa: E402
+
+from app.services import fts_service  # noqa: E402
+
+WORDS = (
+    "camera phone display battery laptop bicycle lamp desk chair sailing boat "
+    "engine garden kitchen coffee printer monitor keyboard speaker guitar"
+).split()
+QUERIES = ["camera phone", "desk lamp", "sailing boat", "coffee printer", "garden chair"]
+
+
+def _make_dataset(dataset_id: str, rows: int, seed: int) -> Path:
+    rng = random.Random(seed)
+    path = Path(_tmp) / f"{dataset_id}.parquet"
+    con = duckdb.connect()
+    con.execute("CREATE TABLE t (name VARCHAR, description VARCHAR)")
+    batch = [
+        (f"item {i}", " ".join(rng.choice(WORDS) for _ in range(12)))
+        for i in range(rows)
+    ]
+    con.executemany("INSERT INTO t VALUES (?, ?)", batch)
+    con.execute(f"COPY t TO '{path}' (FORMAT PARQUET)")
+    con.close()
+    return path
+
+
+def _unpooled_search(query: str, dataset_id: str, limit: int = 20):
+    """The pre-pool search path: a fresh connection per query."""
+    con = duckdb.connect(str(fts_service._get_fts_db_path(dataset_id)), read_only=True)
+    try:
+        con.execute("LOAD fts")
+        return con.execute(fts_service._BM25_SQL, [query, limit]).fetchall()
+    finally:
+        con.close()
+
+
+def _qps(fn, threads: int, seconds: float) -> float:
+    stop = time.monotonic() + seconds
+    counts = [0] * threads
+
+    def worker(i: int) -> None:
+        n = 0
+        while time.monotonic() < stop:
+            fn(QUERIES[n % len(QUERIES)])
+            n += 1
+        counts[i] = n
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return sum(counts) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--datasets", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    try:
+        con = duckdb.connect()
+        con.execute("INSTALL fts")
+        con.execute("LOAD fts")
+        con.close()
+    except Exception as e:
+        sys.exit(f"DuckDB fts extension unavailable: {e}")
+
+    dataset_ids = [f"bench_{i}" for i in range(args.datasets)]
+    print(f"Building {args.datasets} FTS indexes of {args.rows:,} rows ...")
+    for i, dataset_id in enumerate(dataset_ids):
+        fts_service.build_fts_index(dataset_id, _make_dataset(dataset_id, args.rows, i)).result()
+        assert fts_service.get_fts_status(dataset_id) == "ready"
+
+    target = dataset_ids[0]
+    print(f"\nSingle dataset, {args.threads} threads, {args.seconds:.0f}s each")
+    unpooled = _qps(lambda q: _unpooled_search(q, target), args.threads, args.seconds)
+    pooled = _qps(lambda q: fts_service.search_fts(q, target), args.threads, args.seconds)
+    print(f"  unpooled : {unpooled:8.1f} q/s")
+    print(f"  pooled   : {pooled:8.1f} q/s   ({pooled / unpooled:.1f}x)")
+    print(f"  pool     : {fts_service.get_fts_reader_pool().stats()}")
+
+    print(f"\nGlobal search over {args.datasets} datasets, 1 caller")
+    sequential = _qps(
+        lambda q: [fts_service.search_fts(q, d) for d in dataset_ids], 1, args.seconds,
+    )
+    fanned = _qps(lambda q: fts_service.search_fts_many(q, dataset_ids), 1, args.seconds)
+    print(f"  sequential : {sequential:8.1f} searches/s")
+    print(f"  fan-out    : {fanned:8.1f} searches/s   ({fanned / sequential:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Full Pipeline Step 1 Benchmark (BQ-VZ-PERF)
+===========================================
+
+Generates a ~1 GB CSV upload and the same rows as a Parquet DB extraction,
+then times the DuckDB work of run_full_pipeline up to the Presidio scan
+(analysis.json, processed.parquet, and the PII scan's schema/count/sample):
+  1. Old    — get_enhanced_metadata on the raw file (COUNT(*), two rounds of
+              per-column profiling, LENGTH sampling), a full COPY into
+              processed.parquet, then DESCRIBE + COUNT(*) + SAMPLE for PII
+  2. Single — Parquet input hard-linked (CSV written once), profiled once
+              from processed.parquet, PII scan reuses schema and row count
+
+Presidio's per-value scan is the same in both paths and is not timed.
+
+Usage:
+    python scripts/benchmarks/bench_full_pipeline.py [--gb 1.0] [--repeat 1]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_full_pipeline_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+
+from app.services.duckdb_service import ephemeral_duckdb_service  # noqa: E402
+from app.services.pii_service import DEFAULT_SAMPLE_SIZE  # noqa: E402
+from app.services.pipeline_service import PipelineService  # noqa: E402
+
+# ~85 bytes per CSV row
+ROWS_PER_GB = 12_000_000
+
+
+def _generate(rows: int) -> tuple:
+    csv_path = Path(_tmp) / "upload.csv"
+    parquet_path = Path(_tmp) / "extraction.parquet"
+    source = f"""
+        SELECT
+            i AS id,
+            'user' || (i % 250000) || '@example.com' AS email,
+            'Customer ' || (i % 100000) AS name,
+            round((i * 7919) % 100000 / 100.0, 2) AS amount,
+            DATE '2020-01-01' + CAST(i % 1500 AS INTEGER) AS created_at,
+            ['US', 'DE', 'FR', 'JP', 'BR'][1 + i % 5] AS country,
+            'note ' || md5(CAST(i AS VARCHAR))[:16] AS notes
+        FROM range({rows}) t(i)
+    """
+    with ephemeral_duckdb_service() as duckdb:
+        duckdb.connection.execute(f"COPY ({source}) TO '{csv_path}' (FORMAT CSV, HEADER)")
+        duckdb.connection.execute(f"COPY ({source}) TO '{parquet_path}' (FORMAT PARQUET)")
+    return csv_path, parquet_path
+
+
+def _old_profile(conn, read_func: str, max_rows: int = 100_000) -> None:
+    """The pre-single-pass get_column_profile: two queries per column over the file."""
+    source = f"(SELECT * FROM {read_func} LIMIT {max_rows})"
+    for name, *_ in conn.execute(f"DESCRIBE SELECT * FROM {read_func}").fetchall():
+        col = '"{}"'.format(name.replace('"', '""'))
+        conn.execute(
+            f"SELECT COUNT(*), COUNT({col}), COUNT(DISTINCT {col}), "
+            f"MIN({col}::VARCHAR), MAX({col}::VARCHAR) FROM {source}"
+        ).fetchone()
+        conn.execute(
+            f"SELECT DISTINCT {col}::VARCHAR FROM {source} WHERE {col} IS NOT NULL LIMIT 5"
+        ).fetchall()
+
+
+def _old_step1(filepath: Path, out_dir: Path) -> None:
+    with ephemeral_duckdb_service() as duckdb:
+        conn = duckdb.connection
+        read_func = duckdb.get_read_function(duckdb.detect_file_type(filepath), str(filepath))
+        duckdb.get_file_metadata(filepath)
+        _old_profile(conn, read_func)  # column_profiles
+        _old_profile(conn, read_func)  # again, inside calculate_searchability_score
+        try:
+            conn.execute(
+                f"SELECT SUM(LENGTH(t.*::VARCHAR)) FROM (SELECT * FROM {read_func} LIMIT 1000) t"
+            ).fetchone()
+        except Exception:
+            pass  # newer DuckDB rejects t.*::VARCHAR; the service falls back too
+        processed = out_dir / "processed.parquet"
+        conn.execute(
+            f"COPY (SELECT * FROM {read_func}) TO '{processed}' (FORMAT PARQUET, COMPRESSION ZSTD)"
+        )
+        # scan_structured's reads before Presidio
+        read_func = duckdb.get_read_function("parquet", str(processed))
+        conn.execute(f"DESCRIBE SELECT * FROM {read_func}").fetchall()
+        total = conn.execute(f"SELECT COUNT(*) FROM {read_func}").fetchone()[0]
+        conn.execute(
+            f"SELECT * FROM {read_func} USING SAMPLE {min(DEFAULT_SAMPLE_SIZE, total)}"
+        ).fetchall()
+
+
+def _single_step1(filepath: Path, out_dir: Path) -> None:
+    svc = PipelineService.__new__(PipelineService)
+    processed = out_dir / "processed.parquet"
+    analysis = svc._analyze_and_process(filepath, out_dir, processed)
+    with ephemeral_duckdb_service() as duckdb:
+        read_func = duckdb.get_read_function("parquet", str(processed))
+        total = min(DEFAULT_SAMPLE_SIZE, analysis["row_count"])
+        duckdb.connection.execute(f"SELECT * FROM {read_func} USING SAMPLE {total}").fetchall()
+
+
+def _s(fn, filepath: Path, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        out_dir = Path(tempfile.mkdtemp(dir=_tmp))
+        start = time.perf_counter()
+        fn(filepath, out_dir)
+        times.append(time.perf_counter() - start)
+        shutil.rmtree(out_dir)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--gb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = int(ROWS_PER_GB * args.gb)
+    print(f"Generating {rows:,} rows ...")
+    csv_path, parquet_path = _generate(rows)
+    print(f"  csv: {csv_path.stat().st_size / 1e9:.2f} GB   "
+          f"parquet: {parquet_path.stat().st_size / 1e9:.2f} GB")
+
+    for label, path in (("CSV upload", csv_path), ("DB extraction", parquet_path)):
+        old = _s(_old_step1, path, args.repeat)
+        new = _s(_single_step1, path, args.repeat)
+        print(f"  {label:<14} old: {old:8.2f} s   single pass: {new:8.2f} s  ({old / new:,.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+PDF Page Extraction Benchmark (BQ-VZ-PERF)
+==========================================
+
+Generates a PDF (default 500 pages of running text, a ruled 5x4 table on
+every 10th page) and times StreamingDocumentProcessor over it:
+  1. Legacy    — pdfplumber table pass on every page, in-process
+  2. Gated     — table pass only on pages with ruling segments, in-process
+  3. Parallel  — gated, page ranges on a process pool (--workers)
+
+All three must produce identical TextBlocks.
+
+Usage:
+    python scripts/benchmarks/bench_pdf_extract.py [--pages 500]
+        [--table-every 10] [--workers 4] [--pages-per-task 16]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_pdf_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+from app.config import settings  # noqa: E402
+from app.services import streaming_processor as sp  # noqa: E402
+
+
+def _write_pdf(path: Path, n_pages: int, table_every: int) -> None:
+    """Hand-written PDF: Helvetica text lines, tables drawn as stroked rects."""
+    objs = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", None]
+    kids = []
+    for p in range(n_pages):
+        ops = ["BT /F1 10 Tf 72 760 Td 12 TL"]
+        ops += [f"(Page {p + 1} line {i}: lorem ipsum dolor sit amet, consectetur adipiscing) '"
+                for i in range(45)]
+        ops.append("ET")
+        if table_every and p % table_every == 0:
+            for r in range(5):
+                for c in range(4):
+                    x, y = 72 + c * 110, 120 + r * 18
+                    ops.append(f"{x} {y} 110 18 re S BT /F1 9 Tf {x + 4} {y + 5} Td (r{r} c{c}) Tj ET")
+        stream = "\n".join(ops).encode()
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 1 0 R >> >> >>" % len(objs)
+        )
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{k} 0 R" for k in kids).encode(), len(kids),
+    )
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1, len(objs), xref,
+    )
+    path.write_bytes(bytes(out))
+
+
+def _run(path: Path, min_edges: int, workers: int):
+    settings.pdf_table_min_edges = min_edges
+    settings.pdf_extract_workers = workers
+    start = time.perf_counter()
+    blocks = [
+        (b.page_num, b.text, b.tables)
+        for b in sp.StreamingDocumentProcessor(path, "pdf")
+    ]
+    return blocks, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--table-every", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    args = parser.parse_args()
+
+    path = Path(_tmp) / "bench.pdf"
+    _write_pdf(path, args.pages, args.table_every)
+    print(f"{args.pages} pages ({path.stat().st_size / 1e6:.1f} MB), "
+          f"table every {args.table_every} pages\n")
+    settings.pdf_pages_per_task = args.pages_per_task
+
+    legacy, legacy_s = _run(path, min_edges=0, workers=1)
+    print(f"  legacy   (table pass on every page) : {legacy_s:7.2f}s")
+    gated, gated_s = _run(path, min_edges=4, workers=1)
+    assert gated == legacy
+    print(f"  gated    (in-process)               : {gated_s:7.2f}s  ({legacy_s / gated_s:.1f}x)")
+
+    if args.workers > 1:
+        parallel, parallel_s = _run(path, min_edges=4, workers=args.workers)
+        assert parallel == legacy
+        print(f"  parallel ({args.workers} workers)                : "
+              f"{parallel_s:7.2f}s  ({legacy_s / parallel_s:.1f}x)")
+    tables = sum(len(b[2]) for b in legacy)
+    print(f"\n  {len(legacy)} blocks, {tables} tables, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
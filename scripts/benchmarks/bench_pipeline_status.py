@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Pipeline Status Persistence Benchmark (BQ-VZ-PERF)
+==================================================
+
+Simulates N datasets in flight (default 200), each making the status
+transitions of a full pipeline run while a poller reads every status, and
+measures wall time and snapshot writes:
+  1. Locked RMW — the old path: lock file + read + modify + fsynced atomic
+                  rewrite on every transition, locked read per poll
+  2. Store      — PipelineStatusStore: transitions in memory, coalesced
+                  snapshots, terminal statuses written through, polls
+                  served from memory
+
+Usage:
+    python scripts/benchmarks/bench_pipeline_status.py [--datasets 200]
+        [--polls 5] [--workers 16]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_pipeline_status_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+
+import app.services.pipeline_service as ps  # noqa: E402
+
+# (step, status) transitions of one run_full_pipeline, overall updates as None
+TRANSITIONS = [
+    (None, ps.PIPELINE_RUNNING),
+    ("analyze_process", ps.STEP_RUNNING), (None, ps.PIPELINE_RUNNING),
+    ("analyze_process", ps.STEP_SUCCESS),
+    ("pii_scan", ps.STEP_RUNNING), (None, ps.PIPELINE_RUNNING),
+    ("pii_scan", ps.STEP_SUCCESS),
+    ("compliance_check", ps.STEP_RUNNING), (None, ps.PIPELINE_RUNNING),
+    ("compliance_check", ps.STEP_SUCCESS),
+    (None, ps.PIPELINE_SUCCESS),
+]
+
+
+def _run(root: Path, datasets: int, polls: int, workers: int) -> float:
+    svc = ps.PipelineService.__new__(ps.PipelineService)
+    svc.processing_dir = root
+
+    def pipeline(i: int) -> None:
+        dataset_id = f"ds{i:05d}"
+        svc._init_pipeline_state(dataset_id, ps.FULL_PIPELINE_STEPS)
+        for step, status in TRANSITIONS:
+            if step is None:
+                svc._update_status(dataset_id, status, "bench")
+            else:
+                svc._set_step_status(dataset_id, step, status)
+            for _ in range(polls):
+                svc.get_pipeline_status(dataset_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(pipeline, range(datasets)))
+    return time.perf_counter() - start
+
+
+class _LockedRMWStore:
+    """The pre-store persistence, behind the store's interface."""
+
+    def get(self, path):
+        return ps._read_json_locked(path) if path.exists() else None
+
+    def exists(self, path):
+        return path.exists()
+
+    def put(self, path, state, durable=False):
+        ps._atomic_write_json(path, state)
+
+    def update(self, path, modifier, durable=False):
+        return ps._read_modify_write_json(path, modifier)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--datasets", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # per-transition log lines would dominate
+
+    writes = {"n": 0}
+    real_write = ps._atomic_write_json
+
+    def counting_write(path, data):
+        writes["n"] += 1
+        real_write(path, data)
+
+    transitions = args.datasets * (len(TRANSITIONS) + 1)
+    print(f"{args.datasets} datasets x {len(TRANSITIONS) + 1} transitions, "
+          f"{args.polls} polls per transition, {args.workers} workers")
+
+    with patch.object(ps, "_atomic_write_json", counting_write):
+        with patch.object(ps, "get_pipeline_status_store", _LockedRMWStore):
+            old = _run(Path(_tmp) / "rmw", args.datasets, args.polls, args.workers)
+        old_writes, writes["n"] = writes["n"], 0
+
+        store = ps.PipelineStatusStore()
+        with patch.object(ps, "get_pipeline_status_store", lambda: store):
+            new = _run(Path(_tmp) / "store", args.datasets, args.polls, args.workers)
+            store.close()
+        new_writes = writes["n"]
+
+    print(f"  locked RMW : {old:8.2f} s  {old_writes:6,} snapshot writes ({transitions:,} transitions)")
+    print(f"  store      : {new:8.2f} s  {new_writes:6,} snapshot writes  ({old / new:,.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Reranker Recall vs Latency Benchmark (BQ-VZ-PERF)
+=================================================
+
+Scores a local fixture corpus with RerankerService under each backend /
+max-length combination and reports:
+  - recall@1 and recall@5 of the known-relevant document after reranking
+  - p50/p95 latency of a single rerank() call (top-k=30 candidates)
+  - throughput with 8 concurrent callers, micro-batching on vs off
+
+The fixture corpus is generated deterministically: each query has one
+relevant product description and 29 candidates drawn from other products,
+including lexical near-misses that share words with the query. Candidate
+order is shuffled to stand in for an imperfect first-stage retriever.
+
+Requires the cross-encoder model to be downloadable (or cached); the
+onnx_int8 rows additionally need ``optimum[onnxruntime]``.
+
+Usage:
+    python scripts/benchmarks/bench_reranker.py [--queries 40] [--concurrency 8]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.config import settings  # noqa: E402
+from app.services.reranker_service import RerankerService  # noqa: E402
+
+PRODUCTS = [
+    ("waterproof hiking boots", "Leather hiking boots with a waterproof membrane and grippy soles for wet mountain trails."),
+    ("noise cancelling headphones", "Over-ear wireless headphones with active noise cancellation and 30 hour battery life."),
+    ("cast iron skillet", "Pre-seasoned cast iron frying pan that holds heat evenly for searing steaks."),
+    ("standing desk", "Electric height adjustable standing desk with memory presets and a bamboo top."),
+    ("espresso machine", "Semi-automatic espresso machine with a steam wand for milk frothing."),
+    ("mechanical keyboard", "Tenkeyless mechanical keyboard with hot-swappable tactile switches."),
+    ("trail running shoes", "Lightweight trail running shoes with rock plates and aggressive lugs."),
+    ("air purifier", "HEPA air purifier that removes pollen, dust and smoke in large rooms."),
+    ("robot vacuum", "Robot vacuum cleaner with lidar mapping and automatic dirt disposal."),
+    ("camping tent", "Two person backpacking tent, freestanding, with a rainfly for storms."),
+    ("electric toothbrush", "Rechargeable sonic toothbrush with pressure sensor and two minute timer."),
+    ("yoga mat", "Non-slip yoga mat made of natural rubber, six millimetres thick."),
+    ("dslr camera", "Interchangeable lens DSLR camera with a 24 megapixel sensor and fast autofocus."),
+    ("baby stroller", "Foldable baby stroller with reclining seat and all-terrain wheels."),
+    ("gaming monitor", "27 inch gaming monitor with 165Hz refresh rate and 1ms response time."),
+    ("rice cooker", "Fuzzy logic rice cooker that keeps rice warm for hours."),
+    ("cordless drill", "18V cordless drill driver with two batteries and a carrying case."),
+    ("smart thermostat", "Wi-Fi smart thermostat that learns your schedule and saves energy."),
+    ("winter parka", "Down-filled winter parka with a fur-lined hood rated to minus 30 degrees."),
+    ("road bike", "Carbon road bike with electronic shifting and disc brakes."),
+]
+NEAR_MISS = [
+    "{q} replacement parts and accessories sold separately.",
+    "Looking for {q}? Read our buying guide before you shop.",
+    "Cleaning kit compatible with most {q} models.",
+]
+
+
+def _fixture_corpus(n_queries: int, seed: int = 7):
+    rng = random.Random(seed)
+    corpus = []
+    for qi in range(n_queries):
+        name, relevant = PRODUCTS[qi % len(PRODUCTS)]
+        query = f"best {name}" if qi < len(PRODUCTS) else f"{name} reviews"
+        candidates = [{"text_content": relevant, "relevant": True}]
+        candidates += [{"text_content": t.format(q=name), "relevant": False} for t in NEAR_MISS]
+        others = [p for p in PRODUCTS if p[0] != name]
+        while len(candidates) < 30:
+            candidates.append({"text_content": rng.choice(others)[1], "relevant": False})
+        rng.shuffle(candidates)
+        corpus.append((query, candidates))
+    return corpus
+
+
+def _recall(ranked, k: int) -> float:
+    return float(any(d["relevant"] for d in ranked[:k]))
+
+
+def _run_config(corpus, backend: str, max_length: int, concurrency: int):
+    settings.reranker_backend = backend
+    settings.reranker_max_length = max_length
+    settings.reranker_timeout_ms = 60_000  # measure, don't trip the breaker
+    service = RerankerService()
+    service.model  # load outside the timings
+    if service.get_info()["backend"] != backend:
+        service.close()
+        return None
+
+    latencies, r1, r5 = [], [], []
+    for query, docs in corpus:
+        start = time.perf_counter()
+        ranked = service.rerank(query, docs, top_k=30)
+        latencies.append((time.perf_counter() - start) * 1000)
+        r1.append(_recall(ranked, 1))
+        r5.append(_recall(ranked, 5))
+
+    def throughput(window_s: float) -> float:
+        service.close()
+        service._batch_window_s = window_s
+        barrier = threading.Barrier(concurrency)
+        done = []
+
+        def caller(i):
+            barrier.wait()
+            for query, docs in corpus[i::concurrency]:
+                service.rerank(query, docs, top_k=30)
+                done.append(1)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return len(done) / (time.perf_counter() - start)
+
+    unbatched = throughput(0.0)
+    batched = throughput(settings.reranker_batch_window_ms / 1000.0)
+    service.close()
+
+    latencies.sort()
+    return {
+        "recall@1": statistics.mean(r1),
+        "recall@5": statistics.mean(r5),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "qps_unbatched": unbatched,
+        "qps_batched": batched,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = _fixture_corpus(args.queries)
+    baseline = statistics.mean(_recall(docs, 1) for _, docs in corpus)
+    print(f"{len(corpus)} queries x 30 candidates; recall@1 without reranking: {baseline:.2f}\n")
+    print(f"{'backend':<10} {'max_len':>7} {'R@1':>5} {'R@5':>5} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'q/s':>7} {'q/s batched':>12}")
+    for backend, max_length in [
+        ("torch", 512), ("torch", 256), ("torch", 128),
+        ("onnx_int8", 256), ("onnx_int8", 128),
+    ]:
+        row = _run_config(corpus, backend, max_length, args.concurrency)
+        if row is None:
+            print(f"{backend:<10} {max_length:>7}   (backend unavailable)")
+            continue
+        print(f"{backend:<10} {max_length:>7} {row['recall@1']:>5.2f} {row['recall@5']:>5.2f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['qps_unbatched']:>7.1f} "
+              f"{row['qps_batched']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Sketch Profiling Benchmark (BQ-VZ-PERF)
+=======================================
+
+Profiles a synthetic Parquet file (default 5M rows x 50 columns: a mix of
+high-cardinality ids, low-cardinality categories, floats with nulls and
+decimals) with SketchService.generate_profile:
+  1. Legacy    — the old row-at-a-time loop (as_py per cell, one sketch
+                 update per value), run on a --legacy-rows prefix and
+                 extrapolated linearly, since a full run takes hours
+  2. Columnar  — in-process vectorized path (workers=1)
+  3. Parallel  — column groups across a process pool (--workers)
+
+Usage:
+    python scripts/benchmarks/bench_sketch_profile.py [--rows 5000000]
+        [--columns 50] [--workers 8] [--legacy-rows 200000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_sketch_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+import duckdb  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services import sketch_service as sketch_mod  # noqa: E402
+
+
+def _make_parquet(path: Path, rows: int, columns: int) -> None:
+    exprs = []
+    for c in range(columns):
+        kind = c % 5
+        if kind == 0:
+            exprs.append(f"i + {c} AS id_{c}")
+        elif kind == 1:
+            exprs.append(f"'cat_' || ((i * {c + 7}) % 50)::VARCHAR AS cat_{c}")
+        elif kind == 2:
+            exprs.append(f"CASE WHEN i % 11 = 0 THEN NULL ELSE random() * 1000 END AS f_{c}")
+        elif kind == 3:
+            exprs.append(f"((i * {c + 3}) % 10000)::DECIMAL(12, 2) AS d_{c}")
+        else:
+            exprs.append(f"md5((i % 200000)::VARCHAR) AS s_{c}")
+    con = duckdb.connect()
+    con.execute(
+        f"COPY (SELECT {', '.join(exprs)} FROM range({rows}) t(i)) "
+        f"TO '{path}' (FORMAT PARQUET, ROW_GROUP_SIZE 122880)"
+    )
+    con.close()
+
+
+def _legacy_profile(path: Path, rows: int) -> float:
+    """The pre-vectorization loop, timed on the first ``rows`` rows."""
+    from datasketches import frequent_strings_sketch, hll_sketch, kll_floats_sketch
+
+    con = duckdb.connect()
+    reader = con.execute(
+        f"SELECT * FROM read_parquet('{path}') LIMIT {rows}"
+    ).fetch_record_batch(sketch_mod.CHUNK_SIZE)
+    start = time.perf_counter()
+    sketches = {}
+    for batch in reader:
+        names = batch.schema.names
+        for name in names:
+            sketches.setdefault(name, (hll_sketch(12), frequent_strings_sketch(10), kll_floats_sketch()))
+        batch_rows = [
+            tuple(batch.column(i)[r].as_py() for i in range(batch.num_columns))
+            for r in range(batch.num_rows)
+        ]
+        for row in batch_rows:
+            for i, name in enumerate(names):
+                val = row[i]
+                if val is None:
+                    continue
+                hll, freq, kll = sketches[name]
+                s = str(val)
+                hll.update(s)
+                freq.update(s)
+                if isinstance(val, (int, float)):
+                    kll.update(float(val))
+    con.close()
+    return time.perf_counter() - start
+
+
+def _timed_profile(service, dataset_id: str, workers: int) -> float:
+    settings.sketch_workers = workers
+    start = time.perf_counter()
+    service.generate_profile(dataset_id)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--legacy-rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    dataset_id = "bench_sketch"
+    path = Path(settings.data_directory) / f"{dataset_id}.parquet"
+    print(f"Generating {args.rows:,} rows x {args.columns} columns ...")
+    t0 = time.perf_counter()
+    _make_parquet(path, args.rows, args.columns)
+    print(f"  {path.stat().st_size / 1e6:.0f} MB in {time.perf_counter() - t0:.1f}s\n")
+
+    service = sketch_mod.SketchService()
+
+    legacy_rows = min(args.legacy_rows, args.rows)
+    legacy = _legacy_profile(path, legacy_rows) * args.rows / legacy_rows
+    print(f"  legacy   (extrapolated from {legacy_rows:,} rows): {legacy:8.1f}s")
+
+    columnar = _timed_profile(service, dataset_id, workers=1)
+    print(f"  columnar (in-process)                          : {columnar:8.1f}s  ({legacy / columnar:.0f}x)")
+
+    if args.workers > 1:
+        parallel = _timed_profile(service, dataset_id, workers=args.workers)
+        print(f"  parallel ({args.workers} workers)                           : "
+              f"{parallel:8.1f}s  ({legacy / parallel:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+SQL Result Format Benchmark (BQ-VZ-PERF)
+========================================
+
+Compares SQLService result paths on a generated 1M-row Parquet dataset:
+  1. JSON   — execute_query() (fetchall + per-value serialization + json.dumps)
+  2. NDJSON — open_stream("ndjson") (DuckDB to_json + Arrow join per batch)
+  3. Arrow  — open_stream("arrow") (fetch_record_batch → IPC stream)
+
+Reports wall time, bytes produced and peak RSS delta for each path.
+The JSON path is given the same row count by lifting MAX_ROW_LIMIT for
+the run so the comparison is like-for-like.
+
+Usage:
+    python scripts/benchmarks/bench_sql_stream.py [--rows 1000000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+_tmp = tempfile.mkdtemp(prefix="bench_sql_stream_")
+os.environ.setdefault("VECTORAIZ_DATA_DIRECTORY", _tmp)
+os.environ.setdefault("VECTORAIZ_PROCESSED_DIRECTORY", os.path.join(_tmp, "processed"))
+os.environ.setdefault("VECTORAIZ_UPLOAD_DIRECTORY", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/bench.db")
+
+import duckdb  # noqa: E402
+import psutil  # noqa: E402
+
+from app.services import sql_service as sql_mod  # noqa: E402
+from app.services.processing_service import ProcessingStatus  # noqa: E402
+
+
+def log(msg: str, level: str = "INFO") -> None:
+    """Print formatted log message."""
+    print(f"[{level}] {msg}", flush=True)
+
+
+def make_dataset(rows: int) -> str:
+    path = os.path.join(_tmp, "bench.parquet")
+    duckdb.connect().execute(
+        f"COPY (SELECT i AS id, 'customer_' || i AS name, (i % 997) * 1.25 AS amount, "
+        f"DATE '2020-01-01' + (i % 3650)::INT AS day, i % 3 = 0 AS flag "
+        f"FROM range({rows}) t(i)) TO '{path}' (FORMAT PARQUET)"
+    )
+    return path
+
+
+def make_service(path: str) -> "sql_mod.SQLService":
+    class Record:
+        id = "bench"
+        status = ProcessingStatus.READY
+        processed_path = path
+        original_filename = "bench.csv"
+        metadata = {}
+
+    svc = sql_mod.SQLService()
+    svc.processing = type("P", (), {"get_dataset": staticmethod(
+        lambda x: Record() if x == "bench" else None
+    )})()
+    return svc
+
+
+def measure(label: str, fn) -> None:
+    proc = psutil.Process()
+    rss_before = proc.memory_info().rss
+    peak = [rss_before]
+    stop = threading.Event()
+
+    def sample() -> None:
+        while not stop.is_set():
+            peak[0] = max(peak[0], proc.memory_info().rss)
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    total = 0
+    for chunk in fn():
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+    log(f"{label:<7} {elapsed:7.2f}s  {total / 1e6:8.1f} MB out  "
+        f"peak RSS +{(peak[0] - rss_before) / 1e6:7.1f} MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    log(f"Generating {args.rows:,}-row dataset in {_tmp}")
+    svc = make_service(make_dataset(args.rows))
+    query = "SELECT * FROM dataset_bench"
+    sql_mod.MAX_ROW_LIMIT = args.rows
+
+    measure("json", lambda: [json.dumps(
+        svc.execute_query(query, "bench", args.rows, 0)
+    ).encode()])
+    measure("ndjson", lambda: svc.open_stream(query, "ndjson", "bench", args.rows, 0))
+    measure("arrow", lambda: svc.open_stream(query, "arrow", "bench", args.rows, 0))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -314,6 +314,98 @@ class TestCleanup:
         assert removed == 0
 
 
+class TestArtifactIndex:
+    def _make(self, svc, n, user_id="local", fmt="txt"):
+        created = []
+        for i in range(n):
+            svc._rate_limits.clear()
+            created.append(svc.create_artifact(f"f{i}.{fmt}", f"c{i}", fmt, "d", [], user_id))
+        return created
+
+    def test_keyset_pages_cover_every_artifact_once(self, svc):
+        created = self._make(svc, 7)
+        seen, cursor = [], None
+        while True:
+            page, cursor = svc.list_artifacts_page("local", limit=3, cursor=cursor)
+            seen.extend(a.id for a in page)
+            if cursor is None:
+                break
+        assert len(seen) == 7
+        assert set(seen) == {a.id for a in created}
+        assert seen == [a.id for a in svc.list_artifacts("local", limit=100)]
+
+    def test_filters(self, svc):
+        txt = self._make(svc, 2)
+        md = self._make(svc, 1, fmt="md")
+        svc.star_artifact(txt[0].id, "local", True)
+
+        page, _ = svc.list_artifacts_page("local", fmt="md")
+        assert [a.id for a in page] == [md[0].id]
+        page, _ = svc.list_artifacts_page("local", starred=True)
+        assert [a.id for a in page] == [txt[0].id]
+        assert page[0].starred is True
+
+    def test_invalid_cursor_rejected(self, svc):
+        with pytest.raises(ValueError, match="cursor"):
+            svc.list_artifacts_page("local", cursor="not-a-cursor")
+
+    def test_delete_removes_index_row(self, svc):
+        a, b = self._make(svc, 2)
+        svc.delete_artifact(a.id, "local")
+        assert [x.id for x in svc.list_artifacts("local")] == [b.id]
+
+    def test_failed_rename_leaves_no_row(self, svc, monkeypatch):
+        def boom(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("app.services.artifacts_service.os.rename", boom)
+        with pytest.raises(OSError):
+            svc.create_artifact("x.txt", "x", "txt", "d", [], "local")
+        assert svc.list_artifacts("local") == []
+
+    def test_reconcile_fixes_drift(self, svc):
+        import shutil
+
+        keep, gone, edited = self._make(svc, 3)
+        # Removed behind the service's back
+        shutil.rmtree(svc._get_artifact_dir(gone.id))
+        # Edited behind the service's back
+        meta_path = svc._get_artifact_dir(edited.id) / "metadata.json"
+        data = json.loads(meta_path.read_text())
+        data["description"] = "edited externally"
+        meta_path.write_text(json.dumps(data))
+        # Added behind the service's back (e.g. restored from backup)
+        restored = dict(data, id="restored-1", description="restored")
+        (svc._artifacts_dir / "restored-1").mkdir()
+        (svc._artifacts_dir / "restored-1" / "metadata.json").write_text(json.dumps(restored))
+        # In-flight temp dirs are never indexed
+        tmp = svc._artifacts_dir / ".tmp_abc"
+        tmp.mkdir()
+        (tmp / "metadata.json").write_text(json.dumps(dict(data, id=".tmp_abc")))
+
+        stats = svc.reconcile_index()
+        assert stats["added"] == 1
+        assert stats["updated"] == 1
+        assert stats["removed"] == 1
+        listed = {a.id: a for a in svc.list_artifacts("local")}
+        assert set(listed) == {keep.id, edited.id, "restored-1"}
+        assert listed[edited.id].description == "edited externally"
+        assert svc.reconcile_index() == {"added": 0, "updated": 0, "removed": 0, "skipped": 0}
+
+    def test_existing_artifacts_backfilled_on_first_open(self, artifacts_dir):
+        from app.services.artifacts_service import INDEX_DB_NAME, ArtifactsService
+
+        first = ArtifactsService()
+        first._artifacts_dir = artifacts_dir
+        created = self._make(first, 3)
+        first._index().close()
+        (artifacts_dir / INDEX_DB_NAME).unlink()
+
+        second = ArtifactsService()
+        second._artifacts_dir = artifacts_dir
+        assert {a.id for a in second.list_artifacts("local")} == {a.id for a in created}
+
+
 class TestQuotas:
     def test_rate_limit_enforced(self, svc):
         for i in range(5):
@@ -361,35 +453,26 @@ def test_tool_format_param_schema():
     assert "format" in schema["required"]
 
 
-class _FakeResult:
-    def __init__(self, rows):
-        self.description = [("id",), ("name",), ("amount",)]
-        self._rows = list(rows)
-        self._offset = 0
-
-    def fetchmany(self, size):
-        batch = self._rows[self._offset:self._offset + size]
-        self._offset += len(batch)
-        return batch
-
-
-class _FakeConnection:
-    def __init__(self, rows):
-        self._rows = rows
-
-    def execute(self, query):
-        return _FakeResult(self._rows)
-
-    def close(self):
-        pass
-
-
 class _FakeDuckDBService:
+    """In-memory DuckDB exposing ``dataset_ds`` built from rows or a SELECT."""
+
     def __init__(self, rows):
         self._rows = rows
 
     def create_ephemeral_connection(self):
-        return _FakeConnection(self._rows)
+        import duckdb
+        import pyarrow as pa
+
+        conn = duckdb.connect()
+        if isinstance(self._rows, str):
+            conn.execute(f"CREATE VIEW dataset_ds AS {self._rows}")
+        else:
+            ids, names, amounts = (list(c) for c in zip(*self._rows))
+            rows = pa.table({"id": ids, "name": names, "amount": amounts})
+            conn.register("_rows", rows)
+            conn.execute("CREATE TABLE dataset_ds AS SELECT * FROM _rows")
+            conn.unregister("_rows")
+        return conn
 
 
 class _FakeDuckDBContext:
@@ -568,3 +651,127 @@ def test_call_path_gating_ownership_split(monkeypatch, tmp_path):
             description="query export",
             user_id="local",
         )
+
+
+def test_export_cap_leaves_no_partial_file(monkeypatch, tmp_path):
+    from app.services import artifacts_service
+
+    monkeypatch.setattr(artifacts_service, "EXPORT_BATCH_ROWS", 2)
+    original = artifacts_service.ArtifactsService._write_export.__func__
+
+    def capped(cls, conn, query, fmt, dest, max_rows=2, max_bytes=artifacts_service.MAX_ARTIFACT_SIZE_BYTES):
+        return original(cls, conn, query, fmt, dest, max_rows=max_rows, max_bytes=max_bytes)
+
+    monkeypatch.setattr(artifacts_service.ArtifactsService, "_write_export", classmethod(capped))
+    for fmt in ["csv", "json", "xlsx", "parquet"]:
+        with pytest.raises(ValueError, match="row limit"):
+            _create_query_export(monkeypatch, tmp_path / fmt, fmt)
+        assert list((tmp_path / fmt / "export").iterdir()) == []
+        assert [p for p in (tmp_path / fmt / "artifacts").iterdir() if p.is_dir()] == []
+
+
+def test_export_size_cap_enforced_while_streaming(monkeypatch, tmp_path):
+    import duckdb
+    from app.services.artifacts_service import ArtifactFormat, ArtifactsService
+
+    conn = duckdb.connect()
+    dest = tmp_path / "out.json"
+    with pytest.raises(ValueError, match="MB limit"):
+        ArtifactsService._write_export(
+            conn, "SELECT i, repeat('x', 100) AS pad FROM range(100000) t(i)",
+            ArtifactFormat.JSON, dest, max_bytes=1024 * 1024,
+        )
+    # Aborted at the first batch past the cap, not after writing everything
+    assert dest.stat().st_size < 3 * 1024 * 1024
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_copy_export_interrupted_at_size_cap(tmp_path, fmt):
+    """COPY exports stop once the file passes the cap, long before the full result."""
+    import threading
+
+    import duckdb
+    from app.services.artifacts_service import ArtifactFormat, ArtifactsService
+
+    conn = duckdb.connect()
+    dest = tmp_path / f"out.{fmt}"
+    # Largest size the file reaches while DuckDB writes it
+    largest = [0]
+    done = threading.Event()
+
+    def _observe():
+        while not done.wait(0.005):
+            try:
+                largest[0] = max(largest[0], dest.stat().st_size)
+            except FileNotFoundError:
+                pass
+
+    observer = threading.Thread(target=_observe, daemon=True)
+    observer.start()
+    # ~300 MB as CSV, ~65 MB as Parquet; md5 padding defeats compression
+    try:
+        with pytest.raises(ValueError, match="MB limit") as excinfo:
+            ArtifactsService._write_export(
+                conn, "SELECT i, repeat(md5(i::VARCHAR), 3) AS pad FROM range(3000000) t(i)",
+                ArtifactFormat(fmt), dest, max_bytes=1024 * 1024,
+            )
+    finally:
+        done.set()
+        observer.join()
+    # Raised by interrupting the COPY, not by checking a finished file
+    assert isinstance(excinfo.value.__context__, duckdb.InterruptException)
+    # The file stopped growing near the cap, nowhere near the full result
+    assert largest[0] < 32 * 1024 * 1024
+    assert not dest.exists() or dest.stat().st_size < 32 * 1024 * 1024
+    # The connection is usable again after the interrupt
+    assert conn.execute("SELECT 42").fetchone() == (42,)
+
+
+@pytest.mark.parametrize("fmt, n_rows", [("csv", 5_000_000), ("parquet", 5_000_000), ("json", 1_000_000)])
+def test_large_export_stays_under_rss_ceiling(monkeypatch, tmp_path, fmt, n_rows):
+    """Exports stream: peak RSS growth stays far below the result size in Python objects."""
+    import threading
+
+    import psutil
+
+    rss_ceiling = 300 * 1024 * 1024
+    proc = psutil.Process()
+    baseline = proc.memory_info().rss
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], proc.memory_info().rss)
+            time.sleep(0.01)
+
+    svc, export_dir = _install_query_export_fakes(
+        monkeypatch, tmp_path, f"SELECT i AS id FROM range({n_rows}) t(i)",
+    )
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        artifact = svc.create_artifact_from_query(
+            filename=f"big.{fmt}",
+            query="SELECT * FROM dataset_ds",
+            description="large export",
+            user_id="local",
+            fmt=fmt,
+        )
+    finally:
+        done.set()
+        sampler.join()
+
+    assert peak[0] - baseline < rss_ceiling
+    export_path = export_dir / f"big.{fmt}"
+    assert artifact.size_bytes == export_path.stat().st_size
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        meta = pq.ParquetFile(export_path).metadata
+        assert meta.num_rows == n_rows
+        assert meta.row_group(0).column(0).compression == "ZSTD"
+    elif fmt == "csv":
+        with open(export_path, "rb") as f:
+            assert sum(1 for _ in f) == n_rows + 1
+    else:
+        assert export_path.read_bytes().count(b"{") == n_rows
@@ -318,6 +318,33 @@ class TestAPIKeyValidation:
         assert resp.status_code == 401
 
 
+    def test_validation_defers_last_used_write(self):
+        """Validating a key writes nothing; last_used_at lands with the batched flush."""
+        import asyncio
+        from app.auth.api_key_auth import api_key_cache, flush_last_used
+        from app.core.database import get_session_context
+        from app.models.local_auth import LocalAPIKey
+        from sqlmodel import select
+
+        api_key = _do_setup().json()["api_key"]
+        key_id = api_key.split("_", 2)[1]
+        asyncio.run(flush_last_used())  # drop uses recorded by setup
+
+        resp = client.get("/api/auth/me", headers={"X-API-Key": api_key})
+        assert resp.status_code == 200
+        assert api_key not in api_key_cache
+        assert any(k.startswith(f"vz:{key_id}:") for k in api_key_cache.keys())
+
+        def last_used():
+            with get_session_context() as session:
+                stmt = select(LocalAPIKey).where(LocalAPIKey.key_id == key_id)
+                return session.exec(stmt).first().last_used_at
+
+        assert last_used() is None
+        assert asyncio.run(flush_last_used()) == 1
+        assert last_used() is not None
+
+
 # ---------------------------------------------------------------------------
 # Scope Enforcement Tests
 # ---------------------------------------------------------------------------
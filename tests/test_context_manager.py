@@ -10,16 +10,18 @@ Covers:
 - Route-to-screen mapping
 - Capability resolution
 - Default context when no snapshot
+- Schema graph cache and join inference
 
 PHASE: BQ-128 Phase 2 — Personality + Context Engine (Task 2.2)
 CREATED: 2026-02-14
 """
 
 import pytest
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from app.models.copilot import StateSnapshot
-from app.services.context_manager_copilot import CoPilotContextManager
+from app.services.context_manager_copilot import CoPilotContextManager, invalidate_schema_graph
 from app.services.prompt_factory import AllieContext
 
 
@@ -197,3 +199,69 @@ class TestEdgeCases:
         monkeypatch.setenv("ALLAI_QUIET_MODE", "true")
         ctx = await ctx_manager.build_context()
         assert ctx.quiet_mode is True
+
+
+# ---------------------------------------------------------------------------
+# Schema graph cache + join inference
+# ---------------------------------------------------------------------------
+
+def _record(dataset_id, filename, columns, status="ready"):
+    return SimpleNamespace(
+        id=dataset_id,
+        original_filename=filename,
+        file_type="csv",
+        status=status,
+        processed_path=f"/data/{dataset_id}.parquet",
+        file_size_bytes=100,
+        metadata={"row_count": 10, "column_count": len(columns), "column_names": columns, "dtypes": {}},
+    )
+
+
+@pytest.fixture
+def fake_processing_service():
+    invalidate_schema_graph()
+    svc = MagicMock()
+    svc.dataset_state_fingerprint.return_value = (1, 3, None)
+    svc.list_datasets.return_value = [
+        _record("c1", "customers.csv", ["id", "name", "region"]),
+        _record("o1", "orders.csv", ["id", "customer_id", "region", "created_at"]),
+        _record("u1", "upload.csv", ["id"], status="uploaded"),
+    ]
+    with patch("app.services.processing_service.get_processing_service", return_value=svc):
+        yield svc
+    invalidate_schema_graph()
+
+
+class TestSchemaGraph:
+    def test_joins_inferred(self, fake_processing_service):
+        graph = CoPilotContextManager._build_full_schema_graph()
+        assert graph["table_count"] == 2
+        joins = {(j["from_table"], j["from_column"], j["to_table"], j["reason"]) for j in graph["joins"]}
+        assert joins == {
+            ("dataset_o1", "customer_id", "dataset_c1", "fk_name_match"),
+            ("dataset_c1", "region", "dataset_o1", "shared_column_name"),
+        }
+
+    def test_graph_cached_until_fingerprint_changes(self, fake_processing_service):
+        svc = fake_processing_service
+        CoPilotContextManager._build_full_schema_graph()
+        CoPilotContextManager._get_all_datasets_summary()
+        CoPilotContextManager._build_full_schema_graph(active_dataset_id="o1")
+        assert svc.list_datasets.call_count == 1
+
+        svc.list_datasets.return_value = svc.list_datasets.return_value[:1]
+        svc.dataset_state_fingerprint.return_value = (2, 2, None)
+        graph = CoPilotContextManager._build_full_schema_graph()
+        assert svc.list_datasets.call_count == 2
+        assert graph["table_count"] == 1
+        assert graph["joins"] == []
+
+    def test_active_sort_does_not_reorder_cache(self, fake_processing_service):
+        first = CoPilotContextManager._build_full_schema_graph(active_dataset_id="o1")
+        assert first["tables"][0]["dataset_id"] == "o1"
+        again = CoPilotContextManager._build_full_schema_graph()
+        assert [t["dataset_id"] for t in again["tables"]] == ["c1", "o1"]
+
+    def test_summary_includes_unqueryable(self, fake_processing_service):
+        summary = CoPilotContextManager._get_all_datasets_summary()
+        assert [d["id"] for d in summary] == ["c1", "o1", "u1"]
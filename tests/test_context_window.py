@@ -0,0 +1,149 @@
+"""
+Tests for ContextWindowManager — token-budgeted chat history windows.
+=====================================================================
+
+Covers:
+- Token counts and running sums stamped at message insert
+- Newest messages that fit the budget selected in SQL
+- Cached rolling summary for dropped history (sync reuse, async roll-forward)
+- Legacy DB backfill of cumulative token sums
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session as DBSession, SQLModel, create_engine
+
+from app.core.database import _migrate_message_token_sums
+from app.models.state import MessageRole
+from app.services.context_manager import ContextConfig, ContextWindowManager
+from app.services.session_service import SessionService
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def svc(engine):
+    with DBSession(engine) as db:
+        yield SessionService(db)
+
+
+def _fill(svc, session_id, n, tokens=10):
+    for i in range(n):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        svc.add_message(session_id, role, f"message {i}", token_count=tokens)
+
+
+def _contents(window):
+    return [m.content for m in window.messages]
+
+
+class TestTokenStamping:
+    def test_add_message_stamps_running_sum(self, svc):
+        session = svc.create_session(title="t")
+        svc.add_message(session.id, MessageRole.USER, "x" * 40)
+        svc.add_message(session.id, MessageRole.ASSISTANT, "reply", token_count=7)
+        messages = svc.get_messages(session.id)
+        assert [m.token_count for m in messages] == [10, 7]
+        assert [m.cumulative_tokens for m in messages] == [10, 17]
+        assert svc.get_session(session.id).total_tokens == 17
+
+
+class TestWindowSelection:
+    def test_everything_fits(self, svc):
+        session = svc.create_session(title="t")
+        _fill(svc, session.id, 5)
+        window = ContextWindowManager(svc).build_context(session.id, max_tokens=100)
+        assert not window.truncated
+        assert window.message_count == 5
+        assert window.total_tokens == 50
+
+    def test_newest_messages_that_fit(self, svc):
+        session = svc.create_session(title="t")
+        _fill(svc, session.id, 200)
+        config = ContextConfig(min_recent_messages=2, summary_buffer_tokens=30)
+        window = ContextWindowManager(svc, config).build_context(session.id, max_tokens=100)
+
+        assert window.truncated
+        # 100 - 30 reserve = 70 tokens -> the newest 7 messages
+        assert _contents(window)[1:] == [f"message {i}" for i in range(193, 200)]
+        assert window.summary == "(Older context from 193 messages was summarized for brevity)"
+        assert window.messages[0].role == MessageRole.SYSTEM
+
+    def test_system_messages_kept_first(self, svc):
+        session = svc.create_session(title="t")
+        svc.add_message(session.id, MessageRole.SYSTEM, "rules", token_count=5)
+        _fill(svc, session.id, 50)
+        config = ContextConfig(min_recent_messages=2, summary_buffer_tokens=0)
+        window = ContextWindowManager(svc, config).build_context(
+            session.id, max_tokens=60, include_system_prompt="be brief",
+        )
+        # 60 - 2 (prompt) - 5 (rules) = 53 tokens -> the newest 5 messages
+        assert _contents(window)[:2] == ["be brief", "rules"]
+        assert _contents(window)[3:] == [f"message {i}" for i in range(45, 50)]
+        assert window.summary == "(Older context from 45 messages was summarized for brevity)"
+
+    def test_recent_kept_when_over_budget(self, svc):
+        session = svc.create_session(title="t")
+        _fill(svc, session.id, 10, tokens=50)
+        config = ContextConfig(min_recent_messages=2, summary_buffer_tokens=0)
+        window = ContextWindowManager(svc, config).build_context(session.id, max_tokens=60)
+        assert _contents(window) == ["message 8", "message 9"]
+        assert window.truncated and window.summary is None
+
+
+class TestRollingSummary:
+    @staticmethod
+    def _manager(svc, replies):
+        async def stream(message):
+            stream.prompts.append(message)
+            yield MagicMock(text=replies.pop(0))
+
+        stream.prompts = []
+        manager = ContextWindowManager(svc, ContextConfig(min_recent_messages=2, summary_buffer_tokens=30))
+        manager._allie_provider = MagicMock(stream=stream)
+        return manager, stream.prompts
+
+    @pytest.mark.asyncio
+    async def test_summary_cached_and_rolled_forward(self, svc):
+        session = svc.create_session(title="t")
+        _fill(svc, session.id, 20)
+        manager, prompts = self._manager(svc, ["first summary", "second summary"])
+
+        window = await manager.build_context_async(session.id, max_tokens=100)
+        assert window.summary == "first summary"
+        assert "message 0" in prompts[0] and "message 12" in prompts[0]
+
+        # Same dropped range: the sync path reuses the cached summary
+        assert manager.build_context(session.id, max_tokens=100).summary == "first summary"
+
+        # Two more messages drop two more: only those are summarized, on top of the cache
+        _fill(svc, session.id, 2)
+        window = await manager.build_context_async(session.id, max_tokens=100)
+        assert window.summary == "second summary"
+        assert "Earlier summary: first summary" in prompts[1]
+        assert "message 12" not in prompts[1] and "message 13" in prompts[1]
+        assert len(prompts) == 2
+
+
+class TestBackfill:
+    def test_migration_backfills_running_sums(self, engine, svc):
+        session = svc.create_session(title="t")
+        for i in range(5):
+            svc.add_message(session.id, MessageRole.USER, "y" * (i * 8))
+        expected = [(m.token_count, m.cumulative_tokens) for m in svc.get_messages(session.id)]
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE messages SET token_count = NULL, cumulative_tokens = NULL"))
+            conn.execute(text("UPDATE sessions SET total_tokens = 0"))
+            conn.commit()
+
+        _migrate_message_token_sums(engine)
+        svc.db.expire_all()
+        assert [(m.token_count, m.cumulative_tokens) for m in svc.get_messages(session.id)] == expected
+        assert svc.get_session(session.id).total_tokens == expected[-1][1]
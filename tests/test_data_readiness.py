@@ -146,6 +146,209 @@ class TestSketchService:
         assert data["dataset_id"] == dataset_id
 
 
+    @staticmethod
+    def _profile(sketch_service, path, tmp_path):
+        with patch("app.services.sketch_service.ephemeral_duckdb_service",
+                   lambda: _mock_duckdb_for_file(path)):
+            with patch.object(settings, "data_directory", str(tmp_path)):
+                return sketch_service.generate_profile(path.stem)
+
+    @pytest.fixture
+    def nulls_parquet(self, tmp_path):
+        import duckdb
+        path = tmp_path / "nulls.parquet"
+        con = duckdb.connect()
+        con.execute(f"""
+            COPY (
+                SELECT
+                    i AS id,
+                    CASE WHEN i % 4 = 0 THEN NULL ELSE 'cat_' || (i % 7)::VARCHAR END AS category,
+                    CASE WHEN i % 5 = 0 THEN NULL ELSE (i % 100) * 1.5 END AS amount,
+                    (i % 3)::DECIMAL(10, 2) AS price,
+                    i % 2 = 0 AS flag
+                FROM range(3000) t(i)
+            ) TO '{path}' (FORMAT PARQUET)
+        """)
+        con.close()
+        return path
+
+    def test_columnar_profile_matches_exact_stats(self, sketch_service, nulls_parquet, tmp_path):
+        """Null counts, distincts and frequent items match an exact computation."""
+        profile = self._profile(sketch_service, nulls_parquet, tmp_path)
+        cols = {c.column_name: c for c in profile.columns}
+
+        assert profile.row_count == 3000
+        assert cols["category"].null_count == 750
+        assert cols["amount"].null_count == 600
+        assert cols["category"].hll_distinct_estimate == 7
+        assert cols["price"].hll_distinct_estimate == 3
+        # Frequent-item values are str() of the Python value, counts are exact here
+        items = {i["value"]: i["estimate"] for i in cols["category"].frequent_items}
+        assert items["cat_1"] == sum(1 for i in range(3000) if i % 4 and i % 7 == 1)
+        assert {i["value"] for i in cols["price"].frequent_items} == {"0.00", "1.00", "2.00"}
+        assert {i["value"] for i in cols["flag"].frequent_items} == {"True", "False"}
+        # Quantiles only for numerics (decimals included), never for booleans
+        assert cols["amount"].quantiles["p50"] == pytest.approx(75.0, abs=3.0)
+        assert cols["price"].quantiles is not None
+        assert cols["flag"].quantiles is None
+        assert cols["category"].quantiles is None
+
+    def test_parallel_profile_matches_inline(self, sketch_service, nulls_parquet, tmp_path):
+        """Column-parallel profiling in worker processes merges to the same profile."""
+        from app.services import sketch_service as sketch_mod
+
+        inline = self._profile(sketch_service, nulls_parquet, tmp_path)
+        with patch.object(sketch_mod, "PARALLEL_MIN_ROWS", 0), \
+             patch.object(sketch_mod, "PARALLEL_CHUNK_SIZE", 700), \
+             patch.object(settings, "sketch_workers", 2):
+            parallel = self._profile(sketch_service, nulls_parquet, tmp_path)
+
+        for a, b in zip(inline.columns, parallel.columns):
+            assert a.column_name == b.column_name
+            assert (a.null_count, a.total_count) == (b.null_count, b.total_count)
+            assert a.hll_distinct_estimate == pytest.approx(b.hll_distinct_estimate, rel=0.02)
+            if a.column_name in ("category", "price", "flag"):
+                by_value = lambda items: sorted(items, key=lambda i: i["value"])  # noqa: E731
+                assert by_value(a.frequent_items) == by_value(b.frequent_items)
+            if a.quantiles:
+                assert a.quantiles["p50"] == pytest.approx(b.quantiles["p50"], rel=0.05)
+
+    def test_column_sketch_pickles_and_merges(self):
+        """Partial sketches survive pickling and merge via the union APIs."""
+        import pickle
+        import pyarrow as pa
+        from app.services.sketch_service import ColumnSketch
+
+        left, right = ColumnSketch(numeric=True), ColumnSketch(numeric=True)
+        left.update(pa.array([1, 2, 2, None]))
+        right.update(pa.array([2, 3, 4]))
+        left.merge(pickle.loads(pickle.dumps(right)))
+
+        profile = left.to_profile("n", "BIGINT")
+        assert (profile.total_count, profile.null_count) == (7, 1)
+        assert profile.hll_distinct_estimate == 4
+        assert {i["value"]: i["estimate"] for i in profile.frequent_items}["2"] == 3
+        assert profile.quantiles["p25"] == 2.0
+
+
+    @staticmethod
+    def _write_rows(path, n_rows, row_group_size=1000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({
+            "id": pa.array(range(n_rows), pa.int64()),
+            "category": pa.array([None if i % 9 == 0 else f"c{i % 13}" for i in range(n_rows)]),
+            "amount": pa.array([float(i % 250) for i in range(n_rows)]),
+        })
+        pq.write_table(table, path, row_group_size=row_group_size)
+
+    @staticmethod
+    def _profile_processed(sketch_service, dataset_id, parquet_path):
+        record = MagicMock(processed_path=parquet_path)
+        processing = MagicMock()
+        processing.get_dataset.return_value = record
+        with patch("app.services.processing_service.get_processing_service", return_value=processing):
+            return sketch_service.generate_profile(dataset_id)
+
+    def test_profile_reads_processed_parquet_by_row_group(self, sketch_service, tmp_path):
+        """Processed Parquet is profiled per row group; row count comes from the footer."""
+        import pyarrow.ipc as ipc
+        parquet_path = tmp_path / "ds_rg.parquet"
+        self._write_rows(parquet_path, 3500)
+
+        with patch("app.services.sketch_service.SketchService._profile_raw") as raw:
+            profile = self._profile_processed(sketch_service, "ds_rg", parquet_path)
+        raw.assert_not_called()
+
+        cols = {c.column_name: c for c in profile.columns}
+        assert profile.row_count == 3500
+        assert cols["id"].dtype == "BIGINT"
+        assert cols["category"].null_count == len(range(0, 3500, 9))
+        assert cols["category"].hll_distinct_estimate == 13
+        assert abs(cols["id"].hll_distinct_estimate - 3500) / 3500 < 0.05
+        assert cols["amount"].quantiles["p50"] == pytest.approx(125, abs=5)
+
+        stored = ipc.open_file(str(sketch_service.output_dir / "ds_rg" / "sketch_row_groups.arrow")).read_all()
+        assert len(set(stored.column("fingerprint").to_pylist())) == 4  # 3500 rows / 1000
+        assert stored.num_rows == 4 * 3
+
+    def test_reprofile_after_append_reuses_row_groups(self, sketch_service, tmp_path):
+        """Only row groups that are new after an append are sketched again."""
+        from app.services import sketch_service as sketch_mod
+
+        parquet_path = tmp_path / "ds_append.parquet"
+        self._write_rows(parquet_path, 3000)
+        self._profile_processed(sketch_service, "ds_append", parquet_path)
+
+        # Append: same leading rows, two more row groups
+        self._write_rows(parquet_path, 5000)
+        with patch.object(
+            sketch_mod.SketchService, "_sketch_row_groups",
+            side_effect=sketch_mod.SketchService._sketch_row_groups,
+        ) as spy:
+            appended = self._profile_processed(sketch_service, "ds_append", parquet_path)
+        assert spy.call_args.args[1] == [3, 4]
+
+        # Same result as profiling the appended file from scratch
+        (sketch_service.output_dir / "ds_append" / "sketch_row_groups.arrow").unlink()
+        fresh = self._profile_processed(sketch_service, "ds_append", parquet_path)
+        assert appended.row_count == fresh.row_count == 5000
+        for a, b in zip(appended.columns, fresh.columns):
+            assert (a.null_count, a.total_count) == (b.null_count, b.total_count)
+            assert a.hll_distinct_estimate == b.hll_distinct_estimate
+            assert sorted(a.frequent_items or [], key=lambda i: i["value"]) == \
+                sorted(b.frequent_items or [], key=lambda i: i["value"])
+
+    def test_row_groups_without_statistics_are_fingerprinted_by_content(self, sketch_service, tmp_path):
+        """Same sizes but different values: no stale partial is reused without min/max stats."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from app.services import sketch_service as sketch_mod
+
+        parquet_path = tmp_path / "ds_nostats.parquet"
+
+        def write(prefix):
+            table = pa.table({"label": [f"{prefix}{i % 7}" for i in range(2000)]})
+            pq.write_table(table, parquet_path, row_group_size=1000, write_statistics=False,
+                           compression="none")
+
+        write("a")
+        self._profile_processed(sketch_service, "ds_nostats", parquet_path)
+        write("b")
+        assert not pq.ParquetFile(parquet_path).metadata.row_group(0).column(0).is_stats_set
+        with patch.object(
+            sketch_mod.SketchService, "_sketch_row_groups",
+            side_effect=sketch_mod.SketchService._sketch_row_groups,
+        ) as spy:
+            profile = self._profile_processed(sketch_service, "ds_nostats", parquet_path)
+        assert spy.call_args.args[1] == [0, 1]
+        (label,) = profile.columns
+        assert {i["value"][0] for i in label.frequent_items} == {"b"}
+
+        with patch.object(
+            sketch_mod.SketchService, "_sketch_row_groups",
+            side_effect=sketch_mod.SketchService._sketch_row_groups,
+        ) as spy:
+            self._profile_processed(sketch_service, "ds_nostats", parquet_path)
+        assert spy.call_args.args[1] == []  # Unchanged content is still reused
+
+    def test_row_groups_sketched_in_worker_processes(self, sketch_service, tmp_path):
+        """Row groups fan out to a process pool and merge to the in-process result."""
+        from app.services import sketch_service as sketch_mod
+
+        parquet_path = tmp_path / "ds_par.parquet"
+        self._write_rows(parquet_path, 4000)
+        inline = self._profile_processed(sketch_service, "ds_par", parquet_path)
+
+        (sketch_service.output_dir / "ds_par" / "sketch_row_groups.arrow").unlink()
+        with patch.object(sketch_mod, "PARALLEL_MIN_ROWS", 0), \
+             patch.object(settings, "sketch_workers", 2):
+            parallel = self._profile_processed(sketch_service, "ds_par", parquet_path)
+
+        for a, b in zip(inline.columns, parallel.columns):
+            assert (a.null_count, a.hll_distinct_estimate) == (b.null_count, b.hll_distinct_estimate)
+
+
 # ── Quality Contract Service ─────────────────────────────────────────
 
 
@@ -225,6 +428,95 @@ class TestQualityContractService:
         assert scorecard.consistency.score == 1.0
 
 
+class _CountingConnection:
+    """Proxy that records every SQL statement sent to a DuckDB connection."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.statements = []
+
+    def execute(self, sql, *args):
+        self.statements.append(sql)
+        return self._conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class TestQualityRulePlanner:
+    """All aggregate rules run in one scan with the per-rule results."""
+
+    @pytest.fixture
+    def quality_service(self, tmp_path):
+        from app.services.quality_contract_service import QualityContractService
+
+        svc = QualityContractService()
+        svc.output_dir = tmp_path / "processed"
+        svc.output_dir.mkdir()
+        return svc
+
+    @staticmethod
+    def _rules_csv(tmp_path, bad_cast: bool) -> Path:
+        lines = ['id,name,start_date,end_date,min,max,low,high,"we""ird"\n']
+        for i in range(600):
+            name = "" if i % 7 == 0 else f"n{i % 40}"
+            end = f"2026-01-{1 + (i * 3) % 28:02d}" if i % 5 else ""
+            hi = "abc" if bad_cast and i == 17 else str(i % 11)
+            lines.append(
+                f"{i},{name},2026-01-{1 + i % 28:02d},{end},{i % 9},{hi},{i % 4},{i % 6},{i % 3}\n"
+            )
+        path = tmp_path / "ds_rules.csv"
+        path.write_text("".join(lines))
+        return path
+
+    def _validate(self, svc, path, tmp_path, batched=True):
+        from app.services import quality_contract_service as qc
+
+        statements = []
+        original = qc.QualityContractService._evaluate_rules
+
+        def counting_ctx():
+            ctx = _mock_duckdb_for_file(path)
+            counting = _CountingConnection(ctx.svc.connection)
+            counting.statements = statements
+            ctx.svc._connection = counting
+            return ctx
+
+        def evaluate(conn, read_func, rules, batched_=True):
+            return original(conn, read_func, rules, batched=batched)
+
+        with patch.object(settings, "data_directory", str(tmp_path)), \
+             patch.object(qc, "ephemeral_duckdb_service", counting_ctx), \
+             patch.object(qc.QualityContractService, "_evaluate_rules", staticmethod(evaluate)):
+            scorecard = svc.validate_dataset(path.stem)
+        scans = [q for q in statements if "read_csv" in q and "DESCRIBE" not in q]
+        return scorecard, scans
+
+    @pytest.mark.parametrize("bad_cast", [False, True])
+    def test_batched_scorecard_matches_per_rule(self, quality_service, tmp_path, bad_cast):
+        path = self._rules_csv(tmp_path, bad_cast)
+        batched, batched_scans = self._validate(quality_service, path, tmp_path)
+        per_rule, per_rule_scans = self._validate(quality_service, path, tmp_path, batched=False)
+
+        assert batched.model_dump() == per_rule.model_dump()
+        assert len(per_rule_scans) > 20
+        if bad_cast:
+            # min/max cast fails: the optional rules are bisected around it
+            assert not any("min > max" in d for d in batched.consistency.details)
+            assert len(batched_scans) < 12
+        else:
+            # Row count from the metadata lookup, one rule scan, the Pandera sample
+            assert len(batched_scans) == 3
+
+    def test_rule_results(self, quality_service, tmp_path):
+        scorecard, _ = self._validate(quality_service, self._rules_csv(tmp_path, False), tmp_path)
+        details = scorecard.consistency.details
+        assert any(d.startswith("start_date > end_date in ") for d in details)
+        assert any(d.startswith("min > max in ") for d in details)
+        assert any(d.startswith("low > high in ") for d in details)
+        assert any(d.startswith("name: ") and "null" in d for d in scorecard.completeness.details)
+
+
 # ── PII Structured Scanning + Settings ───────────────────────────────
 
 
@@ -12,15 +12,23 @@ Covers:
 - Direct query with empty SQL → 422
 - Direct query result truncation flag
 - SQL validation blocks dangerous patterns
+- Direct query streams Arrow IPC / NDJSON and cancels server-side on
+  timeout or client disconnect
 """
 
+import asyncio
+import json
 import time
 from unittest.mock import MagicMock, patch
 
+import pyarrow as pa
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
 
 from app.main import app
-from app.services.db_connector import TableInfo
+from app.routers import database as db_router
+from app.services.db_connector import DirectQuery, TableInfo
 
 client = TestClient(app)
 
@@ -331,3 +339,181 @@ class TestDirectQuery:
             json={"sql": "WITH cte AS (SELECT 1 AS n) SELECT * FROM cte"},
         )
         assert resp.status_code == 200
+
+
+# =====================================================================
+# Streaming + server-side cancellation
+# =====================================================================
+
+# Runs until interrupted (SQLite has no statement timeout of its own)
+_SLOW_SQL = (
+    "WITH RECURSIVE r(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM r WHERE i < 1000000000) "
+    "SELECT count(*) AS n FROM r"
+)
+
+
+def _sqlite_connector(tmp_path, rows=50):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'direct.db'}", connect_args={"check_same_thread": False},
+    )
+    with engine.begin() as c:
+        c.exec_driver_sql("CREATE TABLE t (id INTEGER, label TEXT, score REAL)")
+        c.exec_driver_sql(
+            "INSERT INTO t VALUES " + ", ".join(f"({i}, 'row {i}', {i * 0.5})" for i in range(rows))
+        )
+    connector = MagicMock()
+    connector.get_engine.return_value = engine
+    return connector, engine
+
+
+def _wait_checked_in(engine, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while engine.pool.checkedout() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return engine.pool.checkedout() == 0
+
+
+class TestDirectQueryStreaming:
+    def test_arrow_stream(self, tmp_path):
+        connector, engine = _sqlite_connector(tmp_path)
+        conn_id = _create_connection(name="Arrow Stream").json()["id"]
+        with patch("app.routers.database.get_db_connector", return_value=connector), \
+                patch.object(db_router, "DIRECT_QUERY_BATCH_ROWS", 7):
+            resp = client.post(
+                f"/api/v1/db/connections/{conn_id}/query",
+                json={"sql": "SELECT id, label, score FROM t ORDER BY id", "limit": 20000},
+                headers={"Accept": "application/vnd.apache.arrow.stream"},
+            )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(resp.content).read_all()
+        assert table.schema.types == [pa.int64(), pa.string(), pa.float64()]
+        assert table.column("id").to_pylist() == list(range(50))
+        assert table.column("label")[49].as_py() == "row 49"
+        assert _wait_checked_in(engine)
+
+    def test_ndjson_stream(self, tmp_path):
+        connector, _ = _sqlite_connector(tmp_path)
+        conn_id = _create_connection(name="NDJSON Stream").json()["id"]
+        with patch("app.routers.database.get_db_connector", return_value=connector), \
+                patch.object(db_router, "DIRECT_QUERY_BATCH_ROWS", 7):
+            resp = client.post(
+                f"/api/v1/db/connections/{conn_id}/query",
+                json={"sql": "SELECT id, label FROM t ORDER BY id", "limit": 10},
+                headers={"Accept": "application/x-ndjson"},
+            )
+        assert resp.status_code == 200
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines[0] == {"id": 0, "label": "row 0"}
+        assert len(lines) == 10
+
+    def test_empty_results(self, tmp_path):
+        connector, _ = _sqlite_connector(tmp_path)
+        conn_id = _create_connection(name="Empty Stream").json()["id"]
+        url = f"/api/v1/db/connections/{conn_id}/query"
+        body = {"sql": "SELECT id, label FROM t WHERE id < 0"}
+        with patch("app.routers.database.get_db_connector", return_value=connector):
+            arrow = client.post(url, json=body, headers={"Accept": "application/vnd.apache.arrow.stream"})
+            ndjson = client.post(url, json=body, headers={"Accept": "application/x-ndjson"})
+        table = pa.ipc.open_stream(arrow.content).read_all()
+        assert table.num_rows == 0 and table.column_names == ["id", "label"]
+        assert ndjson.status_code == 200 and ndjson.content == b""
+
+    def test_json_limit_capped(self):
+        conn_id = _create_connection(name="JSON Cap").json()["id"]
+        resp = client.post(
+            f"/api/v1/db/connections/{conn_id}/query",
+            json={"sql": "SELECT 1", "limit": 20000},
+        )
+        assert resp.status_code == 422
+
+    @pytest.mark.parametrize("accept", [None, "application/x-ndjson"])
+    def test_timeout_interrupts_query(self, tmp_path, accept):
+        """The client timeout cancels the statement instead of abandoning it."""
+        connector, engine = _sqlite_connector(tmp_path)
+        conn_id = _create_connection(name="Interrupt").json()["id"]
+        headers = {"Accept": accept} if accept else {}
+        with patch("app.routers.database.get_db_connector", return_value=connector), \
+                patch.object(db_router, "DIRECT_QUERY_TIMEOUT_S", 0.5), \
+                patch.object(DirectQuery, "cancel", autospec=True, side_effect=DirectQuery.cancel) as cancel:
+            resp = client.post(
+                f"/api/v1/db/connections/{conn_id}/query", json={"sql": _SLOW_SQL}, headers=headers,
+            )
+            assert resp.status_code == 504
+            # The worker thread returns promptly and the connection is released
+            assert _wait_checked_in(engine)
+        assert cancel.called
+
+    def test_disconnect_cancels_stream(self, tmp_path):
+        connector, engine = _sqlite_connector(tmp_path, rows=500)
+        conn_id = _create_connection(name="Disconnect").json()["id"]
+
+        async def consume_one_chunk():
+            resp = await db_router.direct_query(
+                conn_id,
+                db_router.DirectQueryRequest(sql="SELECT * FROM t", limit=500),
+                accept="application/x-ndjson",
+            )
+            chunks = resp.body_iterator
+            first = await chunks.__anext__()
+            await chunks.aclose()  # what Starlette's disconnect does to the stream
+            return first
+
+        with patch("app.routers.database.get_db_connector", return_value=connector), \
+                patch.object(db_router, "DIRECT_QUERY_BATCH_ROWS", 10), \
+                patch.object(DirectQuery, "cancel", autospec=True, side_effect=DirectQuery.cancel) as cancel:
+            first = asyncio.run(consume_one_chunk())
+            assert len(first.splitlines()) == 10
+            assert _wait_checked_in(engine)
+        assert cancel.called
+
+
+class TestDirectQueryCancel:
+    def _engine(self, dialect):
+        engine = MagicMock()
+        engine.dialect.name = dialect
+        conn = engine.connect.return_value
+        conn.closed = False
+        return engine, conn
+
+    def test_postgres_statement_timeout_and_cancel(self):
+        engine, conn = self._engine("postgresql")
+        query = DirectQuery(engine, "SELECT 1", timeout_s=2.5)
+        query.execute()
+        conn.exec_driver_sql.assert_called_once_with("SET LOCAL statement_timeout = 2500")
+        assert conn.execute.call_args.kwargs["execution_options"] == {"stream_results": True}
+
+        query.cancel()
+        conn.connection.driver_connection.cancel.assert_called_once()
+        query.close()
+        conn.invalidate.assert_called_once()
+        conn.close.assert_called_once()
+
+    def test_mysql_statement_timeout_and_kill_query(self):
+        engine, conn = self._engine("mysql")
+        conn.connection.driver_connection.thread_id.return_value = 42
+        query = DirectQuery(engine, "SELECT 1", timeout_s=2.5)
+        query.execute()
+        conn.exec_driver_sql.assert_called_once_with("SET SESSION MAX_EXECUTION_TIME = 2500")
+
+        query.cancel()
+        killer = conn.__enter__.return_value
+        killer.exec_driver_sql.assert_called_once_with("KILL QUERY 42")
+
+    def test_mysql_close_restores_session_timeout(self):
+        engine, conn = self._engine("mysql")
+        query = DirectQuery(engine, "SELECT 1", timeout_s=2.5)
+        query.execute()
+        query.close()
+        conn.exec_driver_sql.assert_called_with("SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+        conn.invalidate.assert_not_called()
+
+    def test_cancel_before_execute(self):
+        engine, conn = self._engine("postgresql")
+        query = DirectQuery(engine, "SELECT 1", timeout_s=1)
+        query.cancel()
+        with pytest.raises(RuntimeError):
+            query.execute()
+        conn.execute.assert_not_called()
+        query.close()
+        conn.invalidate.assert_called_once()
@@ -359,3 +359,130 @@ class TestSelfReferentialExtraction:
         # The background task may not have completed yet in all test configurations,
         # so we just verify the extract was accepted.
         assert dataset_id  # Non-empty
+
+
+# =====================================================================
+# Extraction scheduler (SQLite source with many tables)
+# =====================================================================
+
+class TestExtractionScheduler:
+    """_run_extraction_pipeline: bounded stages, isolated failures, batched status writes."""
+
+    TABLES = 40
+    FAILING = "t7"
+
+    def _source(self, tmp_path):
+        import sqlite3
+        from sqlalchemy import create_engine
+
+        path = tmp_path / "source.db"
+        con = sqlite3.connect(path)
+        for t in range(self.TABLES):
+            con.execute(f"CREATE TABLE t{t} (id INTEGER PRIMARY KEY, label TEXT)")
+            con.executemany(f"INSERT INTO t{t} VALUES (?, ?)", [(i, f"t{t}-{i}") for i in range(50)])
+        con.commit()
+        con.close()
+        return create_engine(f"sqlite:///{path}")
+
+    @pytest.mark.asyncio
+    async def test_many_tables(self, tmp_path):
+        import asyncio
+        import shutil
+        import threading
+        import time
+        from contextlib import contextmanager
+
+        from app.config import settings
+        from app.core.database import get_session_context
+        from app.models.database_connection import DatabaseConnection
+        from app.models.dataset import DatasetRecord, DatasetStatus
+        from app.routers import database as db_router
+        from app.services.db_connector import DatabaseConnector
+
+        engine = self._source(tmp_path)
+        conn_id = _create_connection(name="Scheduler Test").json()["id"]
+        extractions = []
+        with get_session_context() as session:
+            for t in range(self.TABLES):
+                dataset_id = f"sched{t:02d}"
+                session.merge(DatasetRecord(
+                    id=dataset_id, original_filename=f"t{t}.parquet", storage_filename=f"t{t}.parquet",
+                    file_type="parquet", file_size_bytes=0, status=DatasetStatus.UPLOADED.value,
+                    metadata_json='{"source_type": "database"}',
+                ))
+                extractions.append({"dataset_id": dataset_id, "table": f"t{t}", "schema": "main"})
+            session.commit()
+
+        lock = threading.Lock()
+        active = {"extract": 0, "pipeline": 0}
+        peak = {"extract": 0, "pipeline": 0, "overlap": False}
+        test_loop = asyncio.get_running_loop()
+        original_extract = DatabaseConnector.extract_table
+
+        def enter(stage):
+            with lock:
+                active[stage] += 1
+                peak[stage] = max(peak[stage], active[stage])
+                peak["overlap"] |= active["extract"] > 0 and active["pipeline"] > 0
+
+        def leave(stage):
+            with lock:
+                active[stage] -= 1
+
+        def tracked_extract(self, **kwargs):
+            enter("extract")
+            try:
+                time.sleep(0.02)
+                return original_extract(self, **kwargs)
+            finally:
+                leave("extract")
+
+        class FakePipeline:
+            async def run_full_pipeline(self, dataset_id):
+                assert asyncio.get_running_loop() is test_loop
+                enter("pipeline")
+                try:
+                    await asyncio.sleep(0.03)
+                    if dataset_id == f"sched{int(TestExtractionScheduler.FAILING[1:]):02d}":
+                        raise RuntimeError("pipeline exploded")
+                    processed = Path(settings.processed_directory) / dataset_id / "processed.parquet"
+                    processed.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy(Path(settings.data_directory) / f"{dataset_id}.parquet", processed)
+                finally:
+                    leave("pipeline")
+
+        sessions = []
+        real_session_context = db_router.get_session_context
+
+        @contextmanager
+        def counting_session_context():
+            sessions.append(1)
+            with real_session_context() as session:
+                yield session
+
+        with patch.object(DatabaseConnector, "get_engine", return_value=engine), \
+                patch.object(DatabaseConnector, "extract_table", tracked_extract), \
+                patch("app.services.pipeline_service.get_pipeline_service", return_value=FakePipeline()), \
+                patch.object(db_router, "get_session_context", counting_session_context), \
+                patch.object(settings, "db_extract_concurrency", 2), \
+                patch.object(settings, "db_pipeline_concurrency", 3):
+            await db_router._run_extraction_pipeline(conn_id, extractions)
+
+        assert peak["extract"] == 2
+        assert 1 < peak["pipeline"] <= 3
+        assert peak["overlap"]
+        # One session for the connection lookup, then coalesced flushes (the old
+        # loop opened 4 per table)
+        assert len(sessions) < self.TABLES // 2
+
+        with get_session_context() as session:
+            records = {e["dataset_id"]: session.get(DatasetRecord, e["dataset_id"]) for e in extractions}
+            last_sync_at = session.get(DatabaseConnection, conn_id).last_sync_at
+        failing_id = f"sched{int(self.FAILING[1:]):02d}"
+        assert records[failing_id].status == DatasetStatus.ERROR.value
+        assert "pipeline exploded" in records[failing_id].metadata_json
+        ready = [r for dataset_id, r in records.items() if dataset_id != failing_id]
+        assert all(r.status == DatasetStatus.READY.value for r in ready)
+        assert all(r.file_size_bytes > 0 and r.processed_path for r in ready)
+        assert all('"phase": "ready"' in r.metadata_json for r in ready)
+        assert last_sync_at is not None
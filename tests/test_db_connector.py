@@ -1,18 +1,24 @@
 """
-Tests for DatabaseConnector — SQL validation, type mapping, credential encryption.
+Tests for DatabaseConnector — SQL validation, type mapping, credential encryption,
+extraction to Parquet.
 
 Phase: BQ-VZ-DB-CONNECT
 """
 
 import datetime
 import decimal
+import sqlite3
+import sys
+import types
 import uuid
 from unittest.mock import MagicMock, patch
 
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
-from app.services.db_connector import DatabaseConnector, get_db_connector
+from app.config import settings
+from app.services.db_connector import DatabaseConnector, TableInfo, get_db_connector
 
 
 # =====================================================================
@@ -425,6 +431,306 @@ class TestBulkIntrospection:
         assert tables[0].primary_key is None
 
 
+# =====================================================================
+# Extraction to Parquet (DBAPI cursor + native readers)
+# =====================================================================
+
+def _sqlite_engine(path, rows=25_000):
+    """SQLite table with int/float/text/nullable/blob columns."""
+    from sqlalchemy import create_engine
+
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE t (id INTEGER, score REAL, name TEXT, late INTEGER, payload BLOB)")
+    con.executemany(
+        "INSERT INTO t VALUES (?, ?, ?, ?, ?)",
+        [
+            (i, i / 4, f"name_{i % 97}", i if i >= 15_000 else None, b"\x00\x01")
+            for i in range(rows)
+        ],
+    )
+    con.commit()
+    con.close()
+    return create_engine(f"sqlite:///{path}")
+
+
+class TestStreamToParquet:
+    """_stream_to_parquet on a local SQLite database."""
+
+    def test_sqlite_roundtrip(self, tmp_path):
+        engine = _sqlite_engine(tmp_path / "src.db")
+        out = tmp_path / "out.parquet"
+        connector = DatabaseConnector()
+        connector._stream_to_parquet(
+            engine, "sqlite", "SELECT * FROM t", out, column_types={"late": "integer"},
+        )
+
+        table = pq.read_table(out)
+        assert table.schema == pa.schema([
+            ("id", pa.int64()), ("score", pa.float64()), ("name", pa.string()), ("late", pa.int64()),
+        ])  # payload (binary) skipped
+        assert table.num_rows == 25_000
+        assert table.column("id").to_pylist() == list(range(25_000))
+        assert table.column("late").null_count == 15_000
+        assert table.column("late")[24_999].as_py() == 24_999
+        assert pq.ParquetFile(out).metadata.row_group(0).column(0).compression == "ZSTD"
+        assert not out.with_name(out.name + ".partial").exists()
+
+    def test_kinds_fixed_from_first_batch_without_types(self, tmp_path):
+        """Without introspected types an all-NULL first batch pins the column to text."""
+        engine = _sqlite_engine(tmp_path / "src.db")
+        out = tmp_path / "out.parquet"
+        DatabaseConnector()._stream_to_parquet(engine, "sqlite", "SELECT * FROM t", out)
+
+        late = pq.read_table(out).column("late")
+        assert late.type == pa.string()
+        assert late[20_000].as_py() == "20000"
+
+    def test_row_groups_follow_target_size(self, tmp_path):
+        engine = _sqlite_engine(tmp_path / "src.db", rows=5_000)
+        out = tmp_path / "out.parquet"
+        connector = DatabaseConnector()
+        with patch.object(DatabaseConnector, "EXTRACT_BATCH_ROWS", 1_000), \
+                patch.object(settings, "parquet_row_group_size_mb", 0):
+            connector._stream_to_parquet(engine, "sqlite", "SELECT id, name FROM t", out)
+        assert pq.ParquetFile(out).metadata.num_row_groups == 5
+
+        with patch.object(DatabaseConnector, "EXTRACT_BATCH_ROWS", 1_000):
+            connector._stream_to_parquet(engine, "sqlite", "SELECT id, name FROM t", out)
+        assert pq.ParquetFile(out).metadata.num_row_groups == 1
+
+    def test_empty_result_writes_placeholder(self, tmp_path):
+        engine = _sqlite_engine(tmp_path / "src.db", rows=10)
+        out = tmp_path / "out.parquet"
+        DatabaseConnector()._stream_to_parquet(engine, "sqlite", "SELECT * FROM t WHERE id < 0", out)
+        assert pq.read_table(out).column_names == ["_empty"]
+
+    def test_native_reader_output_is_conformed(self, tmp_path, monkeypatch):
+        """connectorx batches are mapped onto the M2 types; the cursor path is not used."""
+        native = pa.table({
+            "id": pa.array([1, 2], type=pa.int32()),
+            "amount": pa.array([decimal.Decimal("1.25"), None], type=pa.decimal128(10, 2)),
+            "ts": pa.array([0, 3_600_000_000], type=pa.timestamp("us", tz="America/New_York")),
+            "tags": pa.array([[1, 2], None]),
+            "payload": pa.array([b"\x00", b"\x01"]),
+        })
+        calls = []
+        fake_cx = types.ModuleType("connectorx")
+        fake_cx.read_sql = lambda uri, query, return_type: calls.append((uri, query)) or native
+        monkeypatch.setitem(sys.modules, "connectorx", fake_cx)
+
+        out = tmp_path / "out.parquet"
+        connector = DatabaseConnector()
+        with patch.object(connector, "_cursor_batches") as cursor_path:
+            connector._stream_to_parquet(
+                MagicMock(), "mysql", "SELECT * FROM t", out, native_uri="mysql://u:p@h:3306/db",
+            )
+        cursor_path.assert_not_called()
+        assert calls == [("mysql://u:p@h:3306/db", "SELECT * FROM t")]
+
+        table = pq.read_table(out)
+        assert table.schema == pa.schema([
+            ("id", pa.int64()), ("amount", pa.float64()), ("ts", pa.timestamp("us")), ("tags", pa.string()),
+        ])
+        assert table.column("amount").to_pylist() == [1.25, None]
+        assert table.column("ts")[1].as_py() == datetime.datetime(1970, 1, 1, 1, 0)
+        assert table.column("tags").to_pylist() == ["[1, 2]", None]
+
+    def test_native_reader_failure_falls_back_to_cursor(self, tmp_path, monkeypatch):
+        fake_cx = types.ModuleType("connectorx")
+
+        def read_sql(uri, query, return_type):
+            raise RuntimeError("unsupported type")
+
+        fake_cx.read_sql = read_sql
+        monkeypatch.setitem(sys.modules, "connectorx", fake_cx)
+
+        engine = _sqlite_engine(tmp_path / "src.db", rows=100)
+        out = tmp_path / "out.parquet"
+        DatabaseConnector()._stream_to_parquet(
+            engine, "mysql", "SELECT id FROM t", out, native_uri="mysql://u:p@h:3306/db",
+        )
+        assert pq.read_table(out).num_rows == 100
+
+    def test_native_reader_disabled_by_setting(self, tmp_path, monkeypatch):
+        fake_cx = types.ModuleType("connectorx")
+        fake_cx.read_sql = MagicMock()
+        monkeypatch.setitem(sys.modules, "connectorx", fake_cx)
+
+        engine = _sqlite_engine(tmp_path / "src.db", rows=10)
+        with patch.object(settings, "db_extract_engine", "sqlalchemy"):
+            DatabaseConnector()._stream_to_parquet(
+                engine, "mysql", "SELECT id FROM t", tmp_path / "out.parquet",
+                native_uri="mysql://u:p@h:3306/db",
+            )
+        fake_cx.read_sql.assert_not_called()
+
+
+class TestPartitionedExtraction:
+    """extract_table(partitioned=True) against a local SQLite table keyed on id."""
+
+    def _extract(self, tmp_path, rows=20_000, estimated=None, pk=("id",), row_limit=None,
+                 max_partitions=4, extra_ids=()):
+        engine = _sqlite_engine(tmp_path / "src.db", rows)
+        with engine.begin() as conn:
+            for extra_id in extra_ids:
+                conn.exec_driver_sql("INSERT INTO t (id) VALUES (?)", (extra_id,))
+        connector = DatabaseConnector()
+        info = TableInfo(
+            name="t", schema="main",
+            columns=[{"name": "id", "type": "integer"}, {"name": "late", "type": "integer"}],
+            primary_key={"constrained_columns": list(pk)} if pk else None,
+            estimated_rows=rows if estimated is None else estimated,
+        )
+        connection = MagicMock(id="c1", db_type="postgresql")
+        out = tmp_path / "out.parquet"
+        with patch.object(connector, "get_engine", return_value=engine), \
+                patch.object(connector, "introspect_schema", return_value=[info]), \
+                patch.object(connector, "_native_uri", return_value=None), \
+                patch.object(settings, "db_extract_max_partitions", max_partitions), \
+                patch.object(settings, "db_extract_partition_min_rows", 1_000), \
+                patch.object(connector, "_stream_to_parquet", wraps=connector._stream_to_parquet) as spy:
+            connector.extract_table(
+                connection, "t", out, schema="main", row_limit=row_limit, partitioned=True,
+            )
+        return pq.read_table(out), [c.args[2] for c in spy.call_args_list], out
+
+    def test_partitions_cover_every_row_once(self, tmp_path):
+        table, queries, out = self._extract(tmp_path)
+        assert len(queries) == 4
+        assert all(" WHERE " in q for q in queries)
+        assert sorted(table.column("id").to_pylist()) == list(range(20_000))
+        # The first part's "late" values are all NULL (sniffed as text); the others vote int64
+        assert table.schema.field("late").type == pa.int64()
+        assert table.column("late").null_count == 15_000
+        assert not out.with_name(f".{out.name}.parts").exists()
+
+    def test_partition_count_is_bounded(self, tmp_path):
+        # SQLite's QueuePool holds 5 connections
+        _, queries, _ = self._extract(tmp_path, max_partitions=8)
+        assert len(queries) == 5
+
+    def test_partition_count_follows_estimated_rows(self, tmp_path):
+        _, queries, _ = self._extract(tmp_path, estimated=2_500)
+        assert len(queries) == 2
+
+    def test_row_limit_holds_for_skewed_ranges(self, tmp_path):
+        # One far-off key: the first range holds every row but one
+        table, queries, _ = self._extract(tmp_path, row_limit=5_000, extra_ids=(10_000_000,))
+        assert len(queries) == 4
+        assert all(q.endswith("LIMIT 5000") for q in queries)
+        assert table.column("id").to_pylist() == list(range(5_000))
+
+    def test_small_row_limit_uses_one_cursor(self, tmp_path):
+        table, queries, _ = self._extract(tmp_path, row_limit=1_000)
+        assert len(queries) == 1
+        assert " WHERE " not in queries[0]
+        assert table.num_rows == 1_000
+
+    @pytest.mark.parametrize("kwargs", [{"estimated": 1_500}, {"pk": ()}])
+    def test_small_or_keyless_table_uses_one_cursor(self, tmp_path, kwargs):
+        table, queries, _ = self._extract(tmp_path, rows=2_000, **kwargs)
+        assert len(queries) == 1
+        assert " WHERE " not in queries[0]
+        assert table.num_rows == 2_000
+
+    def test_range_predicates(self):
+        preds = DatabaseConnector._range_predicates('"id"', 0, 99, 4)
+        assert preds == [
+            '("id" < 25 OR "id" IS NULL)',
+            '"id" >= 25 AND "id" < 50',
+            '"id" >= 50 AND "id" < 75',
+            '"id" >= 75',
+        ]
+        preds = DatabaseConnector._range_predicates(
+            "d", datetime.date(2024, 1, 1), datetime.date(2024, 1, 3), 4,
+        )
+        assert preds == ["(d < '2024-01-02' OR d IS NULL)", "d >= '2024-01-02'"]
+        preds = DatabaseConnector._range_predicates(
+            "ts", datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 2), 2,
+        )
+        assert preds[1] == "ts >= '2024-01-01 12:00:00'"
+        assert DatabaseConnector._range_predicates("k", 5, 5, 4) == []
+        assert DatabaseConnector._range_predicates("k", "a", "z", 4) == []
+
+
+def _docker_available() -> bool:
+    try:
+        import docker
+
+        docker.from_env().ping()
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _docker_available(), reason="Docker not available")
+class TestContainerExtraction:
+    """Server-side cursor extraction against real PostgreSQL / MySQL."""
+
+    DDL = {
+        "postgresql": (
+            "CREATE TABLE items (id BIGINT PRIMARY KEY, price NUMERIC(10, 2), "
+            "created TIMESTAMPTZ, tags JSONB, uid UUID, blob BYTEA)"
+        ),
+        "mysql": (
+            "CREATE TABLE items (id BIGINT PRIMARY KEY, price DECIMAL(10, 2), "
+            "created DATETIME, tags JSON, uid CHAR(36), blob_col BLOB)"
+        ),
+    }
+
+    @pytest.fixture(params=["postgresql", "mysql"])
+    def database(self, request):
+        if request.param == "postgresql":
+            containers = pytest.importorskip("testcontainers.postgres")
+            container = containers.PostgresContainer("postgres:16-alpine", driver="psycopg2")
+        else:
+            containers = pytest.importorskip("testcontainers.mysql")
+            container = containers.MySqlContainer("mysql:8.0")
+        with container:
+            yield request.param, container.get_connection_url()
+
+    def test_extract_items(self, database, tmp_path):
+        from sqlalchemy import create_engine, text
+
+        db_type, url = database
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(text(self.DDL[db_type]))
+            for i in range(2_500):
+                conn.execute(
+                    text(
+                        "INSERT INTO items (id, price, created, tags, uid) "
+                        "VALUES (:id, :price, :created, :tags, :uid)"
+                    ),
+                    {
+                        "id": i, "price": decimal.Decimal(i) / 4,
+                        "created": datetime.datetime(2024, 1, 1, 12, 0), "tags": '["a", "b"]',
+                        "uid": str(uuid.UUID(int=i)),
+                    },
+                )
+
+        connector = DatabaseConnector()
+        schema = "public" if db_type == "postgresql" else None
+        column_types = connector._table_column_types(engine, db_type, schema, "items")
+        assert column_types["price"] in ("numeric", "decimal")
+        assert "id" in connector._indexed_columns(engine, db_type, schema, "items")
+
+        out = tmp_path / "items.parquet"
+        with patch.object(DatabaseConnector, "EXTRACT_BATCH_ROWS", 1_000):
+            connector._stream_to_parquet(
+                engine, db_type, "SELECT * FROM items ORDER BY id", out, column_types=column_types,
+            )
+        table = pq.read_table(out)
+        assert table.num_rows == 2_500
+        assert table.schema.field("price").type == pa.float64()
+        assert table.schema.field("created").type == pa.timestamp("us")
+        assert table.schema.field("tags").type == pa.string()
+        assert table.schema.field("uid").type == pa.string()
+        assert "blob" not in table.column_names and "blob_col" not in table.column_names
+        assert table.column("price")[10].as_py() == 2.5
+        engine.dispose()
+
+
 class TestSingleton:
     def test_get_db_connector_returns_same_instance(self):
         c1 = get_db_connector()
@@ -106,7 +106,7 @@ def test_connection_settings(duckdb_service):
 
 
 def test_excel_read_via_get_read_function(duckdb_service, sample_xlsx):
-    """Excel files should be read via pandas, not st_read."""
+    """Excel files should be read via a registered view, not st_read."""
     view_name = duckdb_service.get_read_function('xlsx', str(sample_xlsx))
     # The view name should be a registered view, not an st_read() call
     assert 'st_read' not in view_name
@@ -133,6 +133,85 @@ def test_excel_get_sample_rows(duckdb_service, sample_xlsx):
     assert "name" in rows[0]
 
 
+@pytest.fixture
+def multi_sheet_xlsx(tmp_path):
+    """Workbook with two data sheets of different columns."""
+    xlsx_file = tmp_path / "multi.xlsx"
+    with pd.ExcelWriter(xlsx_file) as writer:
+        pd.DataFrame({'id': [1, 2, 3], 'amount': [10, 20, 30]}).to_excel(writer, sheet_name='Orders', index=False)
+        pd.DataFrame({'id': [9], 'amount': [1.5], 'reason': ['dup']}).to_excel(writer, sheet_name='Refunds', index=False)
+    return xlsx_file
+
+
+def test_excel_multi_sheet_union_view(duckdb_service, multi_sheet_xlsx):
+    """All sheets are unioned with a sheet column and widened types."""
+    view_name = duckdb_service.get_read_function('xlsx', str(multi_sheet_xlsx))
+    conn = duckdb_service.connection
+    rows = conn.execute(f"SELECT sheet, id, amount, reason FROM {view_name} ORDER BY id").fetchall()
+    assert rows == [
+        ('Orders', 1, 10.0, None), ('Orders', 2, 20.0, None),
+        ('Orders', 3, 30.0, None), ('Refunds', 9, 1.5, 'dup'),
+    ]
+
+
+def test_excel_sheet_views(duckdb_service, multi_sheet_xlsx):
+    """Each sheet can be registered as its own view, typed on its own."""
+    views = duckdb_service.register_excel_sheets(str(multi_sheet_xlsx))
+    assert list(views) == ['Orders', 'Refunds']
+    conn = duckdb_service.connection
+    assert conn.execute(f"SELECT SUM(amount) FROM {views['Orders']}").fetchone() == (60,)
+    cols = [r[0] for r in conn.execute(f"DESCRIBE {views['Refunds']}").fetchall()]
+    assert cols == ['id', 'amount', 'reason']
+
+
+def test_excel_conversion_is_cached(duckdb_service, sample_xlsx, tmp_path):
+    """Re-registering an unchanged workbook reuses the streamed Parquet."""
+    duckdb_service.get_read_function('xlsx', str(sample_xlsx))
+    cached = list((tmp_path / "data" / "temp").glob("excel_*.parquet"))
+    assert len(cached) == 1
+    mtime = cached[0].stat().st_mtime_ns
+    with patch("app.services.streaming_processor.StreamingSpreadsheetProcessor") as proc:
+        duckdb_service.get_read_function('xlsx', str(sample_xlsx))
+    proc.assert_not_called()
+    assert list((tmp_path / "data" / "temp").glob("excel_*.parquet")) == cached
+    assert cached[0].stat().st_mtime_ns >= mtime
+
+
+def test_concurrent_excel_conversions_use_separate_partials(duckdb_service, sample_xlsx, tmp_path):
+    """Two threads converting the same workbook at once don't share a partial file."""
+    import threading
+    from app.services.streaming_processor import StreamingSpreadsheetProcessor
+
+    both_writing = threading.Barrier(2, timeout=10)
+    partials, results, errors = [], [], []
+    write_parquet = StreamingSpreadsheetProcessor.write_parquet
+
+    def slow_write(self, dest, *args, **kwargs):
+        partials.append(dest)
+        rows = write_parquet(self, dest, *args, **kwargs)
+        both_writing.wait()  # Both partials exist before either is renamed
+        return rows
+
+    def convert():
+        try:
+            results.append(duckdb_service._excel_parquet(str(sample_xlsx)))
+        except Exception as e:
+            errors.append(e)
+
+    with patch.object(StreamingSpreadsheetProcessor, "write_parquet", slow_write):
+        threads = [threading.Thread(target=convert) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert errors == []
+    assert len(set(partials)) == 2
+    assert results[0] == results[1]
+    assert pd.read_parquet(results[0])['id'].tolist() == [1, 2, 3]
+    assert list((tmp_path / "data" / "temp").glob("*.partial")) == []
+
+
 def test_write_parquet_produces_valid_file(duckdb_service, tmp_path):
     """write_parquet should produce a valid Parquet file readable by DuckDB."""
     output = tmp_path / "output.parquet"
@@ -14,6 +14,24 @@ import json
 import time
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+
+def _fts_extension_available() -> bool:
+    import duckdb
+    try:
+        con = duckdb.connect()
+        con.execute("INSTALL fts")
+        con.execute("LOAD fts")
+        con.close()
+        return True
+    except Exception:
+        return False
+
+
+requires_fts = pytest.mark.skipif(
+    not _fts_extension_available(), reason="DuckDB fts extension not installable here",
+)
 
 
 # ---------------------------------------------------------------------------
@@ -96,6 +114,188 @@ class TestRerankerCircuitBreaker:
         assert service._consecutive_timeouts == 0
 
 
+class _LengthScorer:
+    """Fake cross-encoder: score = len(text), records predict() batch sizes."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.calls = []
+
+    def predict(self, pairs):
+        self.calls.append(len(pairs))
+        time.sleep(self.delay_s)
+        return [float(len(text)) for _, text in pairs]
+
+
+@pytest.fixture
+def _empty_rerank_cache():
+    from app.services.reranker_service import _score_cache_stats, invalidate_rerank_cache
+    invalidate_rerank_cache()
+    _score_cache_stats.update(hits=0, misses=0)
+    yield
+    invalidate_rerank_cache()
+
+
+@pytest.mark.usefixtures("_empty_rerank_cache")
+class TestRerankerWorker:
+    """Long-lived scorer: micro-batching across callers and early cancellation."""
+
+    def test_concurrent_calls_are_micro_batched(self):
+        import threading
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        scorer = _LengthScorer(delay_s=0.05)
+        service._model = scorer
+        service._batch_window_s = 0.05
+        try:
+            results = {}
+
+            def call(i):
+                docs = [{"text_content": "x" * n} for n in (i + 1, i + 5, i + 3)]
+                results[i] = service.rerank(f"q{i}", docs, top_k=3)
+
+            with patch("app.services.reranker_service.settings") as mock_settings:
+                mock_settings.reranker_timeout_ms = 5000
+                threads = [threading.Thread(target=call, args=(i,)) for i in range(6)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+            # Every caller got its own documents back, correctly ordered
+            for i, ranked in results.items():
+                assert [d["rerank_score"] for d in ranked] == [i + 5, i + 3, i + 1]
+            assert sum(scorer.calls) == 18
+            assert len(scorer.calls) < 6
+            assert service.get_info()["batching"]["jobs"] == 6
+        finally:
+            service.close()
+
+    def test_timed_out_job_stops_early(self):
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        scorer = _LengthScorer(delay_s=0.1)
+        service._model = scorer
+        service._max_batch_pairs = 2
+        docs = [{"text_content": "doc %d" % i} for i in range(20)]
+        try:
+            with patch("app.services.reranker_service.settings") as mock_settings:
+                mock_settings.reranker_timeout_ms = 150
+                result = service.rerank("q", docs, top_k=5)
+            assert result == docs[:5]  # un-reranked fallback
+            assert service._consecutive_timeouts == 1
+
+            time.sleep(0.4)
+            # 10 chunks of 2 pairs were queued; the worker gave up after ~2
+            assert len(scorer.calls) <= 3
+            assert service.get_info()["batching"]["cancelled_jobs"] == 1
+        finally:
+            service.close()
+
+    def test_worker_thread_is_reused(self):
+        import threading
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        service._model = _LengthScorer()
+        docs = [{"text_content": "a"}, {"text_content": "bb"}]
+        try:
+            with patch("app.services.reranker_service.settings") as mock_settings:
+                mock_settings.reranker_timeout_ms = 5000
+                service.rerank("q", docs, top_k=2)
+                before = threading.active_count()
+                for _ in range(10):
+                    service.rerank("q", docs, top_k=2)
+            assert threading.active_count() == before
+        finally:
+            service.close()
+
+
+@pytest.mark.usefixtures("_empty_rerank_cache")
+class TestRerankScoreCache:
+    """Scores cached by (query, point, text hash); only misses reach the model."""
+
+    @staticmethod
+    def _docs(dataset_id, texts):
+        return [
+            {"dataset_id": dataset_id, "point_id": f"p{i}", "row_index": i, "text_content": t}
+            for i, t in enumerate(texts)
+        ]
+
+    def _rerank(self, service, query, docs):
+        with patch("app.services.reranker_service.settings") as mock_settings:
+            mock_settings.reranker_timeout_ms = 5000
+            return service.rerank(query, docs, top_k=len(docs))
+
+    def test_repeated_query_skips_model(self):
+        from app.services.reranker_service import RerankerService, rerank_cache_info
+
+        service = RerankerService()
+        scorer = _LengthScorer()
+        service._model = scorer
+        docs = self._docs("ds1", ["a", "ccc", "bb"])
+        try:
+            first = self._rerank(service, "Red Shoes", docs)
+            # Case and whitespace differences normalize to the same query
+            second = self._rerank(service, "  red   SHOES ", docs)
+            assert [d["rerank_score"] for d in second] == [d["rerank_score"] for d in first]
+            assert scorer.calls == [3]
+            info = rerank_cache_info()
+            assert (info["hits"], info["misses"], info["hit_rate"]) == (3, 3, 0.5)
+            assert service.get_info()["cache"]["size"] == 3
+        finally:
+            service.close()
+
+    def test_only_misses_are_scored(self):
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        scorer = _LengthScorer()
+        service._model = scorer
+        try:
+            self._rerank(service, "q", self._docs("ds1", ["a", "bb"]))
+            docs = self._docs("ds1", ["a", "bb", "dddd", "ccc"])
+            ranked = self._rerank(service, "q", docs)
+            assert scorer.calls == [2, 2]
+            assert [d["text_content"] for d in ranked] == ["dddd", "ccc", "bb", "a"]
+        finally:
+            service.close()
+
+    def test_changed_text_is_rescored(self):
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        scorer = _LengthScorer()
+        service._model = scorer
+        try:
+            self._rerank(service, "q", self._docs("ds1", ["a", "bb"]))
+            ranked = self._rerank(service, "q", self._docs("ds1", ["a", "bbbbb"]))
+            assert scorer.calls == [2, 1]
+            assert ranked[0]["rerank_score"] == 5.0
+        finally:
+            service.close()
+
+    def test_reindex_invalidates_dataset(self):
+        from app.services.indexing_service import IndexingService
+        from app.services.reranker_service import RerankerService
+
+        service = RerankerService()
+        scorer = _LengthScorer()
+        service._model = scorer
+        try:
+            self._rerank(service, "q", self._docs("ds1", ["a", "bb"]))
+            self._rerank(service, "q", self._docs("ds2", ["a", "bb"]))
+            IndexingService._invalidate_rerank_cache("ds1")
+            self._rerank(service, "q", self._docs("ds1", ["a", "bb"]))
+            self._rerank(service, "q", self._docs("ds2", ["a", "bb"]))
+            # ds1 rescored after re-index; ds2 still served from cache
+            assert scorer.calls == [2, 2, 2]
+        finally:
+            service.close()
+
+
 # ---------------------------------------------------------------------------
 # 2. FTS Service: BM25 results for structured data
 # ---------------------------------------------------------------------------
@@ -158,6 +358,254 @@ class TestFTSService:
         results = search_fts("query", "nonexistent_dataset", limit=5)
         assert results == []
 
+    @staticmethod
+    def _write_parquet(path, rows):
+        import duckdb
+        con = duckdb.connect()
+        values = ", ".join(f"('{name}', '{desc}')" for name, desc in rows)
+        con.execute(
+            f"COPY (SELECT * FROM (VALUES {values}) AS t(name, description)) "
+            f"TO '{path}' (FORMAT PARQUET)"
+        )
+        con.close()
+
+    @requires_fts
+    def test_fts_state_persists_and_skips_unchanged(self, tmp_path):
+        """Status survives a restart and an unchanged source is not rebuilt."""
+        from app.services import fts_service
+
+        parquet_path = tmp_path / "persist.parquet"
+        self._write_parquet(parquet_path, [("Red bike", "fast road bicycle"), ("Blue car", "family car")])
+        dataset_id = "fts_persist_001"
+
+        with patch("app.services.fts_service.settings") as mock_settings:
+            mock_settings.processed_directory = str(tmp_path)
+            mock_settings.fts_build_workers = 2
+
+            fts_service.build_fts_index(dataset_id, parquet_path).result(timeout=30)
+            assert fts_service.get_fts_status(dataset_id) == "ready"
+
+            state = json.loads((tmp_path / dataset_id / "fts_state.json").read_text())
+            assert state["status"] == "ready"
+            assert state["text_columns"] == ["name", "description"]
+            # No temp databases left behind
+            assert sorted(p.name for p in (tmp_path / dataset_id).iterdir()) == [
+                "fts.duckdb", "fts_state.json",
+            ]
+
+            # Simulate a restart: in-memory status is gone, disk state is not
+            fts_service._fts_status.pop(dataset_id, None)
+            assert fts_service.get_fts_status(dataset_id) == "ready"
+            assert fts_service.search_fts("bicycle", dataset_id, limit=5)
+
+            # Unchanged source — skipped
+            assert fts_service.build_fts_index(dataset_id, parquet_path) is None
+
+            # Changed source — rebuilt and searchable with new content
+            time.sleep(0.01)
+            self._write_parquet(parquet_path, [("Green boat", "sailing boat"), ("Blue car", "family car")])
+            future = fts_service.build_fts_index(dataset_id, parquet_path)
+            assert future is not None
+            future.result(timeout=30)
+            assert fts_service.search_fts("sailing", dataset_id, limit=5)
+            assert not fts_service.search_fts("bicycle", dataset_id, limit=5)
+
+    def test_fts_no_text_columns_outcome_is_not_rescanned(self, tmp_path):
+        """A source already found to have no text columns is skipped until it changes."""
+        from app.services import fts_service
+
+        parquet_path = tmp_path / "numbers.parquet"
+        parquet_path.write_bytes(b"numeric-only source")
+        dataset_id = "fts_numbers_001"
+
+        with patch("app.services.fts_service.settings") as mock_settings, \
+             patch.object(fts_service, "_build") as build:
+            mock_settings.processed_directory = str(tmp_path)
+            mock_settings.fts_build_workers = 2
+            # What _build records for a source without text columns
+            fts_service._set_status(
+                dataset_id, "unavailable", reason="no_text_columns",
+                source_fingerprint=fts_service._source_fingerprint(parquet_path),
+            )
+            fts_service._fts_status.pop(dataset_id, None)
+
+            assert fts_service.build_fts_index(dataset_id, parquet_path) is None
+            assert fts_service.get_fts_status(dataset_id) == "unavailable"
+            build.assert_not_called()
+
+            # Other "unavailable" outcomes (a failed build) are still retried
+            fts_service._set_status(dataset_id, "unavailable", reason="build_failed")
+            fts_service.build_fts_index(dataset_id, parquet_path).result(timeout=30)
+            assert build.call_count == 1
+
+    @requires_fts
+    def test_fts_failed_rebuild_keeps_previous_index(self, tmp_path):
+        """A failing rebuild never replaces a ready index."""
+        from app.services import fts_service
+
+        parquet_path = tmp_path / "keep.parquet"
+        self._write_parquet(parquet_path, [("Old lamp", "brass desk lamp")])
+        dataset_id = "fts_keep_001"
+
+        with patch("app.services.fts_service.settings") as mock_settings:
+            mock_settings.processed_directory = str(tmp_path)
+            mock_settings.fts_build_workers = 2
+
+            fts_service.build_fts_index(dataset_id, parquet_path).result(timeout=30)
+            parquet_path.write_bytes(b"not a parquet file")
+            fts_service.build_fts_index(dataset_id, parquet_path).result(timeout=30)
+
+            assert fts_service.get_fts_status(dataset_id) == "ready"
+            assert fts_service.search_fts("lamp", dataset_id, limit=5)
+            assert not list((tmp_path / dataset_id).glob(".*.tmp*"))
+
+    @requires_fts
+    def test_fts_builds_are_deduplicated(self, tmp_path):
+        """Concurrent build requests for one dataset share a single job."""
+        from app.services import fts_service
+
+        parquet_path = tmp_path / "dedupe.parquet"
+        self._write_parquet(parquet_path, [("A", "alpha"), ("B", "beta")])
+        dataset_id = "fts_dedupe_001"
+
+        with patch("app.services.fts_service.settings") as mock_settings:
+            mock_settings.processed_directory = str(tmp_path)
+            mock_settings.fts_build_workers = 2
+
+            first = fts_service.build_fts_index(dataset_id, parquet_path, force=True)
+            second = fts_service.build_fts_index(dataset_id, parquet_path, force=True)
+            assert first is second or first.done()
+            first.result(timeout=30)
+            assert fts_service.get_fts_status(dataset_id) == "ready"
+
+
+def _write_fake_index(path, rows):
+    """A stand-in FTS index: same layout as create_fts_index, no extension.
+
+    ``fts_main_data.match_bm25`` is a plain SQL macro scoring 1.0 per query
+    word found in ``description``.
+    """
+    import duckdb
+    con = duckdb.connect(str(path))
+    con.execute("CREATE TABLE data (name VARCHAR, description VARCHAR)")
+    con.executemany("INSERT INTO data VALUES (?, ?)", rows)
+    con.execute("CREATE SCHEMA fts_main_data")
+    con.execute(
+        "CREATE MACRO fts_main_data.match_bm25(id, q) AS ("
+        "  SELECT NULLIF(sum(CASE WHEN contains(lower(d.description), w) THEN 1.0 ELSE 0 END), 0)::DOUBLE"
+        "  FROM data d, (SELECT unnest(string_split(lower(q), ' ')) AS w) words"
+        "  WHERE d.rowid = id)"
+    )
+    con.close()
+
+
+def _open_fake_reader(fts_db_path):
+    import duckdb
+    con = duckdb.connect()
+    con.execute(f"ATTACH '{fts_db_path}' AS fts_index (READ_ONLY)")
+    con.execute("USE fts_index")
+    return con
+
+
+@pytest.fixture
+def fake_fts(tmp_path):
+    """Datasets with ready stand-in indexes and a fresh reader pool."""
+    from app.services import fts_service
+
+    def make(dataset_id, rows):
+        (tmp_path / dataset_id).mkdir(exist_ok=True)
+        tmp = tmp_path / dataset_id / "new.duckdb"
+        _write_fake_index(tmp, rows)
+        import os
+        os.replace(tmp, tmp_path / dataset_id / "fts.duckdb")
+        with fts_service._fts_lock:
+            fts_service._fts_status[dataset_id] = "ready"
+
+    pool = fts_service.FTSReaderPool(max_idle=2, idle_s=300)
+    with patch("app.services.fts_service.settings") as mock_settings, \
+         patch.object(fts_service, "_open_reader", _open_fake_reader), \
+         patch.object(fts_service, "_reader_pool", pool):
+        mock_settings.processed_directory = str(tmp_path)
+        mock_settings.fts_search_workers = 4
+        yield make, pool
+    pool.close()
+
+
+class TestFTSReaderPool:
+    """Pooled read-only connections, parameterized queries and fan-out."""
+
+    def test_connections_are_reused(self, fake_fts):
+        from app.services import fts_service
+        make, pool = fake_fts
+        make("pool_a", [("Lamp", "brass desk lamp"), ("Bike", "red bicycle")])
+
+        for _ in range(5):
+            rows = fts_service.search_fts("bicycle", "pool_a", limit=5)
+            assert [r["name"] for r in rows] == ["Bike"]
+            assert rows[0]["rowid"] == 1
+        stats = pool.stats()
+        assert stats["opened"] == 1
+        assert stats["reused"] == 4
+        assert stats["idle"] == 1
+
+    def test_query_text_is_bound_not_spliced(self, fake_fts):
+        from app.services import fts_service
+        make, _ = fake_fts
+        make("pool_q", [("Pub", "o'brien's pub"), ("Cafe", "small cafe")])
+
+        rows = fts_service.search_fts("o'brien's", "pool_q", limit=5)
+        assert [r["name"] for r in rows] == ["Pub"]
+        # Injection attempts are just unmatched search text
+        assert fts_service.search_fts("x') OR 1=1 --", "pool_q", limit=5) == []
+
+    def test_swapped_index_is_picked_up(self, fake_fts):
+        from app.services import fts_service
+        make, pool = fake_fts
+        make("pool_s", [("Lamp", "brass desk lamp")])
+        assert fts_service.search_fts("lamp", "pool_s", limit=5)
+
+        make("pool_s", [("Boat", "sailing boat")])
+        assert fts_service.search_fts("lamp", "pool_s", limit=5) == []
+        assert [r["name"] for r in fts_service.search_fts("sailing", "pool_s", limit=5)] == ["Boat"]
+        assert pool.stats()["opened"] == 2
+
+    def test_idle_connections_are_evicted(self, fake_fts):
+        from app.services import fts_service
+        make, pool = fake_fts
+        make("pool_e", [("Lamp", "brass desk lamp")])
+        fts_service.search_fts("lamp", "pool_e", limit=5)
+        assert pool.stats()["idle"] == 1
+
+        pool.idle_s = 0
+        assert pool.sweep() == 1
+        assert pool.stats()["idle"] == 0
+        # The next search just opens a new connection
+        assert fts_service.search_fts("lamp", "pool_e", limit=5)
+
+    def test_idle_connections_are_capped(self, fake_fts):
+        from app.services import fts_service
+        make, pool = fake_fts
+        make("pool_c", [("Lamp", "brass desk lamp")])
+        path = fts_service._get_fts_db_path("pool_c")
+
+        held = [pool.acquire("pool_c", path) for _ in range(4)]
+        for con, identity in held:
+            pool.release("pool_c", con, identity)
+        assert pool.stats()["idle"] == 2
+
+    def test_fan_out_across_datasets(self, fake_fts):
+        from app.services import fts_service
+        make, _ = fake_fts
+        make("multi_a", [("Lamp", "brass desk lamp"), ("Bike", "red bicycle")])
+        make("multi_b", [("Tandem", "bicycle for two")])
+        make("multi_c", [("Boat", "sailing boat")])
+
+        results = fts_service.search_fts_many(
+            "bicycle", ["multi_a", "multi_b", "multi_c", "not_indexed"], limit=5,
+        )
+        assert set(results) == {"multi_a", "multi_b"}
+        assert results["multi_b"][0]["name"] == "Tandem"
+
 
 # ---------------------------------------------------------------------------
 # 3. Facet Service: correct counts
@@ -214,6 +662,152 @@ class TestFacetService:
         assert "quality_score_bucket" in facets
 
 
+class TestIncrementalFacets:
+    """Event-driven facet deltas always agree with a full rebuild."""
+
+    @pytest.fixture
+    def facet_env(self, tmp_path):
+        from types import SimpleNamespace
+        from app.services import facet_service
+
+        store = {}
+        processing = MagicMock()
+        processing.list_datasets.side_effect = lambda: list(store.values())
+        processing.get_dataset.side_effect = store.get
+        facet_service._index = None
+        with patch("app.services.facet_service.settings") as mock_settings, \
+             patch("app.services.processing_service.get_processing_service", return_value=processing):
+            mock_settings.data_directory = str(tmp_path)
+            mock_settings.processed_directory = str(tmp_path / "processed")
+            yield SimpleNamespace(store=store, root=tmp_path / "processed", module=facet_service)
+        facet_service._index = None
+
+    @staticmethod
+    def _write(env, dataset_id, name, data):
+        d = env.root / dataset_id
+        d.mkdir(parents=True, exist_ok=True)
+        (d / name).write_text(json.dumps(data))
+
+    def _add(self, env, rng, dataset_id):
+        from types import SimpleNamespace
+        env.store[dataset_id] = SimpleNamespace(
+            id=dataset_id,
+            file_type=rng.choice(["csv", "parquet", "json", None]),
+            metadata_json=json.dumps({
+                "column_count": rng.choice([3, 12, 40]),
+                "row_count": rng.choice([None, 50, 5000, 2_000_000]),
+            }),
+        )
+
+    def test_random_event_stream_matches_rebuild(self, facet_env):
+        import random
+        env, rng = facet_env, random.Random(11)
+        fs = env.module
+        next_id = 0
+        for _ in range(300):
+            op = rng.random()
+            ids = sorted(env.store)
+            if op < 0.35 or not ids:
+                ds = f"ds{next_id}"
+                next_id += 1
+                self._add(env, rng, ds)
+                fs.update_dataset_facets(ds)
+            elif op < 0.55:
+                ds = rng.choice(ids)
+                self._write(env, ds, "pii_scan.json", {"total_pii_findings": rng.choice([0, 3])})
+                fs.update_dataset_facets(ds)
+            elif op < 0.75:
+                ds = rng.choice(ids)
+                self._write(env, ds, "quality_scorecard.json", {"overall_score": rng.random()})
+                fs.update_dataset_facets(ds)
+            else:
+                ds = rng.choice(ids)
+                del env.store[ds]
+                fs.remove_dataset_facets(ds)
+
+        incremental = fs.get_facets()
+        assert incremental == fs.rebuild_facets()
+        assert sum(incremental["has_pii"].values()) == len(env.store)
+
+    def test_counts_persist_across_restart(self, facet_env):
+        import random
+        env, fs = facet_env, facet_env.module
+        rng = random.Random(3)
+        for i in range(5):
+            self._add(env, rng, f"ds{i}")
+            fs.update_dataset_facets(f"ds{i}")
+        before = fs.get_facets()
+
+        fs._index = None  # process restart
+        assert fs.get_facets() == before
+        fs.remove_dataset_facets("ds0")
+        del env.store["ds0"]
+        assert fs.get_facets() == fs.rebuild_facets()
+
+    def test_reads_do_not_touch_dataset_files(self, facet_env):
+        import random
+        env, fs = facet_env, facet_env.module
+        self._add(env, random.Random(1), "ds0")
+        fs.update_dataset_facets("ds0")
+        env.store.clear()  # any rescan would now see nothing
+        assert fs.get_facets()["has_pii"] == {"true": 0, "false": 1}
+
+    def test_legacy_counts_file_is_served_then_rebuilt(self, facet_env):
+        import random
+        env, fs = facet_env, facet_env.module
+        self._add(env, random.Random(2), "ds0")
+        legacy = {"file_type": {"csv": 7}, "has_pii": {"true": 1, "false": 6}}
+        (env.root.parent / "facets.json").write_text(json.dumps(legacy))
+
+        with patch.object(fs, "rebuild_facets_async") as rebuild:
+            assert fs.get_facets() == legacy
+            rebuild.assert_called_once()
+        assert fs.rebuild_facets()["has_pii"]["false"] + fs.get_facets()["has_pii"]["true"] == 1
+
+    def test_workers_sharing_facets_file_keep_each_others_deltas(self, facet_env):
+        """A worker with a stale in-memory copy reloads before applying its delta."""
+        import random
+        env, fs = facet_env, facet_env.module
+        rng = random.Random(5)
+        for i in range(3):
+            self._add(env, rng, f"ds{i}")
+
+        fs.update_dataset_facets("ds0")  # worker A
+        worker_a = fs._index
+        fs._index = None                 # worker B, its own process
+        fs.update_dataset_facets("ds1")
+        worker_b = fs._index
+
+        fs._index = worker_a
+        assert fs.get_facets() == worker_b.view()  # not A's stale counts
+        fs.update_dataset_facets("ds2")
+        assert set(fs._index.contributions) == {"ds0", "ds1", "ds2"}
+
+        fs._index = worker_b
+        fs.remove_dataset_facets("ds0")
+        del env.store["ds0"]
+        assert set(fs._index.contributions) == {"ds1", "ds2"}
+        assert fs.get_facets() == fs.rebuild_facets()
+
+    def test_processing_service_records(self, facet_env):
+        """Deltas and rebuilds read the in-memory record's ``metadata`` dict."""
+        from app.services.processing_service import DatasetRecord
+
+        env, fs = facet_env, facet_env.module
+        for i, rows in enumerate([50, 5000]):
+            record = DatasetRecord(f"ds{i}", f"f{i}.csv", "csv")
+            record.metadata = {"column_count": 4, "row_count": rows}
+            env.store[record.id] = record
+            fs.update_dataset_facets(record.id)
+
+        incremental = fs.get_facets()
+        assert incremental["file_type"] == {"csv": 2}
+        assert incremental["column_count"] == {"4": 2}
+        assert incremental["row_count_bucket"]["<100"] == 1
+        assert incremental["row_count_bucket"]["1K-10K"] == 1
+        assert incremental == fs.rebuild_facets()
+
+
 # ---------------------------------------------------------------------------
 # 4. Qdrant hybrid search methods
 # ---------------------------------------------------------------------------
@@ -310,6 +904,54 @@ class TestSearchServiceStages:
         assert "dense_embedding" in result["stages_active"]
         assert result["total"] == 1
 
+    def test_fts_rankings_are_fused_by_rrf(self):
+        """BM25 hits from every searched dataset are fused with the vector ranking."""
+        from app.services.search_service import SearchService
+
+        service = SearchService()
+        service.embedding_service = MagicMock(embed_text=MagicMock(return_value=[0.1] * 384))
+        service._sparse_encoder = False
+        service.processing_service = MagicMock(get_dataset=MagicMock(return_value=None))
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.collection_has_sparse.return_value = False
+        mock_qdrant.hybrid_search.side_effect = lambda collection_name, **kw: {
+            "dataset_a": [
+                {"score": 0.9, "payload": {"text_content": "a0", "row_index": 0}},
+                {"score": 0.5, "payload": {"text_content": "a1", "row_index": 1}},
+            ],
+            "dataset_b": [
+                {"score": 0.7, "payload": {"text_content": "b0", "row_index": 0}},
+            ],
+        }[collection_name]
+        service.qdrant_service = mock_qdrant
+
+        fts_hits = {
+            # a1 is ranked first by BM25 in dataset a, b3 is a keyword-only hit
+            "a": [{"rowid": 1, "score": 7.0, "name": "a1"}],
+            "b": [{"rowid": 3, "score": 2.0, "name": "b3"}],
+        }
+        with patch.object(service, "_get_searchable_collections", return_value=["dataset_a", "dataset_b"]), \
+             patch("app.services.fts_service.search_fts_many", return_value=fts_hits) as fan_out, \
+             patch("app.services.search_service.settings") as mock_settings:
+            mock_settings.reranker_enabled = False
+            mock_settings.hybrid_search_mode = "dense_only"
+            mock_settings.fts_enabled = True
+            mock_settings.hybrid_rrf_k = 60
+            mock_settings.reranker_top_k = 30
+
+            result = service.search("test query", limit=10)
+
+        fan_out.assert_called_once_with("test query", ["a", "b"], limit=10)
+        assert "fts_bm25" in result["stages_active"]
+        order = [(r["dataset_id"], r["row_index"]) for r in result["results"]]
+        # a1 (vector rank 3 + BM25 rank 1) overtakes the vector-only hits
+        assert order[0] == ("a", 1)
+        assert set(order) == {("a", 0), ("a", 1), ("b", 0), ("b", 3)}
+        keyword_only = next(r for r in result["results"] if r["row_index"] == 3)
+        assert keyword_only["row_data"] == {"name": "b3"}
+        assert keyword_only["rrf_score"] == round(1 / 61, 6)
+
     def test_empty_query_returns_empty(self):
         """Empty query returns empty results."""
         from app.services.search_service import SearchService
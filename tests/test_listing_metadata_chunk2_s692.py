@@ -31,7 +31,7 @@ def _payload(score):
 
 async def _call_route(status, score=None):
     listing_service = SimpleNamespace(generate_listing_metadata=AsyncMock(return_value=ListingMetadata(**_metadata(score))))
-    processing = SimpleNamespace(get_dataset=lambda dataset_id: SimpleNamespace(status=status))
+    processing = SimpleNamespace(get_dataset_async=AsyncMock(return_value=SimpleNamespace(status=status)))
     result = await route_generate_listing_metadata("dataset", listing_service=listing_service, processing=processing, _meter=None)
     return result, listing_service
 
@@ -106,7 +106,7 @@ async def test_datasets_router_precondition_relax_accepts_ready_regression():
 @pytest.mark.asyncio
 async def test_datasets_router_precondition_relax_rejects_uploaded():
     listing_service = SimpleNamespace(generate_listing_metadata=AsyncMock())
-    processing = SimpleNamespace(get_dataset=lambda dataset_id: SimpleNamespace(status=ProcessingStatus.UPLOADED))
+    processing = SimpleNamespace(get_dataset_async=AsyncMock(return_value=SimpleNamespace(status=ProcessingStatus.UPLOADED)))
     with pytest.raises(HTTPException) as exc_info:
         await route_generate_listing_metadata("dataset", listing_service=listing_service, processing=processing, _meter=None)
     assert exc_info.value.status_code == 400
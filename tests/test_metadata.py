@@ -82,3 +82,20 @@ def test_enhanced_metadata(duckdb_service, sample_csv_with_types):
     assert metadata['row_count'] == 5
     assert metadata['column_count'] == 6
     assert len(metadata['column_profiles']) == 6
+
+
+def test_enhanced_metadata_from_parquet_copy(duckdb_service, sample_csv_with_types, tmp_path):
+    """Profiling a Parquet copy describes the original file without re-reading it."""
+    copy = tmp_path / "processed.parquet"
+    duckdb_service.connection.execute(
+        f"COPY (SELECT * FROM read_csv_auto('{sample_csv_with_types}')) TO '{copy}' (FORMAT PARQUET)"
+    )
+    direct = duckdb_service.get_enhanced_metadata(sample_csv_with_types)
+    shared = duckdb_service.get_enhanced_metadata(sample_csv_with_types, profile_source=copy)
+
+    assert shared['filepath'] == str(sample_csv_with_types)
+    assert shared['file_type'] == 'csv'
+    for key in ('row_count', 'columns', 'searchability', 'estimated_memory_bytes'):
+        assert shared[key] == direct[key]
+    assert [p['distinct_count'] for p in shared['column_profiles']] == \
+        [p['distinct_count'] for p in direct['column_profiles']]
@@ -7,10 +7,14 @@ Covers:
   - Atomic status writes under concurrency
   - Single canonical ``status`` field (no ``overall_status``)
   - job_id removed from process-full endpoint
+  - Single analysis pass: Parquet inputs reused, profile shared with PII/compliance
+  - In-memory status store: coalesced snapshots, write-through terminal states
 """
 import asyncio
 import csv
 import json
+import os
+import threading
 from contextlib import contextmanager
 from unittest.mock import MagicMock, AsyncMock, patch
 
@@ -18,6 +22,7 @@ import pytest
 
 from app.services.pipeline_service import (
     PipelineService,
+    PipelineStatusStore,
     PIPELINE_FAILED,
     PIPELINE_SUCCESS,
     PIPELINE_PARTIAL,
@@ -71,9 +76,14 @@ def pipeline_service(pipeline_dir, sample_csv):
         # Eagerly create the connection so the temp dir is created under tmp_path
         _ = duckdb_svc.connection
 
+        # One shared connection stands in for per-call ephemeral services;
+        # serialise it, since pipeline steps run in worker threads
+        duckdb_lock = threading.RLock()
+
         @contextmanager
         def _mock_ephemeral():
-            yield duckdb_svc
+            with duckdb_lock:
+                yield duckdb_svc
 
         svc = PipelineService.__new__(PipelineService)
         svc.duckdb_service = duckdb_svc  # for test access; code uses ephemeral_duckdb_service
@@ -91,6 +101,7 @@ def pipeline_service(pipeline_dir, sample_csv):
             "overall_risk": "none",
             "total_pii_findings": 0,
         }
+        svc.pii_service.scan_structured.return_value = svc.pii_service.scan_dataset.return_value
         svc.compliance_service.generate_compliance_report = AsyncMock(
             return_value={"flags": [], "compliance_score": 100}
         )
@@ -183,6 +194,63 @@ class TestCSVPipeline:
         assert parquet_path.stat().st_size > 0
 
 
+# ---------------------------------------------------------------------------
+# BQ-VZ-PERF: Single analysis pass
+# ---------------------------------------------------------------------------
+
+class TestSingleAnalysisPass:
+
+    @staticmethod
+    def _register(pipeline_service, path):
+        pipeline_service.duckdb_service.get_dataset_by_id = MagicMock(
+            return_value={"filepath": str(path), "file_type": path.suffix[1:]}
+        )
+
+    @pytest.mark.asyncio
+    async def test_parquet_input_reused(self, pipeline_service, sample_csv):
+        """A valid Parquet input is hard-linked, not rewritten, and profiled once."""
+        source = sample_csv.with_name("extracted.parquet")
+        pipeline_service.duckdb_service.connection.execute(
+            f"COPY (SELECT * FROM read_csv_auto('{sample_csv}')) TO '{source}' (FORMAT PARQUET)"
+        )
+        self._register(pipeline_service, source)
+
+        result = await pipeline_service.run_full_pipeline("extracted")
+        assert result["status"] == PIPELINE_SUCCESS
+
+        processed = pipeline_service.processing_dir / "extracted" / "processed.parquet"
+        assert os.path.samefile(processed, source)
+
+        analysis = json.loads((processed.parent / "analysis.json").read_text())
+        assert analysis["filepath"] == str(source)
+        assert analysis["row_count"] == 5
+        assert [p["name"] for p in analysis["column_profiles"]] == ["id", "name", "value"]
+
+    @pytest.mark.asyncio
+    async def test_profile_passed_downstream(self, pipeline_service, sample_csv):
+        """The PII scan gets step 1's schema and row count; compliance gets the scan."""
+        self._register(pipeline_service, sample_csv)
+
+        await pipeline_service.run_full_pipeline("test_dataset")
+
+        processed = pipeline_service.processing_dir / "test_dataset" / "processed.parquet"
+        args, kwargs = pipeline_service.pii_service.scan_structured.call_args
+        assert args == (processed,)
+        assert [name for name, _ in kwargs["columns"]] == ["id", "name", "value"]
+        assert kwargs["total_rows"] == 5
+
+        pipeline_service.compliance_service.generate_compliance_report.assert_awaited_once_with(
+            "test_dataset", pii_results=pipeline_service.pii_service.scan_structured.return_value,
+        )
+
+    def test_invalid_parquet_not_reused(self, tmp_path):
+        """A file with a .parquet suffix but no readable footer falls back to a rewrite."""
+        bogus = tmp_path / "bogus.parquet"
+        bogus.write_bytes(b"not parquet")
+        assert not PipelineService._reuse_parquet(bogus, tmp_path / "processed.parquet")
+        assert not (tmp_path / "processed.parquet").exists()
+
+
 # ---------------------------------------------------------------------------
 # AC-3: Status file uses atomic write (temp + os.replace) + file lock
 # ---------------------------------------------------------------------------
@@ -247,6 +315,96 @@ class TestAtomicWrites:
         assert len(tmp_files) == 0
 
 
+# ---------------------------------------------------------------------------
+# BQ-VZ-PERF: In-memory status store
+# ---------------------------------------------------------------------------
+
+class TestStatusStore:
+
+    @staticmethod
+    def _step(name):
+        def _modify(state):
+            state.setdefault("steps", {})[name] = {"status": STEP_SUCCESS}
+        return _modify
+
+    def test_transitions_coalesced_into_one_snapshot(self, tmp_path):
+        """A burst of updates is served from memory and written once."""
+        store = PipelineStatusStore(flush_interval_s=60)
+        path = tmp_path / "pipeline_status.json"
+        with patch("app.services.pipeline_service._atomic_write_json") as write:
+            for i in range(50):
+                store.update(path, self._step(f"step_{i}"))
+            assert write.call_count == 0
+            assert len(store.get(path)["steps"]) == 50
+
+            store.flush()
+            store.flush()
+        write.assert_called_once()
+        assert write.call_args[0][1]["version"] == 50
+
+    def test_terminal_and_close_written_through(self, tmp_path):
+        """Durable updates reach disk before returning; close() drains the rest."""
+        store = PipelineStatusStore(flush_interval_s=60)
+        path = tmp_path / "pipeline_status.json"
+        store.update(path, lambda s: s.update(status=PIPELINE_SUCCESS), durable=True)
+        assert _read_json_locked(path)["status"] == PIPELINE_SUCCESS
+
+        store.update(path, lambda s: s.update(message="late"))
+        assert "message" not in _read_json_locked(path)
+        store.close()
+        assert _read_json_locked(path)["message"] == "late"
+
+    def test_flusher_writes_after_interval(self, tmp_path):
+        store = PipelineStatusStore(flush_interval_s=0.05)
+        path = tmp_path / "pipeline_status.json"
+        store.update(path, self._step("analyze_process"))
+        deadline = threading.Event()
+        for _ in range(100):
+            if path.exists():
+                break
+            deadline.wait(0.02)
+        assert _read_json_locked(path)["steps"]["analyze_process"]["status"] == STEP_SUCCESS
+        store.close()
+
+    def test_recovered_from_last_snapshot(self, tmp_path):
+        """A fresh store (after a restart) rebuilds state from disk and keeps counting."""
+        path = tmp_path / "pipeline_status.json"
+        first = PipelineStatusStore(flush_interval_s=60)
+        first.update(path, self._step("analyze_process"), durable=True)
+        first.update(path, self._step("pii_scan"))  # lost in the "crash"
+
+        recovered = PipelineStatusStore(flush_interval_s=60)
+        state = recovered.get(path)
+        assert list(state["steps"]) == ["analyze_process"]
+        assert recovered.update(path, self._step("compliance_check"))["version"] == 2
+
+    def test_other_worker_sees_new_snapshots(self, tmp_path):
+        """A store that doesn't run the pipeline re-reads the file when it changes."""
+        path = tmp_path / "pipeline_status.json"
+        writer = PipelineStatusStore(flush_interval_s=60)
+        reader = PipelineStatusStore(flush_interval_s=60)
+
+        writer.update(path, self._step("analyze_process"), durable=True)
+        assert list(reader.get(path)["steps"]) == ["analyze_process"]
+
+        writer.update(path, self._step("pii_scan"), durable=True)
+        assert list(reader.get(path)["steps"]) == ["analyze_process", "pii_scan"]
+
+        path.unlink()
+        assert reader.get(path) is None
+
+    def test_finished_pipeline_released_after_snapshot(self, tmp_path):
+        store = PipelineStatusStore(flush_interval_s=60)
+        path = tmp_path / "pipeline_status.json"
+        store.update(path, self._step("analyze_process"))
+        assert path in store._states
+
+        store.update(path, lambda s: s.update(status=PIPELINE_SUCCESS), durable=True)
+        assert path not in store._states
+        assert store.get(path)["status"] == PIPELINE_SUCCESS
+        assert store.update(path, lambda s: s.update(message="rerun"))["version"] == 3
+
+
 # ---------------------------------------------------------------------------
 # AC-4: Single canonical status field (no overall_status)
 # ---------------------------------------------------------------------------
@@ -195,3 +195,69 @@ class TestSQLViewQuoting:
         neutralized = sql.replace("''", "__ESC__")
         assert dangerous_pattern not in neutralized, \
             "After removing escaped quotes, injection pattern must not appear"
+
+
+# ---------------------------------------------------------------------------
+# SQL timeout — interrupted server-side (BQ-VZ-PERF)
+# ---------------------------------------------------------------------------
+
+def _allow_all(sql, max_length=4096):
+    from app.services.sql_sandbox import SandboxVerdict
+    return SandboxVerdict(True, "", frozenset(), sql.strip().rstrip(";").strip())
+
+
+class TestSQLTimeout:
+    @pytest.mark.asyncio
+    async def test_timeout_reports_query_timeout(self, orchestrator, valid_token):
+        from app.models.connectivity import SQLQueryRequest
+        from app.services.sql_sandbox import SQLSandbox
+
+        _, token = valid_token
+        token.scopes = ["ext:sql"]
+        req = SQLQueryRequest(
+            sql="SELECT count(*) FROM range(100000000) a CROSS JOIN range(100000) b",
+        )
+        with patch("app.services.query_orchestrator.settings") as mock_settings, \
+                patch.object(orchestrator, "_get_all_queryable_dataset_ids", return_value=[]), \
+                patch.object(SQLSandbox, "check_external", side_effect=_allow_all), \
+                patch.object(orchestrator, "_enforce_rate_limit"):
+            mock_settings.connectivity_enabled = True
+            mock_settings.connectivity_sql_max_length = 4096
+            mock_settings.connectivity_sql_max_rows = 10
+            mock_settings.connectivity_sql_timeout_s = 1
+            mock_settings.connectivity_sql_memory_mb = 256
+            with pytest.raises(ConnectivityError) as exc_info:
+                await orchestrator.execute_sql(token, req)
+
+        assert exc_info.value.code == "query_timeout"
+        assert exc_info.value.details == {"cancelled": True, "reason": "timeout"}
+        assert orchestrator.supervisor.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_reports_query_cancelled(self, orchestrator, valid_token):
+        from app.models.connectivity import SQLQueryRequest
+        from app.services.sql_sandbox import SQLSandbox
+
+        _, token = valid_token
+        token.scopes = ["ext:sql"]
+        req = SQLQueryRequest(
+            sql="SELECT count(*) FROM range(100000000) a CROSS JOIN range(100000) b",
+        )
+
+        async def gone() -> bool:
+            return True
+
+        with patch("app.services.query_orchestrator.settings") as mock_settings, \
+                patch.object(orchestrator, "_get_all_queryable_dataset_ids", return_value=[]), \
+                patch.object(SQLSandbox, "check_external", side_effect=_allow_all), \
+                patch.object(orchestrator, "_enforce_rate_limit"):
+            mock_settings.connectivity_enabled = True
+            mock_settings.connectivity_sql_max_length = 4096
+            mock_settings.connectivity_sql_max_rows = 10
+            mock_settings.connectivity_sql_timeout_s = 30
+            mock_settings.connectivity_sql_memory_mb = 256
+            with pytest.raises(ConnectivityError) as exc_info:
+                await orchestrator.execute_sql(token, req, is_disconnected=gone)
+
+        assert exc_info.value.code == "query_cancelled"
+        assert exc_info.value.details["reason"] == "client_disconnect"
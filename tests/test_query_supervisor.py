@@ -0,0 +1,180 @@
+"""
+Tests for QuerySupervisor — DuckDB queries are interrupted (not abandoned)
+on timeout, client disconnect and task cancellation, and the worker thread
+is free again within the deadline.
+
+BQ-VZ-PERF: Interruptible SQL timeouts.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import pytest
+
+from app.services.query_supervisor import QueryCancelledError, QuerySupervisor
+
+# Cross join large enough to run for minutes if left alone
+SLOW_SQL = "SELECT count(*) FROM range(100000000) a CROSS JOIN range(100000) b"
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.fixture
+def conn():
+    c = duckdb.connect(":memory:")
+    c.execute("SET threads = 2")
+    yield c
+    c.close()
+
+
+async def _thread_is_free(executor, within_s: float = 1.0) -> bool:
+    """The single worker can pick up new work immediately."""
+    loop = asyncio.get_running_loop()
+    fut = loop.run_in_executor(executor, lambda: "ok")
+    done, _ = await asyncio.wait({fut}, timeout=within_s)
+    return bool(done) and fut.result() == "ok"
+
+
+class TestQuerySupervisor:
+    @pytest.mark.asyncio
+    async def test_fast_query_returns_rows(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        columns, rows = await sup.execute(conn, "SELECT 1 AS a, 'x' AS b", timeout_s=5)
+        assert columns == ["a", "b"]
+        assert rows == [(1, "x")]
+        assert sup.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_interrupts_and_frees_thread(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        start = time.monotonic()
+        with pytest.raises(QueryCancelledError) as exc_info:
+            await sup.execute(conn, SLOW_SQL, timeout_s=0.5, query_id="slow1")
+        elapsed = time.monotonic() - start
+
+        assert exc_info.value.reason == "timeout"
+        assert exc_info.value.query_id == "slow1"
+        # Interrupted well inside the grace window, not after the query finished
+        assert elapsed < 3.0
+        assert await _thread_is_free(executor)
+        assert sup.active_count == 0
+        assert sup.get_stats()["cancelled_total"] == {"timeout": 1}
+
+        # The connection is reusable after the interrupt
+        _, rows = await sup.execute(conn, "SELECT 42", timeout_s=5)
+        assert rows == [(42,)]
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_interrupts(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        calls = {"n": 0}
+
+        async def is_disconnected() -> bool:
+            calls["n"] += 1
+            return calls["n"] >= 2
+
+        start = time.monotonic()
+        with pytest.raises(QueryCancelledError) as exc_info:
+            await sup.execute(conn, SLOW_SQL, timeout_s=30, is_disconnected=is_disconnected)
+        assert exc_info.value.reason == "client_disconnect"
+        assert time.monotonic() - start < 3.0
+        assert await _thread_is_free(executor)
+
+    @pytest.mark.asyncio
+    async def test_task_cancellation_interrupts(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        task = asyncio.create_task(sup.execute(conn, SLOW_SQL, timeout_s=30))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await _thread_is_free(executor)
+        assert sup.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_explicit_cancel(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        task = asyncio.create_task(sup.execute(conn, SLOW_SQL, timeout_s=30, query_id="q1"))
+        await asyncio.sleep(0.3)
+        assert sup.cancel("q1") is True
+        with pytest.raises(QueryCancelledError) as exc_info:
+            await task
+        assert exc_info.value.reason == "cancelled"
+        assert sup.cancel("q1") is False
+
+    @pytest.mark.asyncio
+    async def test_query_errors_propagate(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+        with pytest.raises(duckdb.Error):
+            await sup.execute(conn, "SELECT * FROM missing_table", timeout_s=5)
+        assert sup.get_stats()["cancelled_total"] == {}
+
+    @pytest.mark.asyncio
+    async def test_memory_limit_is_per_connection(self, executor):
+        sup = QuerySupervisor(executor=executor)
+        small = duckdb.connect(":memory:")
+        small.execute("SET memory_limit = '16MB'")
+        small.execute("SET threads = 1")
+        try:
+            with pytest.raises(duckdb.OutOfMemoryException):
+                await sup.execute(
+                    small,
+                    "SELECT list(repeat('x', 100) || i::VARCHAR) FROM range(2000000) t(i)",
+                    timeout_s=30,
+                )
+        finally:
+            small.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_every_chunk(self, executor, conn):
+        sup = QuerySupervisor(executor=executor)
+
+        def open_chunks():
+            return iter(conn.execute("SELECT * FROM range(25000)").fetch_record_batch(10_000))
+
+        batches = [b async for b in sup.stream(conn, open_chunks, timeout_s=5)]
+        assert sum(b.num_rows for b in batches) == 25_000
+        assert sup.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline_covers_iteration(self, executor, conn):
+        """A batch that takes too long is interrupted mid-stream."""
+        sup = QuerySupervisor(executor=executor)
+
+        def open_chunks():
+            yield "first"
+            conn.execute(SLOW_SQL).fetchall()
+            yield "never"
+
+        received = []
+        start = time.monotonic()
+        with pytest.raises(QueryCancelledError) as exc_info:
+            async for chunk in sup.stream(conn, open_chunks, timeout_s=0.5):
+                received.append(chunk)
+        assert received == ["first"]
+        assert exc_info.value.reason == "timeout"
+        assert time.monotonic() - start < 3.0
+        assert await _thread_is_free(executor)
+        assert sup.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_does_not_time_a_slow_consumer(self, executor, conn):
+        """Only DuckDB work counts against the timeout, not time spent at yield."""
+        sup = QuerySupervisor(executor=executor)
+
+        def open_chunks():
+            return iter(conn.execute("SELECT * FROM range(50000)").fetch_record_batch(10_000))
+
+        rows = 0
+        async for batch in sup.stream(conn, open_chunks, timeout_s=0.3):
+            await asyncio.sleep(0.2)  # client reading slowly
+            rows += batch.num_rows
+        assert rows == 50_000
+        assert sup.get_stats()["cancelled_total"] == {}
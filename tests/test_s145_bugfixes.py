@@ -70,7 +70,7 @@ class TestAttestationLLMError:
 
         mock_record = _make_mock_record()
         mock_processing = MagicMock()
-        mock_processing.get_dataset.return_value = mock_record
+        mock_processing.get_dataset_async = AsyncMock(return_value=mock_record)
 
         mock_attestation = AsyncMock()
         mock_attestation.generate_attestation.side_effect = ValueError("Dataset not found")
@@ -93,7 +93,7 @@ class TestAttestationLLMError:
 
         mock_record = _make_mock_record()
         mock_processing = MagicMock()
-        mock_processing.get_dataset.return_value = mock_record
+        mock_processing.get_dataset_async = AsyncMock(return_value=mock_record)
 
         mock_attestation = AsyncMock()
         mock_attestation.generate_attestation.side_effect = RuntimeError("unexpected")
@@ -123,7 +123,7 @@ class TestListingMetadataLLMError:
 
         mock_record = _make_mock_record()
         mock_processing = MagicMock()
-        mock_processing.get_dataset.return_value = mock_record
+        mock_processing.get_dataset_async = AsyncMock(return_value=mock_record)
 
         mock_listing = AsyncMock()
         mock_listing.generate_listing_metadata.side_effect = RuntimeError("disk full")
@@ -231,3 +231,167 @@ def test_no_replacement_scan_leak(tmp_path):
             )
     finally:
         sql.processing.get_dataset = original_get
+
+
+def _stream_fixture(tmp_path, rows=25_000):
+    """SQLService over a generated Parquet dataset registered as 'stream_ds'."""
+    parquet_path = tmp_path / "stream.parquet"
+    get_duckdb_service().connection.execute(
+        f"COPY (SELECT i AS id, 'row ' || i AS label, (i * 0.5)::DOUBLE AS score, "
+        f"CASE WHEN i % 7 = 0 THEN NULL ELSE DATE '2024-01-01' + i::INT END AS day "
+        f"FROM range({rows}) t(i)) TO '{parquet_path}' (FORMAT PARQUET)"
+    )
+    sql = SQLService()
+
+    class MockRecord:
+        id = "stream_ds"
+        status = ProcessingStatus.READY
+        processed_path = parquet_path
+        original_filename = "stream.csv"
+        metadata = {}
+
+    sql.processing = type("P", (), {"get_dataset": staticmethod(
+        lambda x: MockRecord() if x == "stream_ds" else None
+    )})()
+    return sql
+
+
+def test_open_stream_arrow_roundtrip(tmp_path):
+    """Arrow IPC chunks concatenate into a valid stream with every row."""
+    import pyarrow as pa
+
+    sql = _stream_fixture(tmp_path)
+    chunks = list(sql.open_stream(
+        "SELECT * FROM dataset_stream_ds ORDER BY id", "arrow",
+        dataset_id="stream_ds", limit=50_000,
+    ))
+    assert len(chunks) > 2  # schema + several batches + EOS, not one blob
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+    assert table.num_rows == 25_000
+    assert table.column_names == ["id", "label", "score", "day"]
+    assert table.column("label")[3].as_py() == "row 3"
+    assert table.column("day")[0].as_py() is None
+
+
+def test_open_stream_ndjson_matches_json(tmp_path):
+    """NDJSON rows carry the same values as the default JSON body."""
+    import json
+
+    sql = _stream_fixture(tmp_path, rows=100)
+    body = b"".join(sql.open_stream(
+        "SELECT id, label, score FROM dataset_stream_ds ORDER BY id", "ndjson",
+        dataset_id="stream_ds", limit=100,
+    ))
+    lines = body.decode().splitlines()
+    assert len(lines) == 100
+    expected = sql.execute_query(
+        "SELECT id, label, score FROM dataset_stream_ds ORDER BY id",
+        dataset_id="stream_ds", limit=100,
+    )["data"]
+    assert [json.loads(line) for line in lines] == expected
+
+
+def test_open_stream_empty_result(tmp_path):
+    import pyarrow as pa
+
+    sql = _stream_fixture(tmp_path, rows=10)
+    arrow = b"".join(sql.open_stream(
+        "SELECT * FROM dataset_stream_ds WHERE id < 0", "arrow", dataset_id="stream_ds",
+    ))
+    assert pa.ipc.open_stream(arrow).read_all().num_rows == 0
+    ndjson = b"".join(sql.open_stream(
+        "SELECT * FROM dataset_stream_ds WHERE id < 0", "ndjson", dataset_id="stream_ds",
+    ))
+    assert ndjson == b""
+
+
+def test_open_stream_errors_raise_before_streaming(tmp_path):
+    from app.services.sql_service import SQLValidationError
+
+    sql = _stream_fixture(tmp_path, rows=10)
+    with pytest.raises(SQLValidationError):
+        sql.open_stream("DELETE FROM dataset_stream_ds", "arrow", dataset_id="stream_ds")
+    with pytest.raises(ValueError, match="Query execution failed"):
+        sql.open_stream("SELECT nope FROM dataset_stream_ds", "ndjson", dataset_id="stream_ds")
+    with pytest.raises(ValueError, match="Unsupported result format"):
+        sql.open_stream("SELECT 1", "csv")
+
+
+@pytest.mark.asyncio
+async def test_stream_query_timeout_interrupts_and_closes(tmp_path):
+    """A supervised stream past its deadline is interrupted and its connection closed."""
+    import duckdb
+    from app.services.query_supervisor import QueryCancelledError
+
+    sql = _stream_fixture(tmp_path, rows=10)
+    opened = []
+    connect = sql.connect
+    sql.connect = lambda: opened.append(connect()) or opened[-1]
+
+    with pytest.raises(QueryCancelledError) as exc_info:
+        await sql.stream_query(
+            "SELECT count(*) FROM dataset_stream_ds, range(100000000) a, range(100000) b",
+            "arrow", dataset_id="stream_ds", timeout_s=0.5,
+        )
+    assert exc_info.value.reason == "timeout"
+    with pytest.raises(duckdb.ConnectionException):
+        opened[0].execute("SELECT 1")
+
+    chunks = await sql.stream_query(
+        "SELECT * FROM dataset_stream_ds", "ndjson", dataset_id="stream_ds", timeout_s=5,
+    )
+    assert len(b"".join([c async for c in chunks]).splitlines()) == 10
+    with pytest.raises(duckdb.ConnectionException):
+        opened[1].execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_stream_query_slow_client_gets_every_row(tmp_path):
+    """A client reading slower than the timeout still receives the whole stream."""
+    import asyncio
+
+    import pyarrow as pa
+
+    sql = _stream_fixture(tmp_path)
+    chunks = await sql.stream_query(
+        "SELECT * FROM dataset_stream_ds", "arrow",
+        dataset_id="stream_ds", limit=50_000, timeout_s=0.3,
+    )
+    body = []
+    async for chunk in chunks:
+        await asyncio.sleep(0.15)
+        body.append(chunk)
+    assert pa.ipc.open_stream(b"".join(body)).read_all().num_rows == 25_000
+
+
+def test_negotiate_stream_format():
+    from app.services.sql_service import negotiate_stream_format
+
+    assert negotiate_stream_format(None) is None
+    assert negotiate_stream_format("application/json") is None
+    assert negotiate_stream_format("*/*") is None
+    assert negotiate_stream_format("application/vnd.apache.arrow.stream") == "arrow"
+    assert negotiate_stream_format("application/x-ndjson; charset=utf-8") == "ndjson"
+    assert negotiate_stream_format("application/x-ndjson, application/json") == "ndjson"
+    assert negotiate_stream_format("application/json, application/x-ndjson") is None
+
+
+def test_query_endpoint_streams_ndjson():
+    response = client.post(
+        "/api/sql/query",
+        json={"query": "SELECT 1 AS a"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text == '{"a":1}\n'
+
+
+def test_query_endpoint_stream_validation_error():
+    response = client.post(
+        "/api/sql/query",
+        json={"query": "DELETE FROM users"},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 400
+    assert "Invalid query" in response.json()["detail"]
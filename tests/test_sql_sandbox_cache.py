@@ -0,0 +1,171 @@
+"""
+Tests for the SQL sandbox verdict cache — cached verdicts always equal a
+fresh validation, and the cache invalidates when the dataset set or the
+rule sets change.
+
+Property-style: statements are generated from a seeded random grammar that
+mixes allowed and blocked constructs, whitespace, comments and semicolons.
+
+BQ-VZ-PERF: Parsed-statement cache for the SQL sandbox validator.
+"""
+
+import random
+
+import pytest
+
+from app.services import sql_sandbox
+from app.services.sql_sandbox import (
+    SQLSandbox,
+    invalidate_validation_cache,
+    validation_cache_info,
+)
+
+TABLES = ["dataset_abc123", "dataset_def456", "dataset_x1", "secret_table", "information_schema.tables"]
+FUNCS = ["count(*)", "sum(v)", "read_csv('x.csv')", "http_get('u')", "glob('*')", "lower(name)", "st_read('f')"]
+WS = [" ", "  ", "\n", "\t", " \n "]
+
+
+def _random_sql(rng: random.Random) -> str:
+    """One statement from a small grammar of allowed + blocked constructs."""
+    ws = lambda: rng.choice(WS)  # noqa: E731
+    parts = []
+    if rng.random() < 0.2:
+        parts.append(rng.choice(["INSERT INTO dataset_abc123 VALUES (1)", "DROP TABLE x", "COPY t TO 'f'",
+                                 "PRAGMA version", "ATTACH 'db'"]))
+    else:
+        if rng.random() < 0.3:
+            parts.append(f"WITH cte AS ({ws()}SELECT * FROM {rng.choice(TABLES)})")
+        parts.append(f"SELECT{ws()}{rng.choice(FUNCS)}, \"{rng.choice(['COPY', 'name', 'SET'])}\"")
+        parts.append(f"FROM{ws()}{rng.choice(TABLES + ['cte', 'range(10)', 'main.dataset_abc123'])}")
+        if rng.random() < 0.4:
+            parts.append(f"JOIN {rng.choice(TABLES)} ON 1=1")
+        if rng.random() < 0.2:
+            parts.append("-- trailing comment")
+        if rng.random() < 0.2:
+            parts.append("; SELECT 1")
+    sql = ws().join(parts)
+    prefix = rng.choice(["", " ", "\n"])
+    suffix = rng.choice(["", ";", " ;", "; ;", "\n"])
+    return prefix + sql + suffix
+
+
+def _fresh(sandbox: SQLSandbox, sql: str, external: bool):
+    if external:
+        if sql and sql.strip() and len(sql) > 4096:
+            return False, "SQL exceeds maximum length of 4096 characters"
+        return sandbox._validate_external_uncached(sql)
+    return sandbox._validate_uncached(sql)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    invalidate_validation_cache()
+    yield
+    invalidate_validation_cache()
+
+
+class TestCachedVerdictEqualsFresh:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_internal_mode(self, seed):
+        rng = random.Random(seed)
+        sandbox = SQLSandbox(set(rng.sample(TABLES[:4], k=rng.randint(0, 4))))
+        for _ in range(50):
+            sql = _random_sql(rng)
+            fresh = _fresh(sandbox, sql, external=False)
+            assert sandbox.validate(sql) == fresh   # miss (or hit on repeat)
+            assert sandbox.validate(sql) == fresh   # hit
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_external_mode(self, seed):
+        rng = random.Random(1000 + seed)
+        sandbox = SQLSandbox(set(rng.sample(TABLES[:4], k=rng.randint(0, 4))))
+        for _ in range(50):
+            sql = _random_sql(rng)
+            fresh = _fresh(sandbox, sql, external=True)
+            assert sandbox.validate_external(sql) == fresh
+            assert sandbox.validate_external(sql) == fresh
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_whitespace_variants_share_verdicts(self, seed):
+        """Variants that only differ in surrounding whitespace hit the same entry."""
+        rng = random.Random(2000 + seed)
+        sandbox = SQLSandbox({"dataset_abc123", "dataset_def456"})
+        for _ in range(30):
+            sql = _random_sql(rng)
+            for variant in (sql, f"  {sql}", f"{sql}\n\n", f"\t{sql} "):
+                assert sandbox.validate_external(variant) == _fresh(sandbox, variant, external=True)
+
+    def test_modes_do_not_share_entries(self):
+        sandbox = SQLSandbox({"dataset_abc123"})
+        sql = "SELECT http_get('u') FROM dataset_abc123"
+        # Network functions are only blocked in external mode
+        assert sandbox.validate(sql) == (True, "")
+        assert sandbox.validate_external(sql)[0] is False
+        assert sandbox.validate(sql) == (True, "")
+
+    def test_length_limit_not_cached_across_limits(self):
+        sandbox = SQLSandbox({"dataset_abc123"})
+        sql = "SELECT * FROM dataset_abc123 WHERE name = '" + "x" * 100 + "'"
+        assert sandbox.validate_external(sql, max_length=4096)[0] is True
+        ok, err = sandbox.validate_external(sql, max_length=50)
+        assert ok is False
+        assert "maximum length" in err
+
+
+class TestVerdictContents:
+    def test_tables_and_clean_sql(self):
+        sandbox = SQLSandbox({"dataset_abc123", "dataset_def456"})
+        verdict = sandbox.check(
+            "  WITH c AS (SELECT * FROM dataset_abc123) "
+            "SELECT * FROM c JOIN dataset_def456 ON 1=1 CROSS JOIN range(3);  "
+        )
+        assert verdict.is_valid
+        assert verdict.tables == frozenset({"dataset_abc123", "dataset_def456"})
+        assert verdict.clean_sql.startswith("WITH c AS")
+        assert not verdict.clean_sql.endswith(";")
+
+    def test_rejected_verdict_has_no_tables(self):
+        verdict = SQLSandbox({"dataset_abc123"}).check("DROP TABLE dataset_abc123")
+        assert not verdict.is_valid
+        assert verdict.tables == frozenset()
+
+
+class TestInvalidation:
+    def test_hits_are_counted(self):
+        sandbox = SQLSandbox({"dataset_abc123"})
+        sandbox.validate("SELECT * FROM dataset_abc123")
+        sandbox.validate("SELECT * FROM dataset_abc123")
+        SQLSandbox({"dataset_abc123"}).validate(" SELECT * FROM dataset_abc123 ")
+        info = validation_cache_info()
+        assert info["misses"] >= 1
+        assert info["hits"] >= 2
+
+    def test_dataset_set_change_invalidates(self):
+        sql = "SELECT * FROM dataset_new"
+        assert SQLSandbox({"dataset_abc123"}).validate(sql)[0] is False
+        # A new dataset appears — the new table set must not reuse the rejection
+        assert SQLSandbox({"dataset_abc123", "dataset_new"}).validate(sql)[0] is True
+        # ...and removal must not reuse the acceptance
+        assert SQLSandbox({"dataset_abc123"}).validate(sql)[0] is False
+
+    def test_blocked_function_change_invalidates(self, monkeypatch):
+        sandbox = SQLSandbox({"dataset_abc123"})
+        sql = "SELECT md5(name) FROM dataset_abc123"
+        assert sandbox.validate(sql)[0] is True
+        monkeypatch.setattr(sql_sandbox, "BLOCKED_FUNCTIONS", sql_sandbox.BLOCKED_FUNCTIONS | {"md5"})
+        ok, err = sandbox.validate(sql)
+        assert ok is False
+        assert "md5" in err
+
+    def test_in_place_rule_mutation_invalidates(self):
+        sandbox = SQLSandbox({"dataset_abc123"})
+        sql = "SELECT * FROM dataset_abc123 WHERE sha1 = 'x'"
+        sql_fn = "SELECT sha256(name) FROM dataset_abc123"
+        assert sandbox.validate_external(sql_fn)[0] is True
+        sql_sandbox.EXTERNAL_BLOCKED_FUNCTIONS.add("sha256")
+        try:
+            assert sandbox.validate_external(sql_fn)[0] is False
+        finally:
+            sql_sandbox.EXTERNAL_BLOCKED_FUNCTIONS.discard("sha256")
+        assert sandbox.validate_external(sql_fn)[0] is True
+        assert sandbox.validate_external(sql)[0] is True